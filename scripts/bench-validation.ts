@@ -0,0 +1,169 @@
+/**
+ * Micro-benchmark : ValidationPipe (NestJS) vs CompiledValidationPipe
+ *
+ * Compare le temps de validation des plus gros DTOs et vérifie au passage
+ * que les deux pipes produisent exactement les mêmes erreurs.
+ *
+ * Usage: npm run bench:validation
+ */
+import 'reflect-metadata';
+import {
+  ArgumentMetadata,
+  BadRequestException,
+  PipeTransform,
+  ValidationPipe,
+} from '@nestjs/common';
+import { Equals, IsBoolean, IsNumber, Max, Min } from 'class-validator';
+import { CompiledValidationPipe } from '../src/common/pipes/compiled-validation.pipe';
+import { CreateUserDto } from '../src/modules/users/dto/create-user.dto';
+import { CreateBoatDto } from '../src/modules/boats/dto/create-boat.dto';
+
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS) || 20000;
+
+// Mêmes options que dans main.ts
+const options = { whitelist: true, forbidNonWhitelisted: true, transform: true };
+
+// Messages personnalisés avec $value sur des valeurs non textuelles : aucun DTO de l'API
+// n'en utilise encore, mais les deux pipes doivent les substituer de la même façon
+class MessageTokensDto {
+  @IsNumber()
+  @Min(1, { message: '$property: $value est inférieur à $constraint1' })
+  @Max(12, { message: '$property: $value dépasse $constraint1' })
+  seats: number;
+
+  @IsBoolean()
+  @Equals(true, { message: '$property doit valoir true (reçu $value)' })
+  accepted: boolean;
+}
+
+const cases: Array<{ name: string; metatype: Function; payload: Record<string, any> }> = [
+  {
+    name: 'CreateUserDto (valide)',
+    metatype: CreateUserDto,
+    payload: {
+      lastName: 'Dupont',
+      firstName: 'Jean',
+      email: 'jean.dupont@example.com',
+      password: 'securePassword123',
+      city: 'Nice',
+      phone: '+33612345678',
+      status: 'professional',
+      boatLicenseNumber: '12345678',
+      insuranceNumber: 'ABC123456789',
+      companyName: 'Fisher Boats SARL',
+      activityType: 'rental',
+      birthDate: '1990-05-15',
+      postalCode: '06000',
+      languages: ['Français', 'Anglais'],
+    },
+  },
+  {
+    name: 'CreateUserDto (invalide)',
+    metatype: CreateUserDto,
+    payload: {
+      lastName: '',
+      email: 'not-an-email',
+      password: 'short',
+      status: 'admin',
+      boatLicenseNumber: '123',
+      languages: ['Français', 42],
+      unknownField: true,
+    },
+  },
+  {
+    name: 'CreateBoatDto (valide)',
+    metatype: CreateBoatDto,
+    payload: {
+      name: 'Sea Explorer',
+      description: 'Beautiful fishing boat',
+      brand: 'Beneteau',
+      yearBuilt: 2018,
+      licenseType: 'coastal',
+      boatType: 'cabin',
+      equipment: ['gps', 'sounder'],
+      deposit: 1500,
+      maxCapacity: 8,
+      bedCount: 2,
+      homePort: 'Antibes',
+      latitude: 43.5804,
+      longitude: 7.1251,
+      engineType: 'diesel',
+      enginePower: 150,
+    },
+  },
+  {
+    name: 'CreateBoatDto (invalide)',
+    metatype: CreateBoatDto,
+    payload: {
+      boatType: 'submarine',
+      maxCapacity: 0,
+      deposit: -1,
+      latitude: 'north',
+      homePort: 12,
+    },
+  },
+  {
+    name: 'Messages $value (min)',
+    metatype: MessageTokensDto,
+    payload: { seats: 0, accepted: false },
+  },
+  {
+    name: 'Messages $value (max)',
+    metatype: MessageTokensDto,
+    payload: { seats: 20.5, accepted: true },
+  },
+];
+
+async function run(pipe: PipeTransform, metadata: ArgumentMetadata, payload: object) {
+  try {
+    await pipe.transform({ ...payload }, metadata);
+    return 'ok';
+  } catch (error) {
+    if (error instanceof BadRequestException) {
+      return JSON.stringify(error.getResponse());
+    }
+    throw error;
+  }
+}
+
+async function measure(pipe: PipeTransform, metadata: ArgumentMetadata, payload: object) {
+  for (let i = 0; i < 1000; i++) await run(pipe, metadata, payload); // échauffement (JIT)
+
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < ITERATIONS; i++) await run(pipe, metadata, payload);
+  return Number(process.hrtime.bigint() - start) / ITERATIONS / 1000; // µs par validation
+}
+
+async function main() {
+  const standard = new ValidationPipe(options);
+  const compiled = new CompiledValidationPipe(options);
+
+  console.log(`${ITERATIONS} validations par cas\n`);
+  console.log('Cas'.padEnd(28) + 'ValidationPipe'.padStart(16) + 'Compilé'.padStart(12) + 'Gain'.padStart(8));
+
+  for (const { name, metatype, payload } of cases) {
+    const metadata: ArgumentMetadata = { type: 'body', metatype: metatype as any, data: '' };
+
+    // Les deux pipes doivent renvoyer exactement la même chose
+    const expected = await run(standard, metadata, payload);
+    const actual = await run(compiled, metadata, payload);
+    if (expected !== actual) {
+      console.error(`\n${name}: sorties différentes\n  standard: ${expected}\n  compilé:  ${actual}`);
+      process.exit(1);
+    }
+
+    const standardUs = await measure(standard, metadata, payload);
+    const compiledUs = await measure(compiled, metadata, payload);
+    console.log(
+      name.padEnd(28) +
+        `${standardUs.toFixed(2)} µs`.padStart(16) +
+        `${compiledUs.toFixed(2)} µs`.padStart(12) +
+        `x${(standardUs / compiledUs).toFixed(1)}`.padStart(8),
+    );
+  }
+}
+
+main().catch((error) => {
+  console.error('Benchmark failed:', error);
+  process.exit(1);
+});
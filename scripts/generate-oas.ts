@@ -5,11 +5,68 @@
  * Usage: npx ts-node scripts/generate-oas.ts
  */
 import { NestFactory } from '@nestjs/core';
-import { SwaggerModule, DocumentBuilder } from '@nestjs/swagger';
+import { SwaggerModule, DocumentBuilder, OpenAPIObject } from '@nestjs/swagger';
+import { getMetadataArgsStorage } from 'typeorm';
 import { AppModule } from '../src/app.module';
+import { User } from '../src/modules/users/entities/user.entity';
+import { Boat } from '../src/modules/boats/entities/boat.entity';
+import { Trip } from '../src/modules/trips/entities/trip.entity';
+import { TripSearch } from '../src/modules/trips/entities/trip-search.entity';
+import { Booking } from '../src/modules/bookings/entities/booking.entity';
+import { LogbookEntry } from '../src/modules/logbook/entities/logbook-entry.entity';
+import { AnonymizationJob } from '../src/modules/users/entities/anonymization-job.entity';
+import { execFileSync } from 'child_process';
 import * as fs from 'fs';
 import * as path from 'path';
 
+// Entités renvoyées par l'API : un schéma de réponse chacune (components.schemas)
+const RESPONSE_ENTITIES: Record<string, Function> = {
+  User,
+  Boat,
+  Trip,
+  TripSearch,
+  Booking,
+  LogbookEntry,
+  AnonymizationJob,
+};
+
+// Réponse de chaque opération : [schéma, liste ?] (les 204 n'ont pas de corps)
+const RESPONSE_TYPES: Record<string, [string, boolean]> = {
+  AuthController_login: ['AuthResponse', false],
+  AuthController_refresh: ['AuthResponse', false],
+  UsersController_create: ['User', false],
+  UsersController_findAll: ['User', true],
+  UsersController_findOne: ['User', false],
+  UsersController_update: ['User', false],
+  UsersController_getAnonymization: ['AnonymizationJob', false],
+  UsersController_getUserBoats: ['Boat', true],
+  UsersController_getUserTrips: ['Trip', true],
+  UsersController_getUserBookings: ['Booking', true],
+  UsersController_startExport: ['UserExport', false],
+  UsersController_getExport: ['UserExport', false],
+  BoatsController_create: ['Boat', false],
+  BoatsController_findAll: ['Boat', true],
+  BoatsController_facets: ['BoatFacets', false],
+  BoatsController_findClusters: ['BoatClusters', false],
+  BoatsController_findOne: ['Boat', false],
+  BoatsController_update: ['Boat', false],
+  TripsController_create: ['Trip', false],
+  TripsController_findAll: ['Trip', true],
+  TripsController_facets: ['TripFacets', false],
+  TripsController_search: ['TripSearch', true],
+  TripsController_findOne: ['Trip', false],
+  TripsController_update: ['Trip', false],
+  BookingsController_create: ['Booking', false],
+  BookingsController_findAll: ['Booking', true],
+  BookingsController_findOne: ['Booking', false],
+  BookingsController_update: ['Booking', false],
+  LogbookController_create: ['LogbookEntry', false],
+  LogbookController_import: ['LogbookImportReport', false],
+  LogbookController_findAll: ['LogbookEntry', true],
+  LogbookController_findOne: ['LogbookEntry', false],
+  LogbookController_update: ['LogbookEntry', false],
+};
+
 async function generateOAS() {
   // Créer l'application sans la démarrer
   const app = await NestFactory.create(AppModule, { logger: false });
@@ -25,6 +82,7 @@ async function generateOAS() {
 
   // Générer le document Swagger
   const document = SwaggerModule.createDocument(app, config);
+  addResponseSchemas(document);
 
   // Créer le dossier docs s'il n'existe pas
   const docsDir = path.join(__dirname, '..', 'docs');
@@ -45,6 +103,195 @@ async function generateOAS() {
 
   await app.close();
   console.log('\nOAS files generated successfully!');
+
+  // Client Python typé des tests, régénéré à partir du nouveau document
+  const generator = path.join(__dirname, '..', 'tests', 'generate_client.py');
+  execFileSync(process.env.PYTHON || 'python3', [generator], { stdio: 'inherit' });
+}
+
+/**
+ * Schéma OpenAPI d'une colonne, tel que le driver pg la renvoie en JSON
+ * (mêmes règles que encoderForColumn dans compile-serializer.ts)
+ */
+function schemaForColumn(column: { mode: string; options: any }): Record<string, any> {
+  const type = column.options?.type;
+  let schema: Record<string, any>;
+
+  if (column.options?.array || type === 'simple-array') {
+    schema = { type: 'array', items: { type: 'string' } };
+  } else if (column.mode === 'createDate' || column.mode === 'updateDate') {
+    schema = { type: 'string', format: 'date-time' };
+  } else if (type === 'decimal' || type === 'numeric') {
+    schema = { type: 'string', format: 'decimal' }; // pg renvoie les décimaux en chaîne
+  } else if (type === 'date') {
+    schema = { type: 'string', format: 'date' };
+  } else if (type === 'uuid') {
+    schema = { type: 'string', format: 'uuid' };
+  } else if (type === 'enum') {
+    schema = { type: 'string', enum: column.options.enum };
+  } else if (type === Number) {
+    schema = { type: 'integer' }; // TypeORM crée une colonne integer pour un number
+  } else if (type === Boolean || type === 'boolean') {
+    schema = { type: 'boolean' };
+  } else if (type === Date || type === 'timestamptz' || type === 'timestamp') {
+    schema = { type: 'string', format: 'date-time' };
+  } else {
+    schema = { type: 'string' };
+  }
+
+  if (column.options?.nullable) schema.nullable = true;
+  return schema;
+}
+
+/**
+ * Ajoute les schémas de réponse (entités) et les rattache à chaque opération
+ *
+ * Les entités ne portent pas de décorateurs @ApiProperty : leurs schémas sont construits
+ * à partir des métadonnées TypeORM. Aucune propriété n'est requise : les relations et les
+ * sélections partielles (organisateur d'une sortie) omettent des champs.
+ */
+function addResponseSchemas(document: OpenAPIObject) {
+  const storage = getMetadataArgsStorage();
+  const schemas = document.components.schemas;
+
+  for (const [name, target] of Object.entries(RESPONSE_ENTITIES)) {
+    const properties: Record<string, any> = {};
+    for (const column of storage.filterColumns(target)) {
+      if (column.options?.select === false) continue; // ex: User.password
+      properties[column.propertyName] = schemaForColumn(column);
+    }
+    for (const relation of storage.filterRelations(target)) {
+      const related = (relation.type as () => Function)();
+      const relatedName = Object.keys(RESPONSE_ENTITIES).find(
+        (key) => RESPONSE_ENTITIES[key] === related,
+      );
+      const ref = { $ref: `#/components/schemas/${relatedName}` };
+      const isCollection =
+        relation.relationType === 'one-to-many' || relation.relationType === 'many-to-many';
+      properties[relation.propertyName] = isCollection ? { type: 'array', items: ref } : ref;
+    }
+    schemas[name] = { type: 'object', properties };
+  }
+
+  // Réponse de AuthService.buildAuthResponse
+  schemas.AuthResponse = {
+    type: 'object',
+    properties: {
+      accessToken: { type: 'string' },
+      refreshToken: { type: 'string' },
+      expiresIn: { type: 'integer' },
+      user: { $ref: '#/components/schemas/User' },
+    },
+    required: ['accessToken', 'refreshToken', 'expiresIn', 'user'],
+  };
+
+  // Réponse de BoatsService.findClusters : une cellule est elle-même une tuile (zoom z + 3)
+  schemas.BoatCluster = {
+    type: 'object',
+    properties: {
+      z: { type: 'integer' },
+      x: { type: 'integer' },
+      y: { type: 'integer' },
+      count: { type: 'integer' },
+      latitude: { type: 'number' },
+      longitude: { type: 'number' },
+    },
+    required: ['z', 'x', 'y', 'count', 'latitude', 'longitude'],
+  };
+  schemas.BoatTile = {
+    type: 'object',
+    properties: {
+      z: { type: 'integer' },
+      x: { type: 'integer' },
+      y: { type: 'integer' },
+      count: { type: 'integer' },
+      clusters: { type: 'array', items: { $ref: '#/components/schemas/BoatCluster' } },
+      boats: { type: 'array', items: { $ref: '#/components/schemas/Boat' } },
+    },
+    required: ['z', 'x', 'y', 'count'],
+  };
+  schemas.BoatClusters = {
+    type: 'object',
+    properties: {
+      tiles: { type: 'array', items: { $ref: '#/components/schemas/BoatTile' } },
+    },
+    required: ['tiles'],
+  };
+
+  // Réponses de BoatsService.facets et TripsService.facets (common/search/facets.ts)
+  schemas.FacetValue = {
+    type: 'object',
+    properties: { value: { type: 'string' }, count: { type: 'integer' } },
+    required: ['value', 'count'],
+  };
+  const facetsSchema = (entity: string, facets: string[]) => {
+    const counts = { type: 'array', items: { $ref: '#/components/schemas/FacetValue' } };
+    schemas[`${entity}FacetCounts`] = {
+      type: 'object',
+      properties: Object.fromEntries(facets.map((facet) => [facet, counts])),
+      required: facets,
+    };
+    schemas[`${entity}Facets`] = {
+      type: 'object',
+      properties: {
+        total: { type: 'integer' },
+        facets: { $ref: `#/components/schemas/${entity}FacetCounts` },
+        results: { type: 'array', items: { $ref: `#/components/schemas/${entity}` } },
+      },
+      required: ['total', 'facets'],
+    };
+  };
+  facetsSchema('Boat', ['boatType', 'engineType', 'licenseType', 'homePort']);
+  facetsSchema('Trip', ['tripType', 'pricingType', 'price']);
+
+  // Réponse de LogbookImportService.import
+  schemas.LogbookImportError = {
+    type: 'object',
+    properties: {
+      line: { type: 'integer' },
+      errors: { type: 'array', items: { type: 'string' } },
+    },
+    required: ['line', 'errors'],
+  };
+  schemas.LogbookImportReport = {
+    type: 'object',
+    properties: {
+      imported: { type: 'integer' },
+      failed: { type: 'integer' },
+      errors: { type: 'array', items: { $ref: '#/components/schemas/LogbookImportError' } },
+    },
+    required: ['imported', 'failed', 'errors'],
+  };
+
+  // Export RGPD en arrière-plan (UserExportService)
+  schemas.UserExport = {
+    type: 'object',
+    properties: {
+      id: { type: 'string', format: 'uuid' },
+      userId: { type: 'string', format: 'uuid' },
+      status: { type: 'string', enum: ['pending', 'running', 'completed', 'failed'] },
+      createdAt: { type: 'string', format: 'date-time' },
+      completedAt: { type: 'string', format: 'date-time' },
+      expiresAt: { type: 'string', format: 'date-time' },
+      size: { type: 'integer' },
+      error: { type: 'string' },
+    },
+    required: ['id', 'userId', 'status', 'createdAt'],
+  };
+
+  for (const operations of Object.values(document.paths)) {
+    for (const operation of Object.values(operations) as any[]) {
+      const responseType = RESPONSE_TYPES[operation.operationId];
+      if (!responseType) continue;
+      const [name, isList] = responseType;
+      const ref = { $ref: `#/components/schemas/${name}` };
+      const success =
+        operation.responses['201'] ?? operation.responses['202'] ?? operation.responses['200'];
+      success.content = {
+        'application/json': { schema: isList ? { type: 'array', items: ref } : ref },
+      };
+    }
+  }
 }
 
 /**
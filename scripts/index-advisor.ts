@@ -0,0 +1,177 @@
+/**
+ * Conseiller d'index : rejoue les requêtes des services avec EXPLAIN et signale les Seq Scan
+ *
+ * 1. insère un jeu de données (ADVISOR_USERS utilisateurs, avec leurs bateaux, sorties,
+ *    réservations et carnets) puis ANALYZE, pour que le planificateur raisonne sur des
+ *    volumes réalistes et non sur des tables presque vides
+ * 2. appelle les méthodes des services (findByUser, BF19, BF23...) en enregistrant le SQL
+ *    qu'elles envoient (logger TypeORM)
+ * 3. lance EXPLAIN sur chaque requête enregistrée et liste les parcours séquentiels
+ * 4. supprime le jeu de données
+ *
+ * À lancer sur une base de développement ou jetable (variables DATABASE_*), jamais en
+ * production : les données sont réellement insérées le temps de l'analyse.
+ * Code de sortie 1 si un Seq Scan est trouvé.
+ *
+ * Usage: npm run advise:indexes
+ */
+import { NestFactory } from '@nestjs/core';
+import { DataSource, Logger, QueryRunner } from 'typeorm';
+import { AppModule } from '../src/app.module';
+import { UsersService } from '../src/modules/users/users.service';
+import { BoatsService } from '../src/modules/boats/boats.service';
+import { TripsService } from '../src/modules/trips/trips.service';
+import { BookingsService } from '../src/modules/bookings/bookings.service';
+import { LogbookService } from '../src/modules/logbook/logbook.service';
+import { backfillTripSearch, refreshTripSearch } from '../src/modules/trips/trip-search.projection';
+
+const USERS = parseInt(process.env.ADVISOR_USERS) || 5000;
+// Comptes du jeu de données, reconnus (et supprimés) par leur domaine
+const EMAIL_DOMAIN = 'index-advisor.test';
+
+/**
+ * Logger TypeORM qui enregistre les requêtes pendant un scénario
+ */
+class QueryRecorder implements Logger {
+  queries: Array<{ query: string; parameters?: any[] }> = [];
+  recording = false;
+
+  logQuery(query: string, parameters?: any[]) {
+    if (this.recording) this.queries.push({ query, parameters });
+  }
+  logQueryError() {}
+  logQuerySlow() {}
+  logSchemaBuild() {}
+  logMigration() {}
+  log() {}
+}
+
+const SEED = [
+  `INSERT INTO "users" ("id", "lastName", "firstName", "email", "password", "city")
+   SELECT md5('advisor:user:' || n)::uuid, 'Advisor', 'User' || n,
+          'advisor-' || n || '@${EMAIL_DOMAIN}', 'x', 'Nice'
+   FROM generate_series(1, ${USERS}) n`,
+  `INSERT INTO "boats" ("id", "name", "boatType", "maxCapacity", "homePort", "ownerId")
+   SELECT md5('advisor:boat:' || n)::uuid, 'Boat' || n, 'open', 6, 'Nice', md5('advisor:user:' || n)::uuid
+   FROM generate_series(1, ${USERS}) n`,
+  // 4 sorties par bateau, organisées par son propriétaire
+  `INSERT INTO "trips" ("id", "title", "startDates", "passengerCount", "price", "organizerId", "boatId")
+   SELECT md5('advisor:trip:' || n)::uuid, 'Trip' || n, '2030-06-01,2030-06-08', 4, 50 + n % 100,
+          md5('advisor:user:' || ((n - 1) % ${USERS} + 1))::uuid,
+          md5('advisor:boat:' || ((n - 1) % ${USERS} + 1))::uuid
+   FROM generate_series(1, ${USERS * 4}) n`,
+  `INSERT INTO "bookings" ("selectedDate", "seats", "totalPrice", "tripId", "userId")
+   SELECT date '2030-01-01' + n % 365, 1, 50,
+          md5('advisor:trip:' || ((n - 1) % ${USERS * 4} + 1))::uuid,
+          md5('advisor:user:' || (n * 7 % ${USERS} + 1))::uuid
+   FROM generate_series(1, ${USERS * 10}) n`,
+  `INSERT INTO "logbook_entries" ("fishSpecies", "fishingDate", "userId")
+   SELECT 'Bar', date '2020-01-01' + n % 2000, md5('advisor:user:' || ((n - 1) % ${USERS} + 1))::uuid
+   FROM generate_series(1, ${USERS * 10}) n`,
+];
+
+const ADVISOR_USERS = `SELECT "id" FROM "users" WHERE "email" LIKE '%@${EMAIL_DOMAIN}'`;
+const ADVISOR_TRIPS = `SELECT "id" FROM "trips" WHERE "organizerId" IN (${ADVISOR_USERS})`;
+
+// Ordre des clés étrangères ; les lignes de trip_search suivent les sorties (CASCADE)
+const CLEANUP = [
+  `DELETE FROM "bookings" WHERE "userId" IN (${ADVISOR_USERS}) OR "tripId" IN (${ADVISOR_TRIPS})`,
+  `DELETE FROM "logbook_entries" WHERE "userId" IN (${ADVISOR_USERS})`,
+  `DELETE FROM "trips" WHERE "organizerId" IN (${ADVISOR_USERS})`,
+  `DELETE FROM "boats" WHERE "ownerId" IN (${ADVISOR_USERS})`,
+  `DELETE FROM "users" WHERE "email" LIKE '%@${EMAIL_DOMAIN}'`,
+];
+
+// Requêtes sans plan : transactions, savepoints
+const NOT_EXPLAINABLE = /^\s*(START|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)/i;
+
+function seqScans(plan: any): string[] {
+  const found = plan['Node Type'] === 'Seq Scan' ? [plan['Relation Name']] : [];
+  for (const child of plan.Plans ?? []) found.push(...seqScans(child));
+  return found;
+}
+
+// Recalcul de trip_search dans une transaction annulée (le jeu de données reste intact)
+async function inRollback(dataSource: DataSource, run: (runner: QueryRunner) => Promise<void>) {
+  const runner = dataSource.createQueryRunner();
+  await runner.startTransaction();
+  try {
+    await run(runner);
+  } finally {
+    await runner.rollbackTransaction();
+    await runner.release();
+  }
+}
+
+async function adviseIndexes() {
+  const app = await NestFactory.createApplicationContext(AppModule, { logger: false });
+  const dataSource = app.get(DataSource);
+  const users = app.get(UsersService);
+  const boats = app.get(BoatsService);
+  const trips = app.get(TripsService);
+  const bookings = app.get(BookingsService);
+  const logbook = app.get(LogbookService);
+
+  const recorder = new QueryRecorder();
+  Object.assign(dataSource, { logger: recorder });
+
+  let found = 0;
+  try {
+    console.log(`Jeu de données : ${USERS} utilisateurs...`);
+    for (const statement of SEED) await dataSource.query(statement);
+    await backfillTripSearch(dataSource.manager);
+    await dataSource.query('ANALYZE');
+
+    const [{ id: userId }] = await dataSource.query(`SELECT md5('advisor:user:1')::uuid AS id`);
+    const [{ id: boatId }] = await dataSource.query(`SELECT md5('advisor:boat:1')::uuid AS id`);
+    const [{ id: tripId }] = await dataSource.query(`SELECT md5('advisor:trip:1')::uuid AS id`);
+
+    const scenarios: Record<string, () => Promise<unknown>> = {
+      'UsersService.getUserBoats': () => users.getUserBoats(userId),
+      'UsersService.getUserTrips': () => users.getUserTrips(userId),
+      'UsersService.getUserBookings': () => users.getUserBookings(userId),
+      'BoatsService.findByUser': () => boats.findByUser(userId),
+      'TripsService.findByUser': () => trips.findByUser(userId),
+      'BookingsService.findAll (tripId)': () => bookings.findAll({ tripId }),
+      'BookingsService.findAll (userId)': () => bookings.findAll({ userId }),
+      'BookingsService.findAll (tripId, fromDate, toDate)': () =>
+        bookings.findAll({ tripId, fromDate: '2030-03-01', toDate: '2030-03-31' }),
+      'BookingsService.findByUser': () => bookings.findByUser(userId),
+      'LogbookService.findAll (userId, startDate)': () =>
+        logbook.findAll({ userId, startDate: '2024-01-01' }),
+      'LogbookService.findByUser': () => logbook.findByUser(userId),
+      'refreshTripSearch (boatId)': () =>
+        inRollback(dataSource, (runner) => refreshTripSearch(runner.manager, { boatId })),
+      'refreshTripSearch (organizerId)': () =>
+        inRollback(dataSource, (runner) => refreshTripSearch(runner.manager, { organizerId: userId })),
+    };
+
+    for (const [name, scenario] of Object.entries(scenarios)) {
+      recorder.queries = [];
+      recorder.recording = true;
+      await scenario();
+      recorder.recording = false;
+
+      const problems: string[] = [];
+      for (const { query, parameters } of recorder.queries) {
+        if (NOT_EXPLAINABLE.test(query)) continue;
+        const [row] = await dataSource.query(`EXPLAIN (FORMAT JSON) ${query}`, parameters);
+        for (const table of seqScans(row['QUERY PLAN'][0].Plan)) {
+          problems.push(`Seq Scan sur "${table}" : ${query.replace(/\s+/g, ' ').slice(0, 160)}`);
+        }
+      }
+      console.log(`${problems.length ? 'SEQ SCAN' : 'OK      '}  ${name}`);
+      problems.forEach((problem) => console.log(`          ${problem}`));
+      found += problems.length;
+    }
+  } finally {
+    recorder.recording = false;
+    for (const statement of CLEANUP) await dataSource.query(statement);
+    await app.close();
+  }
+
+  console.log(found ? `\n${found} parcours séquentiel(s) : index manquant ?` : '\nAucun parcours séquentiel.');
+  process.exitCode = found ? 1 : 0;
+}
+
+adviseIndexes();
@@ -1,6 +1,10 @@
-import { Controller, Get } from '@nestjs/common';
+import { Controller, Get, NotFoundException } from '@nestjs/common';
 import { ApiExcludeController } from '@nestjs/swagger';
+import { DataSource } from 'typeorm';
+import { PostgresDriver } from 'typeorm/driver/postgres/PostgresDriver';
+import { readdirSync } from 'fs';
 import { Public } from './common/decorators/public.decorator';
+import { RateLimitCost } from './common/decorators/rate-limit-cost.decorator';
 
 /**
  * Controller racine de l'API
@@ -9,6 +13,8 @@ import { Public } from './common/decorators/public.decorator';
 @ApiExcludeController() // Ne pas afficher dans Swagger
 @Controller()
 export class AppController {
+  constructor(private readonly dataSource: DataSource) {}
+
   @Public()
   @Get()
   getApiInfo() {
@@ -30,6 +36,7 @@ export class AppController {
   }
 
   @Public()
+  @RateLimitCost(0) // Sondes du load balancer : jamais limitées
   @Get('health')
   healthCheck() {
     return {
@@ -37,4 +44,52 @@ export class AppController {
       timestamp: new Date().toISOString(),
     };
   }
+
+  /**
+   * État du processus pour les tests d'endurance (tests/load/soak.py)
+   *
+   * Mémoire (RSS, tas V8), descripteurs de fichiers ouverts, ressources actives de la
+   * boucle d'événements et connexions PostgreSQL (pool de l'API et côté serveur).
+   * Exposé seulement si RUNTIME_METRICS=true : ces informations n'ont pas à être publiques.
+   */
+  @Public()
+  @RateLimitCost(0)
+  @Get('health/runtime')
+  async runtime() {
+    if (process.env.RUNTIME_METRICS !== 'true') {
+      throw new NotFoundException();
+    }
+
+    const activeResources: Record<string, number> = {};
+    for (const resource of process.getActiveResourcesInfo()) {
+      activeResources[resource] = (activeResources[resource] ?? 0) + 1;
+    }
+
+    let openFileDescriptors: number | null = null;
+    try {
+      openFileDescriptors = readdirSync('/proc/self/fd').length; // Linux uniquement
+    } catch {
+      // macOS / Windows : non disponible
+    }
+
+    // Pool pg de TypeORM : connexions ouvertes, libres et requêtes en attente d'une connexion
+    const pool = (this.dataSource.driver as PostgresDriver).master;
+    const [{ count }] = await this.dataSource.query(
+      'SELECT count(*)::int AS count FROM pg_stat_activity WHERE datname = current_database()',
+    );
+
+    return {
+      timestamp: new Date().toISOString(),
+      uptimeSeconds: process.uptime(),
+      memory: process.memoryUsage(),
+      openFileDescriptors,
+      activeResources,
+      database: {
+        poolTotal: pool.totalCount,
+        poolIdle: pool.idleCount,
+        poolWaiting: pool.waitingCount,
+        serverConnections: count,
+      },
+    };
+  }
 }
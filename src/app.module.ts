@@ -2,12 +2,16 @@ import { Module } from '@nestjs/common';
 import { ConfigModule } from '@nestjs/config';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { AppController } from './app.controller';
+import { dataSourceOptions, initializeDataSource } from './database/data-source';
+import { PartitionsModule } from './database/partitions.module';
 import { AuthModule } from './modules/auth/auth.module';
 import { UsersModule } from './modules/users/users.module';
 import { BoatsModule } from './modules/boats/boats.module';
 import { TripsModule } from './modules/trips/trips.module';
 import { BookingsModule } from './modules/bookings/bookings.module';
 import { LogbookModule } from './modules/logbook/logbook.module';
+import { IdempotencyModule } from './common/idempotency/idempotency.module';
+import { RateLimitModule } from './common/rate-limit/rate-limit.module';
 
 /**
  * Module racine de l'application
@@ -33,16 +37,11 @@ import { LogbookModule } from './modules/logbook/logbook.module';
 
     // TypeOrmModule configure la connexion à la base de données PostgreSQL
     // TypeORM est un ORM (Object-Relational Mapping) qui traduit les objets TypeScript en SQL
-    TypeOrmModule.forRoot({
-      type: 'postgres',
-      host: process.env.DATABASE_HOST || 'localhost',
-      port: parseInt(process.env.DATABASE_PORT) || 5432,
-      username: process.env.DATABASE_USER || 'fisherfans',
-      password: process.env.DATABASE_PASSWORD || 'fisherfans',
-      database: process.env.DATABASE_NAME || 'fisherfans',
-      entities: [__dirname + '/**/*.entity{.ts,.js}'],
-      synchronize: true, // ATTENTION: à mettre à false en production ! Synchronise auto le schéma DB
-      logging: true, // Active les logs SQL pour le développement
+    // Options dans database/data-source.ts (partagées avec la CLI TypeORM) ; la fabrique
+    // initializeDataSource lance les migrations AVANT synchronize (voir ce fichier)
+    TypeOrmModule.forRootAsync({
+      useFactory: () => dataSourceOptions(),
+      dataSourceFactory: (options) => initializeDataSource(options),
     }),
 
     // Import de tous les modules métier de l'application
@@ -52,6 +51,10 @@ import { LogbookModule } from './modules/logbook/logbook.module';
     TripsModule,    // Gestion des sorties pêche
     BookingsModule, // Gestion des réservations
     LogbookModule,  // Gestion du carnet de pêche
+
+    IdempotencyModule, // Clés Idempotency-Key des routes de création (@Idempotent())
+    RateLimitModule,   // Limitation de débit par utilisateur / IP (après AuthModule)
+    PartitionsModule,  // Création et archivage des partitions de bookings / logbook_entries
   ],
   controllers: [AppController], // Controller racine pour / et /health
 })
@@ -0,0 +1,25 @@
+import { applyDecorators, UseInterceptors } from '@nestjs/common';
+import { ApiHeader } from '@nestjs/swagger';
+import { IdempotencyInterceptor } from '../interceptors/idempotency.interceptor';
+
+/**
+ * Décorateur @Idempotent()
+ *
+ * Active la gestion de l'en-tête Idempotency-Key sur une route de création
+ * (voir IdempotencyInterceptor) et le documente dans Swagger.
+ *
+ * USAGE:
+ * @Idempotent()
+ * @Post()
+ * create() { ... }
+ */
+export const Idempotent = () =>
+  applyDecorators(
+    UseInterceptors(IdempotencyInterceptor),
+    ApiHeader({
+      name: 'Idempotency-Key',
+      required: false,
+      description:
+        'Unique key for safe retries: a repeated request returns the original response',
+    }),
+  );
@@ -0,0 +1,17 @@
+import { SetMetadata } from '@nestjs/common';
+
+/**
+ * Décorateur @RateLimitCost()
+ *
+ * Nombre de jetons consommés par un appel à la route (1 par défaut).
+ * Les routes coûteuses (bcrypt, recherches ILIKE) consomment plus,
+ * une route à 0 n'est pas limitée (health check).
+ *
+ * USAGE:
+ * @RateLimitCost(5)
+ * @Post('login')
+ * login() { ... }
+ */
+export const RATE_LIMIT_COST_KEY = 'rateLimitCost';
+export const RateLimitCost = (cost: number) =>
+  SetMetadata(RATE_LIMIT_COST_KEY, cost);
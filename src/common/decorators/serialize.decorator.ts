@@ -0,0 +1,17 @@
+import { SetMetadata } from '@nestjs/common';
+import { Serializer } from '../serialization/compile-serializer';
+
+/**
+ * Décorateur @Serialize()
+ *
+ * Associe un sérialiseur compilé (voir compile-serializer.ts) à une route.
+ * Le SerializationInterceptor l'utilise à la place de JSON.stringify().
+ *
+ * USAGE:
+ * @Serialize(boatListSerializer)
+ * @Get()
+ * findAll() { ... }
+ */
+export const SERIALIZER_KEY = 'serializer';
+export const Serialize = (serializer: Serializer) =>
+  SetMetadata(SERIALIZER_KEY, serializer);
@@ -0,0 +1,85 @@
+/**
+ * Tuiles cartographiques (schéma "slippy map" z/x/y, Web Mercator, comme OpenStreetMap)
+ *
+ * À un niveau de zoom z, le monde est découpé en 2^z × 2^z tuiles. La position de chaque
+ * bateau est précalculée en base au zoom TILE_ZOOM (colonnes générées tileX / tileY de
+ * l'entité Boat) : la tuile qui le contient à un zoom z plus faible s'obtient par un simple
+ * décalage de bits (tileX >> (TILE_ZOOM - z)), et toutes les tuiles d'un zoom sont des
+ * intervalles de l'index (tileX, tileY).
+ */
+export const TILE_ZOOM = 20;
+
+// Latitude maximale de la projection Web Mercator (au-delà, la tuile est hors carte)
+const MAX_LATITUDE = 85.0511287798;
+
+export interface Tile {
+  z: number;
+  x: number;
+  y: number;
+}
+
+export function lngToTileX(lng: number, z: number): number {
+  const n = 2 ** z;
+  return Math.min(n - 1, Math.max(0, Math.floor(((lng + 180) / 360) * n)));
+}
+
+export function latToTileY(lat: number, z: number): number {
+  const n = 2 ** z;
+  const rad = (Math.max(-MAX_LATITUDE, Math.min(MAX_LATITUDE, lat)) * Math.PI) / 180;
+  const y = Math.floor(((1 - Math.log(Math.tan(rad) + 1 / Math.cos(rad)) / Math.PI) / 2) * n);
+  return Math.min(n - 1, Math.max(0, y));
+}
+
+/**
+ * Expressions SQL des colonnes générées tileX / tileY (mêmes formules que ci-dessus)
+ * least() et greatest() ignorent NULL : un bateau sans position doit rester sans tuile.
+ */
+export function tileXExpression(lngColumn: string): string {
+  const n = 2 ** TILE_ZOOM;
+  const x = `least(${n - 1}, floor(("${lngColumn}" + 180) / 360 * ${n}))::integer`;
+  return `CASE WHEN "${lngColumn}" IS NOT NULL THEN ${x} END`;
+}
+
+export function tileYExpression(latColumn: string): string {
+  const n = 2 ** TILE_ZOOM;
+  const rad = `radians(greatest(-${MAX_LATITUDE}, least(${MAX_LATITUDE}, "${latColumn}"::double precision)))`;
+  const y = `least(${n - 1}, floor((1 - ln(tan(${rad}) + 1 / cos(${rad})) / pi()) / 2 * ${n}))::integer`;
+  return `CASE WHEN "${latColumn}" IS NOT NULL THEN ${y} END`;
+}
+
+/**
+ * Lit une liste de tuiles "z/x/y,z/x/y" ; null si le format ou les coordonnées sont invalides
+ */
+export function parseTiles(value: string): Tile[] | null {
+  const tiles: Tile[] = [];
+  for (const part of value.split(',')) {
+    const match = /^(\d{1,2})\/(\d+)\/(\d+)$/.exec(part.trim());
+    if (!match) return null;
+    const [z, x, y] = match.slice(1).map(Number);
+    if (z > TILE_ZOOM || x >= 2 ** z || y >= 2 ** z) return null;
+    tiles.push({ z, x, y });
+  }
+  return tiles;
+}
+
+/**
+ * Tuiles du zoom z qui couvrent une bounding box (les y croissent vers le sud) ;
+ * null s'il en faut plus de `limit`
+ */
+export function tilesForBbox(
+  bbox: { minLat: number; maxLat: number; minLng: number; maxLng: number },
+  z: number,
+  limit: number,
+): Tile[] | null {
+  const [minX, maxX] = [lngToTileX(bbox.minLng, z), lngToTileX(bbox.maxLng, z)];
+  const [minY, maxY] = [latToTileY(bbox.maxLat, z), latToTileY(bbox.minLat, z)];
+  if ((maxX - minX + 1) * (maxY - minY + 1) > limit) return null;
+
+  const tiles: Tile[] = [];
+  for (let x = minX; x <= maxX; x++) {
+    for (let y = minY; y <= maxY; y++) {
+      tiles.push({ z, x, y });
+    }
+  }
+  return tiles;
+}
@@ -0,0 +1,115 @@
+import {
+  Injectable,
+  Inject,
+  CanActivate,
+  ExecutionContext,
+  HttpException,
+  HttpStatus,
+  OnModuleDestroy,
+} from '@nestjs/common';
+import { Reflector } from '@nestjs/core';
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { RATE_LIMIT_COST_KEY } from '../decorators/rate-limit-cost.decorator';
+import {
+  BucketPolicy,
+  RATE_LIMIT_STORE,
+  RateLimitStore,
+} from '../rate-limit/rate-limit.store';
+
+/**
+ * Guard de limitation de débit (token bucket)
+ *
+ * Chaque client a un seau de RATE_LIMIT_CAPACITY jetons, rempli de
+ * RATE_LIMIT_REFILL_PER_SECOND jetons par seconde. Chaque requête consomme
+ * le coût de sa route (@RateLimitCost). Seau vide = 429 avec Retry-After.
+ *
+ * CLE DU SEAU:
+ * - utilisateur authentifié : son id (le "sub" du JWT), le JwtAuthGuard s'exécutant avant
+ * - sinon : l'adresse IP (request.ip) ; derrière un load balancer, TRUST_PROXY doit être
+ *   renseigné, sinon tous les clients anonymes partagent le seau de l'adresse du proxy
+ *
+ * CLUSTER:
+ * Avec un stockage en mémoire, chaque instance ne voit que ses propres requêtes :
+ * la limite est divisée par RATE_LIMIT_CLUSTER_SIZE (instances derrière le load balancer).
+ * Avec un stockage partagé, la limite s'applique telle quelle.
+ *
+ * ADAPTATIF:
+ * Quand la boucle d'événements prend du retard (p99 au-delà de RATE_LIMIT_LAG_THRESHOLD_MS),
+ * le coût des requêtes est multiplié (jusqu'à x4) : les clients les plus gourmands
+ * sont freinés en premier et la latence reste correcte pour les autres.
+ */
+@Injectable()
+export class RateLimitGuard implements CanActivate, OnModuleDestroy {
+  private readonly policy: BucketPolicy;
+  private readonly lagThresholdMs =
+    parseInt(process.env.RATE_LIMIT_LAG_THRESHOLD_MS) || 100;
+  private readonly loopDelay = monitorEventLoopDelay({ resolution: 20 });
+  private readonly sampler: NodeJS.Timeout;
+  private loadFactor = 1;
+
+  constructor(
+    private reflector: Reflector,
+    @Inject(RATE_LIMIT_STORE) private store: RateLimitStore,
+  ) {
+    const clusterSize = store.shared
+      ? 1
+      : parseInt(process.env.RATE_LIMIT_CLUSTER_SIZE) || 1;
+
+    this.policy = {
+      capacity: (parseInt(process.env.RATE_LIMIT_CAPACITY) || 100) / clusterSize,
+      refillPerSecond:
+        (parseFloat(process.env.RATE_LIMIT_REFILL_PER_SECOND) || 20) / clusterSize,
+    };
+
+    // Mesure du retard de la boucle d'événements, recalculée chaque seconde
+    this.loopDelay.enable();
+    this.sampler = setInterval(() => {
+      const p99Ms = this.loopDelay.percentile(99) / 1e6;
+      this.loadFactor = Math.min(4, Math.max(1, p99Ms / this.lagThresholdMs));
+      this.loopDelay.reset();
+    }, 1000).unref();
+  }
+
+  async canActivate(context: ExecutionContext): Promise<boolean> {
+    const cost =
+      this.reflector.getAllAndOverride<number>(RATE_LIMIT_COST_KEY, [
+        context.getHandler(),
+        context.getClass(),
+      ]) ?? 1;
+
+    if (cost <= 0) {
+      return true;
+    }
+
+    const http = context.switchToHttp();
+    const request = http.getRequest();
+    const response = http.getResponse();
+
+    const key = request.user?.id ? `user:${request.user.id}` : `ip:${request.ip}`;
+    // Le coût ne dépasse jamais la capacité, sinon la requête ne passerait jamais
+    const weightedCost = Math.min(cost * this.loadFactor, this.policy.capacity);
+    const result = await this.store.consume(key, weightedCost, this.policy);
+
+    response.header('X-RateLimit-Limit', String(Math.floor(this.policy.capacity)));
+    response.header('X-RateLimit-Remaining', String(Math.floor(result.remaining)));
+
+    if (!result.allowed) {
+      response.header('Retry-After', String(Math.ceil(result.retryAfterMs / 1000)));
+      throw new HttpException(
+        {
+          code: '429',
+          businessCode: 'RATE_LIMITED',
+          message: 'Too many requests, retry later',
+        },
+        HttpStatus.TOO_MANY_REQUESTS,
+      );
+    }
+
+    return true;
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.sampler);
+    this.loopDelay.disable();
+  }
+}
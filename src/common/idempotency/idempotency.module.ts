@@ -0,0 +1,15 @@
+import { Global, Module } from '@nestjs/common';
+import { IdempotencyStore } from './idempotency.store';
+
+/**
+ * Module d'idempotence
+ *
+ * @Global() : le store est partagé par toutes les routes marquées @Idempotent(),
+ * quel que soit le module qui les déclare.
+ */
+@Global()
+@Module({
+  providers: [IdempotencyStore],
+  exports: [IdempotencyStore],
+})
+export class IdempotencyModule {}
@@ -0,0 +1,98 @@
+import { Injectable } from '@nestjs/common';
+
+/**
+ * Résultat de la réservation d'une clé d'idempotence
+ * - claimed : première requête avec cette clé, le handler doit s'exécuter
+ * - replay : la réponse est déjà connue, on la renvoie telle quelle
+ * - mismatch : la clé a déjà servi pour une requête différente
+ */
+export type IdempotencyClaim =
+  | { status: 'claimed'; complete: (body: string) => void; fail: () => void }
+  | { status: 'replay'; body: string }
+  | { status: 'mismatch' };
+
+interface IdempotencyRecord {
+  fingerprint: string;
+  expiresAt: number;
+  body?: string; // réponse JSON, une fois la requête terminée
+  pending?: Promise<string | null>; // requête en cours : corps, ou null si elle a échoué
+}
+
+/**
+ * Stockage en mémoire des clés d'idempotence
+ *
+ * Toutes les entrées ont la même durée de vie (IDEMPOTENCY_TTL) : l'ordre
+ * d'insertion de la Map est donc aussi l'ordre d'expiration, et l'éviction
+ * n'a qu'à retirer les entrées en tête. Le nombre d'entrées est borné
+ * (IDEMPOTENCY_MAX_KEYS) : au-delà, les plus anciennes sont retirées.
+ *
+ * Les clés et empreintes reçues sont déjà des hash de taille fixe.
+ */
+@Injectable()
+export class IdempotencyStore {
+  private readonly ttl = (parseInt(process.env.IDEMPOTENCY_TTL) || 86400) * 1000;
+  private readonly maxKeys = parseInt(process.env.IDEMPOTENCY_MAX_KEYS) || 100000;
+  private readonly records = new Map<string, IdempotencyRecord>();
+
+  async acquire(key: string, fingerprint: string): Promise<IdempotencyClaim> {
+    for (;;) {
+      this.evictExpired();
+
+      const record = this.records.get(key);
+      if (!record) {
+        return this.claim(key, fingerprint);
+      }
+      if (record.fingerprint !== fingerprint) {
+        return { status: 'mismatch' };
+      }
+      if (record.body !== undefined) {
+        return { status: 'replay', body: record.body };
+      }
+
+      // Doublon concurrent : on attend la fin de la première requête
+      const body = await record.pending;
+      if (body !== null) {
+        return { status: 'replay', body };
+      }
+      // La première requête a échoué (clé libérée) : on retente la réservation
+    }
+  }
+
+  private claim(key: string, fingerprint: string): IdempotencyClaim {
+    let resolve: (body: string | null) => void;
+    const record: IdempotencyRecord = {
+      fingerprint,
+      expiresAt: Date.now() + this.ttl,
+      pending: new Promise((r) => (resolve = r)),
+    };
+
+    this.records.set(key, record);
+    if (this.records.size > this.maxKeys) {
+      this.records.delete(this.records.keys().next().value);
+    }
+
+    return {
+      status: 'claimed',
+      complete: (body) => {
+        record.body = body;
+        record.pending = undefined;
+        resolve(body);
+      },
+      fail: () => {
+        // Les erreurs ne sont pas mémorisées : le client pourra réessayer
+        if (this.records.get(key) === record) {
+          this.records.delete(key);
+        }
+        resolve(null);
+      },
+    };
+  }
+
+  private evictExpired(): void {
+    const now = Date.now();
+    for (const [key, record] of this.records) {
+      if (record.expiresAt > now) break;
+      this.records.delete(key);
+    }
+  }
+}
@@ -0,0 +1,97 @@
+import { BadRequestException } from '@nestjs/common';
+import { StringDecoder } from 'string_decoder';
+
+/**
+ * Lecture incrémentale d'un CSV (RFC 4180) depuis un flux
+ *
+ * Les enregistrements sont produits au fil des morceaux reçus : seul l'enregistrement en
+ * cours est gardé en mémoire, quelle que soit la taille du fichier. Le consommateur qui
+ * attend (for await) avant de demander l'enregistrement suivant suspend la lecture du
+ * flux : le client est ralenti par la contre-pression TCP au lieu de remplir la mémoire.
+ *
+ * Champs entre guillemets ("a,b", "dit ""oui""", retours à la ligne), fins de ligne LF ou
+ * CRLF, BOM UTF-8 ignoré, lignes vides ignorées.
+ */
+
+// Taille maximale d'un enregistrement (caractères) : au-delà, fichier refusé
+export const MAX_CSV_RECORD_LENGTH = 64 * 1024;
+
+export interface CsvRecord {
+  // Ligne du fichier où commence l'enregistrement (1 = en-tête)
+  line: number;
+  fields: string[];
+}
+
+export async function* readCsv(source: AsyncIterable<Buffer | string>): AsyncGenerator<CsvRecord> {
+  const decoder = new StringDecoder('utf8');
+  let fields: string[] = [];
+  let field = '';
+  let quoted = false; // entre guillemets
+  let closedQuote = false; // guillemet fermant lu : un second guillemet est un "" échappé
+  let line = 1;
+  let recordLine = 1;
+  let recordLength = 0;
+  let start = true;
+
+  const endRecord = (): CsvRecord | undefined => {
+    fields.push(field);
+    const record = fields.length === 1 && fields[0] === '' ? undefined : { line: recordLine, fields };
+    fields = [];
+    field = '';
+    closedQuote = false;
+    recordLength = 0;
+    recordLine = line;
+    return record;
+  };
+
+  for await (const chunk of source) {
+    let text = typeof chunk === 'string' ? chunk : decoder.write(chunk);
+    if (start && text.length > 0) {
+      if (text.charCodeAt(0) === 0xfeff) text = text.slice(1);
+      start = false;
+    }
+
+    for (let i = 0; i < text.length; i++) {
+      const c = text[i];
+      if (++recordLength > MAX_CSV_RECORD_LENGTH) {
+        throw new BadRequestException(
+          `Line ${recordLine}: record longer than ${MAX_CSV_RECORD_LENGTH} characters`,
+        );
+      }
+
+      if (quoted) {
+        if (c === '"') {
+          quoted = false;
+          closedQuote = true;
+        } else {
+          if (c === '\n') line++;
+          field += c;
+        }
+      } else if (c === '"') {
+        if (closedQuote) field += '"';
+        // Guillemet ouvrant en début de champ, ou "" à l'intérieur d'un champ entre guillemets
+        if (closedQuote || field === '') quoted = true;
+        else field += c;
+        closedQuote = false;
+      } else if (c === ',') {
+        fields.push(field);
+        field = '';
+        closedQuote = false;
+      } else if (c === '\n') {
+        line++;
+        const record = endRecord();
+        if (record) yield record;
+      } else if (c !== '\r') {
+        field += c;
+        closedQuote = false;
+      }
+    }
+  }
+
+  field += decoder.end();
+  if (quoted) {
+    throw new BadRequestException(`Line ${recordLine}: unterminated quoted field`);
+  }
+  const record = endRecord();
+  if (record) yield record;
+}
@@ -0,0 +1,102 @@
+import { BadRequestException } from '@nestjs/common';
+import { StringDecoder } from 'string_decoder';
+
+/**
+ * Lecture incrémentale des points (<wpt>) d'un fichier GPX depuis un flux
+ *
+ * Pas d'arbre XML : le texte reçu est parcouru à la recherche des éléments <wpt>, et seul
+ * l'élément en cours est gardé en mémoire (traces et autres éléments sont ignorés).
+ * Comme readCsv, la lecture du flux est suspendue tant que le consommateur n'a pas
+ * demandé le point suivant.
+ */
+
+// Taille maximale d'un élément <wpt> (caractères) : au-delà, fichier refusé
+export const MAX_GPX_ELEMENT_LENGTH = 64 * 1024;
+
+export interface GpxWaypoint {
+  // Ligne du fichier où commence l'élément
+  line: number;
+  lat?: string;
+  lon?: string;
+  name?: string;
+  desc?: string;
+  cmt?: string;
+  time?: string;
+}
+
+const ENTITIES: Record<string, string> = { amp: '&', lt: '<', gt: '>', quot: '"', apos: "'" };
+
+function decodeXml(text: string): string {
+  const cdata = text.match(/^\s*<!\[CDATA\[([\s\S]*)\]\]>\s*$/);
+  if (cdata) return cdata[1];
+  return text.trim().replace(/&(#x[0-9a-f]+|#\d+|\w+);/gi, (entity, name: string) => {
+    if (name[0] !== '#') return ENTITIES[name] ?? entity;
+    return String.fromCodePoint(name[1] === 'x' ? parseInt(name.slice(2), 16) : parseInt(name.slice(1)));
+  });
+}
+
+function parseWaypoint(element: string, line: number): GpxWaypoint {
+  const tag = element.slice(0, element.indexOf('>'));
+  const attribute = (name: string) => tag.match(new RegExp(`\\s${name}\\s*=\\s*["']([^"']*)["']`))?.[1];
+  const child = (name: string) => {
+    const match = element.match(new RegExp(`<${name}>([\\s\\S]*?)</${name}>`));
+    return match ? decodeXml(match[1]) : undefined;
+  };
+  return {
+    line,
+    lat: attribute('lat'),
+    lon: attribute('lon'),
+    name: child('name'),
+    desc: child('desc'),
+    cmt: child('cmt'),
+    time: child('time'),
+  };
+}
+
+const countLines = (text: string) => text.split('\n').length - 1;
+
+export async function* readGpxWaypoints(source: AsyncIterable<Buffer | string>): AsyncGenerator<GpxWaypoint> {
+  const decoder = new StringDecoder('utf8');
+  let buffer = '';
+  let line = 1; // ligne du début de buffer
+
+  const next = (final: boolean): GpxWaypoint | undefined => {
+    const start = buffer.search(/<wpt[\s>/]/);
+    if (start < 0) {
+      // Garde la fin du texte : un "<wpt" coupé entre deux morceaux
+      const keep = final ? 0 : Math.min(buffer.length, 4);
+      line += countLines(buffer.slice(0, buffer.length - keep));
+      buffer = buffer.slice(buffer.length - keep);
+      return undefined;
+    }
+    const tagEnd = buffer.indexOf('>', start);
+    let end = -1;
+    if (tagEnd >= 0 && buffer[tagEnd - 1] === '/') {
+      end = tagEnd + 1; // <wpt lat=".." lon=".."/>
+    } else if (tagEnd >= 0) {
+      const close = buffer.indexOf('</wpt>', tagEnd);
+      if (close >= 0) end = close + '</wpt>'.length;
+    }
+    if (end < 0) {
+      if (buffer.length - start > MAX_GPX_ELEMENT_LENGTH) {
+        throw new BadRequestException(`Line ${line + countLines(buffer.slice(0, start))}: <wpt> element too long`);
+      }
+      if (final) throw new BadRequestException('Unterminated <wpt> element');
+      line += countLines(buffer.slice(0, start));
+      buffer = buffer.slice(start);
+      return undefined;
+    }
+    line += countLines(buffer.slice(0, start));
+    const waypoint = parseWaypoint(buffer.slice(start, end), line);
+    line += countLines(buffer.slice(start, end));
+    buffer = buffer.slice(end);
+    return waypoint;
+  };
+
+  for await (const chunk of source) {
+    buffer += typeof chunk === 'string' ? chunk : decoder.write(chunk);
+    for (let waypoint = next(false); waypoint; waypoint = next(false)) yield waypoint;
+  }
+  buffer += decoder.end();
+  for (let waypoint = next(true); waypoint; waypoint = next(true)) yield waypoint;
+}
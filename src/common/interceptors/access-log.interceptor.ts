@@ -0,0 +1,79 @@
+import {
+  Injectable,
+  NestInterceptor,
+  ExecutionContext,
+  CallHandler,
+} from '@nestjs/common';
+import { Observable } from 'rxjs';
+import { createWriteStream, WriteStream } from 'fs';
+
+/**
+ * Forme d'un corps de requête : les clés et le type de chaque valeur, jamais les valeurs
+ * (mots de passe, emails, téléphones...). Ex: { name: 'string', equipment: ['string'] }
+ */
+export function bodyShape(value: unknown): unknown {
+  if (Array.isArray(value)) {
+    return value.length ? [bodyShape(value[0])] : [];
+  }
+  if (value !== null && typeof value === 'object') {
+    const shape: Record<string, unknown> = {};
+    for (const [key, field] of Object.entries(value)) {
+      shape[key] = bodyShape(field);
+    }
+    return shape;
+  }
+  return value === null ? 'null' : typeof value;
+}
+
+/**
+ * Interceptor de journal d'accès structuré (une ligne JSON par requête)
+ *
+ * Activé si ACCESS_LOG contient un chemin de fichier. Chaque ligne contient l'heure,
+ * la route (modèle, ex: /api/v1/boats/:boatId), le chemin, les paramètres de requête,
+ * la forme du corps, le statut, la durée et l'utilisateur connecté : de quoi rejouer
+ * le trafic réel sur un environnement de recette (tests/load/replay.py).
+ *
+ * Les requêtes refusées par un guard (401, 429) n'atteignent pas les interceptors
+ * et ne sont donc pas journalisées.
+ */
+@Injectable()
+export class AccessLogInterceptor implements NestInterceptor {
+  private readonly stream: WriteStream | null = process.env.ACCESS_LOG
+    ? createWriteStream(process.env.ACCESS_LOG, { flags: 'a' })
+    : null;
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<any> {
+    if (!this.stream) {
+      return next.handle();
+    }
+
+    const http = context.switchToHttp();
+    const request = http.getRequest();
+    // Express : http.ServerResponse ; Fastify : reply.raw
+    const response = http.getResponse().raw ?? http.getResponse();
+    const receivedAt = new Date().toISOString();
+    const start = process.hrtime.bigint();
+
+    // Journalisé à l'envoi de la réponse : statut définitif, y compris après un filtre d'exception
+    response.once('finish', () => {
+      const durationMs = Number(process.hrtime.bigint() - start) / 1e6;
+      // Express : request.route.path ; Fastify : request.routeOptions.url
+      const route = request.route?.path ?? request.routeOptions?.url ?? request.url;
+      this.stream.write(
+        JSON.stringify({
+          time: receivedAt,
+          method: request.method,
+          route,
+          path: request.url.split('?')[0],
+          query: request.query ?? {},
+          body: request.body ? bodyShape(request.body) : null,
+          status: response.statusCode,
+          durationMs: Math.round(durationMs * 100) / 100,
+          userId: request.user?.id ?? null,
+        }) + '\n',
+      );
+    });
+
+    return next.handle();
+  }
+}
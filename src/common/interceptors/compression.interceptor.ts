@@ -0,0 +1,129 @@
+import {
+  Injectable,
+  NestInterceptor,
+  ExecutionContext,
+  CallHandler,
+  StreamableFile,
+} from '@nestjs/common';
+import { SSE_METADATA } from '@nestjs/common/constants';
+import { Observable } from 'rxjs';
+import { mergeMap } from 'rxjs/operators';
+import { promisify } from 'util';
+import * as zlib from 'zlib';
+
+type Encoding = 'br' | 'gzip' | 'deflate';
+
+// Ordre de préférence à qualité égale : brotli compresse le mieux le JSON
+const SUPPORTED_ENCODINGS: Encoding[] = ['br', 'gzip', 'deflate'];
+
+// Versions asynchrones : la compression tourne dans le threadpool de libuv,
+// pas sur la boucle d'événements
+const compressors: Record<Encoding, (body: Buffer) => Promise<Buffer>> = {
+  br: (body) =>
+    promisify(zlib.brotliCompress)(body, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: 4, // bon compromis vitesse / taille
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length,
+      },
+    }),
+  gzip: (body) => promisify(zlib.gzip)(body, { level: 6 }),
+  deflate: (body) => promisify(zlib.deflate)(body, { level: 6 }),
+};
+
+/**
+ * Choisit l'encodage à partir de l'en-tête Accept-Encoding (avec les poids q=)
+ * Retourne null si le client n'accepte aucun encodage supporté.
+ */
+export function negotiateEncoding(acceptEncoding?: string): Encoding | null {
+  if (!acceptEncoding) return null;
+
+  const weights = new Map<string, number>();
+  for (const part of acceptEncoding.split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    if (!name) continue;
+    let q = 1;
+    for (const param of params) {
+      const [key, value] = param.trim().split('=');
+      if (key === 'q') q = parseFloat(value);
+    }
+    weights.set(name, Number.isNaN(q) ? 0 : q);
+  }
+
+  let best: Encoding | null = null;
+  let bestWeight = 0;
+  for (const encoding of SUPPORTED_ENCODINGS) {
+    const weight = weights.get(encoding) ?? weights.get('*') ?? 0;
+    if (weight > bestWeight) {
+      best = encoding;
+      bestWeight = weight;
+    }
+  }
+  return best;
+}
+
+/**
+ * Interceptor de compression des réponses
+ *
+ * La compression est négociée requête par requête (Accept-Encoding) et ne
+ * s'applique qu'aux réponses au-delà d'un seuil (COMPRESSION_THRESHOLD, 1 Ko par défaut) :
+ * en dessous, le coût CPU dépasse le gain réseau.
+ *
+ * Fonctionne avec les deux adaptateurs (Express et Fastify) : le corps compressé
+ * est renvoyé sous forme de StreamableFile, que Nest sait écrire sur chacun d'eux.
+ */
+@Injectable()
+export class CompressionInterceptor implements NestInterceptor {
+  private readonly threshold =
+    parseInt(process.env.COMPRESSION_THRESHOLD) || 1024;
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<any> {
+    // Flux SSE (@Sse) : chaque valeur est un événement envoyé au fil de l'eau, pas un corps
+    if (Reflect.getMetadata(SSE_METADATA, context.getHandler())) {
+      return next.handle();
+    }
+
+    return next.handle().pipe(
+      mergeMap(async (data) => {
+        // Buffer : corps binaire déjà prêt (et son Content-Type choisi par le handler)
+        if (
+          data === undefined ||
+          data === null ||
+          data instanceof StreamableFile ||
+          Buffer.isBuffer(data)
+        ) {
+          return data;
+        }
+
+        const http = context.switchToHttp();
+        const response = http.getResponse();
+        // Objet : sérialisé une seule fois ici, la chaîne est renvoyée telle quelle
+        // (avec un Content-Type JSON, Express et Fastify ne la re-sérialisent pas),
+        // sauf si le handler ou l'adaptateur en a déjà fixé un
+        if (typeof data !== 'string') {
+          data = JSON.stringify(data);
+          if (!response.getHeader('Content-Type')) {
+            response.header('Content-Type', 'application/json; charset=utf-8');
+          }
+        }
+        if (Buffer.byteLength(data) < this.threshold) {
+          return data;
+        }
+
+        // La réponse dépend de Accept-Encoding : les caches doivent en tenir compte
+        const vary = response.getHeader('Vary');
+        response.header('Vary', vary ? `${vary}, Accept-Encoding` : 'Accept-Encoding');
+
+        const encoding = negotiateEncoding(
+          http.getRequest().headers['accept-encoding'],
+        );
+        if (!encoding) {
+          return data;
+        }
+
+        const compressed = await compressors[encoding](Buffer.from(data));
+        response.header('Content-Encoding', encoding);
+        return new StreamableFile(compressed);
+      }),
+    );
+  }
+}
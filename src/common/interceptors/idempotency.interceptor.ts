@@ -0,0 +1,90 @@
+import {
+  Injectable,
+  NestInterceptor,
+  ExecutionContext,
+  CallHandler,
+  BadRequestException,
+  UnprocessableEntityException,
+} from '@nestjs/common';
+import { createHash } from 'crypto';
+import { Observable, of } from 'rxjs';
+import { finalize, map } from 'rxjs/operators';
+import { IdempotencyStore } from '../idempotency/idempotency.store';
+
+export const IDEMPOTENCY_KEY_HEADER = 'idempotency-key';
+export const IDEMPOTENT_REPLAYED_HEADER = 'Idempotent-Replayed';
+
+const digest = (value: string) => createHash('sha256').update(value).digest('base64');
+
+/**
+ * Interceptor d'idempotence (en-tête Idempotency-Key)
+ *
+ * Un client mobile qui réessaie un POST après une coupure réseau renvoie la même clé :
+ * - la réponse déjà produite est renvoyée sans réexécuter le service (pas de doublon en base)
+ * - si la première requête est encore en cours, la seconde attend son résultat
+ * - si la clé a servi avec un autre corps de requête, erreur 422
+ *
+ * La clé est propre à un utilisateur et à une route ; sur une route @Public(), à l'adresse IP
+ * du client (request.ip, derrière un load balancer avec TRUST_PROXY) : deux clients anonymes
+ * qui choisissent la même clé ne reçoivent pas la réponse l'un de l'autre.
+ * Les erreurs ne sont pas mémorisées.
+ * Sans en-tête Idempotency-Key, la route se comporte normalement.
+ */
+@Injectable()
+export class IdempotencyInterceptor implements NestInterceptor {
+  constructor(private store: IdempotencyStore) {}
+
+  async intercept(
+    context: ExecutionContext,
+    next: CallHandler,
+  ): Promise<Observable<any>> {
+    const http = context.switchToHttp();
+    const request = http.getRequest();
+    const key = request.headers[IDEMPOTENCY_KEY_HEADER];
+
+    if (key === undefined) {
+      return next.handle();
+    }
+    if (typeof key !== 'string' || key.length === 0 || key.length > 255) {
+      throw new BadRequestException('Idempotency-Key must be between 1 and 255 characters');
+    }
+
+    const owner = request.user?.id ? `user:${request.user.id}` : `ip:${request.ip}`;
+    const scope = digest([owner, request.method, request.url, key].join('\n'));
+    const fingerprint = digest(JSON.stringify(request.body ?? null));
+
+    const claim = await this.store.acquire(scope, fingerprint);
+    const response = http.getResponse();
+
+    if (claim.status === 'mismatch') {
+      throw new UnprocessableEntityException({
+        code: '422',
+        businessCode: 'IDEMPOTENCY_KEY_REUSED',
+        message: 'Idempotency-Key was already used with a different request body',
+      });
+    }
+
+    if (claim.status === 'replay') {
+      response.header(IDEMPOTENT_REPLAYED_HEADER, 'true');
+      response.header('Content-Type', 'application/json; charset=utf-8');
+      return of(claim.body);
+    }
+
+    let completed = false;
+    return next.handle().pipe(
+      map((data) => {
+        // La réponse est mémorisée (et envoyée) sous forme de chaîne JSON :
+        // les rejeux renvoient exactement les mêmes octets
+        const body = JSON.stringify(data ?? null);
+        claim.complete(body);
+        completed = true;
+        response.header('Content-Type', 'application/json; charset=utf-8');
+        return body;
+      }),
+      // Erreur du handler ou requête interrompue : la clé est libérée
+      finalize(() => {
+        if (!completed) claim.fail();
+      }),
+    );
+  }
+}
@@ -0,0 +1,51 @@
+import {
+  Injectable,
+  NestInterceptor,
+  ExecutionContext,
+  CallHandler,
+  StreamableFile,
+} from '@nestjs/common';
+import { Reflector } from '@nestjs/core';
+import { Observable } from 'rxjs';
+import { map } from 'rxjs/operators';
+import { SERIALIZER_KEY } from '../decorators/serialize.decorator';
+import { Serializer } from '../serialization/compile-serializer';
+
+/**
+ * Interceptor de sérialisation
+ *
+ * CONCEPT NestJS - INTERCEPTOR:
+ * Un interceptor s'exécute avant ET après le handler de la route.
+ * Ici on transforme le résultat du handler (après) : si la route porte @Serialize(),
+ * l'objet retourné est converti en chaîne JSON par le sérialiseur compilé.
+ *
+ * Le Content-Type est posé explicitement pour que Express et Fastify
+ * envoient la chaîne telle quelle sans la re-sérialiser.
+ */
+@Injectable()
+export class SerializationInterceptor implements NestInterceptor {
+  constructor(private reflector: Reflector) {}
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<any> {
+    const serializer = this.reflector.get<Serializer>(
+      SERIALIZER_KEY,
+      context.getHandler(),
+    );
+
+    if (!serializer) {
+      return next.handle();
+    }
+
+    return next.handle().pipe(
+      map((data) => {
+        if (data === undefined || data === null || data instanceof StreamableFile) {
+          return data;
+        }
+
+        const response = context.switchToHttp().getResponse();
+        response.header('Content-Type', 'application/json; charset=utf-8');
+        return serializer(data);
+      }),
+    );
+  }
+}
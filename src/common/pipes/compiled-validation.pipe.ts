@@ -0,0 +1,303 @@
+import { INestApplication, ValidationPipe } from '@nestjs/common';
+import { ModulesContainer } from '@nestjs/core';
+import {
+  getMetadataStorage,
+  ValidationArguments,
+  ValidationError,
+  ValidationTypes,
+  ValidatorOptions,
+} from 'class-validator';
+
+/**
+ * Pipe de validation compilée
+ *
+ * CONCEPT - POURQUOI COMPILER ?
+ * A chaque requête, class-validator parcourt TOUTES les métadonnées enregistrées
+ * par les décorateurs (@IsString, @IsEmail...) pour retrouver celles du DTO,
+ * les regroupe par propriété puis les exécute.
+ *
+ * Ici ce travail de préparation est fait une seule fois par DTO : on obtient une
+ * fonction spécialisée qui ne fait plus qu'appeler les validateurs de chaque propriété.
+ * Les validateurs eux-mêmes et les messages d'erreur sont ceux de class-validator,
+ * donc la sortie (BadRequestException + liste de messages) est identique.
+ *
+ * Les DTOs utilisant des fonctionnalités non couvertes (validation imbriquée,
+ * validateurs asynchrones) retombent automatiquement sur le ValidationPipe standard.
+ */
+type CompiledValidator = (object: object) => ValidationError[];
+
+interface CompiledCheck {
+  type: string; // clé dans error.constraints (ex: 'isEmail')
+  each: boolean;
+  constraints: any[];
+  message: string | ((args: ValidationArguments) => string) | undefined;
+  instance: {
+    validate: (value: any, args: ValidationArguments) => any;
+    defaultMessage?: (args: ValidationArguments) => string;
+  };
+}
+
+interface CompiledProperty {
+  name: string;
+  conditions: Array<(object: object, value: any) => boolean>;
+  checks: CompiledCheck[];
+}
+
+// Options de ValidatorOptions que la version compilée sait reproduire
+const SUPPORTED_OPTIONS = new Set([
+  'whitelist',
+  'forbidNonWhitelisted',
+  'forbidUnknownValues',
+  'stopAtFirstError',
+  'dismissDefaultMessages',
+  'validationError',
+]);
+
+export class CompiledValidationPipe extends ValidationPipe {
+  // null = DTO non compilable, on utilise class-validator classique
+  private readonly compiled = new Map<Function, CompiledValidator | null>();
+
+  /**
+   * Compile à l'avance les DTOs utilisés par les contrôleurs de l'application
+   * (types des paramètres des méthodes, lus via les métadonnées TypeScript)
+   */
+  precompileControllers(app: INestApplication): void {
+    const options = this.validatorOptions as ValidatorOptions;
+
+    for (const module of app.get(ModulesContainer).values()) {
+      for (const wrapper of module.controllers.values()) {
+        const prototype = wrapper.metatype?.prototype;
+        if (!prototype) continue;
+
+        for (const method of Object.getOwnPropertyNames(prototype)) {
+          const paramTypes: Function[] =
+            Reflect.getMetadata('design:paramtypes', prototype, method) ?? [];
+          for (const type of paramTypes) {
+            if (typeof type === 'function' && !this.compiled.has(type)) {
+              this.compiled.set(type, compileValidator(type, options));
+            }
+          }
+        }
+      }
+    }
+  }
+
+  protected validate(
+    object: object,
+    validatorOptions?: ValidatorOptions,
+  ): Promise<any[]> | any[] {
+    const metatype = object.constructor;
+    if (!this.compiled.has(metatype)) {
+      this.compiled.set(metatype, compileValidator(metatype, validatorOptions));
+    }
+
+    const validator = this.compiled.get(metatype);
+    return validator ? validator(object) : super.validate(object, validatorOptions);
+  }
+}
+
+/**
+ * Construit le validateur spécialisé d'une classe
+ * Reproduit l'algorithme de ValidationExecutor (class-validator 0.14) :
+ * même ordre des erreurs, mêmes clés de contraintes, mêmes messages.
+ */
+export function compileValidator(
+  metatype: Function,
+  options: ValidatorOptions = {},
+): CompiledValidator | null {
+  if (Object.keys(options).some((key) => !SUPPORTED_OPTIONS.has(key))) {
+    return null;
+  }
+
+  const storage = getMetadataStorage();
+  const metadatas = storage.getTargetValidationMetadatas(
+    metatype,
+    undefined,
+    false,
+    false,
+    undefined,
+  );
+  if (metadatas.length === 0) {
+    return null; // forbidUnknownValues : laissé à class-validator
+  }
+
+  const grouped = storage.groupByPropertyName(metadatas);
+  const properties: CompiledProperty[] = [];
+
+  for (const [name, propertyMetadatas] of Object.entries(grouped)) {
+    const defined = propertyMetadatas.filter((m) => m.type === ValidationTypes.IS_DEFINED);
+    const others = propertyMetadatas.filter(
+      (m) => m.type !== ValidationTypes.IS_DEFINED && m.type !== ValidationTypes.WHITELIST,
+    );
+
+    if (
+      others.some(
+        (m) =>
+          m.type === ValidationTypes.NESTED_VALIDATION ||
+          m.type === ValidationTypes.PROMISE_VALIDATION,
+      )
+    ) {
+      return null;
+    }
+
+    const checks: CompiledCheck[] = [];
+    const custom = others.filter((m) => m.type === ValidationTypes.CUSTOM_VALIDATION);
+    for (const metadata of [...defined, ...custom]) {
+      for (const constraint of storage.getTargetValidatorConstraints(metadata.constraintCls)) {
+        if (constraint.async) return null;
+        checks.push({
+          type: constraint.name || metadata.type,
+          each: metadata.each,
+          constraints: metadata.constraints,
+          message: metadata.message as CompiledCheck['message'],
+          instance: constraint.instance,
+        });
+      }
+    }
+
+    properties.push({
+      name,
+      conditions: others
+        .filter((m) => m.type === ValidationTypes.CONDITIONAL_VALIDATION)
+        .map((m) => m.constraints[0]),
+      checks,
+    });
+  }
+
+  const allowed = new Set(Object.keys(grouped));
+  return (object) => runCompiled(object, properties, allowed, options);
+}
+
+function runCompiled(
+  object: object,
+  properties: CompiledProperty[],
+  allowed: Set<string>,
+  options: ValidatorOptions,
+): ValidationError[] {
+  const errors: ValidationError[] = [];
+  const targetName = object.constructor ? object.constructor.name : undefined;
+
+  // 1. Propriétés inconnues (whitelist / forbidNonWhitelisted)
+  if (options.whitelist) {
+    for (const property of Object.keys(object)) {
+      if (allowed.has(property)) continue;
+      if (options.forbidNonWhitelisted) {
+        const error = createError(object, object[property], property, options);
+        error.constraints = {
+          [ValidationTypes.WHITELIST]: `property ${property} should not exist`,
+        };
+        error.children = undefined;
+        errors.push(error);
+      } else {
+        delete object[property];
+      }
+    }
+  }
+
+  // 2. Contraintes de chaque propriété, dans l'ordre de déclaration
+  for (const property of properties) {
+    const value = object[property.name];
+
+    // @IsOptional / @ValidateIf : toutes les conditions doivent être vraies
+    let canValidate = true;
+    for (const condition of property.conditions) {
+      canValidate = condition(object, value) && canValidate;
+    }
+    if (!canValidate) continue;
+
+    const error = createError(object, value, property.name, options);
+    for (const check of property.checks) {
+      if (options.stopAtFirstError && Object.keys(error.constraints).length > 0) {
+        break;
+      }
+
+      const args: ValidationArguments = {
+        targetName,
+        property: property.name,
+        object,
+        value,
+        constraints: check.constraints,
+      };
+
+      const isIterable =
+        Array.isArray(value) || value instanceof Set || value instanceof Map;
+      const valid =
+        check.each && isIterable
+          ? toArray(value).every((item) => check.instance.validate(item, args))
+          : check.instance.validate(value, args);
+
+      if (!valid) {
+        error.constraints[check.type] = buildMessage(check, args, options);
+      }
+    }
+
+    // Les erreurs sans contrainte sont retirées (stripEmptyErrors de class-validator)
+    if (Object.keys(error.constraints).length > 0) {
+      errors.push(error);
+    }
+  }
+
+  return errors;
+}
+
+function createError(
+  object: object,
+  value: any,
+  property: string,
+  options: ValidatorOptions,
+): ValidationError {
+  const error = new ValidationError();
+  if (options.validationError?.target !== false) error.target = object;
+  if (options.validationError?.value !== false) error.value = value;
+  error.property = property;
+  error.children = [];
+  error.constraints = {};
+  return error;
+}
+
+function toArray(value: any[] | Set<any> | Map<any, any>): any[] {
+  if (value instanceof Map) return Array.from(value.values());
+  return Array.isArray(value) ? value : Array.from(value);
+}
+
+/**
+ * Message d'erreur : message personnalisé du décorateur ou message par défaut
+ * du validateur, puis remplacement des jetons ($property, $value, $constraint1...)
+ */
+function buildMessage(
+  check: CompiledCheck,
+  args: ValidationArguments,
+  options: ValidatorOptions,
+): string {
+  let message: CompiledCheck['message'] = check.message || '';
+  if (
+    !check.message &&
+    !options.dismissDefaultMessages &&
+    check.instance.defaultMessage instanceof Function
+  ) {
+    message = check.instance.defaultMessage(args);
+  }
+
+  let text = message instanceof Function ? message(args) : message;
+  if (!text) return text;
+
+  args.constraints?.forEach((constraint, index) => {
+    text = text.replace(
+      new RegExp(`\\$constraint${index + 1}`, 'g'),
+      constraintToString(constraint),
+    );
+  });
+  // Comme class-validator : $value pour les valeurs scalaires seulement
+  if (['string', 'number', 'boolean'].includes(typeof args.value)) {
+    text = text.replace(/\$value/g, `${args.value}`);
+  }
+  return text
+    .replace(/\$property/g, args.property)
+    .replace(/\$target/g, args.targetName);
+}
+
+function constraintToString(constraint: unknown): string {
+  if (Array.isArray(constraint)) return constraint.join(', ');
+  if (typeof constraint === 'symbol') return constraint.description;
+  return `${constraint}`;
+}
@@ -0,0 +1,30 @@
+import { Global, Module } from '@nestjs/common';
+import { APP_GUARD } from '@nestjs/core';
+import { RateLimitGuard } from '../guards/rate-limit.guard';
+import { MemoryRateLimitStore, RATE_LIMIT_STORE } from './rate-limit.store';
+
+/**
+ * Module de limitation de débit
+ *
+ * Le stockage des seaux est fourni sous le jeton RATE_LIMIT_STORE :
+ * pour partager les limites entre instances, remplacer useClass par une
+ * implémentation de RateLimitStore (shared = true) adossée à un stockage commun.
+ *
+ * ORDRE DES GUARDS: ce module doit être importé APRES AuthModule,
+ * pour que req.user soit déjà renseigné par le JwtAuthGuard.
+ */
+@Global()
+@Module({
+  providers: [
+    {
+      provide: RATE_LIMIT_STORE,
+      useClass: MemoryRateLimitStore,
+    },
+    {
+      provide: APP_GUARD,
+      useClass: RateLimitGuard,
+    },
+  ],
+  exports: [RATE_LIMIT_STORE],
+})
+export class RateLimitModule {}
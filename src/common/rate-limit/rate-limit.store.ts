@@ -0,0 +1,92 @@
+import { Injectable, OnModuleDestroy } from '@nestjs/common';
+
+/**
+ * Jeton d'injection du stockage des seaux (voir RateLimitModule)
+ */
+export const RATE_LIMIT_STORE = 'RATE_LIMIT_STORE';
+
+export interface BucketPolicy {
+  capacity: number; // nombre maximal de jetons (taille des rafales)
+  refillPerSecond: number; // jetons rendus par seconde (débit soutenu)
+}
+
+export interface RateLimitResult {
+  allowed: boolean;
+  remaining: number; // jetons restants après la requête
+  retryAfterMs: number; // attente avant que `cost` jetons soient disponibles (0 si autorisé)
+}
+
+/**
+ * Stockage des seaux à jetons
+ *
+ * Une implémentation partagée (Redis, base de données...) doit indiquer
+ * shared = true : chaque instance applique alors la limite complète,
+ * au lieu d'une part de la limite (voir RateLimitGuard).
+ */
+export interface RateLimitStore {
+  readonly shared: boolean;
+  consume(
+    key: string,
+    cost: number,
+    policy: BucketPolicy,
+  ): RateLimitResult | Promise<RateLimitResult>;
+}
+
+interface Bucket {
+  tokens: number;
+  updatedAt: number;
+}
+
+/**
+ * Stockage en mémoire (par défaut) : propre à chaque processus
+ *
+ * Un seau plein est équivalent à un seau absent : ils sont retirés
+ * périodiquement pour que la mémoire ne dépende que des clients actifs.
+ */
+@Injectable()
+export class MemoryRateLimitStore implements RateLimitStore, OnModuleDestroy {
+  readonly shared = false;
+  private readonly buckets = new Map<string, Bucket>();
+  private readonly sweeper = setInterval(() => this.sweep(), 60_000).unref();
+  private maxRefillMs = 0;
+
+  consume(key: string, cost: number, policy: BucketPolicy): RateLimitResult {
+    const now = Date.now();
+    const bucket = this.buckets.get(key) ?? { tokens: policy.capacity, updatedAt: now };
+
+    // Remplissage proportionnel au temps écoulé depuis la dernière requête
+    const elapsed = (now - bucket.updatedAt) / 1000;
+    bucket.tokens = Math.min(policy.capacity, bucket.tokens + elapsed * policy.refillPerSecond);
+    bucket.updatedAt = now;
+    this.buckets.set(key, bucket);
+    this.maxRefillMs = Math.max(
+      this.maxRefillMs,
+      (policy.capacity / policy.refillPerSecond) * 1000,
+    );
+
+    if (bucket.tokens >= cost) {
+      bucket.tokens -= cost;
+      return { allowed: true, remaining: bucket.tokens, retryAfterMs: 0 };
+    }
+
+    return {
+      allowed: false,
+      remaining: bucket.tokens,
+      retryAfterMs: ((cost - bucket.tokens) / policy.refillPerSecond) * 1000,
+    };
+  }
+
+  private sweep(): void {
+    const now = Date.now();
+    for (const [key, bucket] of this.buckets) {
+      // Au-delà du temps de remplissage complet, le seau est forcément plein
+      if (now - bucket.updatedAt >= this.maxRefillMs) {
+        this.buckets.delete(key);
+      }
+    }
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.sweeper);
+  }
+}
@@ -0,0 +1,84 @@
+import { BadRequestException } from '@nestjs/common';
+import { SelectQueryBuilder } from 'typeorm';
+
+/**
+ * Comptes par facette d'une recherche (cases à cocher de l'interface)
+ *
+ * CONCEPT SQL - GROUPING SETS:
+ * GROUP BY GROUPING SETS ((a), (b), ()) calcule en un seul parcours des lignes filtrées
+ * les regroupements par a, par b et le total, au lieu d'une requête (ou d'un appel à
+ * l'API) par facette. GROUPING(a, b) indique pour chaque ligne le regroupement dont
+ * elle provient : le bit d'une expression vaut 0 si la ligne est regroupée sur elle.
+ */
+
+// Valeurs renvoyées par facette (les plus fréquentes), pour les facettes à texte libre (homePort)
+export const MAX_FACET_VALUES = 20;
+// Taille maximale de la page de résultats renvoyée avec les facettes
+export const MAX_FACET_PAGE_SIZE = 100;
+
+export interface FacetValue {
+  value: string;
+  count: number;
+}
+
+export interface FacetCounts {
+  total: number;
+  facets: Record<string, FacetValue[]>;
+}
+
+/**
+ * Compte les lignes de `query` (filtres déjà appliqués) par valeur de chaque facette
+ *
+ * @param facets nom de la facette → expression SQL (ex: { boatType: '"boat"."boatType"' })
+ */
+export async function countFacets(
+  query: SelectQueryBuilder<any>,
+  facets: Record<string, string>,
+): Promise<FacetCounts> {
+  const names = Object.keys(facets);
+  const expressions = names.map((name) => facets[name]);
+
+  const aggregate = query
+    .clone()
+    .select(`GROUPING(${expressions.join(', ')})`, 'grouping')
+    .addSelect('count(*)::integer', 'count');
+  names.forEach((name, i) => aggregate.addSelect(expressions[i], `facet_${i}`));
+  const rows = await aggregate
+    .groupBy(`GROUPING SETS (${expressions.map((e) => `(${e})`).join(', ')}, ())`)
+    .orderBy('count', 'DESC')
+    .getRawMany();
+
+  const allBits = (1 << names.length) - 1;
+  const result: FacetCounts = { total: 0, facets: {} };
+  names.forEach((name) => (result.facets[name] = []));
+
+  for (const row of rows) {
+    if (row.grouping === allBits) {
+      result.total = row.count; // ensemble vide () : toutes les lignes filtrées
+      continue;
+    }
+    const i = names.findIndex((_, n) => row.grouping === (allBits ^ (1 << (names.length - 1 - n))));
+    const value = row[`facet_${i}`];
+    const values = result.facets[names[i]];
+    // Les lignes sans valeur (colonne nullable) ne correspondent à aucune case
+    if (value !== null && values.length < MAX_FACET_VALUES) {
+      values.push({ value: String(value), count: row.count });
+    }
+  }
+  return result;
+}
+
+/**
+ * Page de résultats demandée avec les facettes (limit = 0 : facettes seules)
+ */
+export function parsePage(page: { limit?: number; offset?: number }): { limit: number; offset: number } {
+  const limit = page.limit === undefined ? 0 : Number(page.limit);
+  const offset = page.offset === undefined ? 0 : Number(page.offset);
+  if (!Number.isInteger(limit) || limit < 0 || limit > MAX_FACET_PAGE_SIZE) {
+    throw new BadRequestException(`limit must be an integer between 0 and ${MAX_FACET_PAGE_SIZE}`);
+  }
+  if (!Number.isInteger(offset) || offset < 0) {
+    throw new BadRequestException('offset must be a positive integer');
+  }
+  return { limit, offset };
+}
@@ -0,0 +1,10 @@
+/**
+ * Liste de valeurs d'un paramètre de requête : "gps, sounder" → ['gps', 'sounder']
+ */
+export function parseList(value?: string): string[] {
+  if (!value) return [];
+  return value
+    .split(',')
+    .map((item) => item.trim())
+    .filter((item) => item.length > 0);
+}
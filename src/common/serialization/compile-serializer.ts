@@ -0,0 +1,154 @@
+import { getMetadataArgsStorage } from 'typeorm';
+
+/**
+ * Sérialiseurs JSON compilés à partir des métadonnées TypeORM
+ *
+ * CONCEPT - SERIALISATION COMPILEE:
+ * JSON.stringify() découvre la forme de chaque objet à l'exécution (clés, types...).
+ * Pour les grosses listes (GET /boats, GET /trips), c'est du CPU gaspillé :
+ * la forme des entités est connue à l'avance grâce aux décorateurs @Column().
+ *
+ * compileEntitySerializer() lit ces métadonnées UNE fois et génère une fonction
+ * spécialisée qui écrit directement chaque propriété avec l'encodeur adapté à son type.
+ * Le JSON produit est identique à celui de JSON.stringify() pour les propriétés déclarées.
+ */
+export type Serializer = (value: any) => string;
+
+export interface EntitySerializerOptions {
+  /** Relations à inclure dans la sortie (nom de la propriété → options de la relation) */
+  relations?: Record<string, EntitySerializerOptions>;
+}
+
+type Encoder = (value: any) => string;
+
+// Caractères qui obligent à passer par JSON.stringify pour l'échappement
+const NEEDS_ESCAPE = /[\u0000-\u001f"\\\ud800-\udfff]/;
+
+const encodeAny: Encoder = (value) => JSON.stringify(value) ?? 'null';
+
+const encodeString: Encoder = (value) => {
+  if (typeof value !== 'string') return encodeAny(value);
+  return NEEDS_ESCAPE.test(value) ? JSON.stringify(value) : `"${value}"`;
+};
+
+const encodeNumber: Encoder = (value) =>
+  typeof value === 'number' && Number.isFinite(value)
+    ? String(value)
+    : encodeAny(value);
+
+const encodeBoolean: Encoder = (value) =>
+  value === true ? 'true' : value === false ? 'false' : encodeAny(value);
+
+const encodeDate: Encoder = (value) =>
+  value instanceof Date && !Number.isNaN(value.getTime())
+    ? `"${value.toISOString()}"`
+    : encodeAny(value);
+
+const encodeStringArray: Encoder = (value) => {
+  if (!Array.isArray(value)) return encodeAny(value);
+  let out = '[';
+  for (let i = 0; i < value.length; i++) {
+    if (i > 0) out += ',';
+    out += value[i] === undefined ? 'null' : encodeString(value[i]);
+  }
+  return out + ']';
+};
+
+// Types de colonnes dont le driver pg renvoie une chaîne (decimal et date inclus)
+const STRING_TYPES = new Set([
+  'uuid',
+  'varchar',
+  'character varying',
+  'text',
+  'enum',
+  'char',
+  'decimal',
+  'numeric',
+  'date',
+]);
+const NUMBER_TYPES = new Set(['int', 'integer', 'smallint', 'float', 'double precision', 'real']);
+const DATE_TYPES = new Set(['timestamp', 'timestamptz', 'timestamp without time zone', 'timestamp with time zone']);
+
+/**
+ * Choisit l'encodeur d'une colonne à partir de ses métadonnées TypeORM
+ * (type explicite dans @Column, type TypeScript réfléchi ou mode createDate/updateDate)
+ */
+function encoderForColumn(column: { mode: string; options: any }): Encoder {
+  const type = column.options?.type;
+
+  if (column.options?.array || type === 'simple-array') return encodeStringArray;
+  if (column.mode === 'createDate' || column.mode === 'updateDate') return encodeDate;
+  if (type === String || STRING_TYPES.has(type)) return encodeString;
+  if (type === Number || NUMBER_TYPES.has(type)) return encodeNumber;
+  if (type === Boolean || type === 'boolean') return encodeBoolean;
+  if (type === Date || DATE_TYPES.has(type)) return encodeDate;
+
+  return encodeAny;
+}
+
+function buildEntitySerializer(target: Function, options: EntitySerializerOptions): Serializer {
+  const storage = getMetadataArgsStorage();
+  const fields: Array<{ name: string; encode: Encoder }> = [];
+
+  for (const column of storage.filterColumns(target)) {
+    fields.push({ name: column.propertyName, encode: encoderForColumn(column) });
+  }
+
+  for (const [name, relationOptions] of Object.entries(options.relations ?? {})) {
+    const relation = storage.filterRelations(target).find((r) => r.propertyName === name);
+    if (!relation) {
+      throw new Error(`Relation "${name}" not found on entity ${target.name}`);
+    }
+    const relatedType = (relation.type as () => Function)();
+    const item = compileEntitySerializer(relatedType, relationOptions);
+    const isCollection =
+      relation.relationType === 'one-to-many' || relation.relationType === 'many-to-many';
+    fields.push({ name, encode: isCollection ? compileListSerializer(item) : item });
+  }
+
+  // Génération du corps de la fonction : une branche par propriété, sans boucle ni réflexion.
+  // Les propriétés absentes (undefined) sont omises, comme avec JSON.stringify().
+  let body = 'if (o === null || o === undefined) return "null";\n';
+  body += 'let s = "{", c = false, v;\n';
+  fields.forEach((field, i) => {
+    body += `v = o[${JSON.stringify(field.name)}];\n`;
+    body += `if (v !== undefined) { s += (c ? "," : "") + k[${i}] + e[${i}](v); c = true; }\n`;
+  });
+  body += 'return s + "}";';
+
+  const keys = fields.map((field) => `${JSON.stringify(field.name)}:`);
+  const encoders = fields.map((field) => field.encode);
+  return new Function('k', 'e', `return function serialize(o) {\n${body}\n};`)(keys, encoders);
+}
+
+/**
+ * Crée le sérialiseur d'une entité
+ *
+ * La compilation est paresseuse : elle a lieu au premier appel, quand tous les
+ * fichiers d'entités sont chargés (les relations se référencent mutuellement).
+ */
+export function compileEntitySerializer(
+  target: Function,
+  options: EntitySerializerOptions = {},
+): Serializer {
+  let compiled: Serializer | undefined;
+  return (value) => {
+    if (!compiled) compiled = buildEntitySerializer(target, options);
+    return compiled(value);
+  };
+}
+
+/**
+ * Crée le sérialiseur d'un tableau à partir du sérialiseur d'un élément
+ */
+export function compileListSerializer(item: Serializer): Serializer {
+  return (value) => {
+    if (!Array.isArray(value)) return encodeAny(value);
+    let out = '[';
+    for (let i = 0; i < value.length; i++) {
+      if (i > 0) out += ',';
+      out += item(value[i]);
+    }
+    return out + ']';
+  };
+}
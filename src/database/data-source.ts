@@ -0,0 +1,53 @@
+import * as path from 'path';
+import { DataSource, DataSourceOptions } from 'typeorm';
+import { createRawIndexes } from './indexes';
+import { ensurePartitionedTables } from './partitions';
+
+/**
+ * Configuration de la connexion PostgreSQL, partagée par l'application (app.module.ts)
+ * et la CLI TypeORM (npm run typeorm -- migration:run -d src/database/data-source.ts)
+ */
+export function dataSourceOptions(): DataSourceOptions {
+  return {
+    type: 'postgres',
+    host: process.env.DATABASE_HOST || 'localhost',
+    port: parseInt(process.env.DATABASE_PORT) || 5432,
+    username: process.env.DATABASE_USER || 'fisherfans',
+    password: process.env.DATABASE_PASSWORD || 'fisherfans',
+    database: process.env.DATABASE_NAME || 'fisherfans',
+    entities: [path.join(__dirname, '..', '**', '*.entity{.ts,.js}')],
+    // Migrations : ce que synchronize ne sait pas faire sans perte de données
+    // (changement de type d'une colonne remplie...)
+    migrations: [path.join(__dirname, 'migrations', '*{.ts,.js}')],
+    // Une transaction par migration : ForeignKeyIndexes (CREATE INDEX CONCURRENTLY) désactive
+    // la sienne, ce que le mode 'all' de la CLI (npm run migration:run) refuse
+    migrationsTransactionMode: 'each',
+    // synchronize est lancé par initializeDataSource(), APRÈS les migrations
+    synchronize: false,
+    logging: true, // Active les logs SQL pour le développement
+  };
+}
+
+/**
+ * Ouvre la connexion et met le schéma à jour, dans cet ordre :
+ * 1. migrations : conversions en place des colonnes existantes. Lancé après, synchronize
+ *    supprimerait puis recréerait une colonne dont le type a changé (données perdues)
+ * 2. synchronize : crée les tables et colonnes des entités
+ *    (DATABASE_SYNCHRONIZE=false pour le désactiver, à faire en production)
+ * 3. tables partitionnées (bookings, logbook_entries), que synchronize ignore : créées ou
+ *    converties par partitions.ts
+ * 4. index bruts (GIN...) que synchronize ne sait pas créer (indexes.ts)
+ */
+export async function initializeDataSource(options: DataSourceOptions): Promise<DataSource> {
+  const dataSource = await new DataSource(options).initialize();
+  await dataSource.runMigrations();
+  const synchronize = process.env.DATABASE_SYNCHRONIZE !== 'false';
+  if (synchronize) {
+    await dataSource.synchronize();
+  }
+  await ensurePartitionedTables(dataSource, { createMissing: synchronize });
+  await createRawIndexes(dataSource);
+  return dataSource;
+}
+
+export default new DataSource(dataSourceOptions());
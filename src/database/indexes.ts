@@ -0,0 +1,32 @@
+import { DataSource } from 'typeorm';
+
+/**
+ * Index que TypeORM ne sait pas décrire avec @Index() (méthode d'accès GIN...)
+ *
+ * Les entités les déclarent avec @Index(nom, { synchronize: false }) pour que synchronize
+ * ne les supprime pas ; ils sont créés ici, après synchronize, s'ils n'existent pas encore.
+ */
+export const RAW_INDEXES: Array<{ name: string; table: string; definition: string }> = [
+  // Filtres de contenance (@>) de GET /boats?equipment= et GET /users?languages=
+  { name: 'IDX_boats_equipment', table: 'boats', definition: 'USING gin ("equipment")' },
+  { name: 'IDX_users_languages', table: 'users', definition: 'USING gin ("languages")' },
+  // GET /trips/search?language=
+  {
+    name: 'IDX_trip_search_languages',
+    table: 'trip_search',
+    definition: 'USING gin ("organizerLanguages")',
+  },
+];
+
+export async function createRawIndexes(dataSource: DataSource): Promise<void> {
+  for (const index of RAW_INDEXES) {
+    // Table absente : synchronize désactivé sur une base encore vide
+    const [{ exists }] = await dataSource.query('SELECT to_regclass($1) IS NOT NULL AS exists', [
+      `"${index.table}"`,
+    ]);
+    if (!exists) continue;
+    await dataSource.query(
+      `CREATE INDEX IF NOT EXISTS "${index.name}" ON "${index.table}" ${index.definition}`,
+    );
+  }
+}
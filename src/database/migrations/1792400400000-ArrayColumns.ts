@@ -0,0 +1,48 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+// Colonnes passées de simple-array (texte "a,b,c") à text[]
+const COLUMNS: Array<[table: string, column: string]> = [
+  ['boats', 'equipment'],
+  ['users', 'languages'],
+];
+
+/**
+ * Boat.equipment et User.languages : simple-array → text[]
+ *
+ * Conversion en place (string_to_array) des bases existantes. Sans cette migration,
+ * synchronize supprimerait puis recréerait les colonnes. Sur une base neuve (tables
+ * pas encore créées) ou déjà convertie, elle ne fait rien.
+ */
+export class ArrayColumns1792400400000 implements MigrationInterface {
+  name = 'ArrayColumns1792400400000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    for (const [table, column] of COLUMNS) {
+      if ((await this.dataType(queryRunner, table, column)) === 'text') {
+        // simple-array écrit '' pour un tableau vide : string_to_array('', ',') donne '{}'
+        await queryRunner.query(
+          `ALTER TABLE "${table}" ALTER COLUMN "${column}" TYPE text[] USING string_to_array("${column}", ',')`,
+        );
+      }
+    }
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    for (const [table, column] of COLUMNS) {
+      if ((await this.dataType(queryRunner, table, column)) === 'ARRAY') {
+        await queryRunner.query(
+          `ALTER TABLE "${table}" ALTER COLUMN "${column}" TYPE text USING array_to_string("${column}", ',')`,
+        );
+      }
+    }
+  }
+
+  private async dataType(queryRunner: QueryRunner, table: string, column: string): Promise<string | undefined> {
+    const [row] = await queryRunner.query(
+      `SELECT data_type FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = $1 AND column_name = $2`,
+      [table, column],
+    );
+    return row?.data_type;
+  }
+}
@@ -0,0 +1,59 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+// Index déclarés par les entités (@Index) : [nom, table, colonnes]
+const INDEXES: Array<[name: string, table: string, columns: string[]]> = [
+  ['IDX_boats_owner', 'boats', ['ownerId']],
+  ['IDX_trips_organizer', 'trips', ['organizerId']],
+  ['IDX_trips_boat', 'trips', ['boatId']],
+  ['IDX_bookings_trip_date', 'bookings', ['tripId', 'selectedDate']],
+  ['IDX_bookings_user', 'bookings', ['userId']],
+  ['IDX_logbook_user_date', 'logbook_entries', ['userId', 'fishingDate']],
+  ['IDX_trip_search_boat', 'trip_search', ['boatId']],
+  ['IDX_trip_search_organizer', 'trip_search', ['organizerId']],
+];
+
+/**
+ * Index des clés étrangères et des colonnes filtrées (findByUser, BF19, BF23...)
+ *
+ * PostgreSQL n'indexe pas les clés étrangères : sans ces index, chaque recherche par
+ * utilisateur, bateau ou sortie parcourt toute la table. Ils sont créés CONCURRENTLY
+ * (sans bloquer les écritures), donc hors transaction. PostgreSQL refuse CONCURRENTLY
+ * sur une table partitionnée (bookings, logbook_entries, voir database/partitions.ts) :
+ * ses index sont créés et supprimés normalement. Mêmes noms que les @Index des
+ * entités : synchronize les trouve déjà présents. Sur une base neuve, les tables
+ * n'existent pas encore et synchronize crée les index avec elles.
+ */
+export class ForeignKeyIndexes1792400500000 implements MigrationInterface {
+  name = 'ForeignKeyIndexes1792400500000';
+  transaction = false; // CREATE INDEX CONCURRENTLY est interdit dans une transaction
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    for (const [name, table, columns] of INDEXES) {
+      const kind = await this.tableKind(queryRunner, table);
+      if (!kind) continue;
+      const list = columns.map((column) => `"${column}"`).join(', ');
+      await queryRunner.query(
+        `CREATE INDEX ${this.concurrently(kind)}IF NOT EXISTS "${name}" ON "${table}" (${list})`,
+      );
+    }
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    for (const [name, table] of INDEXES) {
+      const kind = await this.tableKind(queryRunner, table);
+      await queryRunner.query(`DROP INDEX ${this.concurrently(kind)}IF EXISTS "${name}"`);
+    }
+  }
+
+  // relkind de la table : 'r' (table), 'p' (partitionnée), undefined si elle n'existe pas
+  private async tableKind(queryRunner: QueryRunner, table: string): Promise<string | undefined> {
+    const [row] = await queryRunner.query('SELECT relkind FROM pg_class WHERE oid = to_regclass($1)', [
+      `"${table}"`,
+    ]);
+    return row?.relkind;
+  }
+
+  private concurrently(kind: string | undefined): string {
+    return kind === 'p' ? '' : 'CONCURRENTLY ';
+  }
+}
@@ -0,0 +1,66 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Table du modèle de lecture trip_search (entities/trip-search.entity.ts)
+ *
+ * Avec DATABASE_SYNCHRONIZE=false, rien d'autre ne crée la table sur une base existante :
+ * la projection des sorties (trip-search.projection.ts) échouerait à chaque écriture.
+ * Même définition que synchronize (noms de contraintes de la stratégie de nommage TypeORM,
+ * noms des @Index) : synchronize la trouve conforme. Sur une base neuve, la table trips
+ * n'existe pas encore et synchronize crée trip_search avec les autres tables.
+ * Les lignes sont calculées au démarrage (backfillTripSearch).
+ */
+export class TripSearchReadModel1792400600000 implements MigrationInterface {
+  name = 'TripSearchReadModel1792400600000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    const [{ trips, tripSearch }] = await queryRunner.query(
+      `SELECT to_regclass('"trips"') IS NOT NULL AS trips,
+              to_regclass('"trip_search"') IS NOT NULL AS "tripSearch"`,
+    );
+    if (!trips || tripSearch) return;
+
+    await queryRunner.query(`
+      CREATE TABLE "trip_search" (
+        "tripId" uuid NOT NULL,
+        "occurrence" integer NOT NULL,
+        "startDate" date,
+        "endDate" date,
+        "startTime" character varying,
+        "endTime" character varying,
+        "title" character varying NOT NULL,
+        "tripType" character varying NOT NULL,
+        "pricingType" character varying NOT NULL,
+        "price" numeric(10,2) NOT NULL,
+        "passengerCount" integer NOT NULL,
+        "boatId" uuid NOT NULL,
+        "boatName" character varying NOT NULL,
+        "boatType" character varying NOT NULL,
+        "boatMaxCapacity" integer NOT NULL,
+        "homePort" character varying NOT NULL,
+        "latitude" numeric(10,8),
+        "longitude" numeric(11,8),
+        "organizerId" uuid NOT NULL,
+        "organizerFirstName" character varying NOT NULL,
+        "organizerLastName" character varying NOT NULL,
+        "organizerCity" character varying NOT NULL,
+        "organizerPhotoUrl" character varying,
+        "organizerLanguages" text array,
+        CONSTRAINT "PK_4d02a76f06036c486635aff3d8a" PRIMARY KEY ("tripId", "occurrence"),
+        CONSTRAINT "FK_5f26240abea5378d698d42a1181" FOREIGN KEY ("tripId")
+          REFERENCES "trips"("id") ON DELETE CASCADE
+      )`);
+    await queryRunner.query(
+      `CREATE INDEX "IDX_trip_search_date_price" ON "trip_search" ("startDate", "price")`,
+    );
+    await queryRunner.query(`CREATE INDEX "IDX_trip_search_boat" ON "trip_search" ("boatId")`);
+    await queryRunner.query(
+      `CREATE INDEX "IDX_trip_search_organizer" ON "trip_search" ("organizerId")`,
+    );
+    // IDX_trip_search_languages (GIN) : créé ensuite par createRawIndexes (indexes.ts)
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP TABLE IF EXISTS "trip_search"`);
+  }
+}
@@ -0,0 +1,88 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Tables anonymization_jobs (users/entities/anonymization-job.entity.ts) et refresh_tokens
+ * (auth/entities/refresh-token.entity.ts)
+ *
+ * Avec DATABASE_SYNCHRONIZE=false, rien d'autre ne les crée sur une base existante :
+ * DELETE /users/:id (file d'effacement RGPD) et la connexion (refresh tokens) échoueraient.
+ * Même définition que synchronize (noms de contraintes et d'index de la stratégie de
+ * nommage TypeORM, noms des @Index) : synchronize les trouve conformes. Sur une base neuve,
+ * la table users n'existe pas encore et synchronize crée ces tables avec les autres.
+ */
+export class AnonymizationJobsRefreshTokens1792400700000 implements MigrationInterface {
+  name = 'AnonymizationJobsRefreshTokens1792400700000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    if (!(await this.exists(queryRunner, 'to_regclass', '"users"'))) return;
+
+    if (!(await this.exists(queryRunner, 'to_regclass', '"anonymization_jobs"'))) {
+      if (!(await this.exists(queryRunner, 'to_regtype', '"anonymization_jobs_status_enum"'))) {
+        await queryRunner.query(
+          `CREATE TYPE "anonymization_jobs_status_enum" AS ENUM('pending', 'running', 'completed', 'failed')`,
+        );
+      }
+      await queryRunner.query(`
+        CREATE TABLE "anonymization_jobs" (
+          "id" uuid NOT NULL DEFAULT uuid_generate_v4(),
+          "status" "anonymization_jobs_status_enum" NOT NULL DEFAULT 'pending',
+          "step" character varying,
+          "processed" integer NOT NULL DEFAULT 0,
+          "total" integer,
+          "attempts" integer NOT NULL DEFAULT 0,
+          "lockedUntil" TIMESTAMP WITH TIME ZONE,
+          "error" text,
+          "createdAt" TIMESTAMP NOT NULL DEFAULT now(),
+          "updatedAt" TIMESTAMP NOT NULL DEFAULT now(),
+          "completedAt" TIMESTAMP WITH TIME ZONE,
+          "userId" uuid NOT NULL,
+          CONSTRAINT "PK_ebe6c74cd4284fe641344810b4d" PRIMARY KEY ("id"),
+          CONSTRAINT "FK_3103a4b5c6fb623e9490f20d9f9" FOREIGN KEY ("userId")
+            REFERENCES "users"("id") ON DELETE CASCADE
+        )`);
+      await queryRunner.query(
+        `CREATE INDEX "IDX_anonymization_jobs_queue" ON "anonymization_jobs" ("status", "createdAt")`,
+      );
+      await queryRunner.query(
+        `CREATE INDEX "IDX_anonymization_jobs_user" ON "anonymization_jobs" ("userId")`,
+      );
+    }
+
+    if (!(await this.exists(queryRunner, 'to_regclass', '"refresh_tokens"'))) {
+      await queryRunner.query(`
+        CREATE TABLE "refresh_tokens" (
+          "id" uuid NOT NULL DEFAULT uuid_generate_v4(),
+          "tokenHash" character varying(64) NOT NULL,
+          "familyId" uuid NOT NULL,
+          "expiresAt" TIMESTAMP WITH TIME ZONE NOT NULL,
+          "revokedAt" TIMESTAMP WITH TIME ZONE,
+          "createdAt" TIMESTAMP NOT NULL DEFAULT now(),
+          "userId" uuid NOT NULL,
+          CONSTRAINT "PK_7d8bee0204106019488c4c50ffa" PRIMARY KEY ("id"),
+          CONSTRAINT "FK_610102b60fea1455310ccd299de" FOREIGN KEY ("userId")
+            REFERENCES "users"("id") ON DELETE CASCADE
+        )`);
+      // Index sans nom (@Index()) : nommés par la stratégie TypeORM
+      await queryRunner.query(
+        `CREATE UNIQUE INDEX "IDX_c25bc63d248ca90e8dcc1d92d0" ON "refresh_tokens" ("tokenHash")`,
+      );
+      await queryRunner.query(
+        `CREATE INDEX "IDX_40e9a8b923a1b3fb4429a5c624" ON "refresh_tokens" ("familyId")`,
+      );
+      await queryRunner.query(
+        `CREATE INDEX "IDX_610102b60fea1455310ccd299d" ON "refresh_tokens" ("userId")`,
+      );
+    }
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP TABLE IF EXISTS "refresh_tokens"`);
+    await queryRunner.query(`DROP TABLE IF EXISTS "anonymization_jobs"`);
+    await queryRunner.query(`DROP TYPE IF EXISTS "anonymization_jobs_status_enum"`);
+  }
+
+  private async exists(queryRunner: QueryRunner, lookup: string, name: string): Promise<boolean> {
+    const [{ exists }] = await queryRunner.query(`SELECT ${lookup}($1) IS NOT NULL AS exists`, [name]);
+    return exists;
+  }
+}
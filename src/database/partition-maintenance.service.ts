@@ -0,0 +1,67 @@
+import { Injectable, Logger, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { DataSource } from 'typeorm';
+import { archiveOldPartitions, createMissingPartitions, partitionedTables } from './partitions';
+
+// Une passe par jour (les partitions sont créées des mois à l'avance)
+const MAINTENANCE_INTERVAL_MS = 24 * 60 * 60 * 1000;
+// Verrou consultatif : une seule instance fait la maintenance à la fois
+const MAINTENANCE_LOCK_KEY = 4_046_001;
+
+/**
+ * Maintenance des tables partitionnées (partitions.ts)
+ *
+ * Au démarrage puis chaque jour :
+ * 1. crée les partitions des périodes à venir, et celles des périodes arrivées dans DEFAULT
+ * 2. archive dans PARTITION_ARCHIVE_DIR (./archive par défaut) puis supprime les partitions
+ *    plus anciennes que BOOKINGS_ARCHIVE_AFTER_MONTHS / LOGBOOK_ARCHIVE_AFTER_MONTHS
+ */
+@Injectable()
+export class PartitionMaintenance implements OnApplicationBootstrap, OnModuleDestroy {
+  private readonly logger = new Logger(PartitionMaintenance.name);
+  private readonly archiveDir = process.env.PARTITION_ARCHIVE_DIR || 'archive';
+  private timer: NodeJS.Timeout;
+
+  constructor(private dataSource: DataSource) {}
+
+  onApplicationBootstrap() {
+    // Sans attendre : l'archivage peut être long, et DEFAULT reçoit les lignes en attendant
+    this.run();
+    this.timer = setInterval(() => this.run(), MAINTENANCE_INTERVAL_MS).unref();
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.timer);
+  }
+
+  async run(now = new Date()): Promise<void> {
+    const runner = this.dataSource.createQueryRunner();
+    try {
+      const [{ locked }] = await runner.query('SELECT pg_try_advisory_lock($1) AS locked', [
+        MAINTENANCE_LOCK_KEY,
+      ]);
+      if (!locked) return;
+      try {
+        for (const config of partitionedTables()) {
+          // Table pas (encore) partitionnée : synchronize désactivé sur une base vide
+          const [row] = await runner.query('SELECT relkind FROM pg_class WHERE oid = to_regclass($1)', [
+            `"${config.table}"`,
+          ]);
+          if (row?.relkind !== 'p') continue;
+
+          for (const name of await createMissingPartitions(this.dataSource, config, now)) {
+            this.logger.log(`Partition ${name} créée`);
+          }
+          for (const file of await archiveOldPartitions(this.dataSource, config, now, this.archiveDir)) {
+            this.logger.log(`Partition archivée dans ${file}`);
+          }
+        }
+      } finally {
+        await runner.query('SELECT pg_advisory_unlock($1)', [MAINTENANCE_LOCK_KEY]);
+      }
+    } catch (error) {
+      this.logger.error(`Maintenance des partitions : ${error.message}`);
+    } finally {
+      await runner.release();
+    }
+  }
+}
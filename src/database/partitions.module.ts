@@ -0,0 +1,10 @@
+import { Module } from '@nestjs/common';
+import { PartitionMaintenance } from './partition-maintenance.service';
+
+/**
+ * Maintenance des partitions de bookings et logbook_entries (voir partitions.ts)
+ */
+@Module({
+  providers: [PartitionMaintenance],
+})
+export class PartitionsModule {}
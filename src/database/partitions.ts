@@ -0,0 +1,378 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import * as zlib from 'zlib';
+import { once } from 'events';
+import { finished } from 'stream/promises';
+import { DataSource, QueryRunner, Table, TableForeignKey } from 'typeorm';
+
+/**
+ * Partitionnement par plage de dates des tables qui grossissent avec le temps
+ *
+ * CONCEPT SQL - PARTITION BY RANGE:
+ * La table "bookings" n'est plus qu'un parent sans données ; chaque ligne est rangée dans
+ * la partition (bookings_p2026_03...) dont la plage contient sa date. Une requête filtrée
+ * sur la date ne lit que les partitions concernées (partition pruning, visible dans
+ * EXPLAIN), et une période entière s'archive en détachant sa partition, sans DELETE.
+ *
+ * La partition DEFAULT reçoit les lignes dont la période n'a pas (encore) de partition :
+ * l'écriture ne crée jamais de table. PartitionMaintenance crée les partitions à venir
+ * et sort de DEFAULT les périodes qui y ont des lignes.
+ *
+ * La clé primaire d'une table partitionnée doit contenir la colonne de partitionnement :
+ * elle devient (id, date) en base, l'entité garde id seul. Ces entités sont déclarées
+ * avec synchronize: false, synchronize ne sachant pas comparer ce schéma au leur.
+ */
+
+export type PartitionInterval = 'month' | 'year';
+
+export interface PartitionedTable {
+  table: string;
+  column: string;
+  interval: PartitionInterval;
+  // Périodes à venir dont la partition est créée à l'avance
+  ahead: number;
+  // Âge (mois) au-delà duquel une partition est archivée puis supprimée, 0 : conservée
+  archiveAfterMonths: number;
+}
+
+// Pas de partition pour les dates plus anciennes (saisies erronées) : elles restent dans DEFAULT
+export const PARTITION_HISTORY_YEARS = 20;
+// Lignes lues par requête lors de l'archivage
+const ARCHIVE_BATCH_SIZE = 5000;
+
+const envMonths = (value: string | undefined, fallback: number) =>
+  value === undefined || value === '' || Number.isNaN(parseInt(value)) ? fallback : parseInt(value);
+
+export function partitionedTables(): PartitionedTable[] {
+  return [
+    {
+      table: 'bookings',
+      column: 'selectedDate',
+      interval: 'month',
+      ahead: 12,
+      archiveAfterMonths: envMonths(process.env.BOOKINGS_ARCHIVE_AFTER_MONTHS, 24),
+    },
+    {
+      table: 'logbook_entries',
+      column: 'fishingDate',
+      interval: 'year',
+      ahead: 1,
+      archiveAfterMonths: envMonths(process.env.LOGBOOK_ARCHIVE_AFTER_MONTHS, 0),
+    },
+  ];
+}
+
+// --- Périodes (dates UTC, premier jour du mois ou de l'année) ---
+
+export function periodStart(date: Date, interval: PartitionInterval): Date {
+  return new Date(Date.UTC(date.getUTCFullYear(), interval === 'year' ? 0 : date.getUTCMonth(), 1));
+}
+
+export function addMonths(date: Date, months: number): Date {
+  return new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth() + months, 1));
+}
+
+export function nextPeriod(start: Date, interval: PartitionInterval): Date {
+  return addMonths(start, interval === 'year' ? 12 : 1);
+}
+
+const isoDate = (date: Date) => date.toISOString().slice(0, 10);
+
+export function partitionName(config: PartitionedTable, start: Date): string {
+  const year = start.getUTCFullYear();
+  const month = String(start.getUTCMonth() + 1).padStart(2, '0');
+  return config.interval === 'year' ? `${config.table}_p${year}` : `${config.table}_p${year}_${month}`;
+}
+
+// Début de la période d'une partition d'après son nom, undefined pour un autre nom
+export function parsePartitionName(config: PartitionedTable, name: string): Date | undefined {
+  const match = name.match(new RegExp(`^${config.table}_p(\\d{4})(?:_(\\d{2}))?$`));
+  if (!match || (config.interval === 'month') !== (match[2] !== undefined)) return undefined;
+  return new Date(Date.UTC(parseInt(match[1]), match[2] ? parseInt(match[2]) - 1 : 0, 1));
+}
+
+const defaultPartition = (config: PartitionedTable) => `${config.table}_default`;
+
+// --- Création et conversion ---
+
+/**
+ * Crée (base neuve) ou convertit (table existante non partitionnée) les tables partitionnées
+ *
+ * Appelé par initializeDataSource() après synchronize, qui a créé les tables référencées.
+ * @param createMissing false quand synchronize est désactivé : une table absente est ignorée
+ */
+export async function ensurePartitionedTables(
+  dataSource: DataSource,
+  options: { createMissing: boolean },
+): Promise<void> {
+  for (const config of partitionedTables()) {
+    const [row] = await dataSource.query(
+      'SELECT relkind FROM pg_class WHERE oid = to_regclass($1)',
+      [`"${config.table}"`],
+    );
+    if (row?.relkind === 'p' || (!row && !options.createMissing)) continue;
+
+    const runner = dataSource.createQueryRunner();
+    await runner.startTransaction();
+    try {
+      if (!row) {
+        // Table d'abord créée d'après l'entité (colonnes, index, clés étrangères), puis convertie
+        const metadata = dataSource.entityMetadatas.find((m) => m.tableName === config.table);
+        const table = Table.create(metadata, dataSource.driver);
+        table.foreignKeys = metadata.foreignKeys.map((fk) => TableForeignKey.create(fk, dataSource.driver));
+        await runner.createTable(table);
+      }
+      await convertToPartitioned(runner, config);
+      await runner.commitTransaction();
+    } catch (error) {
+      await runner.rollbackTransaction();
+      throw error;
+    } finally {
+      await runner.release();
+    }
+  }
+}
+
+/**
+ * Remplace une table ordinaire par une table partitionnée de mêmes colonnes
+ *
+ * Dans la transaction de l'appelant : l'ancienne table est renommée, ses lignes copiées
+ * dans la nouvelle (rangées dans les partitions des périodes présentes), puis supprimée.
+ * Clé primaire, clés étrangères et index sont recréés sous leurs noms d'origine.
+ */
+async function convertToPartitioned(runner: QueryRunner, config: PartitionedTable): Promise<void> {
+  const { table, column } = config;
+  const old = `${table}_unpartitioned`;
+
+  const [primaryKey] = await runner.query(
+    `SELECT conname FROM pg_constraint WHERE conrelid = $1::regclass AND contype = 'p'`,
+    [`"${table}"`],
+  );
+  const foreignKeys: Array<{ conname: string; definition: string }> = await runner.query(
+    `SELECT conname, pg_get_constraintdef(oid) AS definition
+       FROM pg_constraint WHERE conrelid = $1::regclass AND contype = 'f'`,
+    [`"${table}"`],
+  );
+  // Index hors clé primaire, recréés sur la table partitionnée (index partitionnés)
+  const indexes: Array<{ indexname: string; indexdef: string }> = await runner.query(
+    `SELECT indexname, indexdef FROM pg_indexes
+      WHERE schemaname = current_schema() AND tablename = $1 AND indexname <> $2`,
+    [table, primaryKey?.conname ?? ''],
+  );
+
+  await runner.query(`ALTER TABLE "${table}" RENAME TO "${old}"`);
+  for (const { conname } of foreignKeys) {
+    await runner.query(`ALTER TABLE "${old}" DROP CONSTRAINT "${conname}"`);
+  }
+  if (primaryKey) await runner.query(`ALTER TABLE "${old}" DROP CONSTRAINT "${primaryKey.conname}"`);
+  for (const { indexname } of indexes) await runner.query(`DROP INDEX "${indexname}"`);
+
+  await runner.query(
+    `CREATE TABLE "${table}" (LIKE "${old}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+     PARTITION BY RANGE ("${column}")`,
+  );
+  await runner.query(`CREATE TABLE "${defaultPartition(config)}" PARTITION OF "${table}" DEFAULT`);
+  for (const start of await periodsWithRows(runner, config, old)) {
+    await createPartition(runner, config, start);
+  }
+  await runner.query(`INSERT INTO "${table}" SELECT * FROM "${old}"`);
+  await runner.query(`DROP TABLE "${old}"`);
+
+  await runner.query(
+    `ALTER TABLE "${table}" ADD CONSTRAINT "${primaryKey?.conname ?? `PK_${table}`}" PRIMARY KEY ("id", "${column}")`,
+  );
+  for (const { conname, definition } of foreignKeys) {
+    await runner.query(`ALTER TABLE "${table}" ADD CONSTRAINT "${conname}" ${definition}`);
+  }
+  // indexdef a été lu avant le renommage : il désigne déjà la nouvelle table
+  for (const { indexdef } of indexes) await runner.query(indexdef);
+}
+
+/**
+ * Crée la partition d'une période, en y déplaçant les lignes que DEFAULT contient pour elle
+ *
+ * ATTACH PARTITION refuse une plage dont des lignes sont encore dans DEFAULT : la partition
+ * est créée à part, remplie, puis attachée (elle hérite alors des index et clés du parent).
+ * À lancer dans une transaction.
+ */
+export async function createPartition(runner: QueryRunner, config: PartitionedTable, start: Date): Promise<void> {
+  const { table, column } = config;
+  const name = partitionName(config, start);
+  const from = isoDate(start);
+  const to = isoDate(nextPeriod(start, config.interval));
+
+  await runner.query(`CREATE TABLE "${name}" (LIKE "${table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)`);
+  await runner.query(
+    `WITH moved AS (
+       DELETE FROM "${defaultPartition(config)}" WHERE "${column}" >= $1 AND "${column}" < $2 RETURNING *
+     )
+     INSERT INTO "${name}" SELECT * FROM moved`,
+    [from, to],
+  );
+  await runner.query(`ALTER TABLE "${table}" ATTACH PARTITION "${name}" FOR VALUES FROM ('${from}') TO ('${to}')`);
+}
+
+/**
+ * Périodes ayant des lignes dans `source`, limitées à [window.from, window.to)
+ */
+async function periodsWithRows(
+  runner: QueryRunner,
+  config: PartitionedTable,
+  source: string,
+  window = partitionWindow(config, new Date()),
+): Promise<Date[]> {
+  const rows: Array<{ start: string }> = await runner.query(
+    `SELECT DISTINCT to_char(date_trunc('${config.interval}', "${config.column}"), 'YYYY-MM-DD') AS start
+       FROM "${source}" WHERE "${config.column}" >= $1 AND "${config.column}" < $2
+      ORDER BY start`,
+    [isoDate(window.from), isoDate(window.to)],
+  );
+  return rows.map((row) => new Date(`${row.start}T00:00:00Z`));
+}
+
+/**
+ * Plage de dates couverte par des partitions : des périodes non archivées (et pas plus de
+ * PARTITION_HISTORY_YEARS en arrière) jusqu'aux partitions créées à l'avance
+ */
+export function partitionWindow(config: PartitionedTable, now: Date): { from: Date; to: Date } {
+  let from = periodStart(addMonths(now, -12 * PARTITION_HISTORY_YEARS), config.interval);
+  const cutoff = archiveCutoff(config, now);
+  if (cutoff && cutoff > from) from = cutoff;
+  let to = periodStart(now, config.interval);
+  for (let i = 0; i <= config.ahead; i++) to = nextPeriod(to, config.interval);
+  return { from, to };
+}
+
+// Les partitions qui se terminent au plus tard à cette date sont archivées (undefined : jamais)
+export function archiveCutoff(config: PartitionedTable, now: Date): Date | undefined {
+  if (!config.archiveAfterMonths) return undefined;
+  return periodStart(addMonths(now, -config.archiveAfterMonths), config.interval);
+}
+
+// --- Maintenance ---
+
+/**
+ * Partitions existantes (attachées ou non) d'après leur nom, par début de période
+ */
+async function listPartitions(
+  runner: QueryRunner,
+  config: PartitionedTable,
+): Promise<Array<{ name: string; start: Date; attached: boolean }>> {
+  const rows: Array<{ name: string; attached: boolean }> = await runner.query(
+    `SELECT c.relname AS name, c.relispartition AS attached
+       FROM pg_class c
+      WHERE c.relnamespace = to_regnamespace(current_schema()) AND c.relkind = 'r'
+        AND c.relname LIKE $1`,
+    [`${config.table}\\_p%`],
+  );
+  return rows
+    .map((row) => ({ ...row, start: parsePartitionName(config, row.name) }))
+    .filter((row) => row.start !== undefined);
+}
+
+/**
+ * Crée les partitions manquantes : périodes à venir et périodes ayant des lignes dans DEFAULT
+ *
+ * @returns noms des partitions créées
+ */
+export async function createMissingPartitions(
+  dataSource: DataSource,
+  config: PartitionedTable,
+  now: Date,
+): Promise<string[]> {
+  const runner = dataSource.createQueryRunner();
+  const created: string[] = [];
+  try {
+    const window = partitionWindow(config, now);
+    const existing = new Set((await listPartitions(runner, config)).map((p) => p.name));
+
+    const wanted = await periodsWithRows(runner, config, defaultPartition(config), window);
+    for (let start = periodStart(now, config.interval); start < window.to; start = nextPeriod(start, config.interval)) {
+      wanted.push(start);
+    }
+
+    for (const start of wanted) {
+      const name = partitionName(config, start);
+      if (existing.has(name)) continue;
+      // Une transaction par partition : verrous courts sur le parent et sur DEFAULT
+      await runner.startTransaction();
+      try {
+        await createPartition(runner, config, start);
+        await runner.commitTransaction();
+      } catch (error) {
+        await runner.rollbackTransaction();
+        throw error;
+      }
+      existing.add(name);
+      created.push(name);
+    }
+  } finally {
+    await runner.release();
+  }
+  return created;
+}
+
+/**
+ * Archive puis supprime les partitions plus anciennes que config.archiveAfterMonths
+ *
+ * La partition est d'abord détachée : les écritures éventuelles sur sa période vont alors
+ * dans DEFAULT, et la table détachée n'est plus modifiée. Ses lignes sont écrites en JSON,
+ * une par ligne, dans <dir>/<partition>-<horodatage>.ndjson.gz (fichier .tmp renommé une
+ * fois complet), puis la table est supprimée. Interrompu, l'archivage reprend au passage
+ * suivant depuis la table détachée.
+ *
+ * @returns chemins des archives écrites
+ */
+export async function archiveOldPartitions(
+  dataSource: DataSource,
+  config: PartitionedTable,
+  now: Date,
+  dir: string,
+): Promise<string[]> {
+  const cutoff = archiveCutoff(config, now);
+  if (!cutoff) return [];
+
+  const runner = dataSource.createQueryRunner();
+  const archived: string[] = [];
+  try {
+    for (const partition of await listPartitions(runner, config)) {
+      if (nextPeriod(partition.start, config.interval) > cutoff) continue;
+      if (partition.attached) {
+        await runner.query(`ALTER TABLE "${config.table}" DETACH PARTITION "${partition.name}"`);
+      }
+      archived.push(await writeArchive(runner, partition.name, dir));
+      await runner.query(`DROP TABLE "${partition.name}"`);
+    }
+  } finally {
+    await runner.release();
+  }
+  return archived;
+}
+
+async function writeArchive(runner: QueryRunner, table: string, dir: string): Promise<string> {
+  await fs.promises.mkdir(dir, { recursive: true });
+  const stamp = new Date().toISOString().replace(/[-:]/g, '').slice(0, 15);
+  const file = path.join(dir, `${table}-${stamp}.ndjson.gz`);
+  const gzip = zlib.createGzip();
+  const output = fs.createWriteStream(`${file}.tmp`);
+  gzip.pipe(output);
+
+  // Parcours par id croissant (clé primaire) : pas d'OFFSET, mémoire bornée au lot
+  let lastId: string | undefined;
+  for (;;) {
+    const rows: Array<{ id: string; json: string }> = await runner.query(
+      `SELECT "id", row_to_json(p)::text AS json FROM "${table}" p
+        ${lastId ? 'WHERE "id" > $1' : ''} ORDER BY "id" LIMIT ${ARCHIVE_BATCH_SIZE}`,
+      lastId ? [lastId] : [],
+    );
+    for (const row of rows) {
+      if (!gzip.write(`${row.json}\n`)) await once(gzip, 'drain');
+    }
+    if (rows.length < ARCHIVE_BATCH_SIZE) break;
+    lastId = rows[rows.length - 1].id;
+  }
+  gzip.end();
+  await finished(output);
+  await fs.promises.rename(`${file}.tmp`, file);
+  return file;
+}
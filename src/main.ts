@@ -1,7 +1,63 @@
-import { NestFactory } from '@nestjs/core';
-import { ValidationPipe } from '@nestjs/common';
+import { NestFactory, Reflector } from '@nestjs/core';
+import { INestApplication } from '@nestjs/common';
+import { NestExpressApplication } from '@nestjs/platform-express';
 import { SwaggerModule, DocumentBuilder } from '@nestjs/swagger';
 import { AppModule } from './app.module';
+import { AccessLogInterceptor } from './common/interceptors/access-log.interceptor';
+import { CompressionInterceptor } from './common/interceptors/compression.interceptor';
+import { SerializationInterceptor } from './common/interceptors/serialization.interceptor';
+import { CompiledValidationPipe } from './common/pipes/compiled-validation.pipe';
+import { LOGBOOK_IMPORT_CONTENT_TYPES } from './modules/logbook/logbook-import.service';
+
+// Adaptateur HTTP : Express par défaut, Fastify si HTTP_ADAPTER=fastify
+const useFastify = process.env.HTTP_ADAPTER === 'fastify';
+
+/**
+ * Proxys de confiance (TRUST_PROXY), même syntaxe pour Express et Fastify :
+ * vide ou "false" (connexion directe), "true" (tout X-Forwarded-For), un nombre de proxys
+ * devant l'API, ou des adresses / sous-réseaux séparés par des virgules.
+ * request.ip est alors l'adresse du client et non celle du load balancer : la limitation
+ * de débit des requêtes anonymes se fait par client.
+ */
+function parseTrustProxy(value?: string): boolean | number | string {
+  if (!value || value === 'false') return false;
+  if (value === 'true') return true;
+  if (/^\d+$/.test(value)) return parseInt(value, 10);
+  return value;
+}
+
+const trustProxy = parseTrustProxy(process.env.TRUST_PROXY);
+
+/**
+ * Crée l'application avec l'adaptateur HTTP choisi
+ *
+ * Fastify est plus rapide qu'Express (routage, gestion des en-têtes).
+ * @nestjs/platform-fastify est une dépendance optionnelle (optionalDependencies) :
+ * il n'est chargé que dans ce mode, et peut manquer (npm install --omit=optional)
+ */
+async function createApp(): Promise<INestApplication> {
+  if (useFastify) {
+    let FastifyAdapter;
+    try {
+      // eslint-disable-next-line @typescript-eslint/no-var-requires
+      ({ FastifyAdapter } = require('@nestjs/platform-fastify'));
+    } catch {
+      throw new Error(
+        'HTTP_ADAPTER=fastify requires @nestjs/platform-fastify: npm install @nestjs/platform-fastify @fastify/static',
+      );
+    }
+    const app = await NestFactory.create(AppModule, new FastifyAdapter({ trustProxy }));
+    // Imports de fichiers (POST /logbook/import) : corps laissé en flux, lu par le contrôleur
+    app
+      .getHttpAdapter()
+      .getInstance()
+      .addContentTypeParser(Object.keys(LOGBOOK_IMPORT_CONTENT_TYPES), (request, payload, done) => done(null));
+    return app;
+  }
+  const app = await NestFactory.create<NestExpressApplication>(AppModule);
+  app.set('trust proxy', trustProxy);
+  return app;
+}
 
 /**
  * Point d'entrée de l'application NestJS
@@ -10,7 +66,7 @@ import { AppModule } from './app.module';
 async function bootstrap() {
   // Création de l'application NestJS
   // NestFactory.create() initialise l'app avec le module racine (AppModule)
-  const app = await NestFactory.create(AppModule);
+  const app = await createApp();
 
   // Activation de CORS pour permettre les requêtes depuis le navigateur (Swagger UI)
   app.enableCors();
@@ -20,16 +76,28 @@ async function bootstrap() {
   app.setGlobalPrefix('api');
 
   // Activation de la validation automatique des DTOs (Data Transfer Objects)
-  // ValidationPipe utilise class-validator pour valider automatiquement les données entrantes
+  // CompiledValidationPipe se comporte comme le ValidationPipe de NestJS (mêmes options,
+  // mêmes messages d'erreur) mais prépare une fonction de validation par DTO au démarrage
+  // au lieu de relire les métadonnées class-validator à chaque requête
   // whitelist: true = supprime les propriétés non définies dans les DTOs
   // forbidNonWhitelisted: true = renvoie une erreur si des propriétés inconnues sont envoyées
   // transform: true = transforme automatiquement les types (ex: string "5" → number 5)
-  app.useGlobalPipes(
-    new ValidationPipe({
-      whitelist: true,
-      forbidNonWhitelisted: true,
-      transform: true,
-    }),
+  const validationPipe = new CompiledValidationPipe({
+    whitelist: true,
+    forbidNonWhitelisted: true,
+    transform: true,
+  });
+  validationPipe.precompileControllers(app);
+  app.useGlobalPipes(validationPipe);
+
+  // Interceptors globaux (l'ordre compte : au retour, le dernier enregistré s'exécute en premier)
+  // 1. SerializationInterceptor : sérialisation compilée des routes marquées @Serialize()
+  // 2. CompressionInterceptor : compression br/gzip/deflate négociée via Accept-Encoding
+  // AccessLogInterceptor : journal d'accès JSON si ACCESS_LOG est défini (rejeu du trafic)
+  app.useGlobalInterceptors(
+    new AccessLogInterceptor(),
+    new CompressionInterceptor(),
+    new SerializationInterceptor(app.get(Reflector)),
   );
 
   // Configuration de Swagger pour la documentation de l'API
@@ -51,9 +119,14 @@ async function bootstrap() {
   SwaggerModule.setup('api-docs', app, document);
 
   // Démarrage du serveur sur le port configuré
-  await app.listen(port);
+  // Fastify n'écoute que sur 127.0.0.1 par défaut : on écoute sur toutes les interfaces comme Express
+  if (useFastify) {
+    await app.listen(port, '0.0.0.0');
+  } else {
+    await app.listen(port);
+  }
 
-  console.log(`🚀 Application is running on: http://localhost:${port}/api`);
+  console.log(`🚀 Application is running on: http://localhost:${port}/api (${useFastify ? 'fastify' : 'express'})`);
   console.log(`📚 Swagger documentation: http://localhost:${port}/api-docs`);
   console.log(`📄 OpenAPI JSON: ./docs/openapi.json`);
   console.log(`📄 OpenAPI YAML: ./docs/openapi.yaml`);
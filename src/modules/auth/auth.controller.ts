@@ -1,8 +1,10 @@
-import { Controller, Post, Body } from '@nestjs/common';
+import { Controller, Post, Body, HttpCode, HttpStatus } from '@nestjs/common';
 import { ApiTags, ApiOperation, ApiResponse } from '@nestjs/swagger';
 import { AuthService } from './auth.service';
 import { LoginDto } from './dto/login.dto';
+import { RefreshTokenDto } from './dto/refresh-token.dto';
 import { Public } from '../../common/decorators/public.decorator';
+import { RateLimitCost } from '../../common/decorators/rate-limit-cost.decorator';
 
 /**
  * Contrôleur d'authentification
@@ -27,6 +29,7 @@ export class AuthController {
   constructor(private authService: AuthService) {}
 
   @Public() // Cette route est accessible sans authentification
+  @RateLimitCost(5) // bcrypt.compare : la route la plus coûteuse en CPU
   @Post('login')
   @ApiOperation({ summary: 'User login' })
   @ApiResponse({ status: 200, description: 'Login successful - returns JWT token' })
@@ -34,4 +37,23 @@ export class AuthController {
   async login(@Body() loginDto: LoginDto) {
     return this.authService.login(loginDto);
   }
+
+  @Public()
+  @Post('refresh')
+  @HttpCode(HttpStatus.OK)
+  @ApiOperation({ summary: 'Refresh access token (rotates the refresh token)' })
+  @ApiResponse({ status: 200, description: 'Returns a new JWT token and a new refresh token' })
+  @ApiResponse({ status: 401, description: 'Invalid, expired or reused refresh token' })
+  async refresh(@Body() refreshTokenDto: RefreshTokenDto) {
+    return this.authService.refresh(refreshTokenDto.refreshToken);
+  }
+
+  @Public()
+  @Post('logout')
+  @HttpCode(HttpStatus.NO_CONTENT)
+  @ApiOperation({ summary: 'Revoke a refresh token' })
+  @ApiResponse({ status: 204, description: 'Refresh token revoked' })
+  async logout(@Body() refreshTokenDto: RefreshTokenDto) {
+    return this.authService.logout(refreshTokenDto.refreshToken);
+  }
 }
@@ -7,6 +7,7 @@ import { AuthService } from './auth.service';
 import { AuthController } from './auth.controller';
 import { JwtStrategy } from './strategies/jwt.strategy';
 import { User } from '../users/entities/user.entity';
+import { RefreshToken } from './entities/refresh-token.entity';
 import { JwtAuthGuard } from '../../common/guards/jwt-auth.guard';
 import { APP_GUARD } from '@nestjs/core';
 
@@ -14,7 +15,7 @@ import { APP_GUARD } from '@nestjs/core';
  * Module d'authentification
  *
  * Ce module configure tout ce qui concerne l'authentification JWT:
- * - Enregistre l'entité User pour TypeORM
+ * - Enregistre les entités User et RefreshToken pour TypeORM
  * - Configure PassportModule
  * - Configure JwtModule avec la clé secrète et l'expiration
  * - Enregistre la stratégie JWT
@@ -22,7 +23,7 @@ import { APP_GUARD } from '@nestjs/core';
  */
 @Module({
   imports: [
-    TypeOrmModule.forFeature([User]), // Enregistre l'entité User pour l'injection
+    TypeOrmModule.forFeature([User, RefreshToken]), // Enregistre les entités pour l'injection
     PassportModule, // Module Passport pour les stratégies d'authentification
     JwtModule.registerAsync({
       useFactory: (configService: ConfigService) => ({
@@ -3,7 +3,9 @@ import { JwtService } from '@nestjs/jwt';
 import { InjectRepository } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
 import * as bcrypt from 'bcrypt';
+import { createHash, randomBytes, randomUUID } from 'crypto';
 import { User } from '../users/entities/user.entity';
+import { RefreshToken } from './entities/refresh-token.entity';
 import { LoginDto } from './dto/login.dto';
 
 /**
@@ -20,6 +22,8 @@ export class AuthService {
   constructor(
     @InjectRepository(User)
     private userRepository: Repository<User>,
+    @InjectRepository(RefreshToken)
+    private refreshTokenRepository: Repository<RefreshToken>,
     private jwtService: JwtService, // Service NestJS pour créer/vérifier des tokens JWT
   ) {}
 
@@ -49,19 +53,122 @@ export class AuthService {
       throw new UnauthorizedException('Invalid email or password');
     }
 
-    // 3. Créer le payload du JWT (données qu'on met dans le token)
+    // 3. Générer le token d'accès et un refresh token (nouvelle famille de rotation)
+    const refreshToken = await this.issueRefreshToken(user.id, randomUUID());
+    return this.buildAuthResponse(user, refreshToken);
+  }
+
+  /**
+   * Renouvelle le token d'accès à partir d'un refresh token
+   *
+   * Pas de bcrypt ici : une seule requête indexée (sur tokenHash) révoque le token
+   * présenté et récupère l'utilisateur, puis on signe un nouveau JWT.
+   * Le refresh token est remplacé par un nouveau de la même famille (rotation).
+   */
+  async refresh(refreshToken: string) {
+    const tokenHash = this.hashRefreshToken(refreshToken);
+
+    // UPDATE ... RETURNING : la révocation est atomique, deux requêtes concurrentes
+    // avec le même token ne peuvent pas toutes les deux réussir
+    const [rows] = await this.refreshTokenRepository.query(
+      `UPDATE refresh_tokens AS rt
+          SET "revokedAt" = now()
+         FROM users AS u
+        WHERE rt."tokenHash" = $1
+          AND rt."revokedAt" IS NULL
+          AND rt."expiresAt" > now()
+          AND u.id = rt."userId"
+      RETURNING rt."familyId", u.id, u.email, u."firstName", u."lastName"`,
+      [tokenHash],
+    );
+
+    if (!rows.length) {
+      await this.detectReuse(tokenHash);
+      throw new UnauthorizedException('Invalid or expired refresh token');
+    }
+
+    const { familyId, ...user } = rows[0];
+    const nextRefreshToken = await this.issueRefreshToken(user.id, familyId);
+    return this.buildAuthResponse(user, nextRefreshToken);
+  }
+
+  /**
+   * Déconnexion : révoque le refresh token présenté (sans erreur s'il est inconnu)
+   */
+  async logout(refreshToken: string): Promise<void> {
+    await this.refreshTokenRepository
+      .createQueryBuilder()
+      .update(RefreshToken)
+      .set({ revokedAt: () => 'now()' })
+      .where('tokenHash = :tokenHash AND revokedAt IS NULL', {
+        tokenHash: this.hashRefreshToken(refreshToken),
+      })
+      .execute();
+  }
+
+  /**
+   * Détection de réutilisation : un token déjà révoqué est présenté à nouveau.
+   * Soit le client légitime, soit un attaquant a utilisé une copie volée :
+   * on révoque toute la famille pour forcer une reconnexion.
+   */
+  private async detectReuse(tokenHash: string): Promise<void> {
+    const token = await this.refreshTokenRepository.findOne({
+      where: { tokenHash },
+    });
+
+    if (token?.revokedAt) {
+      await this.refreshTokenRepository
+        .createQueryBuilder()
+        .update(RefreshToken)
+        .set({ revokedAt: () => 'now()' })
+        .where('familyId = :familyId AND revokedAt IS NULL', {
+          familyId: token.familyId,
+        })
+        .execute();
+    }
+  }
+
+  /**
+   * Crée un refresh token opaque et enregistre son empreinte
+   */
+  private async issueRefreshToken(userId: string, familyId: string): Promise<string> {
+    const token = randomBytes(32).toString('base64url');
+    const expiresIn = parseInt(process.env.REFRESH_TOKEN_EXPIRES_IN) || 2592000; // 30 jours
+
+    await this.refreshTokenRepository.insert({
+      tokenHash: this.hashRefreshToken(token),
+      familyId,
+      userId,
+      expiresAt: new Date(Date.now() + expiresIn * 1000),
+    });
+
+    return token;
+  }
+
+  private hashRefreshToken(token: string): string {
+    return createHash('sha256').update(token).digest('hex');
+  }
+
+  /**
+   * Réponse commune au login et au refresh
+   */
+  private buildAuthResponse(
+    user: Pick<User, 'id' | 'email' | 'firstName' | 'lastName'>,
+    refreshToken: string,
+  ) {
+    // Créer le payload du JWT (données qu'on met dans le token)
     const payload = {
       sub: user.id, // "sub" = subject, convention JWT pour l'ID utilisateur
       email: user.email,
     };
 
-    // 4. Générer le token JWT signé
+    // Générer le token JWT signé
     const accessToken = this.jwtService.sign(payload);
 
-    // 5. Retourner le token et les infos utilisateur
+    // Retourner les tokens et les infos utilisateur
     return {
       accessToken,
-      refreshToken: accessToken, // En prod, créer un vrai refresh token différent
+      refreshToken,
       expiresIn: parseInt(process.env.JWT_EXPIRES_IN) || 3600,
       user: {
         id: user.id,
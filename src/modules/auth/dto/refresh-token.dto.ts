@@ -0,0 +1,15 @@
+import { ApiProperty } from '@nestjs/swagger';
+import { IsNotEmpty, IsString } from 'class-validator';
+
+/**
+ * DTO pour le renouvellement du token d'accès (et pour la déconnexion)
+ */
+export class RefreshTokenDto {
+  @ApiProperty({
+    description: 'Refresh token returned by login or a previous refresh',
+    example: 'o3Vh1cX9yQ0tq2l8m6Y7bKp4wZr5sJd0aEf1gHi2jKk',
+  })
+  @IsString()
+  @IsNotEmpty()
+  refreshToken: string;
+}
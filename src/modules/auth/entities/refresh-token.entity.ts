@@ -0,0 +1,57 @@
+import {
+  Entity,
+  Column,
+  PrimaryGeneratedColumn,
+  CreateDateColumn,
+  Index,
+  ManyToOne,
+  JoinColumn,
+} from 'typeorm';
+import { User } from '../../users/entities/user.entity';
+
+/**
+ * Entité RefreshToken - Représente la table "refresh_tokens"
+ *
+ * Le refresh token remis au client est une chaîne aléatoire opaque.
+ * On ne stocke que son empreinte SHA-256 (tokenHash) : une fuite de la table
+ * ne permet pas de rejouer les tokens. Le token ayant 256 bits d'entropie,
+ * un hash rapide suffit (pas besoin de bcrypt).
+ *
+ * ROTATION:
+ * Chaque utilisation révoque le token et en émet un nouveau dans la même
+ * "famille" (familyId). Si un token déjà révoqué est présenté à nouveau,
+ * c'est qu'il a été volé : toute la famille est révoquée.
+ *
+ * @Index() : index SQL sur la colonne (recherche du token en une lecture d'index)
+ */
+@Entity('refresh_tokens')
+export class RefreshToken {
+  @PrimaryGeneratedColumn('uuid')
+  id: string;
+
+  @Index({ unique: true })
+  @Column({ length: 64 })
+  tokenHash: string;
+
+  @Index()
+  @Column('uuid')
+  familyId: string;
+
+  @Column({ type: 'timestamptz' })
+  expiresAt: Date;
+
+  @Column({ type: 'timestamptz', nullable: true })
+  revokedAt: Date;
+
+  @CreateDateColumn()
+  createdAt: Date;
+
+  // Relations
+  @ManyToOne(() => User, { onDelete: 'CASCADE' })
+  @JoinColumn({ name: 'userId' })
+  user: User;
+
+  @Index()
+  @Column()
+  userId: string;
+}
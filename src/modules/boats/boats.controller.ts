@@ -17,11 +17,20 @@ import {
   ApiBearerAuth,
   ApiQuery,
 } from '@nestjs/swagger';
-import { BoatsService } from './boats.service';
+import {
+  BoatsService,
+  CLUSTER_MAX_ZOOM,
+  MAX_TILES_PER_REQUEST,
+} from './boats.service';
 import { CreateBoatDto } from './dto/create-boat.dto';
 import { UpdateBoatDto } from './dto/update-boat.dto';
 import { CurrentUser } from '../../common/decorators/current-user.decorator';
+import { RateLimitCost } from '../../common/decorators/rate-limit-cost.decorator';
+import { Serialize } from '../../common/decorators/serialize.decorator';
+import { Idempotent } from '../../common/decorators/idempotent.decorator';
 import { User } from '../users/entities/user.entity';
+import { boatListSerializer } from './serializers/boat.serializer';
+import { MAX_FACET_PAGE_SIZE } from '../../common/search/facets';
 
 /**
  * Contrôleur Boats
@@ -33,6 +42,7 @@ import { User } from '../users/entities/user.entity';
 export class BoatsController {
   constructor(private readonly boatsService: BoatsService) {}
 
+  @Idempotent()
   @Post()
   @ApiOperation({ summary: 'Create new boat' })
   @ApiResponse({ status: 201, description: 'Boat created successfully' })
@@ -48,10 +58,17 @@ export class BoatsController {
   }
 
   @Get()
+  @RateLimitCost(2)
+  @Serialize(boatListSerializer) // Grosses listes : sérialisation compilée
   @ApiOperation({ summary: 'Search boats' })
   @ApiQuery({ name: 'boatType', required: false })
   @ApiQuery({ name: 'homePort', required: false })
   @ApiQuery({ name: 'minCapacity', required: false, type: Number })
+  @ApiQuery({
+    name: 'equipment',
+    required: false,
+    description: 'Comma separated equipment the boat must all have (ex: gps,sounder)',
+  })
   @ApiQuery({ name: 'minLat', required: false, type: Number })
   @ApiQuery({ name: 'maxLat', required: false, type: Number })
   @ApiQuery({ name: 'minLng', required: false, type: Number })
@@ -61,6 +78,7 @@ export class BoatsController {
     @Query('boatType') boatType?: string,
     @Query('homePort') homePort?: string,
     @Query('minCapacity') minCapacity?: number,
+    @Query('equipment') equipment?: string,
     @Query('minLat') minLat?: number,
     @Query('maxLat') maxLat?: number,
     @Query('minLng') minLng?: number,
@@ -70,10 +88,100 @@ export class BoatsController {
       boatType,
       homePort,
       minCapacity,
+      equipment,
+      minLat,
+      maxLat,
+      minLng,
+      maxLng,
+    });
+  }
+
+  // Routes fixes déclarées avant :boatId, sinon "facets" serait pris pour un identifiant
+  @Get('facets')
+  @RateLimitCost(2)
+  @ApiOperation({ summary: 'Boat search facet counts' })
+  @ApiQuery({ name: 'boatType', required: false })
+  @ApiQuery({ name: 'homePort', required: false })
+  @ApiQuery({ name: 'minCapacity', required: false, type: Number })
+  @ApiQuery({
+    name: 'equipment',
+    required: false,
+    description: 'Comma separated equipment the boat must all have (ex: gps,sounder)',
+  })
+  @ApiQuery({ name: 'minLat', required: false, type: Number })
+  @ApiQuery({ name: 'maxLat', required: false, type: Number })
+  @ApiQuery({ name: 'minLng', required: false, type: Number })
+  @ApiQuery({ name: 'maxLng', required: false, type: Number })
+  @ApiQuery({
+    name: 'limit',
+    required: false,
+    type: Number,
+    description: `Page of matching boats returned with the counts (0 to ${MAX_FACET_PAGE_SIZE}, default 0)`,
+  })
+  @ApiQuery({ name: 'offset', required: false, type: Number })
+  @ApiResponse({
+    status: 200,
+    description: 'Counts per boatType, engineType, licenseType and homePort for the filters',
+  })
+  async facets(
+    @Query('boatType') boatType?: string,
+    @Query('homePort') homePort?: string,
+    @Query('minCapacity') minCapacity?: number,
+    @Query('equipment') equipment?: string,
+    @Query('minLat') minLat?: number,
+    @Query('maxLat') maxLat?: number,
+    @Query('minLng') minLng?: number,
+    @Query('maxLng') maxLng?: number,
+    @Query('limit') limit?: number,
+    @Query('offset') offset?: number,
+  ) {
+    return this.boatsService.facets(
+      { boatType, homePort, minCapacity, equipment, minLat, maxLat, minLng, maxLng },
+      { limit, offset },
+    );
+  }
+
+  @Get('clusters')
+  @RateLimitCost(2)
+  @ApiOperation({ summary: 'Boat clusters by map tile' })
+  @ApiQuery({
+    name: 'tiles',
+    required: false,
+    description: `Map tiles z/x/y, comma separated (at most ${MAX_TILES_PER_REQUEST})`,
+  })
+  @ApiQuery({
+    name: 'zoom',
+    required: false,
+    type: Number,
+    description: 'Zoom level of the tiles covering the bounding box (without tiles)',
+  })
+  @ApiQuery({ name: 'minLat', required: false, type: Number })
+  @ApiQuery({ name: 'maxLat', required: false, type: Number })
+  @ApiQuery({ name: 'minLng', required: false, type: Number })
+  @ApiQuery({ name: 'maxLng', required: false, type: Number })
+  @ApiQuery({ name: 'boatType', required: false })
+  @ApiResponse({
+    status: 200,
+    description: `Boat counts per tile cell, or the boats themselves from zoom ${CLUSTER_MAX_ZOOM}`,
+  })
+  @ApiResponse({ status: 400, description: 'Invalid tiles or bounding box' })
+  async findClusters(
+    @Query('tiles') tiles?: string,
+    @Query('zoom') zoom?: number,
+    @Query('minLat') minLat?: number,
+    @Query('maxLat') maxLat?: number,
+    @Query('minLng') minLng?: number,
+    @Query('maxLng') maxLng?: number,
+    @Query('boatType') boatType?: string,
+  ) {
+    return this.boatsService.findClusters({
+      tiles,
+      zoom,
       minLat,
       maxLat,
       minLng,
       maxLng,
+      boatType,
     });
   }
 
@@ -2,13 +2,51 @@ import {
   Injectable,
   NotFoundException,
   ForbiddenException,
+  BadRequestException,
 } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository, Between } from 'typeorm';
+import { Repository, Between, Brackets, SelectQueryBuilder } from 'typeorm';
 import { Boat } from './entities/boat.entity';
 import { User } from '../users/entities/user.entity';
 import { CreateBoatDto } from './dto/create-boat.dto';
 import { UpdateBoatDto } from './dto/update-boat.dto';
+import { Tile, TILE_ZOOM, parseTiles, tilesForBbox } from '../../common/geo/tiles';
+import { FacetCounts, countFacets, parsePage } from '../../common/search/facets';
+import { parseList } from '../../common/search/query-params';
+import { refreshTripSearch } from '../trips/trip-search.projection';
+
+export interface BoatSearchFilters {
+  boatType?: string;
+  homePort?: string;
+  minCapacity?: number;
+  equipment?: string; // liste séparée par des virgules : le bateau doit avoir tous ces équipements
+  minLat?: number;
+  maxLat?: number;
+  minLng?: number;
+  maxLng?: number;
+}
+
+// Nombre maximal de tuiles par appel à GET /boats/clusters (une vue de carte en demande ~20)
+export const MAX_TILES_PER_REQUEST = 64;
+// À partir de ce zoom, les tuiles contiennent les bateaux eux-mêmes au lieu de groupes
+export const CLUSTER_MAX_ZOOM = 15;
+// Chaque tuile est regroupée sur une grille de 2^3 × 2^3 cellules, elles-mêmes des tuiles du zoom z + 3
+const CLUSTER_GRID_BITS = 3;
+
+export interface BoatCluster {
+  z: number;
+  x: number;
+  y: number;
+  count: number;
+  latitude: number; // barycentre des bateaux de la cellule
+  longitude: number;
+}
+
+export interface BoatTile extends Tile {
+  count: number;
+  clusters?: BoatCluster[];
+  boats?: Boat[];
+}
 
 /**
  * Service Boats
@@ -51,15 +89,36 @@ export class BoatsService {
    * Rechercher des bateaux avec filtres
    * Implémente BF21 et BF24 (bounding box)
    */
-  async findAll(filters?: {
-    boatType?: string;
-    homePort?: string;
-    minCapacity?: number;
-    minLat?: number;
-    maxLat?: number;
-    minLng?: number;
-    maxLng?: number;
-  }): Promise<Boat[]> {
+  async findAll(filters?: BoatSearchFilters): Promise<Boat[]> {
+    return this.searchQuery(filters).getMany();
+  }
+
+  /**
+   * Comptes par facette pour les filtres courants, en une requête agrégée
+   * (voir common/search/facets.ts), avec une page de résultats si limit > 0
+   */
+  async facets(
+    filters: BoatSearchFilters,
+    page: { limit?: number; offset?: number } = {},
+  ): Promise<FacetCounts & { results?: Boat[] }> {
+    const { limit, offset } = parsePage(page);
+    const query = this.searchQuery(filters);
+
+    const [counts, results] = await Promise.all([
+      countFacets(query, {
+        boatType: '"boat"."boatType"',
+        engineType: '"boat"."engineType"',
+        licenseType: '"boat"."licenseType"',
+        homePort: '"boat"."homePort"',
+      }),
+      limit
+        ? query.clone().orderBy('boat.createdAt', 'DESC').addOrderBy('boat.id').skip(offset).take(limit).getMany()
+        : undefined,
+    ]);
+    return results ? { ...counts, results } : counts;
+  }
+
+  private searchQuery(filters?: BoatSearchFilters): SelectQueryBuilder<Boat> {
     const query = this.boatRepository.createQueryBuilder('boat');
 
     if (filters?.boatType) {
@@ -80,6 +139,12 @@ export class BoatsService {
       });
     }
 
+    // Contenance de tableaux (@>) : index GIN IDX_boats_equipment
+    const equipment = parseList(filters?.equipment);
+    if (equipment.length) {
+      query.andWhere('boat.equipment @> :equipment', { equipment });
+    }
+
     // Bounding box pour la recherche géographique (BF24)
     if (
       filters?.minLat &&
@@ -98,7 +163,162 @@ export class BoatsService {
       );
     }
 
-    return query.getMany();
+    return query;
+  }
+
+  /**
+   * Groupes de bateaux par tuile de carte (z/x/y), pour l'affichage d'une carte
+   *
+   * Les tuiles sont données directement (tiles=z/x/y,z/x/y...) ou couvrent une bounding box
+   * au zoom demandé. Toutes les tuiles groupées sont calculées en une seule requête SQL
+   * sur l'index IDX_boats_tile ; au-delà de CLUSTER_MAX_ZOOM, une tuile renvoie ses bateaux.
+   */
+  async findClusters(filters: {
+    tiles?: string;
+    zoom?: number;
+    minLat?: number;
+    maxLat?: number;
+    minLng?: number;
+    maxLng?: number;
+    boatType?: string;
+  }): Promise<{ tiles: BoatTile[] }> {
+    const tiles = this.resolveTiles(filters);
+    const clustered = tiles.filter((tile) => tile.z < CLUSTER_MAX_ZOOM);
+    const detailed = tiles.filter((tile) => tile.z >= CLUSTER_MAX_ZOOM);
+
+    const [clusters, boats] = await Promise.all([
+      this.clusterTiles(clustered, filters.boatType),
+      this.boatsInTiles(detailed, filters.boatType),
+    ]);
+
+    return {
+      tiles: tiles.map((tile) => {
+        const key = `${tile.z}/${tile.x}/${tile.y}`;
+        if (tile.z < CLUSTER_MAX_ZOOM) {
+          const cells = clusters.get(key) ?? [];
+          return { ...tile, count: cells.reduce((sum, cell) => sum + cell.count, 0), clusters: cells };
+        }
+        const tileBoats = boats.get(key) ?? [];
+        return { ...tile, count: tileBoats.length, boats: tileBoats };
+      }),
+    };
+  }
+
+  private resolveTiles(filters: {
+    tiles?: string;
+    zoom?: number;
+    minLat?: number;
+    maxLat?: number;
+    minLng?: number;
+    maxLng?: number;
+  }): Tile[] {
+    let tiles: Tile[] | null;
+    if (filters.tiles) {
+      tiles = parseTiles(filters.tiles);
+      if (!tiles) {
+        throw new BadRequestException(`tiles must be a list of z/x/y tiles with z <= ${TILE_ZOOM}`);
+      }
+    } else {
+      const zoom = Number(filters.zoom);
+      const bbox = [filters.minLat, filters.maxLat, filters.minLng, filters.maxLng].map(Number);
+      if (!Number.isInteger(zoom) || zoom < 0 || zoom > TILE_ZOOM || bbox.some(Number.isNaN)) {
+        throw new BadRequestException('tiles, or zoom with minLat, maxLat, minLng and maxLng, are required');
+      }
+      const [minLat, maxLat, minLng, maxLng] = bbox;
+      tiles = tilesForBbox({ minLat, maxLat, minLng, maxLng }, zoom, MAX_TILES_PER_REQUEST);
+    }
+
+    if (!tiles || tiles.length > MAX_TILES_PER_REQUEST) {
+      throw new BadRequestException(`At most ${MAX_TILES_PER_REQUEST} tiles per request`);
+    }
+    return tiles;
+  }
+
+  /**
+   * Cellules non vides de chaque tuile, en une requête : les tuiles sont passées en tableaux
+   * (unnest) et jointes aux bateaux par intervalles de tileX / tileY
+   */
+  private async clusterTiles(tiles: Tile[], boatType?: string): Promise<Map<string, BoatCluster[]>> {
+    const clusters = new Map<string, BoatCluster[]>();
+    if (!tiles.length) return clusters;
+
+    const rows = await this.boatRepository.query(
+      `SELECT t.z, t.x, t.y,
+              b."tileX" >> (${TILE_ZOOM - CLUSTER_GRID_BITS} - t.z) AS "cellX",
+              b."tileY" >> (${TILE_ZOOM - CLUSTER_GRID_BITS} - t.z) AS "cellY",
+              count(*)::integer AS count,
+              avg(b.latitude)::double precision AS latitude,
+              avg(b.longitude)::double precision AS longitude
+         FROM unnest($1::integer[], $2::integer[], $3::integer[]) AS t(z, x, y)
+         JOIN boats b
+           ON b."tileX" >= t.x << (${TILE_ZOOM} - t.z) AND b."tileX" < (t.x + 1) << (${TILE_ZOOM} - t.z)
+          AND b."tileY" >= t.y << (${TILE_ZOOM} - t.z) AND b."tileY" < (t.y + 1) << (${TILE_ZOOM} - t.z)
+        WHERE $4::text IS NULL OR b."boatType"::text = $4
+        GROUP BY t.z, t.x, t.y, "cellX", "cellY"
+        ORDER BY count DESC`,
+      [tiles.map((t) => t.z), tiles.map((t) => t.x), tiles.map((t) => t.y), boatType || null],
+    );
+
+    for (const row of rows) {
+      const key = `${row.z}/${row.x}/${row.y}`;
+      if (!clusters.has(key)) clusters.set(key, []);
+      clusters.get(key).push({
+        z: row.z + CLUSTER_GRID_BITS,
+        x: row.cellX,
+        y: row.cellY,
+        count: row.count,
+        latitude: row.latitude,
+        longitude: row.longitude,
+      });
+    }
+    return clusters;
+  }
+
+  /**
+   * Bateaux des tuiles de fort zoom (détail), rangés par tuile
+   */
+  private async boatsInTiles(tiles: Tile[], boatType?: string): Promise<Map<string, Boat[]>> {
+    const boats = new Map<string, Boat[]>();
+    if (!tiles.length) return boats;
+
+    const query = this.boatRepository
+      .createQueryBuilder('boat')
+      .addSelect(['boat.tileX', 'boat.tileY'])
+      .where(
+        new Brackets((qb) => {
+          tiles.forEach((tile, i) => {
+            const shift = TILE_ZOOM - tile.z;
+            qb.orWhere(
+              `boat.tileX >= :minX${i} AND boat.tileX < :maxX${i} AND boat.tileY >= :minY${i} AND boat.tileY < :maxY${i}`,
+              {
+                [`minX${i}`]: tile.x << shift,
+                [`maxX${i}`]: (tile.x + 1) << shift,
+                [`minY${i}`]: tile.y << shift,
+                [`maxY${i}`]: (tile.y + 1) << shift,
+              },
+            );
+          });
+        }),
+      );
+    if (boatType) {
+      query.andWhere('boat.boatType = :boatType', { boatType });
+    }
+
+    for (const boat of await query.getMany()) {
+      const { tileX, tileY } = boat;
+      // Colonnes internes : retirées de la réponse
+      delete boat.tileX;
+      delete boat.tileY;
+      for (const tile of tiles) {
+        const shift = TILE_ZOOM - tile.z;
+        if (tileX >> shift === tile.x && tileY >> shift === tile.y) {
+          const key = `${tile.z}/${tile.x}/${tile.y}`;
+          if (!boats.has(key)) boats.set(key, []);
+          boats.get(key).push(boat);
+        }
+      }
+    }
+    return boats;
   }
 
   async findOne(id: string): Promise<Boat> {
@@ -130,7 +350,12 @@ export class BoatsService {
     }
 
     Object.assign(boat, updateBoatDto);
-    return this.boatRepository.save(boat);
+    return this.boatRepository.manager.transaction(async (manager) => {
+      const saved = await manager.save(boat);
+      // Position, type, capacité... recopiés dans le modèle de lecture des sorties
+      await refreshTripSearch(manager, { boatId: saved.id });
+      return saved;
+    });
   }
 
   /**
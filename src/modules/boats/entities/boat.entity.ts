@@ -7,9 +7,11 @@ import {
   ManyToOne,
   OneToMany,
   JoinColumn,
+  Index,
 } from 'typeorm';
 import { User } from '../../users/entities/user.entity';
 import { Trip } from '../../trips/entities/trip.entity';
+import { tileXExpression, tileYExpression } from '../../../common/geo/tiles';
 
 /**
  * Entité Boat - Représente la table "boats" dans la base de données
@@ -18,6 +20,7 @@ import { Trip } from '../../trips/entities/trip.entity';
  * @JoinColumn() : Spécifie la colonne de jointure (clé étrangère)
  */
 @Entity('boats')
+@Index('IDX_boats_tile', ['tileX', 'tileY'])
 export class Boat {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -50,8 +53,10 @@ export class Boat {
   })
   boatType: string;
 
-  // type: 'simple-array' stocke un tableau sous forme de chaîne séparée par des virgules
-  @Column({ type: 'simple-array', nullable: true })
+  // Tableau PostgreSQL (text[]) : filtre de contenance GET /boats?equipment=gps,sounder
+  // servi par l'index GIN IDX_boats_equipment (créé par database/indexes.ts)
+  @Index('IDX_boats_equipment', { synchronize: false })
+  @Column({ type: 'text', array: true, nullable: true })
   equipment: string[];
 
   @Column({ type: 'decimal', precision: 10, scale: 2, nullable: true })
@@ -72,6 +77,30 @@ export class Boat {
   @Column({ type: 'decimal', precision: 11, scale: 8, nullable: true })
   longitude: number;
 
+  // Tuile de la position au zoom TILE_ZOOM (common/geo/tiles.ts), calculée par PostgreSQL :
+  // GET /boats/clusters agrège par tuile via l'index IDX_boats_tile. Jamais renvoyées.
+  @Column({
+    type: 'integer',
+    nullable: true,
+    select: false,
+    insert: false,
+    update: false,
+    generatedType: 'STORED',
+    asExpression: tileXExpression('longitude'),
+  })
+  tileX: number;
+
+  @Column({
+    type: 'integer',
+    nullable: true,
+    select: false,
+    insert: false,
+    update: false,
+    generatedType: 'STORED',
+    asExpression: tileYExpression('latitude'),
+  })
+  tileY: number;
+
   @Column({
     type: 'enum',
     enum: ['diesel', 'gasoline', 'none'],
@@ -94,6 +123,8 @@ export class Boat {
   @JoinColumn({ name: 'ownerId' })
   owner: User;
 
+  // Index des clés étrangères : PostgreSQL n'en crée pas (migrations/…-ForeignKeyIndexes.ts)
+  @Index('IDX_boats_owner')
   @Column()
   ownerId: string;
 
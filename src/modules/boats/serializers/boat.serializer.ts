@@ -0,0 +1,12 @@
+import {
+  compileEntitySerializer,
+  compileListSerializer,
+} from '../../../common/serialization/compile-serializer';
+import { Boat } from '../entities/boat.entity';
+
+/**
+ * Sérialiseur compilé de la liste des bateaux (GET /v1/boats)
+ * Dérivé des colonnes de l'entité Boat
+ */
+export const boatSerializer = compileEntitySerializer(Boat);
+export const boatListSerializer = compileListSerializer(boatSerializer);
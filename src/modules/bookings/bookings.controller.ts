@@ -21,6 +21,7 @@ import { BookingsService } from './bookings.service';
 import { CreateBookingDto } from './dto/create-booking.dto';
 import { UpdateBookingDto } from './dto/update-booking.dto';
 import { CurrentUser } from '../../common/decorators/current-user.decorator';
+import { Idempotent } from '../../common/decorators/idempotent.decorator';
 import { User } from '../users/entities/user.entity';
 
 @ApiTags('Bookings')
@@ -29,6 +30,7 @@ import { User } from '../users/entities/user.entity';
 export class BookingsController {
   constructor(private readonly bookingsService: BookingsService) {}
 
+  @Idempotent() // Les apps mobiles réessaient ce POST sur réseau instable
   @Post()
   @ApiOperation({ summary: 'Create new booking' })
   @ApiResponse({ status: 201, description: 'Booking created successfully' })
@@ -44,12 +46,16 @@ export class BookingsController {
   @ApiOperation({ summary: 'Search bookings' })
   @ApiQuery({ name: 'tripId', required: false })
   @ApiQuery({ name: 'userId', required: false })
+  @ApiQuery({ name: 'fromDate', required: false, description: 'First selected date (YYYY-MM-DD)' })
+  @ApiQuery({ name: 'toDate', required: false, description: 'Last selected date (YYYY-MM-DD)' })
   @ApiResponse({ status: 200, description: 'Bookings list retrieved successfully' })
   async findAll(
     @Query('tripId') tripId?: string,
     @Query('userId') userId?: string,
+    @Query('fromDate') fromDate?: string,
+    @Query('toDate') toDate?: string,
   ) {
-    return this.bookingsService.findAll({ tripId, userId });
+    return this.bookingsService.findAll({ tripId, userId, fromDate, toDate });
   }
 
   @Get(':bookingId')
@@ -9,7 +9,13 @@ import { Booking } from './entities/booking.entity';
 import { Trip } from '../trips/entities/trip.entity';
 import { CreateBookingDto } from './dto/create-booking.dto';
 import { UpdateBookingDto } from './dto/update-booking.dto';
+import { lockTripsForSeatsChange, publishSeatsChange } from '../trips/trip-availability.service';
 
+/**
+ * Les écritures (create / update / remove) notifient le changement de places dans leur
+ * transaction : les clients de GET /trips/availability le reçoivent au COMMIT
+ * (trips/trip-availability.service.ts).
+ */
 @Injectable()
 export class BookingsService {
   constructor(
@@ -41,16 +47,25 @@ export class BookingsService {
       totalPrice,
     });
 
-    return this.bookingRepository.save(booking);
+    return this.bookingRepository.manager.transaction(async (manager) => {
+      const saved = await manager.save(booking);
+      await publishSeatsChange(manager, saved.tripId, saved.selectedDate, saved.seats);
+      return saved;
+    });
   }
 
   /**
    * Rechercher des réservations avec filtres
    * Implémente BF23
+   *
+   * fromDate / toDate portent sur selectedDate, la clé de partitionnement de la table :
+   * seules les partitions des mois demandés sont lues (database/partitions.ts).
    */
   async findAll(filters?: {
     tripId?: string;
     userId?: string;
+    fromDate?: string;
+    toDate?: string;
   }): Promise<Booking[]> {
     const query = this.bookingRepository.createQueryBuilder('booking');
 
@@ -62,6 +77,14 @@ export class BookingsService {
       query.andWhere('booking.userId = :userId', { userId: filters.userId });
     }
 
+    if (filters?.fromDate) {
+      query.andWhere('booking.selectedDate >= :fromDate', { fromDate: filters.fromDate });
+    }
+
+    if (filters?.toDate) {
+      query.andWhere('booking.selectedDate <= :toDate', { toDate: filters.toDate });
+    }
+
     return query
       .leftJoinAndSelect('booking.trip', 'trip')
       .leftJoinAndSelect('booking.user', 'user')
@@ -100,8 +123,20 @@ export class BookingsService {
       booking.totalPrice = trip.price * updateBookingDto.seats;
     }
 
+    const before = { tripId: booking.tripId, selectedDate: booking.selectedDate, seats: booking.seats };
     Object.assign(booking, updateBookingDto);
-    return this.bookingRepository.save(booking);
+    return this.bookingRepository.manager.transaction(async (manager) => {
+      const saved = await manager.save(booking);
+      if (saved.tripId === before.tripId && String(saved.selectedDate) === String(before.selectedDate)) {
+        await publishSeatsChange(manager, saved.tripId, saved.selectedDate, saved.seats - before.seats);
+      } else {
+        // Changement de sortie ou de date : places rendues d'un côté, prises de l'autre
+        await lockTripsForSeatsChange(manager, [before.tripId, saved.tripId]);
+        await publishSeatsChange(manager, before.tripId, before.selectedDate, -before.seats);
+        await publishSeatsChange(manager, saved.tripId, saved.selectedDate, saved.seats);
+      }
+      return saved;
+    });
   }
 
   async remove(id: string, userId: string): Promise<void> {
@@ -111,7 +146,11 @@ export class BookingsService {
       throw new ForbiddenException('You can only cancel your own bookings');
     }
 
-    await this.bookingRepository.remove(booking);
+    const { tripId, selectedDate, seats } = booking;
+    await this.bookingRepository.manager.transaction(async (manager) => {
+      await manager.remove(booking);
+      await publishSeatsChange(manager, tripId, selectedDate, -seats);
+    });
   }
 
   /**
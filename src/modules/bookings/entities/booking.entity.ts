@@ -6,6 +6,7 @@ import {
   UpdateDateColumn,
   ManyToOne,
   JoinColumn,
+  Index,
 } from 'typeorm';
 import { User } from '../../users/entities/user.entity';
 import { Trip } from '../../trips/entities/trip.entity';
@@ -13,7 +14,10 @@ import { Trip } from '../../trips/entities/trip.entity';
 /**
  * Entité Booking - Représente la table "bookings" (réservations)
  */
-@Entity('bookings')
+// Table partitionnée par date, créée et tenue à jour par database/partitions.ts
+@Entity('bookings', { synchronize: false })
+// Réservations d'une sortie (filtre tripId de BF23), puis d'une de ses dates
+@Index('IDX_bookings_trip_date', ['tripId', 'selectedDate'])
 export class Booking {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -45,6 +49,7 @@ export class Booking {
   @JoinColumn({ name: 'userId' })
   user: User;
 
+  @Index('IDX_bookings_user')
   @Column()
   userId: string;
 }
@@ -6,13 +6,17 @@ import {
   UpdateDateColumn,
   ManyToOne,
   JoinColumn,
+  Index,
 } from 'typeorm';
 import { User } from '../../users/entities/user.entity';
 
 /**
  * Entité LogbookEntry - Représente la table "logbook_entries" (carnet de pêche)
  */
-@Entity('logbook_entries')
+// Table partitionnée par date, créée et tenue à jour par database/partitions.ts
+@Entity('logbook_entries', { synchronize: false })
+// Carnet d'un utilisateur à partir d'une date (GET /logbook?userId=&startDate=)
+@Index('IDX_logbook_user_date', ['userId', 'fishingDate'])
 export class LogbookEntry {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -0,0 +1,205 @@
+import { BadRequestException, Injectable } from '@nestjs/common';
+import { DataSource } from 'typeorm';
+import { plainToInstance } from 'class-transformer';
+import { ValidationError, ValidatorOptions, validateSync } from 'class-validator';
+import { LogbookEntry } from './entities/logbook-entry.entity';
+import { CreateLogbookEntryDto } from './dto/create-logbook-entry.dto';
+import { compileValidator } from '../../common/pipes/compiled-validation.pipe';
+import { readCsv } from '../../common/import/csv-reader';
+import { readGpxWaypoints } from '../../common/import/gpx-reader';
+
+export type LogbookImportFormat = 'csv' | 'gpx';
+
+// Content-Type accepté par POST /logbook/import → format du fichier
+export const LOGBOOK_IMPORT_CONTENT_TYPES: Record<string, LogbookImportFormat> = {
+  'text/csv': 'csv',
+  'application/gpx+xml': 'gpx',
+};
+
+// Lignes par INSERT multi-lignes (9 colonnes : 9 000 paramètres, PostgreSQL en accepte 65 535)
+export const IMPORT_INSERT_ROWS = 1000;
+// Lignes par transaction : accumulées puis écrites d'un coup, la transaction n'attend
+// jamais le client ; une erreur n'annule que les lignes de la transaction en cours
+export const IMPORT_TRANSACTION_ROWS = 5000;
+// Lignes rejetées détaillées dans le rapport (les suivantes sont seulement comptées)
+export const MAX_REPORTED_ERRORS = 100;
+
+// Colonnes du CSV : propriétés de CreateLogbookEntryDto
+const CSV_COLUMNS = [
+  'fishSpecies',
+  'fishingDate',
+  'released',
+  'length',
+  'weight',
+  'location',
+  'comment',
+  'photoUrl',
+];
+const REQUIRED_CSV_COLUMNS = ['fishSpecies', 'fishingDate'];
+const NUMBER_COLUMNS = ['length', 'weight'];
+const BOOLEANS: Record<string, boolean> = {
+  true: true,
+  false: false,
+  '1': true,
+  '0': false,
+  yes: true,
+  no: false,
+  oui: true,
+  non: false,
+};
+
+// Options du ValidationPipe global (main.ts)
+const VALIDATOR_OPTIONS: ValidatorOptions = { whitelist: true, forbidNonWhitelisted: true };
+
+export interface LogbookImportError {
+  line: number;
+  errors: string[];
+}
+
+export interface LogbookImportReport {
+  imported: number;
+  failed: number;
+  errors: LogbookImportError[];
+}
+
+interface ImportRow {
+  line: number;
+  values?: Record<string, string | undefined>;
+  error?: string;
+}
+
+/**
+ * Import en masse du carnet de pêche (POST /logbook/import)
+ *
+ * Le fichier est lu au fil de l'eau (common/import) : chaque ligne est convertie, validée
+ * avec les règles de CreateLogbookEntryDto (mêmes messages que POST /logbook), puis
+ * accumulée. Toutes les IMPORT_TRANSACTION_ROWS lignes valides, une transaction les
+ * insère par INSERT de IMPORT_INSERT_ROWS lignes. La mémoire reste bornée à un lot, quelle
+ * que soit la taille du fichier.
+ *
+ * Les lignes invalides sont rejetées sans interrompre l'import et listées dans le rapport.
+ * Un fichier illisible (en-tête inconnu, guillemet non fermé...) interrompt l'import
+ * (400) : les transactions déjà validées restent en base.
+ */
+@Injectable()
+export class LogbookImportService {
+  private readonly validate =
+    compileValidator(CreateLogbookEntryDto, VALIDATOR_OPTIONS) ??
+    ((dto: object) => validateSync(dto, VALIDATOR_OPTIONS));
+
+  constructor(private dataSource: DataSource) {}
+
+  async import(
+    source: AsyncIterable<Buffer | string>,
+    format: LogbookImportFormat,
+    userId: string,
+  ): Promise<LogbookImportReport> {
+    const report: LogbookImportReport = { imported: 0, failed: 0, errors: [] };
+    let pending: Array<Partial<LogbookEntry>> = [];
+
+    for await (const row of format === 'csv' ? this.csvRows(source) : this.gpxRows(source)) {
+      const dto = row.values && plainToInstance(CreateLogbookEntryDto, toPlain(row.values));
+      const errors = row.error ? [row.error] : messages(this.validate(dto));
+      if (errors.length) {
+        report.failed++;
+        if (report.errors.length < MAX_REPORTED_ERRORS) report.errors.push({ line: row.line, errors });
+        continue;
+      }
+
+      pending.push({ ...dto, fishingDate: dto.fishingDate as unknown as Date, userId });
+      if (pending.length === IMPORT_TRANSACTION_ROWS) {
+        report.imported += await this.insert(pending);
+        pending = [];
+      }
+    }
+    report.imported += await this.insert(pending);
+    return report;
+  }
+
+  private async insert(rows: Array<Partial<LogbookEntry>>): Promise<number> {
+    if (!rows.length) return 0;
+    await this.dataSource.transaction(async (manager) => {
+      for (let i = 0; i < rows.length; i += IMPORT_INSERT_ROWS) {
+        await manager
+          .createQueryBuilder()
+          .insert()
+          .into(LogbookEntry)
+          .values(rows.slice(i, i + IMPORT_INSERT_ROWS))
+          .updateEntity(false) // pas de RETURNING : les ids générés ne sont pas renvoyés
+          .execute();
+      }
+    });
+    return rows.length;
+  }
+
+  /**
+   * CSV avec en-tête : une colonne par propriété de CreateLogbookEntryDto
+   */
+  private async *csvRows(source: AsyncIterable<Buffer | string>): AsyncGenerator<ImportRow> {
+    let header: string[];
+    for await (const { line, fields } of readCsv(source)) {
+      if (!header) {
+        header = fields.map((name) => name.trim());
+        const unknown = header.filter((name) => !CSV_COLUMNS.includes(name));
+        if (unknown.length) {
+          throw new BadRequestException(
+            `Unknown column(s): ${unknown.join(', ')} (expected ${CSV_COLUMNS.join(', ')})`,
+          );
+        }
+        const missing = REQUIRED_CSV_COLUMNS.filter((name) => !header.includes(name));
+        if (missing.length) {
+          throw new BadRequestException(`Missing column(s): ${missing.join(', ')}`);
+        }
+        continue;
+      }
+      if (fields.length !== header.length) {
+        yield { line, error: `expected ${header.length} fields, got ${fields.length}` };
+        continue;
+      }
+      yield { line, values: Object.fromEntries(header.map((name, i) => [name, fields[i]])) };
+    }
+    if (!header) throw new BadRequestException('Empty file: a header line is required');
+  }
+
+  /**
+   * GPX : un point (<wpt>) par prise ; nom = espèce, description = commentaire,
+   * heure = date de pêche, coordonnées = lieu
+   */
+  private async *gpxRows(source: AsyncIterable<Buffer | string>): AsyncGenerator<ImportRow> {
+    for await (const waypoint of readGpxWaypoints(source)) {
+      yield {
+        line: waypoint.line,
+        values: {
+          fishSpecies: waypoint.name,
+          fishingDate: waypoint.time?.slice(0, 10),
+          comment: waypoint.desc ?? waypoint.cmt,
+          location: waypoint.lat && waypoint.lon ? `${waypoint.lat},${waypoint.lon}` : undefined,
+        },
+      };
+    }
+  }
+}
+
+/**
+ * Valeurs texte du fichier → corps de POST /logbook
+ * (champ vide = propriété absente ; released vaut false par défaut)
+ */
+function toPlain(values: Record<string, string | undefined>): Record<string, unknown> {
+  const plain: Record<string, unknown> = { released: false };
+  for (const [name, raw] of Object.entries(values)) {
+    const value = raw?.trim();
+    if (!value) continue;
+    if (NUMBER_COLUMNS.includes(name)) {
+      // Virgule décimale acceptée (export d'un tableur français) ; NaN est refusé par @IsNumber
+      plain[name] = Number(value.replace(',', '.'));
+    } else if (name === 'released') {
+      plain[name] = BOOLEANS[value.toLowerCase()] ?? value;
+    } else {
+      plain[name] = value;
+    }
+  }
+  return plain;
+}
+
+const messages = (errors: ValidationError[]) =>
+  errors.flatMap((error) => Object.values(error.constraints ?? {}));
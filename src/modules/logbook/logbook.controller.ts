@@ -7,8 +7,10 @@ import {
   Param,
   Delete,
   Query,
+  Req,
   HttpCode,
   HttpStatus,
+  UnsupportedMediaTypeException,
 } from '@nestjs/common';
 import {
   ApiTags,
@@ -16,19 +18,28 @@ import {
   ApiResponse,
   ApiBearerAuth,
   ApiQuery,
+  ApiConsumes,
+  ApiBody,
 } from '@nestjs/swagger';
 import { LogbookService } from './logbook.service';
+import { LogbookImportService, LOGBOOK_IMPORT_CONTENT_TYPES } from './logbook-import.service';
 import { CreateLogbookEntryDto } from './dto/create-logbook-entry.dto';
 import { UpdateLogbookEntryDto } from './dto/update-logbook-entry.dto';
 import { CurrentUser } from '../../common/decorators/current-user.decorator';
+import { Idempotent } from '../../common/decorators/idempotent.decorator';
+import { RateLimitCost } from '../../common/decorators/rate-limit-cost.decorator';
 import { User } from '../users/entities/user.entity';
 
 @ApiTags('Fishing Logbook')
 @Controller('v1/logbook')
 @ApiBearerAuth()
 export class LogbookController {
-  constructor(private readonly logbookService: LogbookService) {}
+  constructor(
+    private readonly logbookService: LogbookService,
+    private readonly logbookImportService: LogbookImportService,
+  ) {}
 
+  @Idempotent()
   @Post()
   @ApiOperation({ summary: 'Create logbook entry' })
   @ApiResponse({
@@ -43,6 +54,35 @@ export class LogbookController {
     return this.logbookService.create(createLogbookEntryDto, user.id);
   }
 
+  // Corps lu en flux (ni body-parser ni @Body) : voir LogbookImportService
+  @Post('import')
+  @HttpCode(HttpStatus.OK)
+  @RateLimitCost(10)
+  @ApiOperation({ summary: 'Import logbook entries from a CSV or GPX file' })
+  @ApiConsumes(...Object.keys(LOGBOOK_IMPORT_CONTENT_TYPES))
+  @ApiBody({
+    description:
+      'CSV with a header line (fishSpecies, fishingDate, released, length, weight, location, comment, photoUrl) or GPX waypoints',
+    schema: { type: 'string', format: 'binary' },
+  })
+  @ApiResponse({
+    status: 200,
+    description: 'Import report: imported entries and rejected lines with their validation errors',
+  })
+  @ApiResponse({ status: 400, description: 'Unreadable file (unknown column, unterminated field...)' })
+  @ApiResponse({ status: 415, description: 'Content-Type is not text/csv or application/gpx+xml' })
+  async import(@Req() request: any, @CurrentUser() user: User) {
+    const contentType: string = request.headers['content-type'] ?? '';
+    const format = LOGBOOK_IMPORT_CONTENT_TYPES[contentType.split(';')[0].trim().toLowerCase()];
+    if (!format) {
+      throw new UnsupportedMediaTypeException(
+        `Content-Type must be one of ${Object.keys(LOGBOOK_IMPORT_CONTENT_TYPES).join(', ')}`,
+      );
+    }
+    // Express : la requête est le flux ; Fastify : request.raw
+    return this.logbookImportService.import(request.raw ?? request, format, user.id);
+  }
+
   @Get()
   @ApiOperation({ summary: 'Get logbook entries' })
   @ApiQuery({ name: 'userId', required: true })
@@ -1,13 +1,14 @@
 import { Module } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { LogbookService } from './logbook.service';
+import { LogbookImportService } from './logbook-import.service';
 import { LogbookController } from './logbook.controller';
 import { LogbookEntry } from './entities/logbook-entry.entity';
 
 @Module({
   imports: [TypeOrmModule.forFeature([LogbookEntry])],
   controllers: [LogbookController],
-  providers: [LogbookService],
+  providers: [LogbookService, LogbookImportService],
   exports: [LogbookService],
 })
 export class LogbookModule {}
@@ -0,0 +1,99 @@
+import { Entity, Column, PrimaryColumn, ManyToOne, JoinColumn, Index } from 'typeorm';
+import { Trip } from './trip.entity';
+
+/**
+ * Entité TripSearch - Modèle de lecture "trip_search" de la recherche de sorties
+ *
+ * Une ligne par sortie et par date (occurrence), avec les champs du bateau et de
+ * l'organisateur recopiés : GET /trips/search filtre sur la date, le prix, la position
+ * du bateau et les langues de l'organisateur sans aucune jointure.
+ *
+ * Ces lignes ne sont jamais écrites directement : trip-search.projection.ts les recalcule
+ * dans la transaction de chaque modification d'une sortie, d'un bateau ou d'un utilisateur.
+ */
+@Entity('trip_search')
+@Index('IDX_trip_search_date_price', ['startDate', 'price'])
+export class TripSearch {
+  @PrimaryColumn('uuid')
+  tripId: string;
+
+  // Rang de la date dans trip.startDates (1, 2...)
+  @PrimaryColumn()
+  occurrence: number;
+
+  // Suppression de la sortie : ses lignes disparaissent avec elle
+  @ManyToOne(() => Trip, { onDelete: 'CASCADE' })
+  @JoinColumn({ name: 'tripId' })
+  trip: Trip;
+
+  @Column({ type: 'date', nullable: true })
+  startDate: string;
+
+  @Column({ type: 'date', nullable: true })
+  endDate: string;
+
+  @Column({ nullable: true })
+  startTime: string;
+
+  @Column({ nullable: true })
+  endTime: string;
+
+  @Column()
+  title: string;
+
+  @Column()
+  tripType: string;
+
+  @Column()
+  pricingType: string;
+
+  @Column({ type: 'decimal', precision: 10, scale: 2 })
+  price: number;
+
+  @Column()
+  passengerCount: number;
+
+  // Bateau (index : recalcul des lignes à la modification du bateau)
+  @Index('IDX_trip_search_boat')
+  @Column('uuid')
+  boatId: string;
+
+  @Column()
+  boatName: string;
+
+  @Column()
+  boatType: string;
+
+  @Column()
+  boatMaxCapacity: number;
+
+  @Column()
+  homePort: string;
+
+  @Column({ type: 'decimal', precision: 10, scale: 8, nullable: true })
+  latitude: number;
+
+  @Column({ type: 'decimal', precision: 11, scale: 8, nullable: true })
+  longitude: number;
+
+  // Organisateur (mêmes champs non sensibles que TripsService.withOrganizer)
+  @Index('IDX_trip_search_organizer')
+  @Column('uuid')
+  organizerId: string;
+
+  @Column()
+  organizerFirstName: string;
+
+  @Column()
+  organizerLastName: string;
+
+  @Column()
+  organizerCity: string;
+
+  @Column({ nullable: true })
+  organizerPhotoUrl: string;
+
+  @Index('IDX_trip_search_languages', { synchronize: false })
+  @Column({ type: 'text', array: true, nullable: true })
+  organizerLanguages: string[];
+}
@@ -7,6 +7,7 @@ import {
   ManyToOne,
   OneToMany,
   JoinColumn,
+  Index,
 } from 'typeorm';
 import { User } from '../../users/entities/user.entity';
 import { Boat } from '../../boats/entities/boat.entity';
@@ -69,6 +70,7 @@ export class Trip {
   @JoinColumn({ name: 'organizerId' })
   organizer: User;
 
+  @Index('IDX_trips_organizer')
   @Column()
   organizerId: string;
 
@@ -76,6 +78,7 @@ export class Trip {
   @JoinColumn({ name: 'boatId' })
   boat: Boat;
 
+  @Index('IDX_trips_boat')
   @Column()
   boatId: string;
 
@@ -0,0 +1,15 @@
+import {
+  compileEntitySerializer,
+  compileListSerializer,
+} from '../../../common/serialization/compile-serializer';
+import { Trip } from '../entities/trip.entity';
+
+/**
+ * Sérialiseur compilé de la liste des sorties (GET /v1/trips)
+ * Inclut les relations chargées par TripsService.findAll : le bateau et
+ * l'organisateur (seuls les champs sélectionnés sont présents, les autres sont omis)
+ */
+export const tripSerializer = compileEntitySerializer(Trip, {
+  relations: { boat: {}, organizer: {} },
+});
+export const tripListSerializer = compileListSerializer(tripSerializer);
@@ -0,0 +1,276 @@
+import {
+  BadRequestException,
+  Injectable,
+  Logger,
+  MessageEvent,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+} from '@nestjs/common';
+import { DataSource, EntityManager, QueryRunner } from 'typeorm';
+import { isUUID } from 'class-validator';
+import { Observable, Subject } from 'rxjs';
+import { parseList } from '../../common/search/query-params';
+
+/**
+ * Places restantes des sorties, poussées aux clients (GET /trips/availability, SSE)
+ *
+ * CONCEPT SQL - LISTEN / NOTIFY:
+ * BookingsService appelle publishSeatsChange dans la transaction de la réservation :
+ * PostgreSQL ne délivre la notification qu'au COMMIT (et jamais si la transaction est
+ * annulée), à toutes les connexions qui écoutent le canal. Chaque instance de l'API garde
+ * une connexion en LISTEN et répartit les notifications entre ses clients abonnés : une
+ * réservation faite sur une instance est vue par les clients de toutes les autres.
+ *
+ * Les abonnés sont rangés par sortie : une notification ne parcourt que les clients de
+ * sa sortie, quel que soit le nombre total de connexions.
+ *
+ * Les totaux (bookedSeats, remainingSeats) sont calculés sous READ COMMITTED : sans
+ * précaution, deux réservations simultanées ne voient pas l'une l'autre et envoient
+ * chacune un total faux. publishSeatsChange verrouille donc la ligne de la sortie
+ * (FOR NO KEY UPDATE, compatible avec les verrous des clés étrangères des réservations)
+ * jusqu'au COMMIT, puis calcule les totaux dans une nouvelle requête : elle voit les
+ * réservations validées par les transactions qui tenaient le verrou avant elle. Les
+ * notifications arrivent dans l'ordre des COMMIT, le dernier total reçu est le bon.
+ */
+
+export const TRIP_AVAILABILITY_CHANNEL = 'trip_availability';
+// Sorties suivies par une connexion
+export const MAX_WATCHED_TRIPS = 50;
+// Événement "ping" : garde la connexion ouverte à travers les proxys
+const HEARTBEAT_MS = 30 * 1000;
+// Attente avant de rouvrir la connexion LISTEN perdue
+const RECONNECT_DELAY_MS = 1000;
+
+// Événement "seats" : une réservation a changé le nombre de places d'une date
+export interface SeatsChange {
+  tripId: string;
+  selectedDate: string;
+  delta: number;
+  // Places réservées / restantes à cette date, après la modification
+  bookedSeats: number;
+  remainingSeats: number;
+}
+
+// Événement "availability" : état initial (et après une reconnexion), dates à venir
+export interface TripAvailability {
+  tripId: string;
+  passengerCount: number;
+  bookedSeats: Record<string, number>;
+}
+
+/**
+ * Verrouille les sorties jusqu'à la fin de la transaction, toujours dans le même ordre :
+ * deux transactions qui déplacent des réservations entre les mêmes sorties ne
+ * s'interbloquent pas
+ */
+export async function lockTripsForSeatsChange(manager: EntityManager, tripIds: string[]): Promise<void> {
+  await manager.query(
+    `SELECT 1 FROM "trips" WHERE "id" = ANY($1) ORDER BY "id" FOR NO KEY UPDATE`,
+    [[...new Set(tripIds)]],
+  );
+}
+
+/**
+ * Notifie le changement de places d'une date de sortie (delta : places ajoutées, ou
+ * retirées si négatif), avec les totaux après les réservations déjà validées
+ */
+export async function publishSeatsChange(
+  manager: EntityManager,
+  tripId: string,
+  selectedDate: string | Date,
+  delta: number,
+): Promise<void> {
+  if (!delta) return;
+  // Requête distincte : sous READ COMMITTED, la suivante voit ce qu'ont validé les
+  // transactions attendues ici
+  await lockTripsForSeatsChange(manager, [tripId]);
+  await manager.query(
+    `SELECT pg_notify($4, json_build_object(
+        'tripId', t."id",
+        'selectedDate', $2::date,
+        'delta', $3::int,
+        'bookedSeats', b."booked",
+        'remainingSeats', t."passengerCount" - b."booked")::text)
+       FROM "trips" t
+      CROSS JOIN LATERAL (
+        SELECT coalesce(sum(bk."seats"), 0)::int AS "booked" FROM "bookings" bk
+         WHERE bk."tripId" = t."id" AND bk."selectedDate" = $2::date) b
+      WHERE t."id" = $1`,
+    [tripId, selectedDate, delta, TRIP_AVAILABILITY_CHANNEL],
+  );
+}
+
+@Injectable()
+export class TripAvailabilityService implements OnApplicationBootstrap, OnModuleDestroy {
+  private readonly logger = new Logger(TripAvailabilityService.name);
+  private readonly trips = new Map<string, Subject<MessageEvent>>();
+  private listener: QueryRunner;
+  // Retire les handlers posés sur la connexion LISTEN
+  private detachListener: () => void;
+  private reconnectTimer: NodeJS.Timeout;
+  private stopped = false;
+
+  constructor(private dataSource: DataSource) {}
+
+  async onApplicationBootstrap() {
+    await this.listen();
+  }
+
+  async onModuleDestroy() {
+    this.stopped = true;
+    clearTimeout(this.reconnectTimer);
+    for (const subject of this.trips.values()) subject.complete();
+
+    const runner = this.listener;
+    if (!runner) return;
+    this.listener = undefined;
+    // La connexion retourne au pool : elle ne doit plus recevoir le canal ni appeler ce service
+    this.detachListener?.();
+    await runner.query(`UNLISTEN "${TRIP_AVAILABILITY_CHANNEL}"`).catch(() => undefined);
+    await runner.release();
+  }
+
+  /**
+   * Flux d'une connexion SSE : état des sorties demandées, puis leurs changements
+   */
+  watch(tripIdsParam: string): Observable<MessageEvent> {
+    const tripIds = [...new Set(parseList(tripIdsParam))];
+    if (!tripIds.length || tripIds.length > MAX_WATCHED_TRIPS) {
+      throw new BadRequestException(`tripIds must list 1 to ${MAX_WATCHED_TRIPS} trip IDs`);
+    }
+    if (!tripIds.every((id) => isUUID(id))) {
+      throw new BadRequestException('tripIds must be UUIDs');
+    }
+
+    return new Observable<MessageEvent>((subscriber) => {
+      // Abonné avant de lire l'état : aucun changement n'est perdu entre les deux ;
+      // ceux reçus pendant la lecture sont envoyés après l'état initial
+      let buffered: MessageEvent[] = [];
+      const forward = (event: MessageEvent) =>
+        buffered ? buffered.push(event) : subscriber.next(event);
+      const subscriptions = tripIds.map((id) => this.subject(id).subscribe(forward));
+
+      this.snapshot(tripIds).then(
+        (availability) => {
+          for (const data of availability) subscriber.next({ type: 'availability', data });
+          for (const event of buffered) subscriber.next(event);
+          buffered = undefined;
+        },
+        (error) => subscriber.error(error),
+      );
+      const heartbeat = setInterval(() => subscriber.next({ type: 'ping', data: '' }), HEARTBEAT_MS);
+
+      return () => {
+        clearInterval(heartbeat);
+        subscriptions.forEach((subscription) => subscription.unsubscribe());
+        for (const id of tripIds) {
+          if (!this.trips.get(id)?.observed) this.trips.delete(id);
+        }
+      };
+    });
+  }
+
+  /**
+   * Places réservées par date à venir, pour chaque sortie existante
+   */
+  async snapshot(tripIds: string[]): Promise<TripAvailability[]> {
+    const rows: Array<{ tripId: string; passengerCount: number; selectedDate: string; booked: number }> =
+      await this.dataSource.query(
+        `SELECT t."id" AS "tripId", t."passengerCount", b."selectedDate", b."booked"
+           FROM "trips" t
+           LEFT JOIN LATERAL (
+             SELECT bk."selectedDate"::text AS "selectedDate", sum(bk."seats")::int AS "booked"
+               FROM "bookings" bk
+              WHERE bk."tripId" = t."id" AND bk."selectedDate" >= current_date
+              GROUP BY bk."selectedDate") b ON true
+          WHERE t."id" = ANY($1)`,
+        [tripIds],
+      );
+
+    const availability = new Map<string, TripAvailability>();
+    for (const row of rows) {
+      let trip = availability.get(row.tripId);
+      if (!trip) {
+        trip = { tripId: row.tripId, passengerCount: row.passengerCount, bookedSeats: {} };
+        availability.set(row.tripId, trip);
+      }
+      if (row.selectedDate) trip.bookedSeats[row.selectedDate] = row.booked;
+    }
+    return [...availability.values()];
+  }
+
+  private subject(tripId: string): Subject<MessageEvent> {
+    let subject = this.trips.get(tripId);
+    if (!subject) {
+      subject = new Subject<MessageEvent>();
+      this.trips.set(tripId, subject);
+    }
+    return subject;
+  }
+
+  private dispatch(payload: string) {
+    let change: SeatsChange;
+    try {
+      change = JSON.parse(payload);
+    } catch {
+      return;
+    }
+    // Aucun abonné à cette sortie sur cette instance : rien à faire
+    this.trips.get(change.tripId)?.next({ type: 'seats', data: change });
+  }
+
+  /**
+   * Connexion dédiée en LISTEN, rouverte si elle est perdue (redémarrage de PostgreSQL...)
+   */
+  private async listen(): Promise<void> {
+    const runner = this.dataSource.createQueryRunner();
+    try {
+      const client = await runner.connect();
+      const onNotification = (message: { channel: string; payload?: string }) => {
+        if (message.channel === TRIP_AVAILABILITY_CHANNEL && message.payload) {
+          this.dispatch(message.payload);
+        }
+      };
+      const onError = (error: Error) => this.reconnect(runner, error);
+      const onEnd = () => this.reconnect(runner);
+      client.on('notification', onNotification);
+      client.once('error', onError);
+      client.once('end', onEnd);
+      this.detachListener = () => {
+        client.removeListener('notification', onNotification);
+        client.removeListener('error', onError);
+        client.removeListener('end', onEnd);
+      };
+      await runner.query(`LISTEN "${TRIP_AVAILABILITY_CHANNEL}"`);
+      this.listener = runner;
+    } catch (error) {
+      this.reconnect(runner, error);
+      return;
+    }
+    // Changements manqués pendant la coupure : les abonnés reçoivent l'état à jour
+    if (this.trips.size) await this.resync();
+  }
+
+  private reconnect(runner: QueryRunner, error?: Error) {
+    if (this.stopped || this.reconnectTimer) return;
+    this.logger.warn(`Connexion LISTEN perdue${error ? ` : ${error.message}` : ''}`);
+    if (this.listener === runner) this.listener = undefined;
+    this.detachListener?.();
+    this.detachListener = undefined;
+    runner.release().catch(() => undefined);
+    this.reconnectTimer = setTimeout(() => {
+      this.reconnectTimer = undefined;
+      this.listen();
+    }, RECONNECT_DELAY_MS);
+  }
+
+  private async resync() {
+    try {
+      for (const data of await this.snapshot([...this.trips.keys()])) {
+        this.trips.get(data.tripId)?.next({ type: 'availability', data });
+      }
+    } catch (error) {
+      this.logger.error(`Places des sorties : ${error.message}`);
+    }
+  }
+}
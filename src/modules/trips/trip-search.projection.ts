@@ -0,0 +1,75 @@
+import { EntityManager } from 'typeorm';
+
+/**
+ * Projection des sorties vers le modèle de lecture trip_search (entities/trip-search.entity.ts)
+ *
+ * Les lignes d'une sortie sont toujours recalculées en entier, par une seule requête
+ * INSERT ... SELECT sur trips, boats et users. Les services l'appellent avec l'EntityManager
+ * de leur transaction : le modèle de lecture est à jour dès le COMMIT de la modification,
+ * et inchangé si elle échoue.
+ */
+
+// Sorties dont les lignes sont à recalculer
+export type TripSearchScope = { tripId: string } | { boatId: string } | { organizerId: string };
+
+// Date d'une occurrence : les dates de trips.startDates ne sont pas validées (texte libre)
+// pg_input_is_valid : PostgreSQL 16 minimum
+const date = (value: string) =>
+  `CASE WHEN pg_input_is_valid(${value}, 'date') THEN ${value}::date END`;
+
+// Valeur de rang o.n d'une colonne simple-array ("a,b,c")
+const nth = (column: string) => `nullif((string_to_array(t."${column}", ','))[o.n], '')`;
+
+const PROJECTION = `
+  INSERT INTO "trip_search" (
+    "tripId", "occurrence", "startDate", "endDate", "startTime", "endTime",
+    "title", "tripType", "pricingType", "price", "passengerCount",
+    "boatId", "boatName", "boatType", "boatMaxCapacity", "homePort", "latitude", "longitude",
+    "organizerId", "organizerFirstName", "organizerLastName", "organizerCity",
+    "organizerPhotoUrl", "organizerLanguages"
+  )
+  SELECT
+    t."id", o.n, ${date('nullif(o.start_date, \'\')')}, ${date(nth('endDates'))},
+    ${nth('startTimes')}, ${nth('endTimes')},
+    t."title", t."tripType"::text, t."pricingType"::text, t."price", t."passengerCount",
+    b."id", b."name", b."boatType"::text, b."maxCapacity", b."homePort", b."latitude", b."longitude",
+    u."id", u."firstName", u."lastName", u."city", u."photoUrl", u."languages"
+  FROM "trips" t
+  JOIN "boats" b ON b."id" = t."boatId"
+  JOIN "users" u ON u."id" = t."organizerId"
+  -- Une ligne par date ; une seule, sans date, si la sortie n'en a pas
+  CROSS JOIN LATERAL unnest(
+    coalesce(nullif(string_to_array(t."startDates", ','), '{}'), ARRAY[NULL::text])
+  ) WITH ORDINALITY AS o(start_date, n)`;
+
+const SCOPE_COLUMNS: Record<string, string> = {
+  tripId: 't."id"',
+  boatId: 't."boatId"',
+  organizerId: 't."organizerId"',
+};
+
+/**
+ * Recalcule les lignes des sorties d'une sortie, d'un bateau ou d'un organisateur
+ */
+export async function refreshTripSearch(
+  manager: EntityManager,
+  scope: TripSearchScope,
+): Promise<void> {
+  const [key, id] = Object.entries(scope)[0];
+  await manager.query(`DELETE FROM "trip_search" WHERE "${key}" = $1`, [id]);
+  await manager.query(`${PROJECTION} WHERE ${SCOPE_COLUMNS[key]} = $1`, [id]);
+}
+
+/**
+ * Projette les sorties qui n'ont pas encore de lignes (base existante au premier démarrage)
+ */
+export async function backfillTripSearch(manager: EntityManager): Promise<void> {
+  // Table absente : synchronize désactivé sur une base encore vide (migration non jouée)
+  const [{ exists }] = await manager.query(
+    `SELECT to_regclass('"trip_search"') IS NOT NULL AS exists`,
+  );
+  if (!exists) return;
+  await manager.query(
+    `${PROJECTION} WHERE NOT EXISTS (SELECT 1 FROM "trip_search" s WHERE s."tripId" = t."id")`,
+  );
+}
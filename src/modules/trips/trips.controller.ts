@@ -9,26 +9,41 @@ import {
   Query,
   HttpCode,
   HttpStatus,
+  Sse,
+  MessageEvent,
 } from '@nestjs/common';
+import { Observable } from 'rxjs';
 import {
   ApiTags,
   ApiOperation,
   ApiResponse,
   ApiBearerAuth,
   ApiQuery,
+  ApiProduces,
 } from '@nestjs/swagger';
-import { TripsService } from './trips.service';
+import { TripsService, DEFAULT_PRICE_STEP, TRIP_SEARCH_PAGE_SIZE } from './trips.service';
+import { MAX_WATCHED_TRIPS, TripAvailabilityService } from './trip-availability.service';
 import { CreateTripDto } from './dto/create-trip.dto';
 import { UpdateTripDto } from './dto/update-trip.dto';
 import { CurrentUser } from '../../common/decorators/current-user.decorator';
+import { Public } from '../../common/decorators/public.decorator';
+import { RateLimitCost } from '../../common/decorators/rate-limit-cost.decorator';
+import { Serialize } from '../../common/decorators/serialize.decorator';
+import { Idempotent } from '../../common/decorators/idempotent.decorator';
 import { User } from '../users/entities/user.entity';
+import { tripListSerializer } from './serializers/trip.serializer';
+import { MAX_FACET_PAGE_SIZE } from '../../common/search/facets';
 
 @ApiTags('Trips')
 @Controller('v1/trips')
 @ApiBearerAuth()
 export class TripsController {
-  constructor(private readonly tripsService: TripsService) {}
+  constructor(
+    private readonly tripsService: TripsService,
+    private readonly tripAvailabilityService: TripAvailabilityService,
+  ) {}
 
+  @Idempotent()
   @Post()
   @ApiOperation({ summary: 'Create new trip' })
   @ApiResponse({ status: 201, description: 'Trip created successfully' })
@@ -44,6 +59,8 @@ export class TripsController {
   }
 
   @Get()
+  @RateLimitCost(2)
+  @Serialize(tripListSerializer) // Grosses listes : sérialisation compilée
   @ApiOperation({ summary: 'Search fishing trips' })
   @ApiQuery({ name: 'tripType', required: false })
   @ApiQuery({ name: 'minPrice', required: false, type: Number })
@@ -59,6 +76,135 @@ export class TripsController {
     return this.tripsService.findAll({ tripType, minPrice, maxPrice, startDate });
   }
 
+  // Déclarée avant :tripId, sinon "facets" serait pris pour un identifiant
+  @Get('facets')
+  @RateLimitCost(2)
+  @ApiOperation({ summary: 'Trip search facet counts' })
+  @ApiQuery({ name: 'tripType', required: false })
+  @ApiQuery({ name: 'minPrice', required: false, type: Number })
+  @ApiQuery({ name: 'maxPrice', required: false, type: Number })
+  @ApiQuery({ name: 'startDate', required: false })
+  @ApiQuery({
+    name: 'priceStep',
+    required: false,
+    type: Number,
+    description: `Width of the price histogram buckets (default ${DEFAULT_PRICE_STEP})`,
+  })
+  @ApiQuery({
+    name: 'limit',
+    required: false,
+    type: Number,
+    description: `Page of matching trips returned with the counts (0 to ${MAX_FACET_PAGE_SIZE}, default 0)`,
+  })
+  @ApiQuery({ name: 'offset', required: false, type: Number })
+  @ApiResponse({
+    status: 200,
+    description: 'Counts per tripType and pricingType, and price histogram for the filters',
+  })
+  async facets(
+    @Query('tripType') tripType?: string,
+    @Query('minPrice') minPrice?: number,
+    @Query('maxPrice') maxPrice?: number,
+    @Query('startDate') startDate?: string,
+    @Query('priceStep') priceStep?: number,
+    @Query('limit') limit?: number,
+    @Query('offset') offset?: number,
+  ) {
+    return this.tripsService.facets(
+      { tripType, minPrice, maxPrice, startDate },
+      { limit, offset, priceStep },
+    );
+  }
+
+  // Déclarée avant :tripId, comme facets
+  @Get('search')
+  @RateLimitCost(2)
+  @ApiOperation({ summary: 'Search trip occurrences (one result per trip and date)' })
+  @ApiQuery({ name: 'fromDate', required: false, description: 'First start date (YYYY-MM-DD)' })
+  @ApiQuery({ name: 'toDate', required: false, description: 'Last start date (YYYY-MM-DD)' })
+  @ApiQuery({ name: 'minPrice', required: false, type: Number })
+  @ApiQuery({ name: 'maxPrice', required: false, type: Number })
+  @ApiQuery({ name: 'tripType', required: false })
+  @ApiQuery({ name: 'boatType', required: false })
+  @ApiQuery({ name: 'seats', required: false, type: Number })
+  @ApiQuery({
+    name: 'languages',
+    required: false,
+    description: 'Comma separated languages the organizer must all speak',
+  })
+  @ApiQuery({ name: 'minLat', required: false, type: Number })
+  @ApiQuery({ name: 'maxLat', required: false, type: Number })
+  @ApiQuery({ name: 'minLng', required: false, type: Number })
+  @ApiQuery({ name: 'maxLng', required: false, type: Number })
+  @ApiQuery({
+    name: 'limit',
+    required: false,
+    type: Number,
+    description: `Page size (1 to ${MAX_FACET_PAGE_SIZE}, default ${TRIP_SEARCH_PAGE_SIZE})`,
+  })
+  @ApiQuery({ name: 'offset', required: false, type: Number })
+  @ApiResponse({
+    status: 200,
+    description: 'Matching occurrences, by start date then price',
+  })
+  async search(
+    @Query('fromDate') fromDate?: string,
+    @Query('toDate') toDate?: string,
+    @Query('minPrice') minPrice?: number,
+    @Query('maxPrice') maxPrice?: number,
+    @Query('tripType') tripType?: string,
+    @Query('boatType') boatType?: string,
+    @Query('seats') seats?: number,
+    @Query('languages') languages?: string,
+    @Query('minLat') minLat?: number,
+    @Query('maxLat') maxLat?: number,
+    @Query('minLng') minLng?: number,
+    @Query('maxLng') maxLng?: number,
+    @Query('limit') limit?: number,
+    @Query('offset') offset?: number,
+  ) {
+    return this.tripsService.search(
+      {
+        fromDate,
+        toDate,
+        minPrice,
+        maxPrice,
+        tripType,
+        boatType,
+        seats,
+        languages,
+        minLat,
+        maxLat,
+        minLng,
+        maxLng,
+      },
+      { limit, offset },
+    );
+  }
+
+  // Déclarée avant :tripId, comme facets. Publique : EventSource (navigateur) n'envoie pas
+  // d'en-tête Authorization, et le flux ne contient que des nombres de places
+  @Public()
+  @Sse('availability')
+  @ApiOperation({ summary: 'Stream remaining seats of trips (Server-Sent Events)' })
+  @ApiQuery({
+    name: 'tripIds',
+    required: true,
+    description: `Comma separated trip IDs to watch (at most ${MAX_WATCHED_TRIPS})`,
+  })
+  @ApiProduces('text/event-stream')
+  @ApiResponse({
+    status: 200,
+    description:
+      'Event "availability" per trip (booked seats per upcoming date), then "seats" on each ' +
+      'booking change (delta, bookedSeats, remainingSeats); invalid tripIds end the stream ' +
+      'with an "error" event',
+    schema: { type: 'string' },
+  })
+  availability(@Query('tripIds') tripIds: string): Observable<MessageEvent> {
+    return this.tripAvailabilityService.watch(tripIds);
+  }
+
   @Get(':tripId')
   @ApiOperation({ summary: 'Get trip details' })
   @ApiResponse({ status: 200, description: 'Trip details retrieved successfully' })
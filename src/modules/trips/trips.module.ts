@@ -2,13 +2,15 @@ import { Module } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { TripsService } from './trips.service';
 import { TripsController } from './trips.controller';
+import { TripAvailabilityService } from './trip-availability.service';
 import { Trip } from './entities/trip.entity';
+import { TripSearch } from './entities/trip-search.entity';
 import { Boat } from '../boats/entities/boat.entity';
 
 @Module({
-  imports: [TypeOrmModule.forFeature([Trip, Boat])],
+  imports: [TypeOrmModule.forFeature([Trip, TripSearch, Boat])],
   controllers: [TripsController],
-  providers: [TripsService],
+  providers: [TripsService, TripAvailabilityService],
   exports: [TripsService],
 })
 export class TripsModule {}
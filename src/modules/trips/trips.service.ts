@@ -2,23 +2,65 @@ import {
   Injectable,
   NotFoundException,
   ForbiddenException,
+  BadRequestException,
+  OnApplicationBootstrap,
 } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { Repository, SelectQueryBuilder } from 'typeorm';
 import { Trip } from './entities/trip.entity';
+import { TripSearch } from './entities/trip-search.entity';
 import { Boat } from '../boats/entities/boat.entity';
 import { CreateTripDto } from './dto/create-trip.dto';
 import { UpdateTripDto } from './dto/update-trip.dto';
+import { FacetCounts, countFacets, parsePage } from '../../common/search/facets';
+import { parseList } from '../../common/search/query-params';
+import { backfillTripSearch, refreshTripSearch } from './trip-search.projection';
+
+// Largeur par défaut des tranches de l'histogramme des prix (GET /trips/facets)
+export const DEFAULT_PRICE_STEP = 50;
+
+// Taille de page par défaut de GET /trips/search
+export const TRIP_SEARCH_PAGE_SIZE = 20;
+
+export interface TripSearchFilters {
+  tripType?: string;
+  minPrice?: number;
+  maxPrice?: number;
+  startDate?: string;
+}
+
+// Filtres de GET /trips/search, servie par le modèle de lecture trip_search
+export interface TripOccurrenceFilters {
+  fromDate?: string;
+  toDate?: string;
+  minPrice?: number;
+  maxPrice?: number;
+  tripType?: string;
+  boatType?: string;
+  seats?: number;
+  languages?: string; // liste séparée par des virgules : l'organisateur parle toutes ces langues
+  minLat?: number;
+  maxLat?: number;
+  minLng?: number;
+  maxLng?: number;
+}
 
 @Injectable()
-export class TripsService {
+export class TripsService implements OnApplicationBootstrap {
   constructor(
     @InjectRepository(Trip)
     private tripRepository: Repository<Trip>,
     @InjectRepository(Boat)
     private boatRepository: Repository<Boat>,
+    @InjectRepository(TripSearch)
+    private tripSearchRepository: Repository<TripSearch>,
   ) {}
 
+  // Base existante : projeter les sorties créées avant le modèle de lecture
+  async onApplicationBootstrap(): Promise<void> {
+    await backfillTripSearch(this.tripRepository.manager);
+  }
+
   /**
    * Créer une sortie pêche
    * Implémente BF26 : interdire la création si l'utilisateur n'a pas de bateau
@@ -55,19 +97,124 @@ export class TripsService {
       organizerId: userId,
     });
 
-    return this.tripRepository.save(trip);
+    return this.tripRepository.manager.transaction(async (manager) => {
+      const saved = await manager.save(trip);
+      await refreshTripSearch(manager, { tripId: saved.id });
+      return saved;
+    });
   }
 
   /**
    * Rechercher des sorties avec filtres
    * Implémente BF22
    */
-  async findAll(filters?: {
-    tripType?: string;
-    minPrice?: number;
-    maxPrice?: number;
-    startDate?: string;
-  }): Promise<Trip[]> {
+  async findAll(filters?: TripSearchFilters): Promise<Trip[]> {
+    return this.withOrganizer(this.searchQuery(filters)).getMany();
+  }
+
+  /**
+   * Comptes par facette pour les filtres courants, en une requête agrégée
+   * (voir common/search/facets.ts) : types de sortie, de tarif, et histogramme
+   * des prix par tranches de priceStep. Page de résultats si limit > 0.
+   */
+  async facets(
+    filters: TripSearchFilters,
+    page: { limit?: number; offset?: number; priceStep?: number } = {},
+  ): Promise<FacetCounts & { results?: Trip[] }> {
+    const { limit, offset } = parsePage(page);
+    const priceStep = page.priceStep === undefined ? DEFAULT_PRICE_STEP : Number(page.priceStep);
+    if (!Number.isFinite(priceStep) || priceStep <= 0) {
+      throw new BadRequestException('priceStep must be a positive number');
+    }
+    const query = this.searchQuery(filters);
+
+    const [counts, results] = await Promise.all([
+      countFacets(query, {
+        tripType: '"trip"."tripType"',
+        pricingType: '"trip"."pricingType"',
+        // Borne basse de la tranche (nombre validé, écrit tel quel : la même expression
+        // doit apparaître à l'identique dans SELECT et GROUP BY)
+        price: `floor("trip"."price" / ${priceStep}) * ${priceStep}`,
+      }),
+      limit
+        ? this.withOrganizer(query.clone())
+            .orderBy('trip.createdAt', 'DESC')
+            .addOrderBy('trip.id')
+            .skip(offset)
+            .take(limit)
+            .getMany()
+        : undefined,
+    ]);
+    // Histogramme : tranches dans l'ordre des prix, et non par effectif
+    counts.facets.price.sort((a, b) => Number(a.value) - Number(b.value));
+    return results ? { ...counts, results } : counts;
+  }
+
+  /**
+   * Recherche par occurrence ("sorties près de moi le week-end prochain à moins de 80 €")
+   *
+   * Servie par le modèle de lecture trip_search, sans jointure : une ligne par sortie
+   * et par date, avec le bateau et l'organisateur. L'index (startDate, price) couvre
+   * les filtres de dates et de prix, l'index GIN les langues de l'organisateur.
+   */
+  async search(
+    filters: TripOccurrenceFilters,
+    page: { limit?: number; offset?: number } = {},
+  ): Promise<TripSearch[]> {
+    const { limit, offset } = parsePage(page);
+    const query = this.tripSearchRepository.createQueryBuilder('search');
+
+    if (filters.fromDate) {
+      query.andWhere('search.startDate >= :fromDate', { fromDate: filters.fromDate });
+    }
+    if (filters.toDate) {
+      query.andWhere('search.startDate <= :toDate', { toDate: filters.toDate });
+    }
+    if (filters.minPrice) {
+      query.andWhere('search.price >= :minPrice', { minPrice: filters.minPrice });
+    }
+    if (filters.maxPrice) {
+      query.andWhere('search.price <= :maxPrice', { maxPrice: filters.maxPrice });
+    }
+    if (filters.tripType) {
+      query.andWhere('search.tripType = :tripType', { tripType: filters.tripType });
+    }
+    if (filters.boatType) {
+      query.andWhere('search.boatType = :boatType', { boatType: filters.boatType });
+    }
+    if (filters.seats) {
+      query.andWhere('search.passengerCount >= :seats', { seats: filters.seats });
+    }
+
+    const languages = parseList(filters.languages);
+    if (languages.length) {
+      query.andWhere('search.organizerLanguages @> :languages', { languages });
+    }
+
+    // Bounding box autour de l'utilisateur, comme GET /boats (BF24)
+    if (filters.minLat && filters.maxLat && filters.minLng && filters.maxLng) {
+      query
+        .andWhere('search.latitude BETWEEN :minLat AND :maxLat', {
+          minLat: filters.minLat,
+          maxLat: filters.maxLat,
+        })
+        .andWhere('search.longitude BETWEEN :minLng AND :maxLng', {
+          minLng: filters.minLng,
+          maxLng: filters.maxLng,
+        });
+    }
+
+    return query
+      .orderBy('search.startDate', 'ASC', 'NULLS LAST')
+      .addOrderBy('search.price', 'ASC')
+      .addOrderBy('search.tripId')
+      .addOrderBy('search.occurrence')
+      .offset(offset)
+      .limit(limit || TRIP_SEARCH_PAGE_SIZE)
+      .getMany();
+  }
+
+  private searchQuery(filters?: TripSearchFilters): SelectQueryBuilder<Trip> {
     const query = this.tripRepository.createQueryBuilder('trip');
 
     if (filters?.tripType) {
@@ -84,12 +231,15 @@ export class TripsService {
       query.andWhere('trip.price <= :maxPrice', { maxPrice: filters.maxPrice });
     }
 
-    // Inclure les infos de l'organisateur (sans données sensibles)
+    return query;
+  }
+
+  // Inclure les infos de l'organisateur (sans données sensibles)
+  private withOrganizer(query: SelectQueryBuilder<Trip>): SelectQueryBuilder<Trip> {
     return query
       .leftJoinAndSelect('trip.boat', 'boat')
       .leftJoin('trip.organizer', 'organizer')
-      .addSelect(['organizer.id', 'organizer.firstName', 'organizer.lastName', 'organizer.languages', 'organizer.city', 'organizer.photoUrl'])
-      .getMany();
+      .addSelect(['organizer.id', 'organizer.firstName', 'organizer.lastName', 'organizer.languages', 'organizer.city', 'organizer.photoUrl']);
   }
 
   async findOne(id: string): Promise<Trip> {
@@ -122,7 +272,11 @@ export class TripsService {
     }
 
     Object.assign(trip, updateTripDto);
-    return this.tripRepository.save(trip);
+    return this.tripRepository.manager.transaction(async (manager) => {
+      const saved = await manager.save(trip);
+      await refreshTripSearch(manager, { tripId: saved.id });
+      return saved;
+    });
   }
 
   async remove(id: string, userId: string): Promise<void> {
@@ -132,6 +286,7 @@ export class TripsService {
       throw new ForbiddenException('You can only delete your own trips');
     }
 
+    // Les lignes de trip_search sont supprimées par la clé étrangère (ON DELETE CASCADE)
     await this.tripRepository.remove(trip);
   }
 
@@ -0,0 +1,236 @@
+import {
+  Injectable,
+  Logger,
+  NotFoundException,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+} from '@nestjs/common';
+import { InjectRepository } from '@nestjs/typeorm';
+import { DataSource, EntityManager, In, Repository } from 'typeorm';
+import { AnonymizationJob } from './entities/anonymization-job.entity';
+
+// Étapes de l'effacement, dans l'ordre : données personnelles laissées par le compte
+export const ANONYMIZATION_STEPS = [
+  {
+    // Commentaires, lieux et photos des prises
+    name: 'logbook',
+    table: 'logbook_entries',
+    column: 'userId',
+    set: '"comment" = NULL, "location" = NULL, "photoUrl" = NULL',
+    remaining: '("comment" IS NOT NULL OR "location" IS NOT NULL OR "photoUrl" IS NOT NULL)',
+  },
+  {
+    // Informations pratiques des sorties organisées (texte libre : téléphone, adresse...)
+    name: 'trips',
+    table: 'trips',
+    column: 'organizerId',
+    set: '"practicalInfo" = NULL',
+    remaining: '"practicalInfo" IS NOT NULL',
+  },
+];
+
+// Recherche de travaux en attente (ceux créés par cette instance démarrent tout de suite)
+const POLL_INTERVAL_MS = 5 * 1000;
+// Bail d'un travail en cours : sans nouvelle du worker passé ce délai, il est repris
+const LEASE_SECONDS = 60;
+// Attente avant de relancer un travail en erreur, et nombre de tentatives
+const RETRY_DELAY_SECONDS = 60;
+const MAX_ATTEMPTS = 5;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Effacement RGPD en cascade, en arrière-plan (BF8)
+ *
+ * DELETE /users/:id anonymise le profil et crée un travail dans anonymization_jobs, dans la
+ * même transaction, puis répond sans attendre. Le travail efface ensuite les données
+ * personnelles des autres tables (ANONYMIZATION_STEPS), par lots de
+ * ANONYMIZATION_BATCH_SIZE lignes espacés de ANONYMIZATION_BATCH_DELAY_MS : chaque lot est
+ * une transaction courte, les verrous ne bloquent pas longtemps les autres requêtes.
+ *
+ * Reprise après un crash : un lot ne sélectionne que les lignes qui contiennent encore des
+ * données (colonne remaining), et la progression est enregistrée dans la transaction du
+ * lot. Le travail abandonné (bail expiré) est repris par n'importe quelle instance ; FOR
+ * UPDATE SKIP LOCKED garantit qu'un travail n'est réclamé que par une seule à la fois.
+ */
+@Injectable()
+export class AnonymizationService implements OnApplicationBootstrap, OnModuleDestroy {
+  private readonly logger = new Logger(AnonymizationService.name);
+  private readonly batchSize = parseInt(process.env.ANONYMIZATION_BATCH_SIZE || '500', 10);
+  private readonly batchDelayMs = parseInt(process.env.ANONYMIZATION_BATCH_DELAY_MS || '200', 10);
+  private timer: NodeJS.Timeout;
+  private draining: Promise<void>;
+  private stopping = false;
+
+  constructor(
+    private dataSource: DataSource,
+    @InjectRepository(AnonymizationJob)
+    private jobRepository: Repository<AnonymizationJob>,
+  ) {}
+
+  onApplicationBootstrap() {
+    this.wake();
+    this.timer = setInterval(() => this.wake(), POLL_INTERVAL_MS).unref();
+  }
+
+  async onModuleDestroy() {
+    clearInterval(this.timer);
+    this.stopping = true;
+    await this.draining;
+  }
+
+  /**
+   * Crée le travail d'effacement d'un utilisateur, dans la transaction de l'appelant
+   * (aucun doublon si un travail est déjà en attente ou en cours)
+   */
+  async enqueue(manager: EntityManager, userId: string): Promise<void> {
+    const active = await manager.exists(AnonymizationJob, {
+      where: { userId, status: In(['pending', 'running']) },
+    });
+    if (!active) await manager.insert(AnonymizationJob, { userId });
+  }
+
+  /**
+   * Dernier travail d'effacement d'un utilisateur (progression)
+   */
+  async findLatest(userId: string): Promise<AnonymizationJob> {
+    const job = await this.jobRepository.findOne({
+      where: { userId },
+      order: { createdAt: 'DESC' },
+    });
+    if (!job) {
+      throw new NotFoundException(`No anonymization job for user ${userId}`);
+    }
+    return job;
+  }
+
+  /**
+   * Traite les travaux en attente ; sans effet si un traitement est déjà en cours
+   * (il réclame les travaux un par un jusqu'à épuisement)
+   */
+  wake() {
+    if (this.draining || this.stopping) return;
+    this.draining = this.drain()
+      .catch((error) => this.logger.error(`File d'anonymisation : ${error.message}`))
+      .finally(() => (this.draining = undefined));
+  }
+
+  private async drain(): Promise<void> {
+    while (!this.stopping) {
+      const job = await this.claim();
+      if (!job) return;
+      await this.run(job);
+    }
+  }
+
+  private async claim(): Promise<AnonymizationJob | undefined> {
+    // CTE : le driver renvoie alors les lignes de RETURNING (et non [lignes, nombre])
+    const [job] = await this.dataSource.query(
+      `WITH claimed AS (
+         UPDATE "anonymization_jobs"
+            SET "status" = 'running', "attempts" = "attempts" + 1,
+                "lockedUntil" = now() + interval '${LEASE_SECONDS} seconds', "updatedAt" = now()
+          WHERE "id" = (
+            SELECT "id" FROM "anonymization_jobs"
+             WHERE "status" IN ('pending', 'running')
+               AND ("lockedUntil" IS NULL OR "lockedUntil" < now())
+             ORDER BY "createdAt"
+             LIMIT 1
+             FOR UPDATE SKIP LOCKED)
+          RETURNING *)
+       SELECT * FROM claimed`,
+    );
+    return job;
+  }
+
+  private async run(job: AnonymizationJob): Promise<void> {
+    if (job.attempts > MAX_ATTEMPTS) {
+      await this.finish(job, 'failed', job.error ?? 'Interrupted too many times');
+      return;
+    }
+    try {
+      if (job.total === null) {
+        job.total = await this.remaining(job.userId);
+        await this.jobRepository.update(job.id, { total: job.total });
+      }
+
+      const start = Math.max(0, ANONYMIZATION_STEPS.findIndex((step) => step.name === job.step));
+      for (const step of ANONYMIZATION_STEPS.slice(start)) {
+        await this.jobRepository.update(job.id, { step: step.name });
+        for (;;) {
+          if (this.stopping) {
+            // Arrêt de l'API : le travail sera repris par la prochaine instance
+            await this.jobRepository.update(job.id, { status: 'pending', lockedUntil: null });
+            return;
+          }
+          const count = await this.batch(job, step);
+          if (count < this.batchSize) break;
+          await sleep(this.batchDelayMs);
+        }
+      }
+
+      await this.finish(job, 'completed', null);
+      this.logger.log(`Données de l'utilisateur ${job.userId} anonymisées (${job.processed} lignes)`);
+    } catch (error) {
+      this.logger.error(`Anonymisation ${job.id} (tentative ${job.attempts}) : ${error.message}`);
+      if (job.attempts >= MAX_ATTEMPTS) {
+        await this.finish(job, 'failed', error.message);
+      } else {
+        await this.dataSource.query(
+          `UPDATE "anonymization_jobs"
+              SET "status" = 'pending', "error" = $2, "updatedAt" = now(),
+                  "lockedUntil" = now() + interval '${RETRY_DELAY_SECONDS} seconds'
+            WHERE "id" = $1`,
+          [job.id, error.message],
+        );
+      }
+    }
+  }
+
+  /**
+   * Un lot : efface au plus batchSize lignes et enregistre la progression (même transaction)
+   */
+  private async batch(job: AnonymizationJob, step: (typeof ANONYMIZATION_STEPS)[number]) {
+    return this.dataSource.transaction(async (manager) => {
+      const [, count]: [unknown, number] = await manager.query(
+        `UPDATE "${step.table}" SET ${step.set}, "updatedAt" = now()
+          WHERE "id" IN (
+            SELECT "id" FROM "${step.table}"
+             WHERE "${step.column}" = $1 AND ${step.remaining}
+             LIMIT ${this.batchSize})`,
+        [job.userId],
+      );
+      job.processed += count;
+      await manager.query(
+        `UPDATE "anonymization_jobs"
+            SET "processed" = $2, "updatedAt" = now(),
+                "lockedUntil" = now() + interval '${LEASE_SECONDS} seconds'
+          WHERE "id" = $1`,
+        [job.id, job.processed],
+      );
+      return count;
+    });
+  }
+
+  private async remaining(userId: string): Promise<number> {
+    let total = 0;
+    for (const step of ANONYMIZATION_STEPS) {
+      const [{ count }] = await this.dataSource.query(
+        `SELECT count(*)::int AS count FROM "${step.table}"
+          WHERE "${step.column}" = $1 AND ${step.remaining}`,
+        [userId],
+      );
+      total += count;
+    }
+    return total;
+  }
+
+  private async finish(job: AnonymizationJob, status: string, error: string | null) {
+    await this.jobRepository.update(job.id, {
+      status,
+      error,
+      lockedUntil: null,
+      completedAt: () => 'now()',
+    });
+  }
+}
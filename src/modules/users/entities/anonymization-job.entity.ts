@@ -0,0 +1,75 @@
+import {
+  Entity,
+  Column,
+  PrimaryGeneratedColumn,
+  CreateDateColumn,
+  UpdateDateColumn,
+  Index,
+  ManyToOne,
+  JoinColumn,
+} from 'typeorm';
+import { User } from './user.entity';
+
+/**
+ * Entité AnonymizationJob - Représente la table "anonymization_jobs"
+ *
+ * File d'attente persistante de l'effacement RGPD en cascade (voir anonymization.service.ts) :
+ * une ligne par suppression de compte, créée dans la même transaction que l'anonymisation
+ * du profil. La ligne survit à un arrêt ou un crash de l'API : le travail reprend à l'étape
+ * (step) où il s'était arrêté.
+ *
+ * lockedUntil : bail du worker qui traite le travail (prolongé à chaque lot). Un travail
+ * "running" dont le bail a expiré a été abandonné (crash) et peut être repris ; pour un
+ * travail "pending", date avant laquelle il ne doit pas être relancé (après une erreur).
+ */
+@Entity('anonymization_jobs')
+@Index('IDX_anonymization_jobs_queue', ['status', 'createdAt'])
+export class AnonymizationJob {
+  @PrimaryGeneratedColumn('uuid')
+  id: string;
+
+  @Column({
+    type: 'enum',
+    enum: ['pending', 'running', 'completed', 'failed'],
+    default: 'pending',
+  })
+  status: string;
+
+  // Étape en cours (ANONYMIZATION_STEPS) ; null avant la première
+  @Column({ type: 'varchar', nullable: true })
+  step: string;
+
+  // Lignes anonymisées / à anonymiser (estimé au premier lancement)
+  @Column({ default: 0 })
+  processed: number;
+
+  @Column({ type: 'int', nullable: true })
+  total: number;
+
+  @Column({ default: 0 })
+  attempts: number;
+
+  @Column({ type: 'timestamptz', nullable: true })
+  lockedUntil: Date;
+
+  @Column({ type: 'text', nullable: true })
+  error: string;
+
+  @CreateDateColumn()
+  createdAt: Date;
+
+  @UpdateDateColumn()
+  updatedAt: Date;
+
+  @Column({ type: 'timestamptz', nullable: true })
+  completedAt: Date;
+
+  // Relations
+  @ManyToOne(() => User, { onDelete: 'CASCADE' })
+  @JoinColumn({ name: 'userId' })
+  user: User;
+
+  @Index('IDX_anonymization_jobs_user')
+  @Column()
+  userId: string;
+}
@@ -5,6 +5,7 @@ import {
   CreateDateColumn,
   UpdateDateColumn,
   OneToMany,
+  Index,
 } from 'typeorm';
 import { Boat } from '../../boats/entities/boat.entity';
 import { Trip } from '../../trips/entities/trip.entity';
@@ -85,7 +86,10 @@ export class User {
   @Column({ nullable: true, length: 10 })
   postalCode: string;
 
-  @Column('simple-array', { nullable: true })
+  // Tableau PostgreSQL (text[]) : filtre de contenance GET /users?languages=Anglais
+  // servi par l'index GIN IDX_users_languages (créé par database/indexes.ts)
+  @Index('IDX_users_languages', { synchronize: false })
+  @Column({ type: 'text', array: true, nullable: true })
   languages: string[];
 
   @CreateDateColumn()
@@ -0,0 +1,239 @@
+import { Injectable, Logger, NotFoundException, OnModuleDestroy } from '@nestjs/common';
+import { DataSource } from 'typeorm';
+import { randomUUID } from 'crypto';
+import * as fs from 'fs';
+import * as path from 'path';
+import * as zlib from 'zlib';
+import { PassThrough, Readable, Writable } from 'stream';
+import { finished } from 'stream/promises';
+
+export type UserExportFormat = 'ndjson' | 'gzip';
+
+export const USER_EXPORT_CONTENT_TYPES: Record<UserExportFormat, string> = {
+  ndjson: 'application/x-ndjson',
+  gzip: 'application/gzip',
+};
+
+// Lignes lues par FETCH : seule cette quantité est en mémoire à un instant donné
+export const EXPORT_FETCH_ROWS = 500;
+// Exports asynchrones exécutés en même temps (les suivants attendent leur tour)
+const MAX_RUNNING_EXPORTS = 2;
+const SWEEP_INTERVAL_MS = 60 * 1000;
+
+// Sections de l'export, dans l'ordre : type de ligne, table, colonne désignant l'utilisateur
+const EXPORT_SECTIONS = [
+  { type: 'user', table: 'users', column: 'id' },
+  { type: 'boat', table: 'boats', column: 'ownerId' },
+  { type: 'trip', table: 'trips', column: 'organizerId' },
+  { type: 'booking', table: 'bookings', column: 'userId' },
+  { type: 'logbookEntry', table: 'logbook_entries', column: 'userId' },
+];
+
+export type UserExportStatus = 'pending' | 'running' | 'completed' | 'failed';
+
+export interface UserExportJob {
+  id: string;
+  userId: string;
+  status: UserExportStatus;
+  createdAt: string;
+  completedAt?: string;
+  // Date après laquelle le fichier est supprimé (export terminé)
+  expiresAt?: string;
+  // Taille du fichier .ndjson.gz (octets)
+  size?: number;
+  error?: string;
+}
+
+/**
+ * Export RGPD des données d'un utilisateur (droit d'accès et à la portabilité)
+ *
+ * Une ligne JSON par enregistrement : {"type":"user","data":{...}}, puis les bateaux,
+ * sorties organisées, réservations et prises du carnet de pêche. Chaque section est lue
+ * par un curseur serveur (DECLARE / FETCH) : PostgreSQL garde le résultat, l'API n'en
+ * reçoit que EXPORT_FETCH_ROWS lignes à la fois et attend que le client (ou le fichier)
+ * les ait absorbées avant de demander les suivantes. La mémoire reste constante, quel
+ * que soit l'historique du compte. Toutes les sections sont lues dans une même
+ * transaction REPEATABLE READ : l'export est une photographie cohérente.
+ *
+ * Pour les très gros comptes, l'export peut aussi être un travail en arrière-plan :
+ * le fichier .ndjson.gz est écrit dans EXPORT_DIR (./exports par défaut), téléchargeable
+ * pendant EXPORT_TTL secondes puis supprimé. Les travaux sont gardés en mémoire, comme
+ * les clés Idempotency-Key.
+ */
+@Injectable()
+export class UserExportService implements OnModuleDestroy {
+  private readonly logger = new Logger(UserExportService.name);
+  private readonly exportDir = process.env.EXPORT_DIR || 'exports';
+  private readonly ttlMs = parseInt(process.env.EXPORT_TTL || '86400', 10) * 1000;
+  private readonly jobs = new Map<string, UserExportJob>();
+  private readonly queue: UserExportJob[] = [];
+  private running = 0;
+  private readonly sweeper = setInterval(() => this.sweep(), SWEEP_INTERVAL_MS).unref();
+
+  constructor(private dataSource: DataSource) {}
+
+  onModuleDestroy() {
+    clearInterval(this.sweeper);
+  }
+
+  /**
+   * Export diffusé directement dans la réponse
+   * (une erreur en cours de route interrompt le flux : le fichier reçu est tronqué)
+   */
+  stream(userId: string, format: UserExportFormat): Readable {
+    const output = format === 'gzip' ? zlib.createGzip() : new PassThrough();
+    this.write(userId, output).then(
+      () => output.end(),
+      (error) => {
+        // Flux détruit par l'appelant (client parti) : rien d'anormal côté serveur
+        if (output.destroyed) return;
+        this.logger.error(`Export de l'utilisateur ${userId} interrompu : ${error.message}`);
+        output.destroy(error);
+      },
+    );
+    return output;
+  }
+
+  /**
+   * Écrit l'export NDJSON dans output, sans le fermer
+   */
+  async write(userId: string, output: Writable): Promise<void> {
+    const runner = this.dataSource.createQueryRunner();
+    await runner.connect();
+    try {
+      await runner.query('BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY');
+      for (const section of EXPORT_SECTIONS) {
+        // Le hash du mot de passe n'est pas une donnée de l'utilisateur : jamais exporté
+        await runner.query(
+          `DECLARE user_export NO SCROLL CURSOR FOR
+             SELECT (to_jsonb(t) - 'password')::text AS data FROM "${section.table}" t
+              WHERE t."${section.column}" = $1 ORDER BY t."createdAt", t."id"`,
+          [userId],
+        );
+        for (;;) {
+          const rows: Array<{ data: string }> = await runner.query(
+            `FETCH ${EXPORT_FETCH_ROWS} FROM user_export`,
+          );
+          for (const row of rows) {
+            await writeLine(output, `{"type":"${section.type}","data":${row.data}}\n`);
+          }
+          if (rows.length < EXPORT_FETCH_ROWS) break;
+        }
+        await runner.query('CLOSE user_export');
+      }
+      await runner.query('COMMIT');
+    } catch (error) {
+      await runner.query('ROLLBACK').catch(() => undefined);
+      throw error;
+    } finally {
+      await runner.release();
+    }
+  }
+
+  /**
+   * Lance un export en arrière-plan (celui déjà en attente ou en cours est réutilisé)
+   */
+  start(userId: string): UserExportJob {
+    for (const job of this.jobs.values()) {
+      if (job.userId === userId && (job.status === 'pending' || job.status === 'running')) return job;
+    }
+    const job: UserExportJob = {
+      id: randomUUID(),
+      userId,
+      status: 'pending',
+      createdAt: new Date().toISOString(),
+    };
+    this.jobs.set(job.id, job);
+    this.queue.push(job);
+    this.next();
+    return job;
+  }
+
+  findJob(userId: string, exportId: string): UserExportJob {
+    const job = this.jobs.get(exportId);
+    if (!job || job.userId !== userId) {
+      throw new NotFoundException(`Export with ID ${exportId} not found`);
+    }
+    return job;
+  }
+
+  /**
+   * Fichier d'un export terminé
+   */
+  download(userId: string, exportId: string): Readable {
+    const job = this.findJob(userId, exportId);
+    if (job.status !== 'completed') {
+      throw new NotFoundException(`Export ${exportId} is not ready (status: ${job.status})`);
+    }
+    return fs.createReadStream(this.file(job));
+  }
+
+  private file(job: UserExportJob): string {
+    return path.join(this.exportDir, `${job.id}.ndjson.gz`);
+  }
+
+  private next() {
+    while (this.running < MAX_RUNNING_EXPORTS && this.queue.length) {
+      const job = this.queue.shift();
+      this.running++;
+      this.run(job).finally(() => {
+        this.running--;
+        this.next();
+      });
+    }
+  }
+
+  private async run(job: UserExportJob): Promise<void> {
+    job.status = 'running';
+    const file = this.file(job);
+    try {
+      await fs.promises.mkdir(this.exportDir, { recursive: true });
+      const gzip = zlib.createGzip();
+      const output = fs.createWriteStream(`${file}.tmp`);
+      gzip.pipe(output);
+      await this.write(job.userId, gzip);
+      gzip.end();
+      await finished(output);
+      await fs.promises.rename(`${file}.tmp`, file);
+
+      job.size = (await fs.promises.stat(file)).size;
+      job.status = 'completed';
+    } catch (error) {
+      this.logger.error(`Export ${job.id} : ${error.message}`);
+      await fs.promises.rm(`${file}.tmp`, { force: true });
+      job.status = 'failed';
+      job.error = 'Export failed';
+    }
+    job.completedAt = new Date().toISOString();
+    job.expiresAt = new Date(Date.now() + this.ttlMs).toISOString();
+  }
+
+  /**
+   * Supprime les exports expirés et leurs fichiers
+   */
+  private sweep(now = Date.now()) {
+    for (const job of this.jobs.values()) {
+      if (!job.expiresAt || Date.parse(job.expiresAt) > now) continue;
+      this.jobs.delete(job.id);
+      fs.promises.rm(this.file(job), { force: true }).catch(() => undefined);
+    }
+  }
+}
+
+/**
+ * Écriture avec contre-pression : attend que output ait vidé son tampon
+ * (ou qu'il soit fermé, le client ayant abandonné le téléchargement)
+ */
+async function writeLine(output: Writable, line: string): Promise<void> {
+  if (output.destroyed) throw new Error('Export output closed');
+  if (output.write(line)) return;
+  await new Promise<void>((resolve) => {
+    const done = () => {
+      output.off('drain', done);
+      output.off('close', done);
+      resolve();
+    };
+    output.on('drain', done);
+    output.on('close', done);
+  });
+}
@@ -9,6 +9,10 @@ import {
   Query,
   HttpCode,
   HttpStatus,
+  BadRequestException,
+  ForbiddenException,
+  StreamableFile,
+  Res,
 } from '@nestjs/common';
 import {
   ApiTags,
@@ -16,12 +20,21 @@ import {
   ApiResponse,
   ApiBearerAuth,
   ApiQuery,
+  ApiProduces,
 } from '@nestjs/swagger';
 import { UsersService } from './users.service';
+import { AnonymizationService } from './anonymization.service';
+import {
+  USER_EXPORT_CONTENT_TYPES,
+  UserExportFormat,
+  UserExportService,
+} from './user-export.service';
 import { CreateUserDto } from './dto/create-user.dto';
 import { UpdateUserDto } from './dto/update-user.dto';
 import { Public } from '../../common/decorators/public.decorator';
 import { CurrentUser } from '../../common/decorators/current-user.decorator';
+import { Idempotent } from '../../common/decorators/idempotent.decorator';
+import { RateLimitCost } from '../../common/decorators/rate-limit-cost.decorator';
 import { User } from './entities/user.entity';
 
 /**
@@ -33,14 +46,22 @@ import { User } from './entities/user.entity';
  * - GET /api/v1/users/:id - Récupérer un utilisateur
  * - PUT /api/v1/users/:id - Mettre à jour un utilisateur
  * - DELETE /api/v1/users/:id - Supprimer un utilisateur (RGPD)
+ * - GET /api/v1/users/:id/anonymization - Progression de l'effacement en arrière-plan
+ * - GET /api/v1/users/:id/export - Exporter ses données (RGPD), diffusé en NDJSON
+ * - POST /api/v1/users/:id/exports - Lancer un export en arrière-plan
  */
 @ApiTags('Users')
 @Controller('v1/users')
 @ApiBearerAuth() // Indique que toutes les routes nécessitent le token JWT (sauf @Public())
 export class UsersController {
-  constructor(private readonly usersService: UsersService) {}
+  constructor(
+    private readonly usersService: UsersService,
+    private readonly userExportService: UserExportService,
+    private readonly anonymizationService: AnonymizationService,
+  ) {}
 
   @Public() // Route publique pour l'inscription
+  @Idempotent()
   @Post()
   @ApiOperation({ summary: 'Create new user' })
   @ApiResponse({ status: 201, description: 'User created successfully' })
@@ -49,6 +70,7 @@ export class UsersController {
     return this.usersService.create(createUserDto);
   }
 
+  @RateLimitCost(3) // Recherche ILIKE sans index
   @Get()
   @ApiOperation({ summary: 'Search users' })
   @ApiQuery({ name: 'lastName', required: false })
@@ -58,13 +80,19 @@ export class UsersController {
     required: false,
     enum: ['individual', 'professional'],
   })
+  @ApiQuery({
+    name: 'languages',
+    required: false,
+    description: 'Comma separated languages the user must all speak',
+  })
   @ApiResponse({ status: 200, description: 'Users list retrieved successfully' })
   async findAll(
     @Query('lastName') lastName?: string,
     @Query('city') city?: string,
     @Query('status') status?: string,
+    @Query('languages') languages?: string,
   ) {
-    return this.usersService.findAll({ lastName, city, status });
+    return this.usersService.findAll({ lastName, city, status, languages });
   }
 
   @Get(':userId')
@@ -90,7 +118,10 @@ export class UsersController {
   @Delete(':userId')
   @HttpCode(HttpStatus.NO_CONTENT)
   @ApiOperation({ summary: 'Delete user account (GDPR)' })
-  @ApiResponse({ status: 204, description: 'User deleted and data anonymized' })
+  @ApiResponse({
+    status: 204,
+    description: 'Profile anonymized; the rest of the personal data is erased in the background',
+  })
   @ApiResponse({ status: 403, description: 'Forbidden - can only delete your own account' })
   async remove(
     @Param('userId') userId: string,
@@ -99,6 +130,18 @@ export class UsersController {
     return this.usersService.remove(userId, currentUser.id);
   }
 
+  @Get(':userId/anonymization')
+  @ApiOperation({ summary: 'Get progress of the background erasure started by DELETE' })
+  @ApiResponse({ status: 200, description: 'Anonymization job retrieved successfully' })
+  @ApiResponse({ status: 403, description: 'Forbidden - can only follow your own account erasure' })
+  @ApiResponse({ status: 404, description: 'No anonymization job for this user' })
+  getAnonymization(@Param('userId') userId: string, @CurrentUser() currentUser: User) {
+    if (userId !== currentUser.id) {
+      throw new ForbiddenException('You can only follow your own account erasure');
+    }
+    return this.anonymizationService.findLatest(userId);
+  }
+
   // Routes supplémentaires pour BF19 : récupérer les ressources d'un utilisateur
 
   @Get(':userId/boats')
@@ -121,4 +164,99 @@ export class UsersController {
   async getUserBookings(@Param('userId') userId: string) {
     return this.usersService.getUserBookings(userId);
   }
+
+  // Export RGPD (droit d'accès et à la portabilité) : uniquement ses propres données
+
+  @RateLimitCost(10) // Lit tout l'historique du compte
+  @Get(':userId/export')
+  @ApiOperation({ summary: 'Export all personal data (GDPR), streamed' })
+  @ApiQuery({
+    name: 'format',
+    required: false,
+    enum: ['ndjson', 'gzip'],
+    description: 'ndjson (default) or gzip compressed ndjson',
+  })
+  @ApiProduces(USER_EXPORT_CONTENT_TYPES.ndjson, USER_EXPORT_CONTENT_TYPES.gzip)
+  @ApiResponse({
+    status: 200,
+    description: 'One JSON object per line: {"type": ..., "data": ...}',
+    schema: { type: 'string', format: 'binary' },
+  })
+  @ApiResponse({ status: 403, description: 'Forbidden - can only export your own data' })
+  exportData(
+    @Param('userId') userId: string,
+    @CurrentUser() currentUser: User,
+    @Query('format') format: string = 'ndjson',
+    @Res({ passthrough: true }) response: any,
+  ) {
+    assertOwnExport(userId, currentUser);
+    if (!(format in USER_EXPORT_CONTENT_TYPES)) {
+      throw new BadRequestException('format must be one of: ndjson, gzip');
+    }
+    const exportFormat = format as UserExportFormat;
+    const extension = exportFormat === 'gzip' ? 'ndjson.gz' : 'ndjson';
+    const output = this.userExportService.stream(userId, exportFormat);
+    // Client parti avant la fin : Nest se contente de débrancher le flux (unpipe), qui
+    // attendrait indéfiniment un drain avec sa transaction ouverte. Le détruire libère
+    // le curseur et la connexion du pool. Express : http.ServerResponse ; Fastify : reply.raw
+    const raw = response.raw ?? response;
+    raw.on('close', () => {
+      if (!raw.writableFinished) output.destroy();
+    });
+    return new StreamableFile(output, {
+      type: USER_EXPORT_CONTENT_TYPES[exportFormat],
+      disposition: `attachment; filename="user-${userId}.${extension}"`,
+    });
+  }
+
+  @RateLimitCost(10)
+  @Post(':userId/exports')
+  @HttpCode(HttpStatus.ACCEPTED)
+  @ApiOperation({ summary: 'Start a background export of all personal data (GDPR)' })
+  @ApiResponse({ status: 202, description: 'Export queued (an export already in progress is returned)' })
+  @ApiResponse({ status: 403, description: 'Forbidden - can only export your own data' })
+  startExport(@Param('userId') userId: string, @CurrentUser() currentUser: User) {
+    assertOwnExport(userId, currentUser);
+    return this.userExportService.start(userId);
+  }
+
+  @Get(':userId/exports/:exportId')
+  @ApiOperation({ summary: 'Get background export status' })
+  @ApiResponse({ status: 200, description: 'Export status retrieved successfully' })
+  @ApiResponse({ status: 404, description: 'Export not found or expired' })
+  getExport(
+    @Param('userId') userId: string,
+    @Param('exportId') exportId: string,
+    @CurrentUser() currentUser: User,
+  ) {
+    assertOwnExport(userId, currentUser);
+    return this.userExportService.findJob(userId, exportId);
+  }
+
+  @Get(':userId/exports/:exportId/download')
+  @ApiOperation({ summary: 'Download a completed background export' })
+  @ApiProduces(USER_EXPORT_CONTENT_TYPES.gzip)
+  @ApiResponse({
+    status: 200,
+    description: 'Gzip compressed ndjson file',
+    schema: { type: 'string', format: 'binary' },
+  })
+  @ApiResponse({ status: 404, description: 'Export not found, expired or not completed' })
+  downloadExport(
+    @Param('userId') userId: string,
+    @Param('exportId') exportId: string,
+    @CurrentUser() currentUser: User,
+  ) {
+    assertOwnExport(userId, currentUser);
+    return new StreamableFile(this.userExportService.download(userId, exportId), {
+      type: USER_EXPORT_CONTENT_TYPES.gzip,
+      disposition: `attachment; filename="user-${userId}.ndjson.gz"`,
+    });
+  }
+}
+
+function assertOwnExport(userId: string, currentUser: User) {
+  if (userId !== currentUser.id) {
+    throw new ForbiddenException('You can only export your own data');
+  }
 }
@@ -2,16 +2,30 @@ import { Module } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { UsersService } from './users.service';
 import { UsersController } from './users.controller';
+import { UserExportService } from './user-export.service';
+import { AnonymizationService } from './anonymization.service';
 import { User } from './entities/user.entity';
+import { AnonymizationJob } from './entities/anonymization-job.entity';
 import { Boat } from '../boats/entities/boat.entity';
 import { Trip } from '../trips/entities/trip.entity';
 import { Booking } from '../bookings/entities/booking.entity';
 import { LogbookEntry } from '../logbook/entities/logbook-entry.entity';
+import { RefreshToken } from '../auth/entities/refresh-token.entity';
 
 @Module({
-  imports: [TypeOrmModule.forFeature([User, Boat, Trip, Booking, LogbookEntry])],
+  imports: [
+    TypeOrmModule.forFeature([
+      User,
+      Boat,
+      Trip,
+      Booking,
+      LogbookEntry,
+      RefreshToken,
+      AnonymizationJob,
+    ]),
+  ],
   controllers: [UsersController],
-  providers: [UsersService],
+  providers: [UsersService, UserExportService, AnonymizationService],
   exports: [UsersService], // Exporter pour utilisation dans d'autres modules
 })
 export class UsersModule {}
@@ -11,6 +11,10 @@ import { Boat } from '../boats/entities/boat.entity';
 import { Trip } from '../trips/entities/trip.entity';
 import { Booking } from '../bookings/entities/booking.entity';
 import { LogbookEntry } from '../logbook/entities/logbook-entry.entity';
+import { RefreshToken } from '../auth/entities/refresh-token.entity';
+import { parseList } from '../../common/search/query-params';
+import { refreshTripSearch } from '../trips/trip-search.projection';
+import { AnonymizationService } from './anonymization.service';
 import { CreateUserDto } from './dto/create-user.dto';
 import { UpdateUserDto } from './dto/update-user.dto';
 import * as bcrypt from 'bcrypt';
@@ -38,6 +42,9 @@ export class UsersService {
     private bookingRepository: Repository<Booking>,
     @InjectRepository(LogbookEntry)
     private logbookRepository: Repository<LogbookEntry>,
+    @InjectRepository(RefreshToken)
+    private refreshTokenRepository: Repository<RefreshToken>,
+    private anonymizationService: AnonymizationService,
   ) {}
 
   /**
@@ -74,6 +81,7 @@ export class UsersService {
     lastName?: string;
     city?: string;
     status?: string;
+    languages?: string; // liste séparée par des virgules : l'utilisateur doit parler toutes ces langues
   }): Promise<User[]> {
     const query = this.userRepository.createQueryBuilder('user');
 
@@ -94,6 +102,12 @@ export class UsersService {
       query.andWhere('user.status = :status', { status: filters.status });
     }
 
+    // Contenance de tableaux (@>) : index GIN IDX_users_languages
+    const languages = parseList(filters?.languages);
+    if (languages.length) {
+      query.andWhere('user.languages @> :languages', { languages });
+    }
+
     return query.getMany();
   }
 
@@ -135,12 +149,20 @@ export class UsersService {
     }
 
     Object.assign(user, updateUserDto);
-    return this.userRepository.save(user);
+    return this.userRepository.manager.transaction(async (manager) => {
+      const saved = await manager.save(user);
+      // Nom, ville, langues... recopiés dans le modèle de lecture des sorties organisées
+      await refreshTripSearch(manager, { organizerId: saved.id });
+      return saved;
+    });
   }
 
   /**
    * Supprimer un utilisateur (anonymisation RGPD)
    * Implémente BF8 et BN6 du cahier des charges
+   *
+   * Seul le profil est anonymisé ici ; le reste (carnet, sorties organisées) est effacé
+   * en arrière-plan par AnonymizationService, la requête n'attend pas la cascade.
    */
   async remove(id: string, currentUserId: string): Promise<void> {
     // Vérifier que l'utilisateur supprime son propre compte
@@ -160,7 +182,20 @@ export class UsersService {
     user.insuranceNumber = null;
     user.companyName = null;
 
-    await this.userRepository.save(user);
+    await this.userRepository.manager.transaction(async (manager) => {
+      await manager.save(user);
+      await refreshTripSearch(manager, { organizerId: id });
+      await this.anonymizationService.enqueue(manager, id);
+    });
+    this.anonymizationService.wake();
+
+    // Révoquer les sessions en cours : plus aucun refresh token utilisable
+    await this.refreshTokenRepository
+      .createQueryBuilder()
+      .update(RefreshToken)
+      .set({ revokedAt: () => 'now()' })
+      .where('userId = :userId AND revokedAt IS NULL', { userId: id })
+      .execute();
   }
 
   /**
@@ -0,0 +1,525 @@
+"""
+Cassettes HTTP (enregistrement / rejeu) pour la suite pytest
+
+Tous les appels passent par requests ; ce plugin intercepte HTTPAdapter.send:
+- record : appelle l'API et enregistre chaque couple requete / reponse
+- replay : repond depuis la cassette, sans reseau ni API (quelques microsecondes)
+- drift  : appelle l'API et signale les reponses qui ne correspondent plus a la cassette
+
+Une cassette par fichier de test : cassettes/<module>.json.gz (JSON compact compresse).
+
+NORMALISATION:
+Les valeurs qui changent a chaque execution sont remplacees par des jetons stables:
+- UUIDs                       -> <uuid:N>   (N = ordre d'apparition dans la session)
+- identifiants de unique_id   -> <uid:N>    (declares via track_value())
+- accessToken / refreshToken  -> <jwt:N> ou <token:N>
+- horodatages ISO 8601        -> <timestamp>
+- emails anonymises (RGPD)    -> deleted_<epoch>@anonymized.com
+Les exports gzip sont enregistres decompresses (et normalises) ; les autres corps
+binaires tels quels, en base64.
+Au rejeu, chaque jeton recoit une nouvelle valeur, et une requete qui la renvoie
+(ex: GET /boats/<id> apres creation) est normalisee vers le meme jeton. Les jetons
+sont communs a toute la session : les fixtures de session (utilisateurs, tokens)
+sont partagees entre les modules.
+
+Les flux (stream=True, reponses text/event-stream) ne sont jamais enregistres : en record
+et drift ils vont au serveur, en replay les tests qui les ouvrent (@pytest.mark.live_stream)
+sont sautes.
+
+Une requete est retrouvee par (methode, chemin + query, corps normalise) ; les
+appels identiques sont rejoues dans l'ordre d'enregistrement. Le rejeu suppose
+les memes fichiers de test qu'a l'enregistrement, executes dans le meme ordre.
+
+Utilisation:
+    pytest --cassettes=record     # contre l'API ou le stand-in
+    pytest --cassettes=replay     # hors ligne
+    pytest --cassettes=drift      # contre l'API, compare a la cassette
+"""
+
+import base64
+import gzip
+import json
+import os
+import re
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+
+UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:?\d{2})?")
+# Email d'un compte supprime : horodatage en millisecondes (users.service.ts)
+ANONYMIZED_EMAIL_RE = re.compile(r"(?<=deleted_)\d+(?=@anonymized\.com)")
+PLACEHOLDER_RE = re.compile(r"<(uuid|uid|jwt|token):(\d+)>|<timestamp>|<epoch>")
+TOKEN_KIND_RE = re.compile(r"<(uuid|uid|jwt|token):\d+>")
+
+# Corps binaires : enregistres en base64, jamais decodes en texte
+BINARY_CONTENT_TYPES = ("application/octet-stream", "image/")
+
+# Champs de reponse dont la valeur entiere est un secret genere par l'API
+TOKEN_FIELDS = ("accessToken", "refreshToken")
+
+# Champs dont la valeur depend des donnees de l'execution (taille d'un export) : en mode
+# drift, seul leur type est compare
+DATA_DEPENDENT_FIELDS = ("size",)
+
+# En-tetes de reponse conserves (les autres dependent du serveur ou de la connexion)
+KEPT_HEADERS = (
+    "Content-Type",
+    "Location",
+    "Content-Disposition",
+    "Retry-After",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "Idempotent-Replayed",
+)
+
+MODES = ("record", "replay", "drift")
+
+_aliases = None
+
+
+def track_value(value):
+    """Declare une valeur generee par le test (unique_id) pour la normaliser."""
+    if _aliases is not None:
+        _aliases.track(value)
+    return value
+
+
+class CassetteMiss(Exception):
+    """Requete absente de la cassette en mode replay."""
+
+
+class Aliases:
+    """Correspondance valeur reelle <-> jeton, pour toute la session."""
+
+    def __init__(self):
+        self.to_token = {}
+        self.to_value = {}
+        self.counters = {}
+
+    def token_for(self, kind, value):
+        token = self.to_token.get(value)
+        if token is None:
+            self.counters[kind] = self.counters.get(kind, 0) + 1
+            token = f"<{kind}:{self.counters[kind]}>"
+            self.to_token[value] = token
+            self.to_value[token] = value
+        return token
+
+    def track(self, value):
+        self.token_for("uid", value)
+
+    def value_for(self, token, kind):
+        value = self.to_value.get(token)
+        if value is None:
+            if kind == "uuid":
+                value = str(uuid.uuid4())
+            elif kind == "uid":
+                value = secrets.token_hex(4)
+            elif kind == "jwt":
+                value = _fake_jwt()
+            else:
+                value = secrets.token_urlsafe(32)
+            self.to_token[value] = token
+            self.to_value[token] = value
+            # Les jetons crees ensuite par normalize() ne doivent pas reprendre ce numero
+            number = int(token[:-1].split(":")[1])
+            self.counters[kind] = max(self.counters.get(kind, 0), number)
+        return value
+
+    def normalize_text(self, text):
+        text = UUID_RE.sub(lambda m: self.token_for("uuid", m.group(0).lower()), text)
+        for value, token in self.to_token.items():
+            if token.startswith("<uid:") and value in text:
+                text = text.replace(value, token)
+        text = ANONYMIZED_EMAIL_RE.sub("<epoch>", text)
+        return TIMESTAMP_RE.sub("<timestamp>", text)
+
+    def normalize(self, data):
+        if isinstance(data, str):
+            return self.normalize_text(data)
+        if isinstance(data, list):
+            return [self.normalize(item) for item in data]
+        if isinstance(data, dict):
+            normalized = {}
+            for key, value in data.items():
+                if key in TOKEN_FIELDS and isinstance(value, str):
+                    kind = "jwt" if value.count(".") == 2 else "token"
+                    normalized[key] = self.token_for(kind, value)
+                else:
+                    normalized[key] = self.normalize(value)
+            return normalized
+        return data
+
+    def materialize(self, data):
+        """Operation inverse de normalize() : jetons -> valeurs pour ce rejeu."""
+        if isinstance(data, str):
+            now = datetime.now(timezone.utc)
+
+            def _replace(match):
+                if match.group(0) == "<timestamp>":
+                    return now.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+                if match.group(0) == "<epoch>":
+                    return str(int(now.timestamp() * 1000))
+                return self.value_for(match.group(0), match.group(1))
+
+            return PLACEHOLDER_RE.sub(_replace, data)
+        if isinstance(data, list):
+            return [self.materialize(item) for item in data]
+        if isinstance(data, dict):
+            return {key: self.materialize(value) for key, value in data.items()}
+        return data
+
+
+def _fake_jwt():
+    """JWT non signe dont seul "exp" est exploitable (cache de tokens des fixtures)."""
+
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    payload = {"exp": int(time.time()) + 3600, "jti": secrets.token_hex(8)}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(payload)}.replayed"
+
+
+def _decode_body(raw, content_type=""):
+    if raw is None or raw == b"" or raw == "":
+        return None
+    if isinstance(raw, bytes):
+        if "gzip" in content_type:
+            try:
+                return {"gzip": _decode_body(gzip.decompress(raw)), "size": len(raw)}
+            except (OSError, EOFError):
+                pass
+        if any(binary in content_type for binary in BINARY_CONTENT_TYPES):
+            return {"base64": base64.b64encode(raw).decode("ascii")}
+        try:
+            raw = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return {"base64": base64.b64encode(raw).decode("ascii")}
+    if "json" in content_type or raw[:1] in ("{", "["):
+        try:
+            return {"json": json.loads(raw)}
+        except ValueError:
+            pass
+    return {"text": raw}
+
+
+def _gzip_padded(data, size):
+    """Archive gzip de data, allongee jusqu'a size octets si possible.
+
+    Les valeurs rejouees ne compressent pas comme les originales : un commentaire
+    d'en-tete (FCOMMENT, ignore a la decompression) redonne a l'archive la taille
+    enregistree, que l'API annonce aussi ailleurs (taille d'un export en arriere-plan).
+    """
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    padding = size - len(compressed)
+    if padding < 1:
+        return compressed
+    flags = compressed[3] | 0x10
+    return compressed[:3] + bytes([flags]) + compressed[4:10] + b" " * (padding - 1) + b"\0" + compressed[10:]
+
+
+def _encode_body(body):
+    """Operation inverse de _decode_body()."""
+    if body is None:
+        return b""
+    if "json" in body:
+        return json.dumps(body["json"]).encode("utf-8")
+    if "gzip" in body:
+        return _gzip_padded(_encode_body(body["gzip"]), body.get("size", 0))
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body["text"].encode("utf-8")
+
+
+class ModuleCassette:
+    """Interactions enregistrees pour un fichier de test."""
+
+    def __init__(self, path, aliases):
+        self.path = path
+        self.aliases = aliases
+        self.interactions = []
+        self.used = set()
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path, aliases):
+        cassette = cls(path, aliases)
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                cassette.interactions = json.load(f)["interactions"]
+        return cassette
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        payload = json.dumps({"version": 1, "interactions": self.interactions}, separators=(",", ":"))
+        # mtime=0 : fichier identique d'un enregistrement a l'autre si les echanges le sont
+        with open(self.path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(payload.encode("utf-8"))
+
+    def request_key(self, request):
+        url = urlsplit(request.url)
+        path = url.path + (f"?{url.query}" if url.query else "")
+        content_type = request.headers.get("Content-Type", "")
+        body = self.aliases.normalize(_decode_body(request.body, content_type))
+        return {
+            "method": request.method,
+            "path": self.aliases.normalize_text(path),
+            "body": json.dumps(body, sort_keys=True, separators=(",", ":")),
+        }
+
+    def find(self, key, loose=False):
+        """Premiere interaction non rejouee pour cette requete.
+
+        loose : jetons compares par nature seulement (<uuid:3> == <uuid:5>), pour le mode
+        drift ou la numerotation depend de l'ordre d'arrivee des reponses concurrentes.
+        """
+        if loose:
+            key = _loose(key)
+        for index, interaction in enumerate(self.interactions):
+            request = _loose(interaction["request"]) if loose else interaction["request"]
+            if index not in self.used and request == key:
+                self.used.add(index)
+                return interaction
+        return None
+
+    def knows(self, key):
+        """La requete figure dans la cassette (meme si deja rejouee)."""
+        key = _loose(key)
+        return any(_loose(interaction["request"]) == key for interaction in self.interactions)
+
+    def normalize_response(self, response):
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        body = _decode_body(response.content, response.headers.get("Content-Type", ""))
+        return {
+            "status": response.status_code,
+            "headers": self.aliases.normalize(headers),
+            "body": self.aliases.normalize(body),
+        }
+
+    def build_response(self, request, recorded):
+        data = self.aliases.materialize(recorded)
+        response = requests.Response()
+        response.status_code = data["status"]
+        response.headers = CaseInsensitiveDict(data["headers"])
+        response._content = _encode_body(data["body"])
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+
+def _loose(key):
+    return {name: TOKEN_KIND_RE.sub(r"<\1>", value) for name, value in key.items()}
+
+
+def _differences(expected, actual, path="$", in_list=False):
+    """Ecarts entre deux reponses normalisees.
+
+    Dans les listes, seuls les types des champs communs sont compares : leur contenu
+    depend des donnees presentes en base au moment de l'appel. Deux jetons de meme
+    nature (<uuid:3> et <uuid:7>) sont consideres egaux.
+    """
+    if type(expected) is not type(actual):
+        return [f"{path}: {type(expected).__name__} -> {type(actual).__name__}"]
+    if path == "$" and isinstance(expected, dict) and "base64" in expected:
+        # Corps binaire (base64) : contenu opaque, seule sa nature est comparee
+        return [] if "base64" in actual else [f"{path}: binaire -> {', '.join(actual)}"]
+    if isinstance(expected, dict):
+        diffs = []
+        for key in sorted(expected.keys() | actual.keys()):
+            if key in expected and key in actual and key in DATA_DEPENDENT_FIELDS:
+                diffs.extend(_differences(expected[key], actual[key], f"{path}.{key}", True))
+            elif key in expected and key in actual:
+                diffs.extend(_differences(expected[key], actual[key], f"{path}.{key}", in_list))
+            elif in_list:
+                continue
+            elif key not in actual:
+                diffs.append(f"{path}.{key}: absent")
+            else:
+                diffs.append(f"{path}.{key}: nouveau champ")
+        return diffs
+    if isinstance(expected, list):
+        if expected and actual:
+            return _differences(expected[0], actual[0], f"{path}[0]", True)
+        return []
+    if isinstance(expected, str):
+        expected, actual = (TOKEN_KIND_RE.sub(r"<\1>", value) for value in (expected, actual))
+    if not in_list and expected != actual:
+        return [f"{path}: {expected!r} -> {actual!r}"]
+    return []
+
+
+class CassettePlugin:
+    def __init__(self, mode, directory):
+        self.mode = mode
+        self.directory = directory
+        self.cassettes = {}
+        self.aliases = Aliases()
+        # Les fixtures peuvent envoyer des requetes depuis plusieurs threads
+        self.lock = threading.Lock()
+        self.current = None
+        self.nodeid = None
+        self.replayed = 0
+        self.recorded = 0
+        self.drifts = []
+        self._original_send = None
+        self._send = None
+
+    # -- cycle de vie ---------------------------------------------------
+
+    def install(self):
+        global _aliases
+        _aliases = self.aliases
+        self._original_send = HTTPAdapter.send
+        plugin = self
+
+        def send(adapter, request, **kwargs):
+            return plugin.send(adapter, request, **kwargs)
+
+        self._send = send
+        HTTPAdapter.send = send
+
+    def uninstall(self):
+        global _aliases
+        _aliases = None
+        # Un autre plugin a pu intercepter send apres nous (rate_limit_pacing) : ne pas defaire
+        # son installation. Notre send reste alors dans la chaine, sans cassette courante : il
+        # passe les requetes au send d'origine.
+        if self._send is not None and HTTPAdapter.send is self._send:
+            HTTPAdapter.send = self._original_send
+
+    def cassette_for(self, item):
+        module = item.nodeid.split("::")[0]
+        if module not in self.cassettes:
+            name = os.path.splitext(os.path.basename(module))[0]
+            path = os.path.join(self.directory, f"{name}.json.gz")
+            if self.mode == "record":
+                self.cassettes[module] = ModuleCassette(path, self.aliases)
+            else:
+                self.cassettes[module] = ModuleCassette.load(path, self.aliases)
+        return self.cassettes[module]
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        if self.mode == "replay" and item.get_closest_marker("live_stream"):
+            # Ses autres echanges ne doivent pas etre rejoues a un test suivant, et leurs jetons
+            # (<uid:N>, <uuid:N>...) sont reserves : les tests suivants gardent leur numerotation
+            cassette = self.cassette_for(item)
+            for index, interaction in enumerate(cassette.interactions):
+                if interaction["test"] == item.nodeid:
+                    cassette.used.add(index)
+                    self.aliases.materialize(interaction)
+            pytest.skip("flux SSE : necessite le serveur, pas de rejeu possible")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.current = self.cassette_for(item)
+        self.nodeid = item.nodeid
+        yield
+        self.current = None
+
+    def pytest_sessionfinish(self, session):
+        if self.mode == "record":
+            for cassette in self.cassettes.values():
+                if cassette.dirty:
+                    cassette.save()
+        if self.drifts and session.exitstatus == 0:
+            session.exitstatus = 1
+        self.uninstall()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        tr = terminalreporter
+        if self.mode == "record":
+            tr.write_line(f"cassettes: {self.recorded} echanges enregistres dans {self.directory}")
+        elif self.mode == "replay":
+            tr.write_line(f"cassettes: {self.replayed} echanges rejoues")
+        elif self.drifts:
+            tr.section("derive des cassettes")
+            for nodeid, request, diffs in self.drifts:
+                tr.write_line(f"{nodeid} {request['method']} {request['path']}")
+                for diff in diffs[:10]:
+                    tr.write_line(f"    {diff}")
+        else:
+            tr.write_line("cassettes: aucune derive detectee")
+
+    # -- interception ---------------------------------------------------
+
+    def send(self, adapter, request, **kwargs):
+        cassette = self.current
+        if cassette is None or kwargs.get("stream"):
+            # Flux : lire le corps pour l'enregistrer bloquerait jusqu'a la fin de la connexion
+            return self._original_send(adapter, request, **kwargs)
+
+        with self.lock:
+            key = cassette.request_key(request)
+
+            if self.mode == "replay":
+                interaction = cassette.find(key)
+                if interaction is None:
+                    raise CassetteMiss(f"{key['method']} {key['path']} absent de {cassette.path} ({self.nodeid})")
+                self.replayed += 1
+                return cassette.build_response(request, interaction["response"])
+
+        response = self._original_send(adapter, request, **kwargs)
+        if response.headers.get("Content-Type", "").startswith("text/event-stream"):
+            return response
+        with self.lock:
+            self._store_or_compare(cassette, key, response)
+        return response
+
+    def _store_or_compare(self, cassette, key, response):
+        recorded = cassette.normalize_response(response)
+
+        if self.mode == "record":
+            cassette.interactions.append({"test": self.nodeid, "request": key, "response": recorded})
+            cassette.dirty = True
+            self.recorded += 1
+        else:
+            interaction = cassette.find(key) or cassette.find(key, loose=True)
+            if interaction is None:
+                # Une requete repetee plus souvent qu'a l'enregistrement (boucle jusqu'au 429) n'est pas une derive
+                if not cassette.knows(key):
+                    self.drifts.append((self.nodeid, key, ["requete absente de la cassette"]))
+            elif 429 not in (interaction["response"]["status"], recorded["status"]):
+                # Un 429 depend du rythme des appels, pas du contrat de l'API
+                expected = interaction["response"]
+                diffs = []
+                if expected["status"] != recorded["status"]:
+                    diffs.append(f"status: {expected['status']} -> {recorded['status']}")
+                diffs.extend(_differences(expected["body"], recorded["body"], "$"))
+                if diffs:
+                    self.drifts.append((self.nodeid, key, diffs))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cassettes",
+        choices=MODES,
+        default=None,
+        help="Enregistrer (record), rejouer (replay) ou verifier (drift) les echanges HTTP",
+    )
+    parser.addoption(
+        "--cassette-dir",
+        default=CASSETTE_DIR,
+        help="Repertoire des cassettes (defaut: tests/cassettes)",
+    )
+
+
+def pytest_configure(config):
+    mode = config.getoption("--cassettes")
+    if mode:
+        plugin = CassettePlugin(mode, config.getoption("--cassette-dir"))
+        plugin.install()
+        config.pluginmanager.register(plugin, "cassette-recorder")
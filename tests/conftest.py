@@ -11,13 +11,30 @@ import uuid
 import time
 import urllib3
 
+from fixture_factory import (
+    FixtureFactory,
+    TokenCache,
+    boat_payload,
+    professional_user_payload,
+    trip_payload,
+    user_payload,
+    user_with_permit_payload,
+)
+
 # Desactiver les warnings SSL pour les tests en local
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Configuration de base de l'API
 BASE_URL = "http://localhost:8443/api"
+# Proxys de confiance de l'API testee (TRUST_PROXY) : un proxy, comme derriere un load balancer
+TRUST_PROXY = "1"
 API_VERSION = "v1"
 
+# Options --cassettes=record|replay|drift (voir cassette_recorder.py)
+# Marqueur @pytest.mark.latency et fixture latency (voir latency_budget.py)
+# Un client (X-Forwarded-For) par test, attente sur 429 dans les fixtures (voir rate_limit_pacing.py)
+pytest_plugins = ("cassette_recorder", "latency_budget", "rate_limit_pacing")
+
 
 def get_url(endpoint: str) -> str:
     """Construit l'URL complete pour un endpoint."""
@@ -26,6 +43,64 @@ def get_url(endpoint: str) -> str:
     return f"{BASE_URL}/{API_VERSION}{endpoint}"
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--standin",
+        action="store_true",
+        default=False,
+        help="Lancer les tests contre le serveur stand-in en memoire (sans PostgreSQL ni Node)",
+    )
+    parser.addoption(
+        "--ephemeral-db",
+        action="store_true",
+        default=False,
+        help="Demarrer PostgreSQL et l'API sur une base jetable, reinitialisee a chaque module",
+    )
+    parser.addoption(
+        "--api-command",
+        default="node dist/main.js",
+        help="Commande de lancement de l'API avec --ephemeral-db (depuis la racine du projet)",
+    )
+
+
+def pytest_configure(config):
+    """Avec --standin ou --ephemeral-db, demarre le serveur de test et redirige BASE_URL vers lui."""
+    global BASE_URL
+    if config.getoption("--standin"):
+        from standin_server import start_in_thread
+
+        # Politique de limitation de debit reelle (RATE_LIMIT_*) : voir rate_limit_pacing.py
+        config._standin_server, BASE_URL = start_in_thread(trust_proxy=TRUST_PROXY)
+    elif config.getoption("--ephemeral-db"):
+        from ephemeral_db import EphemeralDatabase
+
+        config._ephemeral_db = EphemeralDatabase(config.getoption("--api-command"))
+        try:
+            BASE_URL = config._ephemeral_db.start()
+        except Exception:
+            config._ephemeral_db.stop()
+            raise
+
+
+def pytest_unconfigure(config):
+    server = getattr(config, "_standin_server", None)
+    if server is not None:
+        server.shutdown()
+    database = getattr(config, "_ephemeral_db", None)
+    if database is not None:
+        database.stop()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fresh_database(request, fixture_factory):
+    """Avec --ephemeral-db, chaque module de test part d'une base vide."""
+    database = getattr(request.config, "_ephemeral_db", None)
+    if database is not None:
+        database.reset()
+        # Les utilisateurs de la session n'existent plus dans la nouvelle base
+        fixture_factory.invalidate()
+
+
 @pytest.fixture(scope="session")
 def api_base_url():
     """URL de base de l'API."""
@@ -35,162 +110,93 @@ def api_base_url():
 @pytest.fixture(scope="session")
 def unique_id():
     """Generateur d'identifiants uniques pour les tests."""
+    from cassette_recorder import track_value
+
     def _generate():
-        return str(uuid.uuid4())[:8]
+        return track_value(str(uuid.uuid4())[:8])
     return _generate
 
 
 @pytest.fixture(scope="module")
 def test_user_data(unique_id):
     """Donnees pour creer un utilisateur de test."""
-    uid = unique_id()
-    return {
-        "lastName": f"TestUser{uid}",
-        "firstName": f"Prenom{uid}",
-        "email": f"test.user.{uid}@fisherfans.test",
-        "password": "TestPassword123!",
-        "city": "Nice",
-        "phone": "+33612345678",
-        "status": "individual"
-    }
+    return user_payload(unique_id())
 
 
 @pytest.fixture(scope="module")
 def test_user_with_permit_data(unique_id):
     """Donnees pour creer un utilisateur avec permis bateau."""
-    uid = unique_id()
-    return {
-        "lastName": f"TestPermit{uid}",
-        "firstName": f"PrenomPermit{uid}",
-        "email": f"test.permit.{uid}@fisherfans.test",
-        "password": "TestPassword123!",
-        "city": "Marseille",
-        "phone": "+33698765432",
-        "status": "individual",
-        "boatLicenseNumber": "12345678",
-        "insuranceNumber": "ABC123456789"
-    }
+    return user_with_permit_payload(unique_id())
 
 
 @pytest.fixture(scope="module")
 def test_professional_user_data(unique_id):
     """Donnees pour creer un utilisateur professionnel."""
-    uid = unique_id()
-    return {
-        "lastName": f"TestPro{uid}",
-        "firstName": f"PrenomPro{uid}",
-        "email": f"test.pro.{uid}@fisherfans.test",
-        "password": "TestPassword123!",
-        "city": "Antibes",
-        "phone": "+33611223344",
-        "status": "professional",
-        "boatLicenseNumber": "87654321",
-        "insuranceNumber": "XYZ987654321",
-        "companyName": f"Societe{uid}",
-        "activityType": "rental"
-    }
+    return professional_user_payload(unique_id())
+
+
+@pytest.fixture(scope="session")
+def token_cache():
+    """Cache des accessTokens de la session (renouveles avant expiration)."""
+    return TokenCache(get_url)
+
+
+@pytest.fixture(scope="session")
+def fixture_factory(token_cache):
+    """Fabrique des utilisateurs de test, crees en parallele et partages par la session."""
+    return FixtureFactory(get_url, token_cache)
 
 
 @pytest.fixture(scope="module")
-def created_user(test_user_data):
+def reference_users(fixture_factory, test_user_data, test_user_with_permit_data, test_professional_user_data):
+    """Les trois utilisateurs de reference du module, crees en parallele (seaux de debit pleins)."""
+    return fixture_factory.create_users({
+        "individual": test_user_data,
+        "permit": test_user_with_permit_data,
+        "professional": test_professional_user_data,
+    })
+
+
+@pytest.fixture(scope="module")
+def created_user(reference_users):
     """Cree un utilisateur de test et retourne ses donnees."""
-    response = requests.post(
-        get_url("/users"),
-        json=test_user_data,
-        verify=False
-    )
-    if response.status_code == 201:
-        user = response.json()
-        user["password"] = test_user_data["password"]
-        return user
-    return None
+    return reference_users["individual"]
 
 
 @pytest.fixture(scope="module")
-def created_user_with_permit(test_user_with_permit_data):
+def created_user_with_permit(reference_users):
     """Cree un utilisateur avec permis bateau."""
-    response = requests.post(
-        get_url("/users"),
-        json=test_user_with_permit_data,
-        verify=False
-    )
-    if response.status_code == 201:
-        user = response.json()
-        user["password"] = test_user_with_permit_data["password"]
-        return user
-    return None
+    return reference_users["permit"]
 
 
 @pytest.fixture(scope="module")
-def created_professional_user(test_professional_user_data):
+def created_professional_user(reference_users):
     """Cree un utilisateur professionnel."""
-    response = requests.post(
-        get_url("/users"),
-        json=test_professional_user_data,
-        verify=False
-    )
-    if response.status_code == 201:
-        user = response.json()
-        user["password"] = test_professional_user_data["password"]
-        return user
-    return None
+    return reference_users["professional"]
 
 
 @pytest.fixture(scope="module")
-def auth_token(created_user):
+def auth_token(created_user, token_cache):
     """Obtient un token JWT pour l'utilisateur de test."""
     if not created_user:
         return None
-
-    response = requests.post(
-        get_url("/auth/v1/login"),
-        json={
-            "email": created_user["email"],
-            "password": created_user["password"]
-        },
-        verify=False
-    )
-    if response.status_code in [200, 201]:
-        return response.json().get("accessToken")
-    return None
+    return token_cache.get(created_user["email"], created_user["password"])
 
 
 @pytest.fixture(scope="module")
-def auth_token_with_permit(created_user_with_permit):
+def auth_token_with_permit(created_user_with_permit, token_cache):
     """Obtient un token JWT pour l'utilisateur avec permis."""
     if not created_user_with_permit:
         return None
-
-    response = requests.post(
-        get_url("/auth/v1/login"),
-        json={
-            "email": created_user_with_permit["email"],
-            "password": created_user_with_permit["password"]
-        },
-        verify=False
-    )
-    if response.status_code in [200, 201]:
-        return response.json().get("accessToken")
-    return None
+    return token_cache.get(created_user_with_permit["email"], created_user_with_permit["password"])
 
 
 @pytest.fixture(scope="module")
-def auth_token_professional(created_professional_user):
+def auth_token_professional(created_professional_user, token_cache):
     """Obtient un token JWT pour l'utilisateur professionnel."""
     if not created_professional_user:
         return None
-
-    response = requests.post(
-        get_url("/auth/v1/login"),
-        json={
-            "email": created_professional_user["email"],
-            "password": created_professional_user["password"]
-        },
-        verify=False
-    )
-    if response.status_code in [200, 201]:
-        return response.json().get("accessToken")
-    return None
+    return token_cache.get(created_professional_user["email"], created_professional_user["password"])
 
 
 @pytest.fixture(scope="module")
@@ -217,26 +223,23 @@ def auth_headers_professional(auth_token_professional):
     return {"Authorization": f"Bearer {auth_token_professional}"}
 
 
+@pytest.fixture
+def dedicated_auth_headers(fixture_factory, token_cache, unique_id):
+    """Headers d'un utilisateur cree pour le test : seau de limitation de debit plein.
+
+    Pour les mesures de latence : les utilisateurs du module ont deja consomme une partie de
+    leur seau, un 429 ferait echouer la mesure (voir rate_limit_pacing.py).
+    """
+    user = fixture_factory.create_users({"dedicated": user_payload(unique_id())})["dedicated"]
+    if not user:
+        return {}
+    return {"Authorization": f"Bearer {token_cache.get(user['email'], user['password'])}"}
+
+
 @pytest.fixture(scope="module")
 def test_boat_data(unique_id):
     """Donnees pour creer un bateau de test."""
-    uid = unique_id()
-    return {
-        "name": f"TestBoat{uid}",
-        "description": "Bateau de test pour pytest",
-        "brand": "TestBrand",
-        "yearBuilt": 2020,
-        "boatType": "open",
-        "equipment": ["gps", "sounder", "vhf_radio"],
-        "deposit": 500.00,
-        "maxCapacity": 6,
-        "bedCount": 2,
-        "homePort": "Nice",
-        "latitude": 43.7102,
-        "longitude": 7.2620,
-        "engineType": "diesel",
-        "enginePower": 150
-    }
+    return boat_payload(unique_id())
 
 
 @pytest.fixture(scope="module")
@@ -291,20 +294,7 @@ def test_trip_data(created_boat):
     """Donnees pour creer une sortie peche de test."""
     if not created_boat:
         return None
-
-    return {
-        "title": "Sortie Peche Test Pytest",
-        "practicalInfo": "Rendez-vous au port a 6h",
-        "tripType": "daily",
-        "pricingType": "per_person",
-        "startDates": ["2026-03-01"],
-        "endDates": ["2026-03-01"],
-        "startTimes": ["06:00"],
-        "endTimes": ["14:00"],
-        "passengerCount": 4,
-        "price": 75.00,
-        "boatId": created_boat["id"]
-    }
+    return trip_payload(created_boat["id"])
 
 
 @pytest.fixture(scope="module")
@@ -0,0 +1,254 @@
+"""
+Base PostgreSQL ephemere pour la suite pytest (option --ephemeral-db)
+
+Evite d'accumuler les donnees de test dans la base partagee `fisherfans`:
+1. initdb dans un repertoire temporaire et demarrage d'un PostgreSQL local
+   (sans Docker, durabilite desactivee : fsync, synchronous_commit...)
+2. creation de la base `fisherfans_template`, dont le schema est cree une seule fois
+   par l'API elle-meme (TypeORM synchronize) lors d'un premier demarrage
+3. clonage du template en `fisherfans` (CREATE DATABASE ... TEMPLATE) et demarrage de l'API
+   sur cette base, via les variables DATABASE_* lues par app.module.ts
+4. avant chaque module de test, reset() arrete l'API, supprime et reclone `fisherfans`
+   (quelques dizaines de millisecondes au lieu d'une base qui grossit a chaque execution)
+   puis redemarre l'API sur le meme port
+
+L'API est redemarree plutot que de survivre a la base : son pool et sa connexion LISTEN,
+ses etats en memoire (idempotence, exports, limitation de debit) et ses workers
+d'arriere-plan appartiennent a l'ancienne base et fuiraient d'un module a l'autre.
+
+Avec pytest-xdist, chaque worker est un processus pytest distinct et obtient donc
+son propre PostgreSQL, sa propre base et sa propre API.
+
+Prerequis : binaires PostgreSQL >= 16 (initdb, pg_ctl, psql) dans le PATH ou dans PG_BIN,
+et une API construite (`npm run build`) ou une commande de lancement via --api-command.
+"""
+
+import glob
+import os
+import re
+import shlex
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DEFAULT_API_COMMAND = "node dist/main.js"
+
+# pg_input_is_valid (projection trip_search de l'API) n'existe qu'a partir de PostgreSQL 16
+MIN_PG_VERSION = 16
+
+DATABASE_USER = "fisherfans"
+DATABASE_NAME = "fisherfans"
+TEMPLATE_NAME = "fisherfans_template"
+
+# Reglages d'un serveur jetable : aucune garantie de durabilite necessaire
+SERVER_SETTINGS = {
+    "listen_addresses": "127.0.0.1",
+    "fsync": "off",
+    "synchronous_commit": "off",
+    "full_page_writes": "off",
+}
+
+API_START_TIMEOUT = 60
+# L'API se comporte comme derriere un load balancer : X-Forwarded-For designe le client
+TRUST_PROXY = "1"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _pg_major_version(directory):
+    """Version majeure des binaires d'un repertoire (initdb --version), 0 si illisible."""
+    try:
+        output = subprocess.run(
+            [os.path.join(directory, "initdb"), "--version"], capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 0
+    match = re.search(r"(\d+)(?:\.\d+)?", output)
+    return int(match.group(1)) if match else 0
+
+
+def find_pg_bin():
+    """Repertoire des binaires PostgreSQL >= MIN_PG_VERSION : PG_BIN, puis PATH, puis
+    emplacements Debian/Homebrew."""
+    candidates = [os.environ.get("PG_BIN")]
+    initdb = shutil.which("initdb")
+    if initdb:
+        candidates.append(os.path.dirname(initdb))
+    candidates += sorted(glob.glob("/usr/lib/postgresql/*/bin"), reverse=True)
+    candidates += sorted(glob.glob("/opt/homebrew/opt/postgresql*/bin"), reverse=True)
+
+    for directory in candidates:
+        if directory and os.path.exists(os.path.join(directory, "initdb")):
+            if _pg_major_version(directory) >= MIN_PG_VERSION:
+                return directory
+    raise RuntimeError(
+        f"Binaires PostgreSQL >= {MIN_PG_VERSION} introuvables : installer PostgreSQL ou definir PG_BIN"
+    )
+
+
+class EphemeralDatabase:
+    """PostgreSQL jetable + API demarree sur un clone du template."""
+
+    def __init__(self, api_command=DEFAULT_API_COMMAND, pg_bin=None):
+        self.api_command = shlex.split(api_command)
+        self.pg_bin = pg_bin or find_pg_bin()
+        self.workdir = None
+        self.pg_port = None
+        self.api_port = None
+        self.api_process = None
+        self.api_log = None
+        # Aucun module n'a encore utilise la base clonee par start()
+        self.pristine = False
+
+    @property
+    def data_dir(self):
+        return os.path.join(self.workdir, "data")
+
+    @property
+    def api_url(self):
+        return f"http://127.0.0.1:{self.api_port}/api"
+
+    # -- PostgreSQL ------------------------------------------------------
+
+    def _run(self, binary, *args):
+        result = subprocess.run(
+            [os.path.join(self.pg_bin, binary), *args],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{binary} a echoue : {result.stderr.strip() or result.stdout.strip()}")
+        return result.stdout
+
+    def sql(self, *statements, database="postgres"):
+        """Execute chaque instruction hors transaction (requis par CREATE/DROP DATABASE)."""
+        args = ["-h", self.workdir, "-p", str(self.pg_port), "-U", DATABASE_USER, "-d", database]
+        args += ["-v", "ON_ERROR_STOP=1", "-q", "-X"]
+        for statement in statements:
+            args += ["-c", statement]
+        return self._run("psql", *args)
+
+    def _start_postgres(self):
+        self.workdir = tempfile.mkdtemp(prefix="fisherfans-pg-")
+        self.pg_port = _free_port()
+        self._run(
+            "initdb",
+            "-D", self.data_dir,
+            "-U", DATABASE_USER,
+            "--auth=trust",
+            "--encoding=UTF8",
+            "--no-sync",
+        )
+        options = [f"-p {self.pg_port}", f"-k {self.workdir}"]
+        options += [f"-c {name}={value}" for name, value in SERVER_SETTINGS.items()]
+        self._run(
+            "pg_ctl",
+            "-D", self.data_dir,
+            "-l", os.path.join(self.workdir, "postgres.log"),
+            "-o", " ".join(options),
+            "-w",
+            "start",
+        )
+
+    # -- API ---------------------------------------------------------------
+
+    def _start_api(self, database):
+        # Meme port a chaque redemarrage : BASE_URL reste valable pour toute la session
+        if self.api_port is None:
+            self.api_port = _free_port()
+        env = {
+            **os.environ,
+            "PORT": str(self.api_port),
+            "DATABASE_HOST": "127.0.0.1",
+            "DATABASE_PORT": str(self.pg_port),
+            "DATABASE_USER": DATABASE_USER,
+            "DATABASE_PASSWORD": DATABASE_USER,
+            "DATABASE_NAME": database,
+            "TRUST_PROXY": TRUST_PROXY,
+            # GET /api/health/runtime : etat du pool, verifie par les tests d'export
+            "RUNTIME_METRICS": "true",
+        }
+        self.api_log = open(os.path.join(self.workdir, f"api-{database}.log"), "a")
+        self.api_process = subprocess.Popen(
+            self.api_command,
+            cwd=ROOT_DIR,
+            env=env,
+            stdout=self.api_log,
+            stderr=subprocess.STDOUT,
+        )
+
+        deadline = time.monotonic() + API_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.api_process.poll() is not None:
+                raise RuntimeError(f"L'API s'est arretee au demarrage, voir {self.api_log.name}")
+            try:
+                with urllib.request.urlopen(f"{self.api_url}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.1)
+        raise RuntimeError(f"L'API n'a pas demarre en {API_START_TIMEOUT}s, voir {self.api_log.name}")
+
+    def _stop_api(self):
+        if self.api_process is not None:
+            self.api_process.terminate()
+            try:
+                self.api_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.api_process.kill()
+                self.api_process.wait()
+            self.api_process = None
+        if self.api_log is not None:
+            self.api_log.close()
+            self.api_log = None
+
+    # -- cycle de vie ------------------------------------------------------
+
+    def start(self):
+        """Demarre PostgreSQL, cree le template puis l'API sur un clone. Retourne l'URL /api."""
+        self._start_postgres()
+
+        # Migration unique : l'API cree le schema (synchronize) dans le futur template
+        self.sql(f"CREATE DATABASE {TEMPLATE_NAME}")
+        self._start_api(TEMPLATE_NAME)
+        self._stop_api()
+        self.sql(f"ALTER DATABASE {TEMPLATE_NAME} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false")
+
+        self.sql(f"CREATE DATABASE {DATABASE_NAME} TEMPLATE {TEMPLATE_NAME}")
+        self._start_api(DATABASE_NAME)
+        self.pristine = True
+        return self.api_url
+
+    def reset(self):
+        """Redemarre l'API sur un clone vierge du template (attend GET /health)."""
+        if self.pristine:
+            self.pristine = False
+            return
+        self._stop_api()
+        self.sql(
+            f"DROP DATABASE IF EXISTS {DATABASE_NAME} WITH (FORCE)",
+            f"CREATE DATABASE {DATABASE_NAME} TEMPLATE {TEMPLATE_NAME}",
+        )
+        self._start_api(DATABASE_NAME)
+
+    def stop(self):
+        self._stop_api()
+        if self.workdir is None:
+            return
+        if os.path.exists(os.path.join(self.data_dir, "postmaster.pid")):
+            subprocess.run(
+                [os.path.join(self.pg_bin, "pg_ctl"), "-D", self.data_dir, "-m", "immediate", "stop"],
+                capture_output=True,
+            )
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        self.workdir = None
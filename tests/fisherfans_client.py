@@ -0,0 +1,1426 @@
+"""
+Client Python type de l'API Fisher Fans
+
+FICHIER GENERE par tests/generate_client.py a partir de docs/openapi.json : ne pas le
+modifier a la main, relancer `npm run generate:oas` (ou `python tests/generate_client.py`).
+
+    client = FisherFansClient("http://localhost:8443/api", token=token)
+    boats = client.boats_find_all(minLat=43.5, maxLat=43.8)   # list[Boat]
+    boats[0].deposit                                          # Decimal
+
+Decodage : msgspec s'il est installe (directement dans les dataclasses), sinon orjson,
+sinon json, puis from_dict(). Les erreurs HTTP levent ApiError (code, businessCode, message).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import IO, Any
+
+import requests
+
+try:
+    import msgspec
+except ImportError:  # decodage plus lent, mais meme resultat
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ApiError(Exception):
+    """Reponse d'erreur de l'API (format {code, businessCode, message})."""
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body if isinstance(body, dict) else {}
+        self.business_code = self.body.get("businessCode")
+        super().__init__(f"{status} {self.business_code or ''} {self.body.get('message', '')}".strip())
+
+
+def _decimal(value):
+    return None if value is None else Decimal(str(value))
+
+
+def _date(value):
+    return None if value is None else date.fromisoformat(value[:10])
+
+
+def _datetime(value):
+    return None if value is None else datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _object(cls, value):
+    return None if value is None else cls.from_dict(value)
+
+
+def _list(convert, value):
+    return None if value is None else [convert(item) for item in value]
+
+
+def _loads(content):
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def _to_json(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return value
+
+
+_DECODERS = {}
+
+
+def decode(response_type, content):
+    """Decode un corps JSON en response_type (dataclass ou list[dataclass])."""
+    decoder = _DECODERS.get(response_type)
+    if decoder is None:
+        cls, is_list = response_type
+        if msgspec is not None:
+            typed = msgspec.json.Decoder(list[cls] if is_list else cls, strict=False)
+            decoder = typed.decode
+        elif is_list:
+            decoder = lambda content: [cls.from_dict(item) for item in _loads(content)]  # noqa: E731
+        else:
+            decoder = lambda content: cls.from_dict(_loads(content))  # noqa: E731
+        _DECODERS[response_type] = decoder
+    return decoder(content)
+
+
+@dataclass(slots=True, kw_only=True)
+class LoginDto:
+    """Corps de requete LoginDto (docs/openapi.json)."""
+
+    email: str
+    password: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LoginDto:
+        return cls(
+            email=data.get("email"),
+            password=data.get("password"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class RefreshTokenDto:
+    """Corps de requete RefreshTokenDto (docs/openapi.json)."""
+
+    refreshToken: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RefreshTokenDto:
+        return cls(
+            refreshToken=data.get("refreshToken"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class CreateUserDto:
+    """Corps de requete CreateUserDto (docs/openapi.json)."""
+
+    lastName: str
+    firstName: str
+    email: str
+    password: str
+    city: str
+    phone: str | None = None
+    photoUrl: str | None = None
+    status: str
+    boatLicenseNumber: str | None = None
+    insuranceNumber: str | None = None
+    companyName: str | None = None
+    activityType: str | None = None
+    birthDate: str | None = None
+    address: str | None = None
+    postalCode: str | None = None
+    languages: list[str] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CreateUserDto:
+        return cls(
+            lastName=data.get("lastName"),
+            firstName=data.get("firstName"),
+            email=data.get("email"),
+            password=data.get("password"),
+            city=data.get("city"),
+            phone=data.get("phone"),
+            photoUrl=data.get("photoUrl"),
+            status=data.get("status"),
+            boatLicenseNumber=data.get("boatLicenseNumber"),
+            insuranceNumber=data.get("insuranceNumber"),
+            companyName=data.get("companyName"),
+            activityType=data.get("activityType"),
+            birthDate=data.get("birthDate"),
+            address=data.get("address"),
+            postalCode=data.get("postalCode"),
+            languages=data.get("languages"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class UpdateUserDto:
+    """Corps de requete UpdateUserDto (docs/openapi.json)."""
+
+    lastName: str | None = None
+    firstName: str | None = None
+    email: str | None = None
+    password: str | None = None
+    city: str | None = None
+    phone: str | None = None
+    photoUrl: str | None = None
+    status: str | None = None
+    boatLicenseNumber: str | None = None
+    insuranceNumber: str | None = None
+    companyName: str | None = None
+    activityType: str | None = None
+    birthDate: str | None = None
+    address: str | None = None
+    postalCode: str | None = None
+    languages: list[str] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UpdateUserDto:
+        return cls(
+            lastName=data.get("lastName"),
+            firstName=data.get("firstName"),
+            email=data.get("email"),
+            password=data.get("password"),
+            city=data.get("city"),
+            phone=data.get("phone"),
+            photoUrl=data.get("photoUrl"),
+            status=data.get("status"),
+            boatLicenseNumber=data.get("boatLicenseNumber"),
+            insuranceNumber=data.get("insuranceNumber"),
+            companyName=data.get("companyName"),
+            activityType=data.get("activityType"),
+            birthDate=data.get("birthDate"),
+            address=data.get("address"),
+            postalCode=data.get("postalCode"),
+            languages=data.get("languages"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class CreateBoatDto:
+    """Corps de requete CreateBoatDto (docs/openapi.json)."""
+
+    name: str
+    description: str | None = None
+    brand: str | None = None
+    yearBuilt: float | None = None
+    photoUrl: str | None = None
+    licenseType: str | None = None
+    boatType: str
+    equipment: list[str] | None = None
+    deposit: float | None = None
+    maxCapacity: float
+    bedCount: float | None = None
+    homePort: str
+    latitude: float | None = None
+    longitude: float | None = None
+    engineType: str | None = None
+    enginePower: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CreateBoatDto:
+        return cls(
+            name=data.get("name"),
+            description=data.get("description"),
+            brand=data.get("brand"),
+            yearBuilt=data.get("yearBuilt"),
+            photoUrl=data.get("photoUrl"),
+            licenseType=data.get("licenseType"),
+            boatType=data.get("boatType"),
+            equipment=data.get("equipment"),
+            deposit=data.get("deposit"),
+            maxCapacity=data.get("maxCapacity"),
+            bedCount=data.get("bedCount"),
+            homePort=data.get("homePort"),
+            latitude=data.get("latitude"),
+            longitude=data.get("longitude"),
+            engineType=data.get("engineType"),
+            enginePower=data.get("enginePower"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class UpdateBoatDto:
+    """Corps de requete UpdateBoatDto (docs/openapi.json)."""
+
+    name: str | None = None
+    description: str | None = None
+    brand: str | None = None
+    yearBuilt: float | None = None
+    photoUrl: str | None = None
+    licenseType: str | None = None
+    boatType: str | None = None
+    equipment: list[str] | None = None
+    deposit: float | None = None
+    maxCapacity: float | None = None
+    bedCount: float | None = None
+    homePort: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    engineType: str | None = None
+    enginePower: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UpdateBoatDto:
+        return cls(
+            name=data.get("name"),
+            description=data.get("description"),
+            brand=data.get("brand"),
+            yearBuilt=data.get("yearBuilt"),
+            photoUrl=data.get("photoUrl"),
+            licenseType=data.get("licenseType"),
+            boatType=data.get("boatType"),
+            equipment=data.get("equipment"),
+            deposit=data.get("deposit"),
+            maxCapacity=data.get("maxCapacity"),
+            bedCount=data.get("bedCount"),
+            homePort=data.get("homePort"),
+            latitude=data.get("latitude"),
+            longitude=data.get("longitude"),
+            engineType=data.get("engineType"),
+            enginePower=data.get("enginePower"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class CreateTripDto:
+    """Corps de requete CreateTripDto (docs/openapi.json)."""
+
+    title: str
+    practicalInfo: str | None = None
+    tripType: str
+    pricingType: str
+    startDates: list[str] | None = None
+    endDates: list[str] | None = None
+    startTimes: list[str] | None = None
+    endTimes: list[str] | None = None
+    passengerCount: float
+    price: float
+    boatId: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CreateTripDto:
+        return cls(
+            title=data.get("title"),
+            practicalInfo=data.get("practicalInfo"),
+            tripType=data.get("tripType"),
+            pricingType=data.get("pricingType"),
+            startDates=data.get("startDates"),
+            endDates=data.get("endDates"),
+            startTimes=data.get("startTimes"),
+            endTimes=data.get("endTimes"),
+            passengerCount=data.get("passengerCount"),
+            price=data.get("price"),
+            boatId=data.get("boatId"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class UpdateTripDto:
+    """Corps de requete UpdateTripDto (docs/openapi.json)."""
+
+    title: str | None = None
+    practicalInfo: str | None = None
+    tripType: str | None = None
+    pricingType: str | None = None
+    startDates: list[str] | None = None
+    endDates: list[str] | None = None
+    startTimes: list[str] | None = None
+    endTimes: list[str] | None = None
+    passengerCount: float | None = None
+    price: float | None = None
+    boatId: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UpdateTripDto:
+        return cls(
+            title=data.get("title"),
+            practicalInfo=data.get("practicalInfo"),
+            tripType=data.get("tripType"),
+            pricingType=data.get("pricingType"),
+            startDates=data.get("startDates"),
+            endDates=data.get("endDates"),
+            startTimes=data.get("startTimes"),
+            endTimes=data.get("endTimes"),
+            passengerCount=data.get("passengerCount"),
+            price=data.get("price"),
+            boatId=data.get("boatId"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class CreateBookingDto:
+    """Corps de requete CreateBookingDto (docs/openapi.json)."""
+
+    tripId: str
+    selectedDate: str
+    seats: float
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CreateBookingDto:
+        return cls(
+            tripId=data.get("tripId"),
+            selectedDate=data.get("selectedDate"),
+            seats=data.get("seats"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class UpdateBookingDto:
+    """Corps de requete UpdateBookingDto (docs/openapi.json)."""
+
+    tripId: str | None = None
+    selectedDate: str | None = None
+    seats: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UpdateBookingDto:
+        return cls(
+            tripId=data.get("tripId"),
+            selectedDate=data.get("selectedDate"),
+            seats=data.get("seats"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class CreateLogbookEntryDto:
+    """Corps de requete CreateLogbookEntryDto (docs/openapi.json)."""
+
+    fishSpecies: str
+    photoUrl: str | None = None
+    comment: str | None = None
+    length: float | None = None
+    weight: float | None = None
+    location: str | None = None
+    fishingDate: str
+    released: bool
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CreateLogbookEntryDto:
+        return cls(
+            fishSpecies=data.get("fishSpecies"),
+            photoUrl=data.get("photoUrl"),
+            comment=data.get("comment"),
+            length=data.get("length"),
+            weight=data.get("weight"),
+            location=data.get("location"),
+            fishingDate=data.get("fishingDate"),
+            released=data.get("released"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class UpdateLogbookEntryDto:
+    """Corps de requete UpdateLogbookEntryDto (docs/openapi.json)."""
+
+    fishSpecies: str | None = None
+    photoUrl: str | None = None
+    comment: str | None = None
+    length: float | None = None
+    weight: float | None = None
+    location: str | None = None
+    fishingDate: str | None = None
+    released: bool | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UpdateLogbookEntryDto:
+        return cls(
+            fishSpecies=data.get("fishSpecies"),
+            photoUrl=data.get("photoUrl"),
+            comment=data.get("comment"),
+            length=data.get("length"),
+            weight=data.get("weight"),
+            location=data.get("location"),
+            fishingDate=data.get("fishingDate"),
+            released=data.get("released"),
+        )
+
+    def to_dict(self) -> dict:
+        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(slots=True, kw_only=True)
+class User:
+    """Reponse User (docs/openapi.json)."""
+
+    id: str | None = None
+    lastName: str | None = None
+    firstName: str | None = None
+    email: str | None = None
+    city: str | None = None
+    phone: str | None = None
+    photoUrl: str | None = None
+    status: str | None = None
+    boatLicenseNumber: str | None = None
+    insuranceNumber: str | None = None
+    companyName: str | None = None
+    activityType: str | None = None
+    birthDate: date | None = None
+    address: str | None = None
+    postalCode: str | None = None
+    languages: list[str] | None = None
+    createdAt: datetime | None = None
+    updatedAt: datetime | None = None
+    boats: list[Boat] | None = None
+    trips: list[Trip] | None = None
+    bookings: list[Booking] | None = None
+    logbookEntries: list[LogbookEntry] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> User:
+        return cls(
+            id=data.get("id"),
+            lastName=data.get("lastName"),
+            firstName=data.get("firstName"),
+            email=data.get("email"),
+            city=data.get("city"),
+            phone=data.get("phone"),
+            photoUrl=data.get("photoUrl"),
+            status=data.get("status"),
+            boatLicenseNumber=data.get("boatLicenseNumber"),
+            insuranceNumber=data.get("insuranceNumber"),
+            companyName=data.get("companyName"),
+            activityType=data.get("activityType"),
+            birthDate=_date(data.get("birthDate")),
+            address=data.get("address"),
+            postalCode=data.get("postalCode"),
+            languages=data.get("languages"),
+            createdAt=_datetime(data.get("createdAt")),
+            updatedAt=_datetime(data.get("updatedAt")),
+            boats=_list(Boat.from_dict, data.get("boats")),
+            trips=_list(Trip.from_dict, data.get("trips")),
+            bookings=_list(Booking.from_dict, data.get("bookings")),
+            logbookEntries=_list(LogbookEntry.from_dict, data.get("logbookEntries")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class Boat:
+    """Reponse Boat (docs/openapi.json)."""
+
+    id: str | None = None
+    name: str | None = None
+    description: str | None = None
+    brand: str | None = None
+    yearBuilt: int | None = None
+    photoUrl: str | None = None
+    licenseType: str | None = None
+    boatType: str | None = None
+    equipment: list[str] | None = None
+    deposit: Decimal | None = None
+    maxCapacity: int | None = None
+    bedCount: int | None = None
+    homePort: str | None = None
+    latitude: Decimal | None = None
+    longitude: Decimal | None = None
+    engineType: str | None = None
+    enginePower: int | None = None
+    createdAt: datetime | None = None
+    updatedAt: datetime | None = None
+    ownerId: str | None = None
+    owner: User | None = None
+    trips: list[Trip] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Boat:
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            description=data.get("description"),
+            brand=data.get("brand"),
+            yearBuilt=data.get("yearBuilt"),
+            photoUrl=data.get("photoUrl"),
+            licenseType=data.get("licenseType"),
+            boatType=data.get("boatType"),
+            equipment=data.get("equipment"),
+            deposit=_decimal(data.get("deposit")),
+            maxCapacity=data.get("maxCapacity"),
+            bedCount=data.get("bedCount"),
+            homePort=data.get("homePort"),
+            latitude=_decimal(data.get("latitude")),
+            longitude=_decimal(data.get("longitude")),
+            engineType=data.get("engineType"),
+            enginePower=data.get("enginePower"),
+            createdAt=_datetime(data.get("createdAt")),
+            updatedAt=_datetime(data.get("updatedAt")),
+            ownerId=data.get("ownerId"),
+            owner=_object(User, data.get("owner")),
+            trips=_list(Trip.from_dict, data.get("trips")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class Trip:
+    """Reponse Trip (docs/openapi.json)."""
+
+    id: str | None = None
+    title: str | None = None
+    practicalInfo: str | None = None
+    tripType: str | None = None
+    pricingType: str | None = None
+    startDates: list[str] | None = None
+    endDates: list[str] | None = None
+    startTimes: list[str] | None = None
+    endTimes: list[str] | None = None
+    passengerCount: int | None = None
+    price: Decimal | None = None
+    createdAt: datetime | None = None
+    updatedAt: datetime | None = None
+    organizerId: str | None = None
+    boatId: str | None = None
+    organizer: User | None = None
+    boat: Boat | None = None
+    bookings: list[Booking] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Trip:
+        return cls(
+            id=data.get("id"),
+            title=data.get("title"),
+            practicalInfo=data.get("practicalInfo"),
+            tripType=data.get("tripType"),
+            pricingType=data.get("pricingType"),
+            startDates=data.get("startDates"),
+            endDates=data.get("endDates"),
+            startTimes=data.get("startTimes"),
+            endTimes=data.get("endTimes"),
+            passengerCount=data.get("passengerCount"),
+            price=_decimal(data.get("price")),
+            createdAt=_datetime(data.get("createdAt")),
+            updatedAt=_datetime(data.get("updatedAt")),
+            organizerId=data.get("organizerId"),
+            boatId=data.get("boatId"),
+            organizer=_object(User, data.get("organizer")),
+            boat=_object(Boat, data.get("boat")),
+            bookings=_list(Booking.from_dict, data.get("bookings")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class TripSearch:
+    """Reponse TripSearch (docs/openapi.json)."""
+
+    tripId: str | None = None
+    occurrence: int | None = None
+    startDate: date | None = None
+    endDate: date | None = None
+    startTime: str | None = None
+    endTime: str | None = None
+    title: str | None = None
+    tripType: str | None = None
+    pricingType: str | None = None
+    price: Decimal | None = None
+    passengerCount: int | None = None
+    boatId: str | None = None
+    boatName: str | None = None
+    boatType: str | None = None
+    boatMaxCapacity: int | None = None
+    homePort: str | None = None
+    latitude: Decimal | None = None
+    longitude: Decimal | None = None
+    organizerId: str | None = None
+    organizerFirstName: str | None = None
+    organizerLastName: str | None = None
+    organizerCity: str | None = None
+    organizerPhotoUrl: str | None = None
+    organizerLanguages: list[str] | None = None
+    trip: Trip | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TripSearch:
+        return cls(
+            tripId=data.get("tripId"),
+            occurrence=data.get("occurrence"),
+            startDate=_date(data.get("startDate")),
+            endDate=_date(data.get("endDate")),
+            startTime=data.get("startTime"),
+            endTime=data.get("endTime"),
+            title=data.get("title"),
+            tripType=data.get("tripType"),
+            pricingType=data.get("pricingType"),
+            price=_decimal(data.get("price")),
+            passengerCount=data.get("passengerCount"),
+            boatId=data.get("boatId"),
+            boatName=data.get("boatName"),
+            boatType=data.get("boatType"),
+            boatMaxCapacity=data.get("boatMaxCapacity"),
+            homePort=data.get("homePort"),
+            latitude=_decimal(data.get("latitude")),
+            longitude=_decimal(data.get("longitude")),
+            organizerId=data.get("organizerId"),
+            organizerFirstName=data.get("organizerFirstName"),
+            organizerLastName=data.get("organizerLastName"),
+            organizerCity=data.get("organizerCity"),
+            organizerPhotoUrl=data.get("organizerPhotoUrl"),
+            organizerLanguages=data.get("organizerLanguages"),
+            trip=_object(Trip, data.get("trip")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class Booking:
+    """Reponse Booking (docs/openapi.json)."""
+
+    id: str | None = None
+    selectedDate: date | None = None
+    seats: int | None = None
+    totalPrice: Decimal | None = None
+    createdAt: datetime | None = None
+    updatedAt: datetime | None = None
+    tripId: str | None = None
+    userId: str | None = None
+    trip: Trip | None = None
+    user: User | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Booking:
+        return cls(
+            id=data.get("id"),
+            selectedDate=_date(data.get("selectedDate")),
+            seats=data.get("seats"),
+            totalPrice=_decimal(data.get("totalPrice")),
+            createdAt=_datetime(data.get("createdAt")),
+            updatedAt=_datetime(data.get("updatedAt")),
+            tripId=data.get("tripId"),
+            userId=data.get("userId"),
+            trip=_object(Trip, data.get("trip")),
+            user=_object(User, data.get("user")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class LogbookEntry:
+    """Reponse LogbookEntry (docs/openapi.json)."""
+
+    id: str | None = None
+    fishSpecies: str | None = None
+    photoUrl: str | None = None
+    comment: str | None = None
+    length: Decimal | None = None
+    weight: Decimal | None = None
+    location: str | None = None
+    fishingDate: date | None = None
+    released: bool | None = None
+    createdAt: datetime | None = None
+    updatedAt: datetime | None = None
+    userId: str | None = None
+    user: User | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LogbookEntry:
+        return cls(
+            id=data.get("id"),
+            fishSpecies=data.get("fishSpecies"),
+            photoUrl=data.get("photoUrl"),
+            comment=data.get("comment"),
+            length=_decimal(data.get("length")),
+            weight=_decimal(data.get("weight")),
+            location=data.get("location"),
+            fishingDate=_date(data.get("fishingDate")),
+            released=data.get("released"),
+            createdAt=_datetime(data.get("createdAt")),
+            updatedAt=_datetime(data.get("updatedAt")),
+            userId=data.get("userId"),
+            user=_object(User, data.get("user")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class AnonymizationJob:
+    """Reponse AnonymizationJob (docs/openapi.json)."""
+
+    id: str | None = None
+    status: str | None = None
+    step: str | None = None
+    processed: int | None = None
+    total: int | None = None
+    attempts: int | None = None
+    lockedUntil: datetime | None = None
+    error: str | None = None
+    createdAt: datetime | None = None
+    updatedAt: datetime | None = None
+    completedAt: datetime | None = None
+    userId: str | None = None
+    user: User | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> AnonymizationJob:
+        return cls(
+            id=data.get("id"),
+            status=data.get("status"),
+            step=data.get("step"),
+            processed=data.get("processed"),
+            total=data.get("total"),
+            attempts=data.get("attempts"),
+            lockedUntil=_datetime(data.get("lockedUntil")),
+            error=data.get("error"),
+            createdAt=_datetime(data.get("createdAt")),
+            updatedAt=_datetime(data.get("updatedAt")),
+            completedAt=_datetime(data.get("completedAt")),
+            userId=data.get("userId"),
+            user=_object(User, data.get("user")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class AuthResponse:
+    """Reponse AuthResponse (docs/openapi.json)."""
+
+    accessToken: str | None = None
+    refreshToken: str | None = None
+    expiresIn: int | None = None
+    user: User | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> AuthResponse:
+        return cls(
+            accessToken=data.get("accessToken"),
+            refreshToken=data.get("refreshToken"),
+            expiresIn=data.get("expiresIn"),
+            user=_object(User, data.get("user")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class BoatCluster:
+    """Reponse BoatCluster (docs/openapi.json)."""
+
+    z: int | None = None
+    x: int | None = None
+    y: int | None = None
+    count: int | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BoatCluster:
+        return cls(
+            z=data.get("z"),
+            x=data.get("x"),
+            y=data.get("y"),
+            count=data.get("count"),
+            latitude=data.get("latitude"),
+            longitude=data.get("longitude"),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class BoatTile:
+    """Reponse BoatTile (docs/openapi.json)."""
+
+    z: int | None = None
+    x: int | None = None
+    y: int | None = None
+    count: int | None = None
+    clusters: list[BoatCluster] | None = None
+    boats: list[Boat] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BoatTile:
+        return cls(
+            z=data.get("z"),
+            x=data.get("x"),
+            y=data.get("y"),
+            count=data.get("count"),
+            clusters=_list(BoatCluster.from_dict, data.get("clusters")),
+            boats=_list(Boat.from_dict, data.get("boats")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class BoatClusters:
+    """Reponse BoatClusters (docs/openapi.json)."""
+
+    tiles: list[BoatTile] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BoatClusters:
+        return cls(
+            tiles=_list(BoatTile.from_dict, data.get("tiles")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class FacetValue:
+    """Reponse FacetValue (docs/openapi.json)."""
+
+    value: str | None = None
+    count: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> FacetValue:
+        return cls(
+            value=data.get("value"),
+            count=data.get("count"),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class BoatFacetCounts:
+    """Reponse BoatFacetCounts (docs/openapi.json)."""
+
+    boatType: list[FacetValue] | None = None
+    engineType: list[FacetValue] | None = None
+    licenseType: list[FacetValue] | None = None
+    homePort: list[FacetValue] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BoatFacetCounts:
+        return cls(
+            boatType=_list(FacetValue.from_dict, data.get("boatType")),
+            engineType=_list(FacetValue.from_dict, data.get("engineType")),
+            licenseType=_list(FacetValue.from_dict, data.get("licenseType")),
+            homePort=_list(FacetValue.from_dict, data.get("homePort")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class BoatFacets:
+    """Reponse BoatFacets (docs/openapi.json)."""
+
+    total: int | None = None
+    facets: BoatFacetCounts | None = None
+    results: list[Boat] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BoatFacets:
+        return cls(
+            total=data.get("total"),
+            facets=_object(BoatFacetCounts, data.get("facets")),
+            results=_list(Boat.from_dict, data.get("results")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class TripFacetCounts:
+    """Reponse TripFacetCounts (docs/openapi.json)."""
+
+    tripType: list[FacetValue] | None = None
+    pricingType: list[FacetValue] | None = None
+    price: list[FacetValue] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TripFacetCounts:
+        return cls(
+            tripType=_list(FacetValue.from_dict, data.get("tripType")),
+            pricingType=_list(FacetValue.from_dict, data.get("pricingType")),
+            price=_list(FacetValue.from_dict, data.get("price")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class TripFacets:
+    """Reponse TripFacets (docs/openapi.json)."""
+
+    total: int | None = None
+    facets: TripFacetCounts | None = None
+    results: list[Trip] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TripFacets:
+        return cls(
+            total=data.get("total"),
+            facets=_object(TripFacetCounts, data.get("facets")),
+            results=_list(Trip.from_dict, data.get("results")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class LogbookImportError:
+    """Reponse LogbookImportError (docs/openapi.json)."""
+
+    line: int | None = None
+    errors: list[str] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LogbookImportError:
+        return cls(
+            line=data.get("line"),
+            errors=data.get("errors"),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class LogbookImportReport:
+    """Reponse LogbookImportReport (docs/openapi.json)."""
+
+    imported: int | None = None
+    failed: int | None = None
+    errors: list[LogbookImportError] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LogbookImportReport:
+        return cls(
+            imported=data.get("imported"),
+            failed=data.get("failed"),
+            errors=_list(LogbookImportError.from_dict, data.get("errors")),
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class UserExport:
+    """Reponse UserExport (docs/openapi.json)."""
+
+    id: str | None = None
+    userId: str | None = None
+    status: str | None = None
+    createdAt: datetime | None = None
+    completedAt: datetime | None = None
+    expiresAt: datetime | None = None
+    size: int | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UserExport:
+        return cls(
+            id=data.get("id"),
+            userId=data.get("userId"),
+            status=data.get("status"),
+            createdAt=_datetime(data.get("createdAt")),
+            completedAt=_datetime(data.get("completedAt")),
+            expiresAt=_datetime(data.get("expiresAt")),
+            size=data.get("size"),
+            error=data.get("error"),
+        )
+
+
+class FisherFansClient:
+    """Une methode par operation de docs/openapi.json."""
+
+    def __init__(self, base_url, token=None, session=None, verify=False):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.verify = verify
+        self.token = token
+
+    def _request(self, method, path, params=None, body=None, data=None, headers=None, response_type=None, raw=False):
+        headers = {key: value for key, value in (headers or {}).items() if value is not None}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        response = self.session.request(
+            method,
+            self.base_url + path,
+            params={key: value for key, value in (params or {}).items() if value is not None},
+            json=_to_json(body),
+            data=data,
+            headers=headers,
+            verify=self.verify,
+        )
+        if response.status_code >= 400:
+            try:
+                error = response.json()
+            except ValueError:
+                error = None
+            raise ApiError(response.status_code, error)
+        if raw:
+            return response.content
+        if response_type is None or not response.content:
+            return None
+        return decode(response_type, response.content)
+
+    def auth_login(self, body: LoginDto | dict) -> AuthResponse:
+        """POST /auth/v1/login : User login"""
+        return self._request(
+            "POST",
+            "/auth/v1/login",
+            body=body,
+            response_type=(AuthResponse, False),
+        )
+
+    def auth_refresh(self, body: RefreshTokenDto | dict) -> AuthResponse:
+        """POST /auth/v1/refresh : Refresh access token (rotates the refresh token)"""
+        return self._request(
+            "POST",
+            "/auth/v1/refresh",
+            body=body,
+            response_type=(AuthResponse, False),
+        )
+
+    def auth_logout(self, body: RefreshTokenDto | dict) -> None:
+        """POST /auth/v1/logout : Revoke a refresh token"""
+        return self._request(
+            "POST",
+            "/auth/v1/logout",
+            body=body,
+        )
+
+    def users_create(self, body: CreateUserDto | dict, *, idempotency_key: str | None = None) -> User:
+        """POST /v1/users : Create new user"""
+        return self._request(
+            "POST",
+            "/v1/users",
+            body=body,
+            headers={"Idempotency-Key": idempotency_key},
+            response_type=(User, False),
+        )
+
+    def users_find_all(self, *, lastName: str | None = None, city: str | None = None, status: str | None = None, languages: str | None = None) -> list[User]:
+        """GET /v1/users : Search users"""
+        return self._request(
+            "GET",
+            "/v1/users",
+            params={"lastName": lastName, "city": city, "status": status, "languages": languages},
+            response_type=(User, True),
+        )
+
+    def users_find_one(self, userId: str) -> User:
+        """GET /v1/users/{userId} : Get user details"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}",
+            response_type=(User, False),
+        )
+
+    def users_update(self, userId: str, body: UpdateUserDto | dict) -> User:
+        """PUT /v1/users/{userId} : Update user"""
+        return self._request(
+            "PUT",
+            f"/v1/users/{userId}",
+            body=body,
+            response_type=(User, False),
+        )
+
+    def users_remove(self, userId: str) -> None:
+        """DELETE /v1/users/{userId} : Delete user account (GDPR)"""
+        return self._request(
+            "DELETE",
+            f"/v1/users/{userId}",
+        )
+
+    def users_get_anonymization(self, userId: str) -> AnonymizationJob:
+        """GET /v1/users/{userId}/anonymization : Get progress of the background erasure started by DELETE"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}/anonymization",
+            response_type=(AnonymizationJob, False),
+        )
+
+    def users_get_user_boats(self, userId: str) -> list[Boat]:
+        """GET /v1/users/{userId}/boats : Get user's boats"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}/boats",
+            response_type=(Boat, True),
+        )
+
+    def users_get_user_trips(self, userId: str) -> list[Trip]:
+        """GET /v1/users/{userId}/trips : Get user's trips"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}/trips",
+            response_type=(Trip, True),
+        )
+
+    def users_get_user_bookings(self, userId: str) -> list[Booking]:
+        """GET /v1/users/{userId}/bookings : Get user's bookings"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}/bookings",
+            response_type=(Booking, True),
+        )
+
+    def users_export_data(self, userId: str, *, format: str | None = None) -> bytes:
+        """GET /v1/users/{userId}/export : Export all personal data (GDPR), streamed"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}/export",
+            params={"format": format},
+            raw=True,
+        )
+
+    def users_start_export(self, userId: str) -> UserExport:
+        """POST /v1/users/{userId}/exports : Start a background export of all personal data (GDPR)"""
+        return self._request(
+            "POST",
+            f"/v1/users/{userId}/exports",
+            response_type=(UserExport, False),
+        )
+
+    def users_get_export(self, userId: str, exportId: str) -> UserExport:
+        """GET /v1/users/{userId}/exports/{exportId} : Get background export status"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}/exports/{exportId}",
+            response_type=(UserExport, False),
+        )
+
+    def users_download_export(self, userId: str, exportId: str) -> bytes:
+        """GET /v1/users/{userId}/exports/{exportId}/download : Download a completed background export"""
+        return self._request(
+            "GET",
+            f"/v1/users/{userId}/exports/{exportId}/download",
+            raw=True,
+        )
+
+    def boats_create(self, body: CreateBoatDto | dict, *, idempotency_key: str | None = None) -> Boat:
+        """POST /v1/boats : Create new boat"""
+        return self._request(
+            "POST",
+            "/v1/boats",
+            body=body,
+            headers={"Idempotency-Key": idempotency_key},
+            response_type=(Boat, False),
+        )
+
+    def boats_find_all(self, *, boatType: str | None = None, homePort: str | None = None, minCapacity: float | None = None, equipment: str | None = None, minLat: float | None = None, maxLat: float | None = None, minLng: float | None = None, maxLng: float | None = None) -> list[Boat]:
+        """GET /v1/boats : Search boats"""
+        return self._request(
+            "GET",
+            "/v1/boats",
+            params={"boatType": boatType, "homePort": homePort, "minCapacity": minCapacity, "equipment": equipment, "minLat": minLat, "maxLat": maxLat, "minLng": minLng, "maxLng": maxLng},
+            response_type=(Boat, True),
+        )
+
+    def boats_facets(self, *, boatType: str | None = None, homePort: str | None = None, minCapacity: float | None = None, equipment: str | None = None, minLat: float | None = None, maxLat: float | None = None, minLng: float | None = None, maxLng: float | None = None, limit: float | None = None, offset: float | None = None) -> BoatFacets:
+        """GET /v1/boats/facets : Boat search facet counts"""
+        return self._request(
+            "GET",
+            "/v1/boats/facets",
+            params={"boatType": boatType, "homePort": homePort, "minCapacity": minCapacity, "equipment": equipment, "minLat": minLat, "maxLat": maxLat, "minLng": minLng, "maxLng": maxLng, "limit": limit, "offset": offset},
+            response_type=(BoatFacets, False),
+        )
+
+    def boats_find_clusters(self, *, tiles: str | None = None, zoom: float | None = None, minLat: float | None = None, maxLat: float | None = None, minLng: float | None = None, maxLng: float | None = None, boatType: str | None = None) -> BoatClusters:
+        """GET /v1/boats/clusters : Boat clusters by map tile"""
+        return self._request(
+            "GET",
+            "/v1/boats/clusters",
+            params={"tiles": tiles, "zoom": zoom, "minLat": minLat, "maxLat": maxLat, "minLng": minLng, "maxLng": maxLng, "boatType": boatType},
+            response_type=(BoatClusters, False),
+        )
+
+    def boats_find_one(self, boatId: str) -> Boat:
+        """GET /v1/boats/{boatId} : Get boat details"""
+        return self._request(
+            "GET",
+            f"/v1/boats/{boatId}",
+            response_type=(Boat, False),
+        )
+
+    def boats_update(self, boatId: str, body: UpdateBoatDto | dict) -> Boat:
+        """PUT /v1/boats/{boatId} : Update boat"""
+        return self._request(
+            "PUT",
+            f"/v1/boats/{boatId}",
+            body=body,
+            response_type=(Boat, False),
+        )
+
+    def boats_remove(self, boatId: str) -> None:
+        """DELETE /v1/boats/{boatId} : Delete boat"""
+        return self._request(
+            "DELETE",
+            f"/v1/boats/{boatId}",
+        )
+
+    def trips_create(self, body: CreateTripDto | dict, *, idempotency_key: str | None = None) -> Trip:
+        """POST /v1/trips : Create new trip"""
+        return self._request(
+            "POST",
+            "/v1/trips",
+            body=body,
+            headers={"Idempotency-Key": idempotency_key},
+            response_type=(Trip, False),
+        )
+
+    def trips_find_all(self, *, tripType: str | None = None, minPrice: float | None = None, maxPrice: float | None = None, startDate: str | None = None) -> list[Trip]:
+        """GET /v1/trips : Search fishing trips"""
+        return self._request(
+            "GET",
+            "/v1/trips",
+            params={"tripType": tripType, "minPrice": minPrice, "maxPrice": maxPrice, "startDate": startDate},
+            response_type=(Trip, True),
+        )
+
+    def trips_facets(self, *, tripType: str | None = None, minPrice: float | None = None, maxPrice: float | None = None, startDate: str | None = None, priceStep: float | None = None, limit: float | None = None, offset: float | None = None) -> TripFacets:
+        """GET /v1/trips/facets : Trip search facet counts"""
+        return self._request(
+            "GET",
+            "/v1/trips/facets",
+            params={"tripType": tripType, "minPrice": minPrice, "maxPrice": maxPrice, "startDate": startDate, "priceStep": priceStep, "limit": limit, "offset": offset},
+            response_type=(TripFacets, False),
+        )
+
+    def trips_search(self, *, fromDate: str | None = None, toDate: str | None = None, minPrice: float | None = None, maxPrice: float | None = None, tripType: str | None = None, boatType: str | None = None, seats: float | None = None, languages: str | None = None, minLat: float | None = None, maxLat: float | None = None, minLng: float | None = None, maxLng: float | None = None, limit: float | None = None, offset: float | None = None) -> list[TripSearch]:
+        """GET /v1/trips/search : Search trip occurrences (one result per trip and date)"""
+        return self._request(
+            "GET",
+            "/v1/trips/search",
+            params={"fromDate": fromDate, "toDate": toDate, "minPrice": minPrice, "maxPrice": maxPrice, "tripType": tripType, "boatType": boatType, "seats": seats, "languages": languages, "minLat": minLat, "maxLat": maxLat, "minLng": minLng, "maxLng": maxLng, "limit": limit, "offset": offset},
+            response_type=(TripSearch, True),
+        )
+
+    def trips_find_one(self, tripId: str) -> Trip:
+        """GET /v1/trips/{tripId} : Get trip details"""
+        return self._request(
+            "GET",
+            f"/v1/trips/{tripId}",
+            response_type=(Trip, False),
+        )
+
+    def trips_update(self, tripId: str, body: UpdateTripDto | dict) -> Trip:
+        """PUT /v1/trips/{tripId} : Update trip"""
+        return self._request(
+            "PUT",
+            f"/v1/trips/{tripId}",
+            body=body,
+            response_type=(Trip, False),
+        )
+
+    def trips_remove(self, tripId: str) -> None:
+        """DELETE /v1/trips/{tripId} : Delete trip"""
+        return self._request(
+            "DELETE",
+            f"/v1/trips/{tripId}",
+        )
+
+    def bookings_create(self, body: CreateBookingDto | dict, *, idempotency_key: str | None = None) -> Booking:
+        """POST /v1/bookings : Create new booking"""
+        return self._request(
+            "POST",
+            "/v1/bookings",
+            body=body,
+            headers={"Idempotency-Key": idempotency_key},
+            response_type=(Booking, False),
+        )
+
+    def bookings_find_all(self, *, tripId: str | None = None, userId: str | None = None, fromDate: str | None = None, toDate: str | None = None) -> list[Booking]:
+        """GET /v1/bookings : Search bookings"""
+        return self._request(
+            "GET",
+            "/v1/bookings",
+            params={"tripId": tripId, "userId": userId, "fromDate": fromDate, "toDate": toDate},
+            response_type=(Booking, True),
+        )
+
+    def bookings_find_one(self, bookingId: str) -> Booking:
+        """GET /v1/bookings/{bookingId} : Get booking details"""
+        return self._request(
+            "GET",
+            f"/v1/bookings/{bookingId}",
+            response_type=(Booking, False),
+        )
+
+    def bookings_update(self, bookingId: str, body: UpdateBookingDto | dict) -> Booking:
+        """PUT /v1/bookings/{bookingId} : Update booking"""
+        return self._request(
+            "PUT",
+            f"/v1/bookings/{bookingId}",
+            body=body,
+            response_type=(Booking, False),
+        )
+
+    def bookings_remove(self, bookingId: str) -> None:
+        """DELETE /v1/bookings/{bookingId} : Cancel booking"""
+        return self._request(
+            "DELETE",
+            f"/v1/bookings/{bookingId}",
+        )
+
+    def logbook_create(self, body: CreateLogbookEntryDto | dict, *, idempotency_key: str | None = None) -> LogbookEntry:
+        """POST /v1/logbook : Create logbook entry"""
+        return self._request(
+            "POST",
+            "/v1/logbook",
+            body=body,
+            headers={"Idempotency-Key": idempotency_key},
+            response_type=(LogbookEntry, False),
+        )
+
+    def logbook_find_all(self, *, userId: str | None = None, startDate: str | None = None, fishSpecies: str | None = None) -> list[LogbookEntry]:
+        """GET /v1/logbook : Get logbook entries"""
+        return self._request(
+            "GET",
+            "/v1/logbook",
+            params={"userId": userId, "startDate": startDate, "fishSpecies": fishSpecies},
+            response_type=(LogbookEntry, True),
+        )
+
+    def logbook_import(self, data: bytes | IO, *, content_type: str = "text/csv") -> LogbookImportReport:
+        """POST /v1/logbook/import : Import logbook entries from a CSV or GPX file"""
+        return self._request(
+            "POST",
+            "/v1/logbook/import",
+            data=data,
+            headers={"Content-Type": content_type},
+            response_type=(LogbookImportReport, False),
+        )
+
+    def logbook_find_one(self, entryId: str) -> LogbookEntry:
+        """GET /v1/logbook/{entryId} : Get logbook entry details"""
+        return self._request(
+            "GET",
+            f"/v1/logbook/{entryId}",
+            response_type=(LogbookEntry, False),
+        )
+
+    def logbook_update(self, entryId: str, body: UpdateLogbookEntryDto | dict) -> LogbookEntry:
+        """PUT /v1/logbook/{entryId} : Update logbook entry"""
+        return self._request(
+            "PUT",
+            f"/v1/logbook/{entryId}",
+            body=body,
+            response_type=(LogbookEntry, False),
+        )
+
+    def logbook_remove(self, entryId: str) -> None:
+        """DELETE /v1/logbook/{entryId} : Delete logbook entry"""
+        return self._request(
+            "DELETE",
+            f"/v1/logbook/{entryId}",
+        )
@@ -0,0 +1,202 @@
+"""
+Cache de tokens et creation concurrente des donnees de test
+
+Chaque creation d'utilisateur (bcrypt.hash) et chaque login (bcrypt.compare) coute
+~100 ms cote API. Plutot que de recreer et reconnecter les memes utilisateurs dans
+chaque module, la session les cree une seule fois et garde leurs tokens:
+
+- TokenCache : un accessToken par (email, mot de passe), reutilise tant qu'il n'expire
+  pas dans les EXPIRY_MARGIN prochaines secondes (champ "exp" du JWT), sinon nouveau login
+- FixtureFactory : cree en parallele des utilisateurs independants (creation + login
+  dans un thread chacun) et les garde en cache jusqu'a invalidate() (reset de la base)
+
+Les donnees des ressources de test (*_payload) sont partagees par les fixtures de
+conftest.py et les scenarios de charge (load/scenarios.py).
+"""
+
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Un token qui expire dans moins de EXPIRY_MARGIN secondes est renouvele
+EXPIRY_MARGIN = 30
+MAX_WORKERS = 8
+
+
+def user_payload(uid):
+    """Donnees POST /users d'un particulier sans permis."""
+    return {
+        "lastName": f"TestUser{uid}",
+        "firstName": f"Prenom{uid}",
+        "email": f"test.user.{uid}@fisherfans.test",
+        "password": "TestPassword123!",
+        "city": "Nice",
+        "phone": "+33612345678",
+        "status": "individual"
+    }
+
+
+def user_with_permit_payload(uid):
+    """Donnees POST /users d'un particulier avec permis bateau."""
+    return {
+        "lastName": f"TestPermit{uid}",
+        "firstName": f"PrenomPermit{uid}",
+        "email": f"test.permit.{uid}@fisherfans.test",
+        "password": "TestPassword123!",
+        "city": "Marseille",
+        "phone": "+33698765432",
+        "status": "individual",
+        "boatLicenseNumber": "12345678",
+        "insuranceNumber": "ABC123456789"
+    }
+
+
+def professional_user_payload(uid):
+    """Donnees POST /users d'un professionnel."""
+    return {
+        "lastName": f"TestPro{uid}",
+        "firstName": f"PrenomPro{uid}",
+        "email": f"test.pro.{uid}@fisherfans.test",
+        "password": "TestPassword123!",
+        "city": "Antibes",
+        "phone": "+33611223344",
+        "status": "professional",
+        "boatLicenseNumber": "87654321",
+        "insuranceNumber": "XYZ987654321",
+        "companyName": f"Societe{uid}",
+        "activityType": "rental"
+    }
+
+
+def boat_payload(uid):
+    """Donnees POST /boats d'un bateau complet a Nice."""
+    return {
+        "name": f"TestBoat{uid}",
+        "description": "Bateau de test pour pytest",
+        "brand": "TestBrand",
+        "yearBuilt": 2020,
+        "boatType": "open",
+        "equipment": ["gps", "sounder", "vhf_radio"],
+        "deposit": 500.00,
+        "maxCapacity": 6,
+        "bedCount": 2,
+        "homePort": "Nice",
+        "latitude": 43.7102,
+        "longitude": 7.2620,
+        "engineType": "diesel",
+        "enginePower": 150
+    }
+
+
+def trip_payload(boat_id):
+    """Donnees POST /trips d'une sortie a la journee sur ce bateau."""
+    return {
+        "title": "Sortie Peche Test Pytest",
+        "practicalInfo": "Rendez-vous au port a 6h",
+        "tripType": "daily",
+        "pricingType": "per_person",
+        "startDates": ["2026-03-01"],
+        "endDates": ["2026-03-01"],
+        "startTimes": ["06:00"],
+        "endTimes": ["14:00"],
+        "passengerCount": 4,
+        "price": 75.00,
+        "boatId": boat_id
+    }
+
+
+def jwt_expiry(token):
+    """Date d'expiration (timestamp) d'un JWT, sans verifier sa signature."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0.0
+
+
+class TokenCache:
+    """accessTokens de la session, renouveles a l'approche de leur expiration."""
+
+    def __init__(self, url_for):
+        self.url_for = url_for
+        self.tokens = {}
+        self.lock = threading.Lock()
+
+    def put(self, email, password, token):
+        with self.lock:
+            self.tokens[(email, password)] = token
+
+    def get(self, email, password):
+        """Token valide pour cet utilisateur (login si absent ou bientot expire), None si echec."""
+        with self.lock:
+            token = self.tokens.get((email, password))
+        if token and jwt_expiry(token) - time.time() > EXPIRY_MARGIN:
+            return token
+
+        response = requests.post(
+            self.url_for("/auth/v1/login"),
+            json={"email": email, "password": password},
+            verify=False
+        )
+        if response.status_code not in [200, 201]:
+            return None
+        token = response.json().get("accessToken")
+        self.put(email, password, token)
+        return token
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+
+
+class FixtureFactory:
+    """Utilisateurs de test crees une fois, en parallele, puis partages."""
+
+    def __init__(self, url_for, token_cache):
+        self.url_for = url_for
+        self.token_cache = token_cache
+        self.users = {}
+        self.lock = threading.Lock()
+
+    def _create_user(self, user_data):
+        response = requests.post(self.url_for("/users"), json=user_data, verify=False)
+        if response.status_code != 201:
+            return None
+        user = response.json()
+        user["password"] = user_data["password"]
+        # Login immediat dans le meme thread : le token est pret pour les fixtures auth_*
+        self.token_cache.get(user["email"], user["password"])
+        return user
+
+    def create_users(self, users_data):
+        """Cree les utilisateurs absents du cache en parallele.
+
+        users_data : {nom: donnees POST /users}. Retourne {nom: utilisateur ou None}.
+        """
+        with self.lock:
+            missing = {
+                name: data for name, data in users_data.items()
+                if data["email"] not in self.users
+            }
+            if missing:
+                with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(missing))) as pool:
+                    created = dict(zip(missing, pool.map(self._create_user, missing.values())))
+                for name, data in missing.items():
+                    self.users[data["email"]] = created[name]
+
+            # Copies : un test qui modifie son utilisateur n'affecte pas les autres modules
+            return {
+                name: dict(self.users[data["email"]]) if self.users[data["email"]] else None
+                for name, data in users_data.items()
+            }
+
+    def invalidate(self):
+        """Oublie les utilisateurs et tokens (base reinitialisee)."""
+        with self.lock:
+            self.users.clear()
+        self.token_cache.clear()
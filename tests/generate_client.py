@@ -0,0 +1,359 @@
+"""
+Generateur du client Python type de l'API (tests/fisherfans_client.py)
+
+Lit docs/openapi.json et ecrit:
+- une dataclass a slots par schema de reponse (User, Boat, Trip...) et par DTO de requete
+  (CreateBoatDto...), avec des champs types (Decimal, date, datetime, listes, relations)
+- une methode par operation sur FisherFansClient, dont le type de retour est celui de la
+  reponse de l'operation
+
+Le client decode les reponses avec msgspec s'il est installe (directement dans les
+dataclasses, sans dictionnaire intermediaire), sinon avec orjson ou json puis from_dict().
+
+Lance automatiquement par `npm run generate:oas`, ou a la main:
+    python tests/generate_client.py [--check]
+"""
+
+import argparse
+import json
+import keyword
+import os
+import re
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SPEC = os.path.join(TESTS_DIR, "..", "docs", "openapi.json")
+DEFAULT_OUTPUT = os.path.join(TESTS_DIR, "fisherfans_client.py")
+
+# format OpenAPI -> (annotation Python, convertisseur de from_dict)
+STRING_FORMATS = {
+    "decimal": ("Decimal", "_decimal"),
+    "date": ("date", "_date"),
+    "date-time": ("datetime", "_datetime"),
+}
+SCALAR_TYPES = {"string": "str", "integer": "int", "number": "float", "boolean": "bool"}
+
+HEADER = '''"""
+Client Python type de l'API Fisher Fans
+
+FICHIER GENERE par tests/generate_client.py a partir de docs/openapi.json : ne pas le
+modifier a la main, relancer `npm run generate:oas` (ou `python tests/generate_client.py`).
+
+    client = FisherFansClient("http://localhost:8443/api", token=token)
+    boats = client.boats_find_all(minLat=43.5, maxLat=43.8)   # list[Boat]
+    boats[0].deposit                                          # Decimal
+
+Decodage : msgspec s'il est installe (directement dans les dataclasses), sinon orjson,
+sinon json, puis from_dict(). Les erreurs HTTP levent ApiError (code, businessCode, message).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import IO, Any
+
+import requests
+
+try:
+    import msgspec
+except ImportError:  # decodage plus lent, mais meme resultat
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ApiError(Exception):
+    """Reponse d'erreur de l'API (format {code, businessCode, message})."""
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body if isinstance(body, dict) else {}
+        self.business_code = self.body.get("businessCode")
+        super().__init__(f"{status} {self.business_code or ''} {self.body.get('message', '')}".strip())
+
+
+def _decimal(value):
+    return None if value is None else Decimal(str(value))
+
+
+def _date(value):
+    return None if value is None else date.fromisoformat(value[:10])
+
+
+def _datetime(value):
+    return None if value is None else datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _object(cls, value):
+    return None if value is None else cls.from_dict(value)
+
+
+def _list(convert, value):
+    return None if value is None else [convert(item) for item in value]
+
+
+def _loads(content):
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def _to_json(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return value
+
+
+_DECODERS = {}
+
+
+def decode(response_type, content):
+    """Decode un corps JSON en response_type (dataclass ou list[dataclass])."""
+    decoder = _DECODERS.get(response_type)
+    if decoder is None:
+        cls, is_list = response_type
+        if msgspec is not None:
+            typed = msgspec.json.Decoder(list[cls] if is_list else cls, strict=False)
+            decoder = typed.decode
+        elif is_list:
+            decoder = lambda content: [cls.from_dict(item) for item in _loads(content)]  # noqa: E731
+        else:
+            decoder = lambda content: cls.from_dict(_loads(content))  # noqa: E731
+        _DECODERS[response_type] = decoder
+    return decoder(content)
+'''
+
+CLIENT = '''
+
+class FisherFansClient:
+    """Une methode par operation de docs/openapi.json."""
+
+    def __init__(self, base_url, token=None, session=None, verify=False):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.verify = verify
+        self.token = token
+
+    def _request(self, method, path, params=None, body=None, data=None, headers=None, response_type=None, raw=False):
+        headers = {key: value for key, value in (headers or {}).items() if value is not None}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        response = self.session.request(
+            method,
+            self.base_url + path,
+            params={key: value for key, value in (params or {}).items() if value is not None},
+            json=_to_json(body),
+            data=data,
+            headers=headers,
+            verify=self.verify,
+        )
+        if response.status_code >= 400:
+            try:
+                error = response.json()
+            except ValueError:
+                error = None
+            raise ApiError(response.status_code, error)
+        if raw:
+            return response.content
+        if response_type is None or not response.content:
+            return None
+        return decode(response_type, response.content)
+'''
+
+
+def _ref_name(schema):
+    return schema["$ref"].rsplit("/", 1)[-1]
+
+
+def _annotation(schema):
+    """(annotation, expression de conversion de from_dict avec {} pour la valeur, ou None)."""
+    if "$ref" in schema:
+        name = _ref_name(schema)
+        return name, f"_object({name}, {{}})"
+    if schema.get("type") == "array":
+        item, convert = _annotation(schema.get("items", {}))
+        if convert is None:
+            return f"list[{item}]", None
+        return f"list[{item}]", f"_list({_item_converter(schema['items'])}, {{}})"
+    if schema.get("type") == "string" and schema.get("format") in STRING_FORMATS:
+        annotation, converter = STRING_FORMATS[schema["format"]]
+        return annotation, f"{converter}({{}})"
+    return SCALAR_TYPES.get(schema.get("type"), "Any"), None
+
+
+def _item_converter(schema):
+    if "$ref" in schema:
+        return f"{_ref_name(schema)}.from_dict"
+    return STRING_FORMATS[schema["format"]][1]
+
+
+def _identifier(name):
+    name = re.sub(r"\W", "_", name)
+    return f"{name}_" if keyword.iskeyword(name) else name
+
+
+def _snake(name):
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _header_argument(name):
+    """Idempotency-Key -> idempotency_key"""
+    return re.sub(r"\W", "_", name).lower()
+
+
+def render_schema(name, schema):
+    properties = schema.get("properties", {})
+    is_request = name.endswith("Dto")
+    doc = "Corps de requete" if is_request else "Reponse"
+    lines = ["", "", "@dataclass(slots=True, kw_only=True)", f"class {name}:", f'    """{doc} {name} (docs/openapi.json)."""', ""]
+    required = set(schema.get("required", [])) if is_request else set()
+    for field, field_schema in properties.items():
+        annotation, _ = _annotation(field_schema)
+        if field in required:
+            lines.append(f"    {_identifier(field)}: {annotation}")
+        else:
+            lines.append(f"    {_identifier(field)}: {annotation} | None = None")
+    if not properties:
+        lines.append("    pass")
+
+    lines += ["", "    @classmethod", "    def from_dict(cls, data: dict) -> " + name + ":", "        return cls("]
+    for field, field_schema in properties.items():
+        _, convert = _annotation(field_schema)
+        value = f'data.get("{field}")'
+        lines.append(f"            {_identifier(field)}={convert.format(value) if convert else value},")
+    lines.append("        )")
+
+    if is_request:
+        lines += [
+            "",
+            "    def to_dict(self) -> dict:",
+            "        # Les champs non renseignes ne sont pas envoyes (forbidNonWhitelisted accepte l'absence)",
+            "        return {key: value for key, value in asdict(self).items() if value is not None}",
+        ]
+    return lines
+
+
+def _success_response(operation):
+    for status in ("200", "201", "202"):
+        response = operation.get("responses", {}).get(status)
+        if response:
+            content = response.get("content", {})
+            schema = content.get("application/json", {}).get("schema")
+            if schema is None:
+                # Fichier (export NDJSON, gzip...) : corps renvoye tel quel, en octets
+                if any(media.get("schema", {}).get("format") == "binary" for media in content.values()):
+                    return "bytes", None
+                return None
+            if schema.get("type") == "array":
+                return _ref_name(schema["items"]), True
+            return _ref_name(schema), False
+    return None
+
+
+def _is_event_stream(operation):
+    return "text/event-stream" in operation.get("responses", {}).get("200", {}).get("content", {})
+
+
+def _method_name(operation_id):
+    controller, _, action = operation_id.partition("_")
+    return f"{_snake(controller.removesuffix('Controller'))}_{_snake(action)}"
+
+
+def render_operation(path, method, operation):
+    parameters = operation.get("parameters", [])
+    path_params = [p for p in parameters if p["in"] == "path"]
+    query_params = [p for p in parameters if p["in"] == "query"]
+    header_params = [p for p in parameters if p["in"] == "header"]
+    content = operation.get("requestBody", {}).get("content", {})
+    body = content.get("application/json")
+    # Corps non JSON (fichier CSV, GPX...) : octets ou fichier ouvert, envoye tel quel (en flux)
+    raw_types = [] if body else list(content)
+    response = _success_response(operation)
+
+    arguments = ["self"] + [_identifier(p["name"]) + ": str" for p in path_params]
+    if body:
+        arguments.append(f"body: {_ref_name(body['schema'])} | dict")
+    if raw_types:
+        arguments.append("data: bytes | IO")
+    keyword_arguments = [
+        f"{_identifier(p['name'])}: {_annotation(p.get('schema', {}))[0]} | None = None" for p in query_params
+    ] + [f"{_header_argument(p['name'])}: str | None = None" for p in header_params]
+    if raw_types:
+        keyword_arguments.append(f'content_type: str = "{raw_types[0]}"')
+    if keyword_arguments:
+        arguments += ["*"] + keyword_arguments
+
+    if response:
+        returns = f"list[{response[0]}]" if response[1] else response[0]
+    else:
+        returns = "None"
+
+    python_path = re.sub(r"\{(\w+)\}", lambda m: "{" + _identifier(m.group(1)) + "}", path)
+    lines = [
+        "",
+        f"    def {_method_name(operation['operationId'])}({', '.join(arguments)}) -> {returns}:",
+        f'        """{method.upper()} {path} : {operation.get("summary", operation["operationId"])}"""',
+        "        return self._request(",
+        f'            "{method.upper()}",',
+        f'            f"{python_path}",' if path_params else f'            "{path}",',
+    ]
+    if query_params:
+        params = ", ".join(f'"{p["name"]}": {_identifier(p["name"])}' for p in query_params)
+        lines.append(f"            params={{{params}}},")
+    if body:
+        lines.append("            body=body,")
+    if raw_types:
+        lines.append("            data=data,")
+    headers = [f'"{p["name"]}": {_header_argument(p["name"])}' for p in header_params]
+    if raw_types:
+        headers.append('"Content-Type": content_type')
+    if headers:
+        lines.append(f"            headers={{{', '.join(headers)}}},")
+    if response and response[1] is None:
+        lines.append("            raw=True,")
+    elif response:
+        lines.append(f"            response_type=({response[0]}, {response[1]}),")
+    lines.append("        )")
+    return lines
+
+
+def render(spec):
+    """Source du client pour ce document OpenAPI."""
+    lines = [HEADER.rstrip("\n")]
+    for name, schema in spec.get("components", {}).get("schemas", {}).items():
+        lines += render_schema(name, schema)
+    lines.append(CLIENT.rstrip("\n"))
+    for path, operations in spec["paths"].items():
+        for method, operation in operations.items():
+            if _is_event_stream(operation):
+                continue  # flux SSE sans fin : a lire avec un client SSE, pas de methode
+            lines += render_operation(path, method, operation)
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generateur du client Python type (docs/openapi.json)")
+    parser.add_argument("--spec", default=DEFAULT_SPEC)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--check", action="store_true", help="Echoue si le client n'est pas a jour")
+    args = parser.parse_args()
+
+    with open(args.spec, encoding="utf-8") as spec_file:
+        source = render(json.load(spec_file))
+
+    if args.check:
+        with open(args.output, encoding="utf-8") as output:
+            if output.read() != source:
+                sys.exit(f"{args.output} n'est pas a jour : lancer python tests/generate_client.py")
+        return
+    with open(args.output, "w", encoding="utf-8") as output:
+        output.write(source)
+    print(f"Client Python genere : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
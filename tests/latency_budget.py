@@ -0,0 +1,333 @@
+"""
+Budgets de latence et suivi des regressions (marqueur @pytest.mark.latency)
+
+Un test declare son budget avec le marqueur et mesure ses appels avec la fixture `latency`:
+
+    @pytest.mark.latency(p95_ms=50)
+    def test_bounding_box_latency(self, latency, auth_headers):
+        response = latency.measure(lambda: requests.get(get_url("/boats"), params=bbox, ...))
+
+measure() appelle la fonction `warmup` fois sans mesurer, puis `samples` fois en
+chronometrant chaque appel, et retourne le resultat du dernier appel.
+
+A la fin de la mesure:
+- budget : le test echoue si un percentile depasse la valeur declaree (p50_ms, p95_ms, p99_ms)
+- historique : les durees sont enregistrees dans une base SQLite locale, par commit git
+- regression : les durees sont comparees a celles des derniers commits (test de Mann-Whitney
+  unilateral) ; un ralentissement significatif (p < alpha) et superieur a MIN_SLOWDOWN sur la
+  mediane donne un avertissement, ou un echec avec --latency-regressions=fail
+
+Avec pytest-html, le rapport affiche pour chaque test mesure la tendance des medianes.
+Les durees d'un stand-in ou d'une autre API ne sont jamais comparees entre elles (cible).
+"""
+
+import math
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+import warnings
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import pytest
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".latency-history.sqlite")
+
+DEFAULT_SAMPLES = 15
+DEFAULT_WARMUP = 2
+PERCENTILES = {"p50_ms": 50, "p95_ms": 95, "p99_ms": 99}
+
+# Regression : nombre de commits precedents servant de reference, seuils de detection
+BASELINE_COMMITS = 5
+ALPHA = 0.01
+MIN_SLOWDOWN = 0.10
+TREND_POINTS = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT NOT NULL,
+    target TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    duration_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_test_idx ON samples (test, run_id);
+"""
+
+
+class LatencyRegressionWarning(UserWarning):
+    """Ralentissement significatif par rapport aux commits precedents."""
+
+
+def percentile(values, rank):
+    """Percentile par rang le plus proche (valeurs non triees acceptees)."""
+    ordered = sorted(values)
+    index = max(0, math.ceil(rank / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def mann_whitney_greater(current, baseline):
+    """p-valeur unilaterale (current plus lent que baseline), approximation normale avec ex aequo."""
+    n1, n2 = len(current), len(baseline)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        size = j - i + 1
+        tie_term += size ** 3 - size
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _git_commit():
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], capture_output=True).returncode != 0
+        return f"{sha}-dirty" if dirty else sha
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class LatencyHistory:
+    """Historique SQLite des durees mesurees."""
+
+    def __init__(self, path, commit, target):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self.commit = commit
+        self.target = target
+        self.run_id = None
+
+    def _ensure_run(self):
+        if self.run_id is None:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (commit_sha, target, started_at) VALUES (?, ?, ?)",
+                (self.commit, self.target, datetime.now(timezone.utc).isoformat()),
+            )
+            self.run_id = cursor.lastrowid
+
+    def record(self, test, durations):
+        self._ensure_run()
+        self.connection.executemany(
+            "INSERT INTO samples (run_id, test, duration_ms) VALUES (?, ?, ?)",
+            [(self.run_id, test, duration) for duration in durations],
+        )
+        self.connection.commit()
+
+    def baseline(self, test):
+        """Durees du test sur les BASELINE_COMMITS derniers commits differents du commit courant."""
+        rows = self.connection.execute(
+            """
+            SELECT s.duration_ms FROM samples s JOIN runs r ON r.id = s.run_id
+            WHERE s.test = ? AND r.target = ? AND r.commit_sha IN (
+                SELECT r2.commit_sha FROM runs r2 JOIN samples s2 ON s2.run_id = r2.id
+                WHERE s2.test = ? AND r2.target = ? AND r2.commit_sha != ?
+                GROUP BY r2.commit_sha ORDER BY MAX(r2.id) DESC LIMIT ?
+            )
+            """,
+            (test, self.target, test, self.target, self.commit, BASELINE_COMMITS),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def trend(self, test):
+        """(commit, mediane) des TREND_POINTS derniers runs, du plus ancien au plus recent."""
+        rows = self.connection.execute(
+            """
+            SELECT r.id, r.commit_sha, s.duration_ms FROM samples s JOIN runs r ON r.id = s.run_id
+            WHERE s.test = ? AND r.target = ? AND r.id IN (
+                SELECT DISTINCT s2.run_id FROM samples s2 JOIN runs r2 ON r2.id = s2.run_id
+                WHERE s2.test = ? AND r2.target = ? ORDER BY s2.run_id DESC LIMIT ?
+            )
+            ORDER BY r.id
+            """,
+            (test, self.target, test, self.target, TREND_POINTS),
+        ).fetchall()
+        runs = {}
+        for run_id, commit, duration in rows:
+            runs.setdefault((run_id, commit), []).append(duration)
+        return [(commit, statistics.median(durations)) for (_, commit), durations in runs.items()]
+
+    def close(self):
+        self.connection.close()
+
+
+def trend_svg(points, width=320, height=80):
+    """Courbe SVG des medianes (ms) par run, le dernier point etant le run courant."""
+    if not points:
+        return ""
+    values = [median for _, median in points]
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    step = (width - 20) / max(1, len(points) - 1)
+
+    coordinates = [
+        (10 + i * step, height - 15 - (value - low) / span * (height - 30))
+        for i, value in enumerate(values)
+    ]
+    polyline = " ".join(f"{x:.1f},{y:.1f}" for x, y in coordinates)
+    circles = "".join(
+        f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3"><title>{commit}: {value:.1f} ms</title></circle>'
+        for (x, y), (commit, value) in zip(coordinates, points)
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+        f'<polyline points="{polyline}" fill="none" stroke="#1f77b4" stroke-width="2"/>'
+        f'<g fill="#1f77b4">{circles}</g>'
+        f'<text x="10" y="10" font-size="10">mediane (ms) : {low:.1f} - {high:.1f}</text>'
+        "</svg>"
+    )
+
+
+class LatencyProbe:
+    """Objet de la fixture `latency` : mesure et verifie les budgets du test."""
+
+    def __init__(self, plugin, item, base_url):
+        self.plugin = plugin
+        self.item = item
+        self.base_url = base_url
+        marker = item.get_closest_marker("latency")
+        self.options = dict(marker.kwargs) if marker else {}
+        self.durations = []
+
+    def measure(self, call, samples=None, warmup=None):
+        samples = samples or self.options.get("samples", DEFAULT_SAMPLES)
+        warmup = self.options.get("warmup", DEFAULT_WARMUP) if warmup is None else warmup
+
+        for _ in range(warmup):
+            call()
+        result = None
+        for _ in range(samples):
+            start = time.perf_counter()
+            result = call()
+            self.durations.append((time.perf_counter() - start) * 1000)
+
+        self.plugin.check(self.item, self.base_url, self.options, self.durations)
+        return result
+
+
+class LatencyPlugin:
+    def __init__(self, config):
+        self.config = config
+        self.mode = config.getoption("--latency-regressions")
+        # Durees rejouees depuis une cassette : sans rapport avec l'API
+        self.enabled = config.getoption("--cassettes", None) != "replay"
+        self.history = None
+        self.results = {}
+
+    def _history(self, base_url):
+        if self.history is None:
+            target = "standin" if self.config.getoption("--standin", False) else urlsplit(base_url).hostname
+            self.history = LatencyHistory(
+                self.config.getoption("--latency-history"), _git_commit(), target
+            )
+        return self.history
+
+    def check(self, item, base_url, options, durations):
+        if not self.enabled or not durations:
+            return
+        history = self._history(base_url)
+        baseline = history.baseline(item.nodeid)
+        history.record(item.nodeid, durations)
+
+        stats = {name: percentile(durations, rank) for name, rank in PERCENTILES.items()}
+        self.results[item.nodeid] = stats
+
+        over = [
+            f"{name[:-3]} {stats[name]:.1f} ms > {options[name]} ms"
+            for name in PERCENTILES
+            if name in options and stats[name] > options[name]
+        ]
+        if over:
+            pytest.fail(f"Budget de latence depasse : {', '.join(over)}")
+
+        if self.mode == "off" or not baseline:
+            return
+        p_value = mann_whitney_greater(durations, baseline)
+        slowdown = statistics.median(durations) / statistics.median(baseline) - 1
+        if p_value < ALPHA and slowdown > MIN_SLOWDOWN:
+            message = (
+                f"{item.nodeid}: mediane +{slowdown:.0%} par rapport aux {BASELINE_COMMITS} "
+                f"derniers commits (p={p_value:.4f})"
+            )
+            if self.mode == "fail":
+                pytest.fail(f"Regression de latence : {message}")
+            warnings.warn(LatencyRegressionWarning(message))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when != "call" or item.nodeid not in self.results:
+            return
+        try:
+            from pytest_html import extras
+        except ImportError:
+            return
+        svg = trend_svg(self.history.trend(item.nodeid))
+        report.extras = getattr(report, "extras", []) + [extras.html(f"<div>{svg}</div>")]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        tr = terminalreporter
+        tr.section("latence")
+        for nodeid, stats in self.results.items():
+            values = "  ".join(f"{name[:-3]}={value:.1f}ms" for name, value in stats.items())
+            tr.write_line(f"{nodeid}  {values}")
+
+    def pytest_unconfigure(self, config):
+        if self.history is not None:
+            self.history.close()
+
+
+@pytest.fixture
+def latency(request, api_base_url):
+    """Mesure des appels du test (voir LatencyProbe.measure)."""
+    plugin = request.config.pluginmanager.get_plugin("latency-budget")
+    return LatencyProbe(plugin, request.node, api_base_url)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--latency-history",
+        default=DEFAULT_HISTORY,
+        help="Base SQLite de l'historique des latences (defaut: tests/.latency-history.sqlite)",
+    )
+    parser.addoption(
+        "--latency-regressions",
+        choices=("warn", "fail", "off"),
+        default="warn",
+        help="Comportement en cas de regression significative de latence (defaut: warn)",
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(LatencyPlugin(config), "latency-budget")
@@ -0,0 +1,123 @@
+"""
+Creation en masse d'utilisateurs de charge, directement en base, avec tokens signes hors ligne
+
+Passer par POST /users puis POST /auth/v1/login pour 10 000 utilisateurs mesure surtout
+bcrypt (~100 ms par hash et par comparaison cote API) et retarde le debut du test de
+plusieurs minutes. Ici:
+- les utilisateurs sont inseres en une seule commande COPY (psql), avec des UUIDs generes
+  localement et un hash bcrypt precalcule de DEFAULT_PASSWORD : ils peuvent quand meme se
+  connecter normalement si besoin
+- leurs accessTokens sont signes localement (HS256, JWT_SECRET), avec le meme payload
+  {sub, email} que AuthService.buildAuthResponse : JwtStrategy les accepte comme ceux du login
+
+La base est celle de l'API (variables d'environnement DATABASE_*, memes valeurs par defaut
+que app.module.ts) et JWT_SECRET doit etre celui de l'API testee.
+
+Utilisation:
+    python tests/load/bulk_users.py --count 10000 --output users.json
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ephemeral_db import find_pg_bin  # noqa: E402
+from standin_server import sign_jwt  # noqa: E402
+
+DEFAULT_PASSWORD = "TestPassword123!"
+# bcrypt.hash(DEFAULT_PASSWORD, 10), cout identique a AuthService.hashPassword
+DEFAULT_PASSWORD_HASH = "$2b$10$fIHnTIfM6/xC7SB/HYeAgO979/QmlKS/6lKrJEgl5Y3HxwdiSbExq"
+
+COPY_COLUMNS = ("id", "lastName", "firstName", "email", "password", "city", "status")
+
+
+def database_settings():
+    """Connexion a la base de l'API, comme app.module.ts."""
+    return {
+        "host": os.environ.get("DATABASE_HOST", "localhost"),
+        "port": os.environ.get("DATABASE_PORT", "5432"),
+        "user": os.environ.get("DATABASE_USER", "fisherfans"),
+        "password": os.environ.get("DATABASE_PASSWORD", "fisherfans"),
+        "database": os.environ.get("DATABASE_NAME", "fisherfans"),
+    }
+
+
+def _psql():
+    if os.environ.get("PG_BIN"):
+        return os.path.join(os.environ["PG_BIN"], "psql")
+    return shutil.which("psql") or os.path.join(find_pg_bin(), "psql")
+
+
+def mint_access_token(user_id, email, secret=None, expires_in=None):
+    """accessToken equivalent a celui de POST /auth/v1/login pour cet utilisateur."""
+    secret = secret or os.environ.get("JWT_SECRET", "your-super-secret-jwt-key")
+    expires_in = expires_in or int(os.environ.get("JWT_EXPIRES_IN", 3600))
+    issued = int(time.time())
+    return sign_jwt({"sub": user_id, "email": email, "iat": issued, "exp": issued + expires_in}, secret)
+
+
+def bulk_create_users(count, settings=None, secret=None, expires_in=None):
+    """Insere `count` utilisateurs (COPY) et retourne [{id, email, accessToken}]."""
+    settings = settings or database_settings()
+    run = uuid.uuid4().hex[:8]
+    users = []
+    rows = io.StringIO()
+    writer = csv.writer(rows)
+    for n in range(count):
+        user_id = str(uuid.uuid4())
+        email = f"load.{run}.{n}@fisherfans.test"
+        writer.writerow([user_id, f"Charge{n}", f"Prenom{run}", email, DEFAULT_PASSWORD_HASH, "Nice", "individual"])
+        users.append({"id": user_id, "email": email})
+
+    columns = ", ".join(f'"{column}"' for column in COPY_COLUMNS)
+    result = subprocess.run(
+        [
+            _psql(),
+            "-h", settings["host"], "-p", str(settings["port"]),
+            "-U", settings["user"], "-d", settings["database"],
+            "-v", "ON_ERROR_STOP=1", "-q", "-X",
+            "-c", f"COPY users ({columns}) FROM STDIN WITH (FORMAT csv)",
+        ],
+        input=rows.getvalue(),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PGPASSWORD": settings["password"]},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"COPY users a echoue : {result.stderr.strip()}")
+
+    for user in users:
+        user["accessToken"] = mint_access_token(user["id"], user["email"], secret, expires_in)
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Utilisateurs de charge crees en base, tokens signes hors ligne")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--expires-in", type=int, help="Duree de validite des tokens (s), defaut JWT_EXPIRES_IN")
+    parser.add_argument("--output", help="Fichier JSON [{id, email, accessToken}] (defaut: sortie standard)")
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    users = bulk_create_users(args.count, expires_in=args.expires_in)
+    elapsed = time.monotonic() - start
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(users, f)
+    else:
+        json.dump(users, sys.stdout)
+    print(f"{len(users)} utilisateurs crees en {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Histogramme HDR (High Dynamic Range) fusionnable
+
+Meme disposition des compteurs que HdrHistogram (Gil Tene) : pour une precision de
+`significant_figures` chiffres, chaque puissance de 2 est decoupee en sous-buckets de
+largeur constante. L'erreur relative sur une valeur enregistree est donc bornee
+(0,1 % avec 3 chiffres) quelle que soit son ordre de grandeur, et la memoire reste fixe.
+
+Deux histogrammes de memes parametres se fusionnent en additionnant leurs compteurs :
+les percentiles de l'agregat sont exacts (a la precision pres), contrairement a une
+moyenne des percentiles de chaque worker.
+
+Les valeurs sont des entiers (ici des microsecondes).
+"""
+
+import math
+
+
+class HdrHistogram:
+    def __init__(self, lowest=1, highest=60_000_000, significant_figures=3):
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        sub_bucket_count_magnitude = math.ceil(math.log2(largest_single_unit))
+        self.sub_bucket_half_count_magnitude = max(sub_bucket_count_magnitude, 1) - 1
+        self.unit_magnitude = int(math.floor(math.log2(lowest)))
+        self.sub_bucket_count = 2 ** (self.sub_bucket_half_count_magnitude + 1)
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+
+        smallest_untrackable = self.sub_bucket_count << self.unit_magnitude
+        bucket_count = 1
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self.bucket_count = bucket_count
+
+        self.counts = [0] * ((bucket_count + 1) * self.sub_bucket_half_count)
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    # -- indexation -------------------------------------------------------
+
+    def _bucket_index(self, value):
+        return (value | self.sub_bucket_mask).bit_length() - self.unit_magnitude - (
+            self.sub_bucket_half_count_magnitude + 1
+        )
+
+    def _counts_index(self, value):
+        bucket = self._bucket_index(value)
+        sub_bucket = value >> (bucket + self.unit_magnitude)
+        return ((bucket + 1) << self.sub_bucket_half_count_magnitude) + (sub_bucket - self.sub_bucket_half_count)
+
+    def _value_from_index(self, index):
+        bucket = (index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket = (index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket < 0:
+            sub_bucket -= self.sub_bucket_half_count
+            bucket = 0
+        return sub_bucket << (bucket + self.unit_magnitude)
+
+    def _highest_equivalent(self, value):
+        bucket = self._bucket_index(value)
+        sub_bucket = value >> (bucket + self.unit_magnitude)
+        if sub_bucket >= self.sub_bucket_count:
+            bucket += 1
+        return value + (1 << (self.unit_magnitude + bucket)) - 1
+
+    # -- enregistrement ---------------------------------------------------
+
+    def record(self, value, count=1):
+        """Enregistre une valeur, ramenee dans [lowest, highest]."""
+        value = min(max(int(value), self.lowest), self.highest)
+        self.counts[self._counts_index(value)] += count
+        self.total += count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if (other.lowest, other.highest, other.significant_figures) != (
+            self.lowest, self.highest, self.significant_figures
+        ):
+            raise ValueError("Histogrammes de parametres differents")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    # -- lecture ----------------------------------------------------------
+
+    def value_at_percentile(self, percentile):
+        if self.total == 0:
+            return 0
+        target = max(1, math.ceil(percentile / 100 * self.total))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(self._highest_equivalent(self._value_from_index(index)), self.max)
+        return self.max
+
+    def mean(self):
+        if self.total == 0:
+            return 0.0
+        weighted = sum(
+            self._value_from_index(index) * count for index, count in enumerate(self.counts) if count
+        )
+        return weighted / self.total
+
+    # -- serialisation (echange entre processus et machines) ---------------
+
+    def to_dict(self):
+        return {
+            "lowest": self.lowest,
+            "highest": self.highest,
+            "significant_figures": self.significant_figures,
+            "counts": {str(index): count for index, count in enumerate(self.counts) if count},
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["lowest"], data["highest"], data["significant_figures"])
+        for index, count in data["counts"].items():
+            histogram.counts[int(index)] = count
+            histogram.total += count
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
@@ -0,0 +1,318 @@
+"""
+Generateur de charge multi-processus (et multi-machines) de l'API Fisher Fans
+
+Un seul processus Python plafonne a quelques centaines de requetes/s (GIL, requests).
+Ici la charge est repartie:
+- sur plusieurs processus (--workers), chacun avec plusieurs connexions keep-alive
+  (--connections) en http.client, un thread par connexion
+- optionnellement sur d'autres machines qui executent `loadgen.py serve` (--remote)
+
+DEBIT CONSTANT ET COORDINATED OMISSION:
+Chaque connexion suit un planning fixe (une requete toutes les 1/debit secondes).
+La latence est mesuree depuis l'instant PREVU de la requete, pas depuis son envoi reel:
+si l'API ralentit, les requetes qui auraient du partir pendant ce temps comptent leur
+attente, comme pour un vrai client. Le temps de service (depuis l'envoi) est aussi
+enregistre, pour comparaison.
+
+Une erreur de transport (connexion refusee, delai depasse) compte dans la latence pour
+REQUEST_TIMEOUT secondes au moins : un run qui echoue ne parait pas plus rapide. Leur nombre
+est affiche a cote des percentiles.
+
+Chaque thread enregistre dans ses propres histogrammes HDR (load/hdr.py), fusionnes par
+processus, puis par machine, puis par le coordinateur : les percentiles affiches sont
+ceux de l'ensemble des requetes, pas une moyenne de percentiles.
+
+Utilisation:
+    python tests/load/loadgen.py run --scenario browse --rate 2000 --duration 30 --workers 8
+    LOADGEN_TOKEN=secret python tests/load/loadgen.py serve --listen 0.0.0.0:7700   # chaque machine
+    LOADGEN_TOKEN=secret python tests/load/loadgen.py run --rate 8000 --remote host1:7700 --remote host2:7700
+
+Un worker (`serve`) execute les jobs qu'on lui envoie : il n'ecoute que sur 127.0.0.1 par
+defaut et n'accepte que les jobs portant le jeton partage (--token ou LOADGEN_TOKEN).
+"""
+
+import argparse
+import hmac
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import socket
+import socketserver
+import ssl
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Les scenarios reutilisent les donnees de la suite pytest (tests/fixture_factory.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hdr import HdrHistogram  # noqa: E402
+from scenarios import SCENARIOS  # noqa: E402
+
+DEFAULT_BASE_URL = "http://localhost:8443/api"
+DEFAULT_PORT = 7700
+DEFAULT_LISTEN = f"127.0.0.1:{DEFAULT_PORT}"
+# Delai d'une requete, et latence comptee pour une erreur de transport
+REQUEST_TIMEOUT = 30
+REPORTED_PERCENTILES = (50, 90, 99, 99.9)
+# Delai entre l'envoi des jobs et le depart commun (synchronisation des machines)
+START_DELAY = 2.0
+
+
+def _connect(url):
+    if url.scheme == "https":
+        return http.client.HTTPSConnection(
+            url.hostname, url.port or 443, timeout=REQUEST_TIMEOUT, context=ssl._create_unverified_context()
+        )
+    return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=REQUEST_TIMEOUT)
+
+
+def _run_connection(job, index, mono_start, result):
+    """Boucle d'une connexion : planning a debit constant, mesures dans result."""
+    url = urlsplit(job["base_url"])
+    plan = job["requests"]
+    weights = [weight for weight, *_ in plan]
+    headers = {**job["headers"], "Connection": "keep-alive"}
+    users = job["users"]
+    rng = random.Random(f"{job['seed']}-{index}")
+
+    interval = job["connections"] / job["rate"]
+    # Connexions decalees dans l'intervalle : le debit du processus reste regulier
+    intended = mono_start + interval * index / job["connections"]
+    end = mono_start + job["duration"]
+
+    connection = _connect(url)
+    while intended < end:
+        now = time.monotonic()
+        if now < intended:
+            time.sleep(intended - now)
+
+        _, method, path, body = rng.choices(plan, weights)[0]
+        payload = json.dumps(body) if body is not None else None
+        request_headers = {**headers, "Content-Type": "application/json"} if payload else headers
+        if users:
+            user = rng.choice(users)
+            path = path.format(userId=user["id"])
+            request_headers = {**request_headers, "Authorization": f"Bearer {user['accessToken']}"}
+
+        sent = time.monotonic()
+        try:
+            connection.request(method, url.path + path, body=payload, headers=request_headers)
+            response = connection.getresponse()
+            response.read()
+            status = str(response.status)
+        except (OSError, http.client.HTTPException) as error:
+            status = f"error:{type(error).__name__}"
+            # Requete perdue : au moins le delai d'attente d'un client, jamais une reponse rapide
+            result["latency"].record(max(time.monotonic() - intended, REQUEST_TIMEOUT) * 1e6)
+            connection.close()
+            connection = _connect(url)
+        else:
+            done = time.monotonic()
+            result["latency"].record((done - intended) * 1e6)
+            result["service"].record((done - sent) * 1e6)
+        result["statuses"][status] = result["statuses"].get(status, 0) + 1
+        intended += interval
+
+    connection.close()
+
+
+def run_process(job):
+    """Point d'entree d'un processus worker : une connexion par thread."""
+    mono_start = time.monotonic() + (job["start_at"] - time.time())
+    results = [
+        {"latency": HdrHistogram(), "service": HdrHistogram(), "statuses": {}}
+        for _ in range(job["connections"])
+    ]
+    threads = [
+        threading.Thread(target=_run_connection, args=(job, index, mono_start, results[index]))
+        for index in range(job["connections"])
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    finished_at = time.time()
+    return merge_results([
+        {
+            "latency": result["latency"].to_dict(),
+            "service": result["service"].to_dict(),
+            "statuses": result["statuses"],
+            "finished_at": finished_at,
+        }
+        for result in results
+    ])
+
+
+def run_local(job, processes):
+    """Lance `processes` workers sur cette machine et fusionne leurs resultats."""
+    jobs = [{**job, "seed": f"{job['seed']}-{socket.gethostname()}-{n}"} for n in range(processes)]
+    with multiprocessing.Pool(processes) as pool:
+        return merge_results(pool.map(run_process, jobs))
+
+
+def merge_results(results):
+    latency, service, statuses = HdrHistogram(), HdrHistogram(), {}
+    finished_at = 0.0
+    for result in results:
+        finished_at = max(finished_at, result["finished_at"])
+        latency.merge(HdrHistogram.from_dict(result["latency"]))
+        service.merge(HdrHistogram.from_dict(result["service"]))
+        for status, count in result["statuses"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        "latency": latency.to_dict(),
+        "service": service.to_dict(),
+        "statuses": statuses,
+        "finished_at": finished_at,
+    }
+
+
+# -- machines distantes ------------------------------------------------------
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """Une ligne JSON (job + nombre de processus) en entree, une ligne JSON (resultat) en sortie."""
+
+    token = None  # jeton partage, renseigne par serve()
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        # Sans le jeton, rien n'est execute : un worker ne doit pas servir de relais de charge
+        if not hmac.compare_digest(str(request.get("token", "")).encode(), self.token.encode()):
+            self.wfile.write(json.dumps({"error": "invalid token"}).encode() + b"\n")
+            return
+        result = run_local(request["job"], request["processes"])
+        self.wfile.write(json.dumps(result).encode() + b"\n")
+
+
+def serve(address, token):
+    host, port = address
+    handler = type("BoundJobHandler", (_JobHandler,), {"token": token})
+    with socketserver.TCPServer((host, port), handler) as server:
+        print(f"Worker de charge en attente sur {host}:{port}")
+        server.serve_forever()
+
+
+def _run_remote(address, job, processes, token, results):
+    with socket.create_connection(address) as connection:
+        connection.sendall(json.dumps({"job": job, "processes": processes, "token": token}).encode() + b"\n")
+        with connection.makefile("rb") as stream:
+            result = json.loads(stream.readline())
+    if "error" in result:
+        raise RuntimeError(f"Worker {address[0]}:{address[1]} : {result['error']}")
+    results.append(result)
+
+
+# -- coordinateur ------------------------------------------------------------
+
+
+def _address(value, default_host=""):
+    host, _, port = value.rpartition(":")
+    return (host or default_host, int(port or DEFAULT_PORT))
+
+
+def _format_histogram(label, data):
+    histogram = HdrHistogram.from_dict(data)
+    values = "  ".join(
+        f"p{percentile:g}={histogram.value_at_percentile(percentile) / 1000:.2f}ms"
+        for percentile in REPORTED_PERCENTILES
+    )
+    return f"{label:<24}{values}  max={histogram.max / 1000:.2f}ms"
+
+
+def coordinate(args):
+    scenario = SCENARIOS[args.scenario]
+    context = scenario.setup(args.base_url, args.users)
+
+    hosts = len(args.remote) + (0 if args.no_local else 1)
+    total_processes = hosts * args.workers
+    job = {
+        "base_url": args.base_url,
+        "headers": context.get("headers", {}),
+        "users": context.get("users", []),
+        "requests": scenario.requests(context),
+        "rate": args.rate / total_processes,
+        "connections": args.connections,
+        "duration": args.duration,
+        "start_at": time.time() + START_DELAY,
+        "seed": args.seed,
+    }
+
+    results = []
+    threads = [
+        threading.Thread(target=_run_remote, args=(_address(remote), job, args.workers, args.token, results))
+        for remote in args.remote
+    ]
+    for thread in threads:
+        thread.start()
+    if not args.no_local:
+        results.append(run_local(job, args.workers))
+    for thread in threads:
+        thread.join()
+
+    merged = merge_results(results)
+    total = sum(merged["statuses"].values())
+    # Les requetes en retard sur le planning partent apres la fin prevue : duree reelle
+    achieved = total / max(args.duration, merged["finished_at"] - job["start_at"])
+
+    print(f"Scenario {scenario.name} : {scenario.description}")
+    print(f"Cible {args.rate:g} req/s pendant {args.duration:g}s, {args.workers} processus x {hosts} machine(s)")
+    print(f"Requetes : {total}, debit obtenu {achieved:.1f} req/s")
+    print("Statuts : " + ", ".join(f"{status}={count}" for status, count in sorted(merged["statuses"].items())))
+    errors = sum(count for status, count in merged["statuses"].items() if status.startswith("error:"))
+    print(_format_histogram("Latence (corrigee CO)", merged["latency"]) + f"  erreurs={errors}")
+    print(_format_histogram("Temps de service", merged["service"]))
+    if achieved < 0.95 * args.rate:
+        print("ATTENTION : debit cible non atteint (API saturee ou generateur insuffisant : --workers)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"scenario": scenario.name, "rate": args.rate, "duration": args.duration, **merged}, f)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generateur de charge distribue de l'API Fisher Fans")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Coordonner un test de charge")
+    run.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    run.add_argument("--scenario", choices=sorted(SCENARIOS), default="browse")
+    run.add_argument("--rate", type=float, default=1000, help="Debit total cible (requetes/s)")
+    run.add_argument("--duration", type=float, default=30, help="Duree de la mesure (s)")
+    run.add_argument("--workers", type=int, default=os.cpu_count(), help="Processus par machine")
+    run.add_argument("--connections", type=int, default=8, help="Connexions keep-alive par processus")
+    run.add_argument("--remote", action="append", default=[], help="Machine `loadgen.py serve` (hote:port)")
+    run.add_argument("--no-local", action="store_true", help="N'utiliser que les machines distantes")
+    run.add_argument("--users", type=int, default=10000, help="Utilisateurs distincts (scenario crowd)")
+    run.add_argument("--seed", default="fisherfans", help="Graine du tirage des requetes")
+    run.add_argument("--json", help="Fichier de sortie (resultats et histogrammes)")
+
+    server = commands.add_parser("serve", help="Executer les jobs d'un coordinateur distant")
+    server.add_argument("--listen", default=DEFAULT_LISTEN, help="hote:port (0.0.0.0 pour les autres machines)")
+
+    for command in (run, server):
+        command.add_argument(
+            "--token", default=os.environ.get("LOADGEN_TOKEN"), help="Jeton partage des workers (LOADGEN_TOKEN)"
+        )
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        if not args.token:
+            parser.error("serve exige un jeton partage : --token ou LOADGEN_TOKEN")
+        serve(_address(args.listen, "127.0.0.1"), args.token)
+    else:
+        if args.remote and not args.token:
+            parser.error("--remote exige le jeton partage des workers : --token ou LOADGEN_TOKEN")
+        coordinate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Rejeu du trafic reel (journal d'acces de l'API) sur une instance de recette
+
+Les melanges synthetiques de loadgen.py ne reproduisent pas la repartition reelle des
+recherches (bounding boxes de GET /boats, filtres homePort...) : pour valider un cache ou
+un index avant mise en production, on rejoue le journal ACCESS_LOG de l'API
+(AccessLogInterceptor, une ligne JSON par requete : route, parametres, forme du corps, duree).
+
+- Temps : les ecarts entre requetes sont conserves, divises par --speed (1 = temps reel,
+  jusqu'a 10x). Comme dans loadgen.py, la latence est mesuree depuis l'instant prevu
+  (coordinated omission) par un pool de connexions keep-alive.
+- Identifiants : chaque identifiant du journal (parametres de chemin, de requete, et
+  utilisateur connecte) est remplace, toujours par le meme, par une entite existante de
+  la recette. Un bateau tres consulte en production reste donc un bateau tres consulte.
+- Authentification : chaque utilisateur du journal est rejoue par un utilisateur de charge
+  distinct (load/bulk_users.py, ou --users-file), avec son propre token.
+- Corps : le journal ne contient que la forme des corps (cles et types). Avec
+  --include-writes, les ecritures sont rejouees avec les donnees de test de
+  fixture_factory.py restreintes aux memes cles ; les autres ecritures sont ignorees.
+
+Les routes /auth (login, refresh) ne sont jamais rejouees : les tokens sont ceux des
+utilisateurs de charge.
+
+Utilisation:
+    python tests/load/replay.py access.log --base-url https://recette/api --speed 5
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_users import bulk_create_users  # noqa: E402
+from fixture_factory import boat_payload, trip_payload, user_payload  # noqa: E402
+from hdr import HdrHistogram  # noqa: E402
+from loadgen import _connect  # noqa: E402
+
+DEFAULT_BASE_URL = "http://localhost:8443/api"
+API_PREFIX = "/api"
+READ_METHODS = ("GET", "HEAD")
+SUMMARY_PERCENTILES = (50, 99)
+
+# Parametre (chemin ou requete) -> collection d'entites de la recette
+ID_KINDS = {
+    "userId": "users",
+    "boatId": "boats",
+    "tripId": "trips",
+    "bookingId": "bookings",
+}
+# Collections chargees depuis la recette (les utilisateurs sont ceux de charge)
+POOL_ENDPOINTS = {
+    "boats": "/v1/boats",
+    "trips": "/v1/trips",
+    "bookings": "/v1/bookings",
+}
+
+# Donnees des ecritures rejouees, par route (restreintes aux cles du corps journalise)
+PAYLOAD_BUILDERS = {
+    "/api/v1/users": lambda ids: user_payload(uuid.uuid4().hex[:8]),
+    "/api/v1/users/:userId": lambda ids: user_payload(uuid.uuid4().hex[:8]),
+    "/api/v1/boats": lambda ids: boat_payload(uuid.uuid4().hex[:8]),
+    "/api/v1/boats/:boatId": lambda ids: boat_payload(uuid.uuid4().hex[:8]),
+    "/api/v1/trips": lambda ids: trip_payload(ids.pick("boats")),
+    "/api/v1/trips/:tripId": lambda ids: trip_payload(ids.pick("boats")),
+}
+
+
+class Unmappable(Exception):
+    """Requete qui ne peut pas etre rejouee (identifiant sans equivalent, route /auth...)."""
+
+
+class IdRewriter:
+    """Correspondance stable identifiant du journal -> entite de la recette."""
+
+    def __init__(self, pools, seed):
+        self.pools = pools
+        self.mapping = {kind: {} for kind in pools}
+        self.rng = random.Random(seed)
+
+    def rewrite(self, kind, original):
+        pool = self.pools.get(kind)
+        if not pool:
+            raise Unmappable(f"aucune entite '{kind}' sur la recette")
+        mapping = self.mapping[kind]
+        if original not in mapping:
+            # Ordre d'apparition : des identifiants distincts restent distincts tant que possible
+            mapping[original] = pool[len(mapping) % len(pool)]
+        return mapping[original]
+
+    def pick(self, kind):
+        pool = self.pools.get(kind)
+        if not pool:
+            raise Unmappable(f"aucune entite '{kind}' sur la recette")
+        return self.rng.choice(pool)
+
+
+def load_log(path):
+    """Entrees du journal, triees par heure d'arrivee."""
+    opener = gzip.open if path.endswith(".gz") else open
+    entries = []
+    with opener(path, "rt", encoding="utf-8") as log:
+        for line in log:
+            if line.strip():
+                entry = json.loads(line)
+                entry["timestamp"] = datetime.fromisoformat(entry["time"].replace("Z", "+00:00")).timestamp()
+                entries.append(entry)
+    entries.sort(key=lambda entry: entry["timestamp"])
+    return entries
+
+
+def _rewrite_path(entry, ids):
+    path = entry["path"].split("/")
+    template = entry["route"].split("/")
+    if len(path) != len(template):
+        return entry["path"]
+    for index, segment in enumerate(template):
+        if segment.startswith(":"):
+            name = segment[1:]
+            if name not in ID_KINDS:
+                raise Unmappable(f"parametre {name} non reecrit")
+            path[index] = ids.rewrite(ID_KINDS[name], path[index])
+    return "/".join(path)
+
+
+def _rewrite_query(query, ids):
+    rewritten = {}
+    for key, value in query.items():
+        if key in ID_KINDS and isinstance(value, list):
+            value = [ids.rewrite(ID_KINDS[key], item) for item in value]
+        elif key in ID_KINDS:
+            value = ids.rewrite(ID_KINDS[key], value)
+        rewritten[key] = value
+    return rewritten
+
+
+def _body(entry, ids):
+    builder = PAYLOAD_BUILDERS.get(entry["route"])
+    if builder is None:
+        raise Unmappable(f"pas de donnees pour {entry['method']} {entry['route']}")
+    payload = builder(ids)
+    shape = entry.get("body") or {}
+    return {key: value for key, value in payload.items() if key in shape}
+
+
+def prepare(entries, ids, tokens, speed, include_writes):
+    """Requetes pretes a envoyer : (decalage prevu, route, methode, chemin, en-tetes, corps, entree)."""
+    prepared, skipped = [], {}
+    origin = entries[0]["timestamp"] if entries else 0
+    for entry in entries:
+        try:
+            if entry["route"].startswith(API_PREFIX + "/auth"):
+                raise Unmappable("route d'authentification")
+            if entry["method"] not in READ_METHODS and not include_writes:
+                raise Unmappable("ecriture (--include-writes)")
+
+            path = _rewrite_path(entry, ids)
+            query = _rewrite_query(entry.get("query") or {}, ids)
+            if query:
+                path += "?" + urlencode(query, doseq=True)
+            headers = {"Connection": "keep-alive"}
+            if entry.get("userId"):
+                user_id = ids.rewrite("users", entry["userId"])
+                headers["Authorization"] = f"Bearer {tokens[user_id]}"
+            body = None
+            if entry["method"] not in READ_METHODS and entry.get("body"):
+                body = json.dumps(_body(entry, ids))
+                headers["Content-Type"] = "application/json"
+        except Unmappable as reason:
+            skipped[str(reason)] = skipped.get(str(reason), 0) + 1
+            continue
+        offset = (entry["timestamp"] - origin) / speed
+        prepared.append((offset, entry["route"], entry["method"], path, headers, body, entry))
+    return prepared, skipped
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency = HdrHistogram()
+        self.original = HdrHistogram()
+        self.statuses = {}
+        self.changed = 0
+
+
+def replay(base_url, prepared, connections):
+    """Envoie les requetes a leur instant prevu ; retourne {route: RouteStats}."""
+    url = urlsplit(base_url)
+    # Les chemins du journal incluent deja le prefixe /api
+    root = url.path[: -len(API_PREFIX)] if url.path.endswith(API_PREFIX) else url.path
+    stats = {}
+    lock = threading.Lock()
+    pending = queue.Queue()
+
+    def worker():
+        connection = _connect(url)
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            intended, (_, route, method, path, headers, body, entry) = item
+            try:
+                connection.request(method, root + path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException) as error:
+                status = f"error:{type(error).__name__}"
+                connection.close()
+                connection = _connect(url)
+            done = time.monotonic()
+            with lock:
+                route_stats = stats.setdefault(f"{method} {route}", RouteStats())
+                route_stats.latency.record((done - intended) * 1e6)
+                route_stats.original.record(entry["durationMs"] * 1000)
+                route_stats.statuses[status] = route_stats.statuses.get(status, 0) + 1
+                if status != entry["status"]:
+                    route_stats.changed += 1
+        connection.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+
+    # Le dispatcher ne fait qu'attendre et deposer : les requetes sont deja preparees
+    start = time.monotonic() + 0.5
+    for item in prepared:
+        intended = start + item[0]
+        delay = intended - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        pending.put((intended, item))
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+    return stats
+
+
+def _load_pools(base_url, identities):
+    headers = {"Authorization": f"Bearer {identities[0]['accessToken']}"} if identities else {}
+    pools = {"users": [user["id"] for user in identities]}
+    for kind, endpoint in POOL_ENDPOINTS.items():
+        response = requests.get(f"{base_url}{endpoint}", headers=headers, verify=False)
+        pools[kind] = [item["id"] for item in response.json()] if response.status_code == 200 else []
+    return pools
+
+
+def _percentiles(histogram):
+    return "/".join(f"{histogram.value_at_percentile(p) / 1000:.1f}" for p in SUMMARY_PERCENTILES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu d'un journal d'acces de l'API Fisher Fans")
+    parser.add_argument("log", help="Journal ACCESS_LOG de l'API (JSON lines, eventuellement .gz)")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--speed", type=float, default=1.0, help="Acceleration du temps (1 a 10)")
+    parser.add_argument("--connections", type=int, default=32, help="Connexions keep-alive")
+    parser.add_argument("--users-file", help="Utilisateurs de charge (sortie de bulk_users.py) au lieu d'en creer")
+    parser.add_argument("--include-writes", action="store_true", help="Rejouer aussi les ecritures")
+    parser.add_argument("--limit", type=int, help="Ne rejouer que les N premieres requetes")
+    parser.add_argument("--seed", default="fisherfans", help="Graine des choix d'entites")
+    parser.add_argument("--json", help="Fichier de sortie (statistiques par route)")
+    args = parser.parse_args()
+    if not 0 < args.speed <= 10:
+        parser.error("--speed doit etre compris entre 0 (exclu) et 10")
+
+    entries = load_log(args.log)[: args.limit]
+    if args.users_file:
+        with open(args.users_file) as f:
+            identities = json.load(f)
+    else:
+        identities = bulk_create_users(len({entry["userId"] for entry in entries if entry.get("userId")}))
+    tokens = {user["id"]: user["accessToken"] for user in identities}
+
+    ids = IdRewriter(_load_pools(args.base_url, identities), args.seed)
+    prepared, skipped = prepare(entries, ids, tokens, args.speed, args.include_writes)
+    duration = prepared[-1][0] if prepared else 0
+    print(f"{len(prepared)} requetes a rejouer en {duration:.1f}s (x{args.speed:g}), {sum(skipped.values())} ignorees")
+    for reason, count in sorted(skipped.items()):
+        print(f"  ignorees : {count} ({reason})")
+
+    stats = replay(args.base_url, prepared, args.connections)
+
+    print(f"{'Route':<40}{'N':>7}  {'origine p50/p99 ms':>20}  {'rejeu p50/p99 ms':>20}  statut different")
+    for route, route_stats in sorted(stats.items(), key=lambda item: -item[1].latency.total):
+        print(
+            f"{route:<40}{route_stats.latency.total:>7}  {_percentiles(route_stats.original):>20}  "
+            f"{_percentiles(route_stats.latency):>20}  {route_stats.changed}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                route: {
+                    "latency": route_stats.latency.to_dict(),
+                    "original": route_stats.original.to_dict(),
+                    "statuses": {str(status): count for status, count in route_stats.statuses.items()},
+                    "changed": route_stats.changed,
+                }
+                for route, route_stats in stats.items()
+            }, f)
+
+
+if __name__ == "__main__":
+    main()
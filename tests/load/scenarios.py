@@ -0,0 +1,148 @@
+"""
+Scenarios de charge construits a partir des donnees de test de la suite pytest
+
+Un scenario a deux phases:
+- setup(base_url) : execute une seule fois par le coordinateur, avec les memes donnees
+  que les fixtures de conftest.py (utilisateur avec permis, bateau, sortie). Retourne un
+  contexte JSON (token, identifiants) envoye a tous les workers, locaux ou distants.
+- refresh(base_url, context) : renouvelle les tokens du contexte (tests longs, load/soak.py)
+- requests(context) : liste ponderee (poids, methode, chemin, corps) dans laquelle chaque
+  worker tire ses requetes. Les chemins sont relatifs a l'URL de base /api.
+
+Si le contexte contient "users" ([{id, accessToken}]), chaque requete est envoyee au nom
+d'un de ces utilisateurs tire au hasard, et `{userId}` est remplace dans son chemin.
+
+Les scenarios browse et geo utilisent des routes authentifiees : la limite de debit s'applique
+donc par utilisateur, et RATE_LIMIT_CAPACITY doit etre releve sur l'API testee.
+"""
+
+import uuid
+
+import requests
+
+from bulk_users import bulk_create_users, mint_access_token
+from fixture_factory import (
+    FixtureFactory,
+    TokenCache,
+    boat_payload,
+    trip_payload,
+    user_with_permit_payload,
+)
+
+# Bounding box de test_bf24_geographic_filter.py (Nice, Monaco, Antibes)
+COTE_AZUR_EST = "minLat=43.5&maxLat=43.8&minLng=7.0&maxLng=7.5"
+
+
+def _setup_owner(base_url):
+    """Utilisateur avec permis, un bateau et une sortie, comme created_trip dans conftest.py."""
+
+    def url_for(endpoint):
+        if endpoint.startswith("/auth"):
+            return f"{base_url}{endpoint}"
+        return f"{base_url}/v1{endpoint}"
+
+    tokens = TokenCache(url_for)
+    factory = FixtureFactory(url_for, tokens)
+    uid = str(uuid.uuid4())[:8]
+    owner = factory.create_users({"owner": user_with_permit_payload(uid)})["owner"]
+    if owner is None:
+        raise RuntimeError("Creation de l'utilisateur de charge impossible")
+
+    headers = {"Authorization": f"Bearer {tokens.get(owner['email'], owner['password'])}"}
+    boat = requests.post(url_for("/boats"), json=boat_payload(uid), headers=headers, verify=False)
+    boat.raise_for_status()
+    trip = requests.post(url_for("/trips"), json=trip_payload(boat.json()["id"]), headers=headers, verify=False)
+    trip.raise_for_status()
+
+    return {
+        "headers": headers,
+        "credentials": {"email": owner["email"], "password": owner["password"]},
+        "boatId": boat.json()["id"],
+        "tripId": trip.json()["id"],
+    }
+
+
+class Scenario:
+    """Scenario de base : setup commun, melange de requetes a definir."""
+
+    name = None
+    description = ""
+
+    def setup(self, base_url, users):
+        return _setup_owner(base_url)
+
+    def refresh(self, base_url, context):
+        credentials = context.get("credentials")
+        if credentials:
+            response = requests.post(f"{base_url}/auth/v1/login", json=credentials, verify=False)
+            response.raise_for_status()
+            context["headers"] = {"Authorization": f"Bearer {response.json()['accessToken']}"}
+        return context
+
+    def requests(self, context):
+        raise NotImplementedError
+
+
+class BrowseScenario(Scenario):
+    name = "browse"
+    description = "Consultation : bounding box BF24, liste des sorties, detail d'un bateau"
+
+    def requests(self, context):
+        return [
+            (5, "GET", f"/v1/boats?{COTE_AZUR_EST}", None),
+            (3, "GET", "/v1/trips", None),
+            (2, "GET", f"/v1/boats/{context['boatId']}", None),
+        ]
+
+
+class GeoScenario(Scenario):
+    name = "geo"
+    description = "Filtrage geographique BF24 uniquement"
+
+    def requests(self, context):
+        return [(1, "GET", f"/v1/boats?{COTE_AZUR_EST}", None)]
+
+
+class HealthScenario(Scenario):
+    name = "health"
+    description = "Health check (sans base ni limitation) : plafond du generateur et du framework"
+
+    def setup(self, base_url, users):
+        return {"headers": {}}
+
+    def requests(self, context):
+        return [(1, "GET", "/health", None)]
+
+
+class CrowdScenario(Scenario):
+    name = "crowd"
+    description = "Consultation par --users utilisateurs distincts, crees en base (load/bulk_users.py)"
+
+    def setup(self, base_url, users):
+        # Pas de login : tokens signes hors ligne, la limite de debit est repartie par utilisateur
+        identities = bulk_create_users(users)
+        return {
+            "headers": {},
+            "users": [
+                {"id": user["id"], "email": user["email"], "accessToken": user["accessToken"]}
+                for user in identities
+            ],
+        }
+
+    def refresh(self, base_url, context):
+        for user in context["users"]:
+            user["accessToken"] = mint_access_token(user["id"], user["email"])
+        return context
+
+    def requests(self, context):
+        return [
+            (5, "GET", f"/v1/boats?{COTE_AZUR_EST}", None),
+            (3, "GET", "/v1/users/{userId}/bookings", None),
+            (2, "GET", "/v1/logbook?userId={userId}", None),
+        ]
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (BrowseScenario(), GeoScenario(), HealthScenario(), CrowdScenario())
+}
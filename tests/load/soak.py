@@ -0,0 +1,256 @@
+"""
+Test d'endurance (soak) : charge constante pendant des heures et suivi des fuites
+
+Certaines fuites ne se voient qu'apres des heures (graphes d'entites TypeORM hydrates,
+etat Passport par requete, connexions non rendues au pool...). Ce mode envoie le melange
+d'un scenario de loadgen.py a debit constant, par fenetres de --interval secondes, et a la
+fin de chaque fenetre:
+- mesure la latence de la fenetre (histogramme HDR, corrige de la coordinated omission)
+- releve l'etat du processus de l'API : GET /api/health/runtime (RSS, tas V8, descripteurs
+  ouverts, ressources actives, connexions PostgreSQL), expose si RUNTIME_METRICS=true
+
+En fin de test, chaque serie est analysee apres un echauffement (WARMUP_FRACTION des
+fenetres) : une croissance monotone (test de Mann-Kendall, p < ALPHA) dont l'ampleur entre
+le premier et le dernier quart depasse le seuil de la serie est signalee. Les memes regles
+s'appliquent aux percentiles de latence (derive). Le code de sortie est 1 si une serie est
+signalee.
+
+Utilisation:
+    python tests/load/soak.py --scenario browse --rate 200 --duration 4h --interval 60 --html soak.html
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hdr import HdrHistogram  # noqa: E402
+from latency_budget import ALPHA, MIN_SLOWDOWN, trend_svg  # noqa: E402
+from loadgen import DEFAULT_BASE_URL, run_local  # noqa: E402
+from scenarios import SCENARIOS  # noqa: E402
+
+DEFAULT_INTERVAL = 60
+# Les tokens (JWT_EXPIRES_IN, 1 h par defaut) sont renouveles bien avant leur expiration
+TOKEN_REFRESH_EVERY = 20 * 60
+# Fenetres ignorees par l'analyse : JIT, montee du tas et du pool au demarrage
+WARMUP_FRACTION = 0.1
+MIN_WINDOWS = 8
+
+# Series suivies : chemin dans la reponse de /health/runtime, croissance minimale signalee
+# (relative pour la memoire, en valeur absolue pour les compteurs : un descripteur de plus
+# a chaque fenetre est deja une fuite)
+RUNTIME_SERIES = {
+    "rss": (("memory", "rss"), "relative", 0.10),
+    "heapUsed": (("memory", "heapUsed"), "relative", 0.10),
+    "external": (("memory", "external"), "relative", 0.10),
+    "openFileDescriptors": (("openFileDescriptors",), "absolute", 1),
+    "activeResources": (("activeResources",), "absolute", 1),
+    "poolTotal": (("database", "poolTotal"), "absolute", 1),
+    "serverConnections": (("database", "serverConnections"), "absolute", 1),
+}
+LATENCY_SERIES = {
+    "latencyP50Ms": ("relative", MIN_SLOWDOWN),
+    "latencyP99Ms": ("relative", MIN_SLOWDOWN),
+}
+
+
+def parse_duration(value):
+    """'4h', '90m', '30s' ou un nombre de secondes."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value[-1:] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def mann_kendall_increasing(values):
+    """p-valeur unilaterale d'une tendance croissante (Mann-Kendall, approximation normale)."""
+    n = len(values)
+    if n < 3:
+        return 1.0
+    s = sum(
+        (values[j] > values[i]) - (values[j] < values[i])
+        for i in range(n - 1)
+        for j in range(i + 1, n)
+    )
+    ties = {}
+    for value in values:
+        ties[value] = ties.get(value, 0) + 1
+    variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties.values())) / 18
+    if variance <= 0 or s <= 0:
+        return 1.0
+    z = (s - 1) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def analyse(values, mode, threshold):
+    """Verdict d'une serie (apres echauffement) : croissance, ampleur, p-valeur."""
+    values = [value for value in values if value is not None]
+    values = values[int(len(values) * WARMUP_FRACTION):]
+    if len(values) < MIN_WINDOWS:
+        return {"flagged": False, "reason": "trop peu de fenetres"}
+
+    quarter = max(1, len(values) // 4)
+    first, last = statistics.median(values[:quarter]), statistics.median(values[-quarter:])
+    growth = (last / first - 1) if mode == "relative" and first else last - first
+    p_value = mann_kendall_increasing(values)
+    return {
+        "first": first,
+        "last": last,
+        "growth": growth,
+        "pValue": p_value,
+        "flagged": p_value < ALPHA and growth >= threshold,
+    }
+
+
+def _runtime_value(runtime, path):
+    value = runtime
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    # activeResources : nombre total, tous types confondus
+    return sum(value.values()) if isinstance(value, dict) else value
+
+
+def sample_runtime(base_url):
+    """Etat du processus de l'API, None si /health/runtime n'est pas expose."""
+    try:
+        response = requests.get(f"{base_url}/health/runtime", timeout=10, verify=False)
+    except requests.RequestException:
+        return None
+    return response.json() if response.status_code == 200 else None
+
+
+def _format_window(window):
+    elapsed = int(window["elapsed"])
+    values = [f"[{elapsed // 3600:02d}:{elapsed // 60 % 60:02d}:{elapsed % 60:02d}]"]
+    values.append(f"p50={window['latencyP50Ms']:.1f}ms p99={window['latencyP99Ms']:.1f}ms")
+    values.append(f"erreurs={window['errors']}")
+    if window.get("rss") is not None:
+        values.append(f"rss={window['rss'] / 2**20:.0f}Mo")
+    if window.get("heapUsed") is not None:
+        values.append(f"tas={window['heapUsed'] / 2**20:.0f}Mo")
+    for name in ("openFileDescriptors", "activeResources", "poolTotal", "serverConnections"):
+        if window.get(name) is not None:
+            values.append(f"{name}={window[name]}")
+    return " ".join(values)
+
+
+def soak(args):
+    scenario = SCENARIOS[args.scenario]
+    context = scenario.setup(args.base_url, args.users)
+    refreshed_at = time.monotonic()
+
+    if sample_runtime(args.base_url) is None:
+        print("ATTENTION : /health/runtime indisponible (RUNTIME_METRICS=true sur l'API) : latence seule")
+
+    windows = []
+    start = time.monotonic()
+    while time.monotonic() - start < args.duration:
+        if time.monotonic() - refreshed_at > TOKEN_REFRESH_EVERY:
+            context = scenario.refresh(args.base_url, context)
+            refreshed_at = time.monotonic()
+
+        job = {
+            "base_url": args.base_url,
+            "headers": context.get("headers", {}),
+            "users": context.get("users", []),
+            "requests": scenario.requests(context),
+            "rate": args.rate / args.workers,
+            "connections": args.connections,
+            "duration": args.interval,
+            "start_at": time.time() + 0.5,
+            "seed": f"{args.seed}-{len(windows)}",
+        }
+        result = run_local(job, args.workers)
+        latency = HdrHistogram.from_dict(result["latency"])
+        window = {
+            "elapsed": time.monotonic() - start,
+            "time": datetime.now(timezone.utc).isoformat(),
+            "requests": sum(result["statuses"].values()),
+            "errors": sum(
+                count for status, count in result["statuses"].items()
+                if not status.isdigit() or int(status) >= 500
+            ),
+            "latencyP50Ms": latency.value_at_percentile(50) / 1000,
+            "latencyP99Ms": latency.value_at_percentile(99) / 1000,
+        }
+        runtime = sample_runtime(args.base_url)
+        for name, (path, _, _) in RUNTIME_SERIES.items():
+            window[name] = _runtime_value(runtime, path) if runtime else None
+        windows.append(window)
+        print(_format_window(window), flush=True)
+
+    return windows
+
+
+def report(windows):
+    """Analyse de chaque serie disponible : {serie: verdict}."""
+    series = {name: (mode, threshold) for name, (_, mode, threshold) in RUNTIME_SERIES.items()}
+    series.update(LATENCY_SERIES)
+    verdicts = {}
+    for name, (mode, threshold) in series.items():
+        values = [window[name] for window in windows]
+        if any(value is not None for value in values):
+            verdicts[name] = {"mode": mode, **analyse(values, mode, threshold)}
+    return verdicts
+
+
+def write_html(path, windows, verdicts):
+    sections = []
+    for name, verdict in verdicts.items():
+        points = [(f"{window['elapsed'] / 60:.0f} min", window[name]) for window in windows if window[name] is not None]
+        status = "CROISSANCE" if verdict["flagged"] else "ok"
+        sections.append(f"<h2>{name} : {status}</h2><pre>{json.dumps(verdict, indent=2)}</pre>{trend_svg(points, 640, 160)}")
+    with open(path, "w") as f:
+        f.write("<html><head><meta charset='utf-8'><title>Soak</title></head><body>")
+        f.write(f"<h1>Test d'endurance : {len(windows)} fenetres</h1>{''.join(sections)}</body></html>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test d'endurance de l'API Fisher Fans")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="browse")
+    parser.add_argument("--rate", type=float, default=100, help="Debit constant (requetes/s)")
+    parser.add_argument("--duration", type=parse_duration, default=parse_duration("4h"), help="Ex: 4h, 90m")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Duree d'une fenetre (s)")
+    parser.add_argument("--workers", type=int, default=2, help="Processus generateurs")
+    parser.add_argument("--connections", type=int, default=8, help="Connexions keep-alive par processus")
+    parser.add_argument("--users", type=int, default=10000, help="Utilisateurs distincts (scenario crowd)")
+    parser.add_argument("--seed", default="fisherfans")
+    parser.add_argument("--json", help="Fichier de sortie (fenetres et verdicts)")
+    parser.add_argument("--html", help="Rapport HTML (courbe de chaque serie)")
+    args = parser.parse_args()
+
+    windows = soak(args)
+    verdicts = report(windows)
+
+    print(f"\n{'Serie':<22}{'debut':>14}{'fin':>14}{'croissance':>12}{'p':>10}  verdict")
+    for name, verdict in verdicts.items():
+        if "pValue" not in verdict:
+            print(f"{name:<22}{verdict['reason']:>50}")
+            continue
+        growth = f"{verdict['growth']:+.1%}" if verdict["mode"] == "relative" else f"{verdict['growth']:+g}"
+        print(
+            f"{name:<22}{verdict['first']:>14.6g}{verdict['last']:>14.6g}{growth:>12}"
+            f"{verdict['pValue']:>10.4f}  {'CROISSANCE' if verdict['flagged'] else 'ok'}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"scenario": args.scenario, "rate": args.rate, "windows": windows, "verdicts": verdicts}, f)
+    if args.html:
+        write_html(args.html, windows, verdicts)
+    sys.exit(1 if any(verdict["flagged"] for verdict in verdicts.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
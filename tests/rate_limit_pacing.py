@@ -0,0 +1,106 @@
+"""
+Limitation de debit et suite pytest : un client par test, attente limitee aux fixtures
+
+L'API et le stand-in appliquent la politique reelle (RATE_LIMIT_CAPACITY jetons par client,
+RATE_LIMIT_REFILL_PER_SECOND par seconde). Pour qu'un test ne depende pas du seau laisse
+par les precedents :
+- chaque test est un client distinct : ses requetes anonymes portent une adresse
+  X-Forwarded-For propre (plage de test 198.18.0.0/15), donc un seau plein. L'API doit
+  faire confiance a un proxy (TRUST_PROXY=1), comme le stand-in et --ephemeral-db ;
+- les utilisateurs de reference sont recrees dans chaque module (conftest.py) : chaque
+  module part de seaux pleins.
+
+Seules les fixtures (setup et teardown) attendent sur un 429 : la requete est renvoyee
+toutes les RETRY_INTERVAL secondes, dans la limite de Retry-After (arrondi a la seconde
+superieure par l'API : c'est un majorant). Dans le corps d'un test, un 429 est recu tel
+quel : une regression de la limitation ou un test trop bavard se voit.
+
+Ce plugin intercepte HTTPAdapter.send, comme cassette_recorder : requests, sessions et
+client genere sont tous concernes.
+"""
+
+import ipaddress
+import time
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+RETRY_INTERVAL = 0.1
+# Adresses des clients simules (RFC 2544, reservee aux tests de performance)
+CLIENT_NETWORK = ipaddress.ip_network("198.18.0.0/15")
+
+
+class RateLimitPacing:
+    def __init__(self):
+        self.enabled = False
+        self.client_address = None
+        self.clients = 0
+        self.retries = 0
+        self._original_send = None
+        self._send = None
+
+    def install(self):
+        self._original_send = HTTPAdapter.send
+        plugin = self
+
+        def send(adapter, request, **kwargs):
+            return plugin.send(adapter, request, **kwargs)
+
+        self._send = send
+        HTTPAdapter.send = send
+
+    def uninstall(self):
+        # Un autre plugin a pu intercepter send apres nous : ne pas defaire son installation
+        if HTTPAdapter.send is self._send:
+            HTTPAdapter.send = self._original_send
+
+    def send(self, adapter, request, **kwargs):
+        # Les tests du proxy choisissent eux-memes leur adresse
+        if self.client_address is not None and "X-Forwarded-For" not in request.headers:
+            request.headers["X-Forwarded-For"] = self.client_address
+
+        response = self._original_send(adapter, request, **kwargs)
+        if not self.enabled or response.status_code != 429:
+            return response
+
+        deadline = time.monotonic() + int(response.headers.get("Retry-After", "1"))
+        while response.status_code == 429 and time.monotonic() < deadline:
+            response.close()
+            time.sleep(RETRY_INTERVAL)
+            self.retries += 1
+            response = self._original_send(adapter, request, **kwargs)
+        return response
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.clients += 1
+        self.client_address = str(CLIENT_NETWORK[self.clients])
+        yield
+        self.client_address = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self.enabled = True
+        yield
+        self.enabled = False
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        self.enabled = True
+        yield
+        self.enabled = False
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.retries:
+            terminalreporter.write_line(
+                f"limitation de debit : {self.retries} requetes de fixtures renvoyees apres un 429 (seau vide)"
+            )
+
+    def pytest_unconfigure(self, config):
+        self.uninstall()
+
+
+def pytest_configure(config):
+    plugin = RateLimitPacing()
+    plugin.install()
+    config.pluginmanager.register(plugin, "rate-limit-pacing")
@@ -0,0 +1,1672 @@
+"""
+Serveur de remplacement (stand-in) de l'API Fisher Fans
+
+Permet de lancer la suite pytest et les outils de charge sans PostgreSQL ni Node:
+- les routes sont lues dans docs/openapi.json (chemins, parametres, securite, DTOs)
+- chaque operationId est associe a un handler Python qui reproduit le service NestJS
+- les donnees sont stockees en memoire (perdues a l'arret)
+
+Comportements reproduits:
+- validation des DTOs (whitelist, forbidNonWhitelisted) a partir des schemas OpenAPI
+- JWT HS256 signes avec JWT_SECRET, refresh tokens avec rotation et detection de reutilisation
+- BF24 (bounding box), BF25 (codes d'erreur et businessCode), BF26, BF27
+- Idempotency-Key sur les routes de creation, limitation de debit par utilisateur / IP (TRUST_PROXY)
+
+Utilisation:
+    python standin_server.py --port 8443
+    pytest --standin          # demarre le serveur sur un port libre pour la session
+"""
+
+import argparse
+import base64
+import csv
+import gzip
+import hashlib
+import hmac
+import html
+import io
+import ipaddress
+import json
+import math
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs", "openapi.json")
+API_PREFIX = "/api"
+# En-tete Server des reponses : distingue le stand-in de l'API
+SERVER_NAME = "FisherFansStandin"
+
+JWT_SECRET = os.environ.get("JWT_SECRET", "your-super-secret-jwt-key")
+JWT_EXPIRES_IN = int(os.environ.get("JWT_EXPIRES_IN", "3600"))
+REFRESH_TOKEN_EXPIRES_IN = int(os.environ.get("REFRESH_TOKEN_EXPIRES_IN", "2592000"))
+
+UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?$")
+
+# Contraintes class-validator absentes du document OpenAPI (@IsEmail, @IsUUID, @Min, @IsDateString...)
+# Les DTOs Update* (PartialType) reprennent celles du DTO Create* correspondant.
+EXTRA_CONSTRAINTS = {
+    "LoginDto": {"email": {"format": "email"}},
+    "CreateUserDto": {
+        "email": {"format": "email"},
+        "birthDate": {"format": "date"},
+        "postalCode": {"pattern": r"^\d{5}$"},
+    },
+    "CreateBoatDto": {"deposit": {"minimum": 0}, "maxCapacity": {"minimum": 1}},
+    "CreateTripDto": {
+        "passengerCount": {"minimum": 1},
+        "price": {"minimum": 0},
+        "boatId": {"format": "uuid"},
+    },
+    "CreateBookingDto": {
+        "tripId": {"format": "uuid"},
+        "selectedDate": {"format": "date"},
+        "seats": {"minimum": 1},
+    },
+    "CreateLogbookEntryDto": {
+        "length": {"minimum": 0},
+        "weight": {"minimum": 0},
+        "fishingDate": {"format": "date"},
+    },
+}
+
+# Messages @Matches personnalises des DTOs
+PATTERN_MESSAGES = {
+    "boatLicenseNumber": "Boat license must be 8 digits",
+    "insuranceNumber": "Insurance number must be 12 alphanumeric characters",
+    "postalCode": "Le code postal doit contenir 5 chiffres",
+}
+
+# Routes @Public() : le document OpenAPI ne le reflete pas (@ApiBearerAuth au niveau du controleur)
+PUBLIC_OPERATIONS = {
+    "AuthController_login",
+    "AuthController_refresh",
+    "AuthController_logout",
+    "UsersController_create",
+    "TripsController_availability",
+}
+
+# GET dont le handler modifie le stockage (abonnement d'un flux aux reservations)
+WRITING_READS = {"TripsController_availability"}
+
+# Cout des routes pour la limitation de debit (@RateLimitCost), 1 par defaut
+RATE_LIMIT_COSTS = {
+    "AuthController_login": 5,
+    "UsersController_findAll": 3,
+    "BoatsController_findAll": 2,
+    "BoatsController_facets": 2,
+    "BoatsController_findClusters": 2,
+    "TripsController_findAll": 2,
+    "TripsController_facets": 2,
+    "TripsController_search": 2,
+    "LogbookController_import": 10,
+    "UsersController_exportData": 10,
+    "UsersController_startExport": 10,
+}
+RATE_LIMIT_CAPACITY = float(os.environ.get("RATE_LIMIT_CAPACITY", "100"))
+RATE_LIMIT_REFILL_PER_SECOND = float(os.environ.get("RATE_LIMIT_REFILL_PER_SECOND", "20"))
+# Proxys de confiance (TRUST_PROXY de l'API) : adresse du client lue dans X-Forwarded-For
+TRUST_PROXY = os.environ.get("TRUST_PROXY", "")
+# Noms acceptes par Express (proxy-addr) dans la liste TRUST_PROXY
+PROXY_SUBNETS = {
+    "loopback": ["127.0.0.1/8", "::1/128"],
+    "linklocal": ["169.254.0.0/16", "fe80::/10"],
+    "uniquelocal": ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "fc00::/7"],
+}
+
+# GET /boats/clusters : memes constantes que common/geo/tiles.ts et BoatsService
+TILE_ZOOM = 20
+MAX_LATITUDE = 85.0511287798
+MAX_TILES_PER_REQUEST = 64
+CLUSTER_MAX_ZOOM = 15
+CLUSTER_GRID_BITS = 3
+TILE_RE = re.compile(r"^(\d{1,2})/(\d+)/(\d+)$")
+
+# GET /boats/facets et /trips/facets : memes constantes que common/search/facets.ts
+MAX_FACET_VALUES = 20
+MAX_FACET_PAGE_SIZE = 100
+DEFAULT_PRICE_STEP = 50
+# GET /trips/search : meme constante que TripsService
+TRIP_SEARCH_PAGE_SIZE = 20
+BOAT_FACETS = ("boatType", "engineType", "licenseType", "homePort")
+
+# Champs de l'organisateur exposes dans les sorties (sans donnees sensibles)
+ORGANIZER_FIELDS = ("id", "firstName", "lastName", "languages", "city", "photoUrl")
+
+STATUS_TEXT = {
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    409: "Conflict",
+    415: "Unsupported Media Type",
+    422: "Unprocessable Entity",
+    429: "Too Many Requests",
+    500: "Internal server error",
+    501: "Not Implemented",
+}
+
+
+class ReadWriteLock:
+    """Lectures simultanees, ecritures exclusives.
+
+    Les ecrivains en attente passent avant les nouveaux lecteurs : un flux continu de GET
+    ne peut pas bloquer indefiniment un POST.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class RawResponse:
+    """Corps non JSON (export RGPD) : octets envoyes tels quels."""
+
+    def __init__(self, data, content_type, filename=None):
+        self.data = data
+        self.content_type = content_type
+        self.headers = {"Content-Disposition": f'attachment; filename="{filename}"'} if filename else {}
+
+
+class EventStream:
+    """Flux SSE (GET /trips/availability) : evenements initiaux, puis ceux de la file."""
+
+    def __init__(self, events, watcher=None, on_close=None):
+        self.events = events
+        self.watcher = watcher  # queue.Queue alimentee par les reservations, None = flux termine
+        self.on_close = on_close
+
+    def messages(self):
+        # Meme format que le SseStream de NestJS (id numerote, event, data JSON)
+        counter = 0
+        pending = list(self.events)
+        while True:
+            while pending:
+                counter += 1
+                event = pending.pop(0)
+                data = event["data"] if isinstance(event["data"], str) else json.dumps(event["data"])
+                yield f"id: {counter}\nevent: {event['type']}\ndata: {data}\n\n".encode()
+            if self.watcher is None:
+                return
+            try:
+                pending.append(self.watcher.get(timeout=SSE_HEARTBEAT_SECONDS))
+            except queue.Empty:
+                pending.append({"type": "ping", "data": ""})
+
+    def close(self):
+        if self.on_close is not None:
+            self.on_close()
+
+
+class HttpError(Exception):
+    """Erreur HTTP au format des exceptions NestJS."""
+
+    def __init__(self, status, message=None, body=None, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+        if body is None:
+            body = {"statusCode": status, "message": message or STATUS_TEXT[status]}
+            if message is not None and status != 500:
+                body["error"] = STATUS_TEXT[status]
+        self.body = body
+
+
+def business_error(status, business_code, message, headers=None):
+    body = {"code": str(status), "businessCode": business_code, "message": message}
+    return HttpError(status, body=body, headers=headers)
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+# ---------------------------------------------------------------------------
+# JWT HS256 (meme secret et meme payload que AuthService)
+# ---------------------------------------------------------------------------
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64url_decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def sign_jwt(payload, secret=JWT_SECRET):
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    body = _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{_b64url(signature)}"
+
+
+def verify_jwt(token, secret=JWT_SECRET):
+    """Retourne le payload d'un JWT valide et non expire, sinon None."""
+    try:
+        header, body, signature = token.split(".")
+        expected = hmac.new(secret.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64url_decode(signature), expected):
+            return None
+        payload = json.loads(_b64url_decode(body))
+    except (ValueError, json.JSONDecodeError):
+        return None
+    if payload.get("exp", 0) <= time.time():
+        return None
+    return payload
+
+
+# ---------------------------------------------------------------------------
+# Validation des DTOs a partir des schemas OpenAPI
+# ---------------------------------------------------------------------------
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_property(name, value, schema):
+    """Contraintes d'une propriete presente (non nulle), messages de class-validator."""
+    errors = []
+    expected = schema.get("type")
+
+    if expected == "string":
+        if not isinstance(value, str):
+            return [f"{name} must be a string"]
+        if value == "":
+            errors.append(f"{name} should not be empty")
+    elif expected == "number" and not _is_number(value):
+        return [f"{name} must be a number conforming to the specified constraints"]
+    elif expected == "boolean" and not isinstance(value, bool):
+        return [f"{name} must be a boolean value"]
+    elif expected == "array" and not isinstance(value, list):
+        return [f"{name} must be an array"]
+
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{name} must be one of the following values: {', '.join(schema['enum'])}")
+    if "minLength" in schema and isinstance(value, str) and len(value) < schema["minLength"]:
+        errors.append(f"{name} must be longer than or equal to {schema['minLength']} characters")
+    if "pattern" in schema and not (isinstance(value, str) and re.search(schema["pattern"], value)):
+        errors.append(PATTERN_MESSAGES.get(name, f"{name} must match {schema['pattern']} regular expression"))
+    if "minimum" in schema and _is_number(value) and value < schema["minimum"]:
+        errors.append(f"{name} must not be less than {schema['minimum']}")
+
+    fmt = schema.get("format")
+    if fmt == "email" and not (isinstance(value, str) and EMAIL_RE.match(value)):
+        errors.append(f"{name} must be an email")
+    elif fmt == "uuid" and not (isinstance(value, str) and UUID_RE.match(value)):
+        errors.append(f"{name} must be a UUID")
+    elif fmt == "date" and not (isinstance(value, str) and DATE_RE.match(value)):
+        errors.append(f"{name} must be a valid ISO 8601 date string")
+
+    return errors
+
+
+def validate_body(body, schema_name, schema):
+    """Equivalent du ValidationPipe global (whitelist + forbidNonWhitelisted)."""
+    if not isinstance(body, dict):
+        raise HttpError(400, ["an unknown value was passed to the validate function"])
+
+    extras = EXTRA_CONSTRAINTS.get(schema_name.replace("Update", "Create", 1), {})
+    properties = schema.get("properties", {})
+    required = set(schema.get("required", []))
+    messages = [f"property {name} should not exist" for name in body if name not in properties]
+
+    for name, prop in properties.items():
+        prop = {**prop, **extras.get(name, {})}
+        value = body.get(name)
+        if value is None:
+            # @IsOptional : null et absent sont ignores ; sinon @IsNotEmpty + type
+            if name in required:
+                messages.append(f"{name} should not be empty")
+                messages.extend(_check_property(name, value, prop))
+            continue
+        messages.extend(_check_property(name, value, prop))
+
+    if messages:
+        raise HttpError(400, messages)
+    return body
+
+
+# ---------------------------------------------------------------------------
+# Stockage en memoire
+# ---------------------------------------------------------------------------
+
+class Store:
+    """Tables en memoire (dictionnaires id -> ligne) et etats annexes."""
+
+    def __init__(self):
+        self.users = {}
+        self.passwords = {}  # id -> hash sha256 (le stand-in n'a pas besoin de bcrypt)
+        self.boats = {}
+        self.trips = {}
+        self.bookings = {}
+        self.logbook = {}
+        self.refresh_tokens = {}  # hash -> {familyId, userId, expiresAt, revoked}
+        self.idempotency = {}  # scope -> (empreinte, corps JSON)
+        self.buckets = {}  # cle -> (jetons, horodatage)
+        self.exports = {}  # id -> export RGPD en arriere-plan (UserExport)
+        self.anonymization_jobs = {}  # id -> effacement RGPD en cascade (AnonymizationJob)
+        self.seat_watchers = {}  # tripId -> files des flux GET /trips/availability
+
+    @staticmethod
+    def insert(table, row):
+        timestamp = now_iso()
+        row = {"id": str(uuid.uuid4()), **row, "createdAt": timestamp, "updatedAt": timestamp}
+        table[row["id"]] = row
+        return row
+
+    @staticmethod
+    def update(row, changes):
+        row.update(changes)
+        row["updatedAt"] = now_iso()
+        return row
+
+
+def _hash(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _ilike(value, needle):
+    return value is not None and needle.lower() in str(value).lower()
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _list_param(value):
+    # "gps, sounder" -> {"gps", "sounder"} (contenance @> de l'API : toutes les valeurs)
+    return {item.strip() for item in (value or "").split(",") if item.strip()}
+
+
+def _get_or_404(table, entity_id, label):
+    # Postgres rejette un identifiant qui n'est pas un UUID (erreur 500 cote API)
+    if not UUID_RE.match(entity_id):
+        raise HttpError(500)
+    row = table.get(entity_id)
+    if row is None:
+        raise HttpError(404, f"{label} with ID {entity_id} not found")
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Handlers (un par operationId, equivalents des services NestJS)
+# ---------------------------------------------------------------------------
+
+HANDLERS = {}
+
+
+def operation(operation_id):
+    def register(func):
+        HANDLERS[operation_id] = func
+        return func
+    return register
+
+
+class Request:
+    def __init__(self, store, params, query, body, user, headers, raw_body=b"", schemas=None):
+        self.store = store
+        self.params = params
+        self.query = query
+        self.body = body
+        self.user = user
+        self.headers = headers
+        self.raw_body = raw_body  # corps non JSON (POST /logbook/import)
+        self.schemas = schemas or {}
+
+    def q(self, name):
+        values = self.query.get(name)
+        return values[0] if values else None
+
+
+def _auth_response(store, user, family_id, status):
+    token = secrets.token_urlsafe(32)
+    store.refresh_tokens[_hash(token)] = {
+        "familyId": family_id,
+        "userId": user["id"],
+        "expiresAt": time.time() + REFRESH_TOKEN_EXPIRES_IN,
+        "revoked": False,
+    }
+    issued = int(time.time())
+    access_token = sign_jwt({"sub": user["id"], "email": user["email"], "iat": issued, "exp": issued + JWT_EXPIRES_IN})
+    return status, {
+        "accessToken": access_token,
+        "refreshToken": token,
+        "expiresIn": JWT_EXPIRES_IN,
+        "user": {key: user.get(key) for key in ("id", "email", "firstName", "lastName")},
+    }
+
+
+@operation("AuthController_login")
+def login(req):
+    store = req.store
+    user = next((u for u in store.users.values() if u["email"] == req.body["email"]), None)
+    if user is None or store.passwords.get(user["id"]) != _hash(req.body["password"]):
+        raise HttpError(401, "Invalid email or password")
+    return _auth_response(store, user, str(uuid.uuid4()), 201)  # POST sans @HttpCode : 201
+
+
+@operation("AuthController_refresh")
+def refresh(req):
+    store = req.store
+    token = store.refresh_tokens.get(_hash(req.body["refreshToken"]))
+    if token is None or token["revoked"] or token["expiresAt"] <= time.time():
+        if token is not None and token["revoked"]:
+            # Reutilisation d'un token deja consomme : toute la famille est revoquee
+            for other in store.refresh_tokens.values():
+                if other["familyId"] == token["familyId"]:
+                    other["revoked"] = True
+        raise HttpError(401, "Invalid or expired refresh token")
+
+    token["revoked"] = True
+    return _auth_response(store, store.users[token["userId"]], token["familyId"], 200)
+
+
+@operation("AuthController_logout")
+def logout(req):
+    token = req.store.refresh_tokens.get(_hash(req.body["refreshToken"]))
+    if token is not None:
+        token["revoked"] = True
+    return 204, None
+
+
+@operation("UsersController_create")
+def create_user(req):
+    store = req.store
+    if any(u["email"] == req.body["email"] for u in store.users.values()):
+        raise HttpError(409, "Email already exists")
+    fields = {k: v for k, v in req.body.items() if k != "password"}
+    user = store.insert(store.users, {"status": "individual", **fields})
+    store.passwords[user["id"]] = _hash(req.body["password"])
+    return 201, user
+
+
+@operation("UsersController_findAll")
+def find_users(req):
+    last_name, city, status = req.q("lastName"), req.q("city"), req.q("status")
+    languages = _list_param(req.q("languages"))
+    return 200, [
+        u for u in req.store.users.values()
+        if (not last_name or _ilike(u.get("lastName"), last_name))
+        and (not city or _ilike(u.get("city"), city))
+        and (not status or u.get("status") == status)
+        and languages <= set(u.get("languages") or [])
+    ]
+
+
+@operation("UsersController_findOne")
+def find_user(req):
+    store = req.store
+    user = _get_or_404(store.users, req.params["userId"], "User")
+    return 200, {
+        **user,
+        "boats": [b for b in store.boats.values() if b["ownerId"] == user["id"]],
+        "trips": [t for t in store.trips.values() if t["organizerId"] == user["id"]],
+        "bookings": [b for b in store.bookings.values() if b["userId"] == user["id"]],
+        "logbookEntries": [e for e in store.logbook.values() if e["userId"] == user["id"]],
+    }
+
+
+@operation("UsersController_update")
+def update_user(req):
+    store = req.store
+    if req.params["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only update your own profile")
+    user = _get_or_404(store.users, req.params["userId"], "User")
+    changes = dict(req.body)
+    if "password" in changes:
+        store.passwords[user["id"]] = _hash(changes.pop("password"))
+    return 200, store.update(user, changes)
+
+
+@operation("UsersController_remove")
+def remove_user(req):
+    store = req.store
+    if req.params["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only delete your own account")
+    user = _get_or_404(store.users, req.params["userId"], "User")
+
+    # Anonymisation RGPD (BF8) et revocation des refresh tokens
+    store.update(user, {
+        "lastName": "ANONYME",
+        "firstName": "ANONYME",
+        "email": f"deleted_{int(time.time() * 1000)}@anonymized.com",
+        "phone": None,
+        "photoUrl": None,
+        "boatLicenseNumber": None,
+        "insuranceNumber": None,
+        "companyName": None,
+    })
+    for token in store.refresh_tokens.values():
+        if token["userId"] == user["id"]:
+            token["revoked"] = True
+
+    # Cascade (AnonymizationService) : executee sur-le-champ, le travail est deja termine
+    processed = 0
+    for entry in store.logbook.values():
+        if entry["userId"] == user["id"] and any(entry.get(k) is not None for k in ("comment", "location", "photoUrl")):
+            store.update(entry, {"comment": None, "location": None, "photoUrl": None})
+            processed += 1
+    for trip in store.trips.values():
+        if trip["organizerId"] == user["id"] and trip.get("practicalInfo") is not None:
+            store.update(trip, {"practicalInfo": None})
+            processed += 1
+    store.insert(store.anonymization_jobs, {
+        "status": "completed",
+        "step": "trips",
+        "processed": processed,
+        "total": processed,
+        "attempts": 1,
+        "lockedUntil": None,
+        "error": None,
+        "completedAt": now_iso(),
+        "userId": user["id"],
+    })
+    return 204, None
+
+
+@operation("UsersController_getAnonymization")
+def user_anonymization(req):
+    if req.params["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only follow your own account erasure")
+    jobs = [j for j in req.store.anonymization_jobs.values() if j["userId"] == req.params["userId"]]
+    if not jobs:
+        raise HttpError(404, f"No anonymization job for user {req.params['userId']}")
+    return 200, jobs[-1]
+
+
+@operation("UsersController_getUserBoats")
+def user_boats(req):
+    store = req.store
+    user = _get_or_404(store.users, req.params["userId"], "User")
+    return 200, [b for b in store.boats.values() if b["ownerId"] == user["id"]]
+
+
+@operation("UsersController_getUserTrips")
+def user_trips(req):
+    store = req.store
+    user = _get_or_404(store.users, req.params["userId"], "User")
+    return 200, [
+        {**t, "boat": store.boats.get(t["boatId"])}
+        for t in store.trips.values() if t["organizerId"] == user["id"]
+    ]
+
+
+@operation("UsersController_getUserBookings")
+def user_bookings(req):
+    store = req.store
+    user = _get_or_404(store.users, req.params["userId"], "User")
+    return 200, [
+        {**b, "trip": store.trips.get(b["tripId"])}
+        for b in store.bookings.values() if b["userId"] == user["id"]
+    ]
+
+
+# Export RGPD (UserExportService) : sections dans l'ordre, une ligne JSON par enregistrement
+USER_EXPORT_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "gzip": "application/gzip"}
+EXPORT_TTL = int(os.environ.get("EXPORT_TTL", "86400"))
+
+
+def _own_export(req):
+    if req.params["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only export your own data")
+    return req.params["userId"]
+
+
+def _user_export(store, user_id):
+    sections = (
+        ("user", store.users, "id"),
+        ("boat", store.boats, "ownerId"),
+        ("trip", store.trips, "organizerId"),
+        ("booking", store.bookings, "userId"),
+        ("logbookEntry", store.logbook, "userId"),
+    )
+    return b"".join(
+        json.dumps({"type": kind, "data": row}).encode() + b"\n"
+        for kind, table, column in sections
+        for row in table.values() if row[column] == user_id
+    )
+
+
+def _find_export(req):
+    user_id = _own_export(req)
+    job = req.store.exports.get(req.params["exportId"])
+    if job is None or job["userId"] != user_id:
+        raise HttpError(404, f"Export with ID {req.params['exportId']} not found")
+    return job
+
+
+@operation("UsersController_exportData")
+def export_user_data(req):
+    user_id = _own_export(req)
+    export_format = req.q("format") or "ndjson"
+    if export_format not in USER_EXPORT_CONTENT_TYPES:
+        raise HttpError(400, "format must be one of: ndjson, gzip")
+    data = _user_export(req.store, user_id)
+    extension = "ndjson"
+    if export_format == "gzip":
+        data, extension = gzip.compress(data), "ndjson.gz"
+    return 200, RawResponse(data, USER_EXPORT_CONTENT_TYPES[export_format], f"user-{user_id}.{extension}")
+
+
+@operation("UsersController_startExport")
+def start_user_export(req):
+    # Travail termine immediatement : le stand-in n'a pas de file d'attente
+    user_id = _own_export(req)
+    data = gzip.compress(_user_export(req.store, user_id))
+    job = {
+        "id": str(uuid.uuid4()),
+        "userId": user_id,
+        "status": "completed",
+        "createdAt": now_iso(),
+        "completedAt": now_iso(),
+        "expiresAt": datetime.fromtimestamp(time.time() + EXPORT_TTL, timezone.utc)
+        .isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "size": len(data),
+    }
+    req.store.exports[job["id"]] = {**job, "data": data}
+    return 202, job
+
+
+@operation("UsersController_getExport")
+def get_user_export(req):
+    job = _find_export(req)
+    return 200, {key: value for key, value in job.items() if key != "data"}
+
+
+@operation("UsersController_downloadExport")
+def download_user_export(req):
+    job = _find_export(req)
+    return 200, RawResponse(job["data"], USER_EXPORT_CONTENT_TYPES["gzip"], f"user-{job['userId']}.ndjson.gz")
+
+
+@operation("BoatsController_create")
+def create_boat(req):
+    store = req.store
+    # BF27 : interdire la creation d'un bateau sans permis
+    if not req.user.get("boatLicenseNumber"):
+        raise business_error(403, "PERMIT_REQUIRED", "Boat license is required to create a boat")
+    return 201, store.insert(store.boats, {**req.body, "ownerId": req.user["id"]})
+
+
+def _matching_boats(req):
+    boat_type, home_port = req.q("boatType"), req.q("homePort")
+    min_capacity = _number(req.q("minCapacity"))
+    equipment = _list_param(req.q("equipment"))
+    bbox = [_number(req.q(name)) for name in ("minLat", "maxLat", "minLng", "maxLng")]
+
+    def in_bbox(boat):
+        # BF24 : la bounding box ne s'applique que si les 4 bornes sont fournies
+        if any(value is None for value in bbox):
+            return True
+        lat, lng = boat.get("latitude"), boat.get("longitude")
+        if lat is None or lng is None:
+            return False
+        return bbox[0] <= lat <= bbox[1] and bbox[2] <= lng <= bbox[3]
+
+    return [
+        b for b in req.store.boats.values()
+        if (not boat_type or b.get("boatType") == boat_type)
+        and (not home_port or _ilike(b.get("homePort"), home_port))
+        and (not min_capacity or b.get("maxCapacity", 0) >= min_capacity)
+        and equipment <= set(b.get("equipment") or [])
+        and in_bbox(b)
+    ]
+
+
+@operation("BoatsController_findAll")
+def find_boats(req):
+    return 200, _matching_boats(req)
+
+
+def _facet_page(req):
+    limit, offset = _number(req.q("limit") or 0), _number(req.q("offset") or 0)
+    if limit is None or not limit.is_integer() or not 0 <= limit <= MAX_FACET_PAGE_SIZE:
+        raise HttpError(400, f"limit must be an integer between 0 and {MAX_FACET_PAGE_SIZE}")
+    if offset is None or not offset.is_integer() or offset < 0:
+        raise HttpError(400, "offset must be a positive integer")
+    return int(limit), int(offset)
+
+
+def _facet_counts(rows, facets):
+    """Equivalent de countFacets (common/search/facets.ts)."""
+    result = {"total": len(rows), "facets": {}}
+    for name, value_of in facets.items():
+        counts = {}
+        for row in rows:
+            value = value_of(row)
+            if value is not None:
+                counts[value] = counts.get(value, 0) + 1
+        ordered = sorted(counts.items(), key=lambda item: -item[1])[:MAX_FACET_VALUES]
+        result["facets"][name] = [{"value": str(value), "count": count} for value, count in ordered]
+    return result
+
+
+def _facet_results(result, rows, limit, offset):
+    if limit:
+        ordered = sorted(rows, key=lambda row: (row["createdAt"], row["id"]), reverse=True)
+        result["results"] = ordered[offset:offset + limit]
+    return result
+
+
+@operation("BoatsController_facets")
+def boat_facets(req):
+    limit, offset = _facet_page(req)
+    boats = _matching_boats(req)
+    result = _facet_counts(boats, {name: (lambda b, name=name: b.get(name)) for name in BOAT_FACETS})
+    return 200, _facet_results(result, boats, limit, offset)
+
+
+def _tile_x(lng, z):
+    n = 2 ** z
+    return min(n - 1, max(0, math.floor((lng + 180) / 360 * n)))
+
+
+def _tile_y(lat, z):
+    n = 2 ** z
+    rad = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, lat)))
+    return min(n - 1, max(0, math.floor((1 - math.log(math.tan(rad) + 1 / math.cos(rad)) / math.pi) / 2 * n)))
+
+
+def _requested_tiles(req):
+    if req.q("tiles"):
+        tiles = []
+        for part in req.q("tiles").split(","):
+            match = TILE_RE.match(part.strip())
+            z, x, y = map(int, match.groups()) if match else (TILE_ZOOM + 1, 0, 0)
+            if z > TILE_ZOOM or x >= 2 ** z or y >= 2 ** z:
+                raise HttpError(400, f"tiles must be a list of z/x/y tiles with z <= {TILE_ZOOM}")
+            tiles.append((z, x, y))
+    else:
+        zoom = _number(req.q("zoom"))
+        bbox = [_number(req.q(name)) for name in ("minLat", "maxLat", "minLng", "maxLng")]
+        if zoom is None or not zoom.is_integer() or not 0 <= zoom <= TILE_ZOOM or None in bbox:
+            raise HttpError(400, "tiles, or zoom with minLat, maxLat, minLng and maxLng, are required")
+        z = int(zoom)
+        xs = range(_tile_x(bbox[2], z), _tile_x(bbox[3], z) + 1)
+        ys = range(_tile_y(bbox[1], z), _tile_y(bbox[0], z) + 1)
+        if len(xs) * len(ys) > MAX_TILES_PER_REQUEST:
+            raise HttpError(400, f"At most {MAX_TILES_PER_REQUEST} tiles per request")
+        tiles = [(z, x, y) for x in xs for y in ys]
+    if len(tiles) > MAX_TILES_PER_REQUEST:
+        raise HttpError(400, f"At most {MAX_TILES_PER_REQUEST} tiles per request")
+    return tiles
+
+
+@operation("BoatsController_findClusters")
+def find_boat_clusters(req):
+    tiles = _requested_tiles(req)
+    boat_type = req.q("boatType")
+    boats = [
+        (b, _tile_x(b["longitude"], TILE_ZOOM), _tile_y(b["latitude"], TILE_ZOOM))
+        for b in req.store.boats.values()
+        if b.get("latitude") is not None and b.get("longitude") is not None
+        and (not boat_type or b.get("boatType") == boat_type)
+    ]
+
+    result = []
+    for z, x, y in tiles:
+        shift = TILE_ZOOM - z
+        inside = [(b, bx, by) for b, bx, by in boats if bx >> shift == x and by >> shift == y]
+        tile = {"z": z, "x": x, "y": y, "count": len(inside)}
+        if z >= CLUSTER_MAX_ZOOM:
+            tile["boats"] = [b for b, _, _ in inside]
+        else:
+            cells = {}
+            for b, bx, by in inside:
+                cells.setdefault((bx >> (shift - CLUSTER_GRID_BITS), by >> (shift - CLUSTER_GRID_BITS)), []).append(b)
+            tile["clusters"] = sorted(
+                (
+                    {
+                        "z": z + CLUSTER_GRID_BITS,
+                        "x": cx,
+                        "y": cy,
+                        "count": len(members),
+                        "latitude": sum(b["latitude"] for b in members) / len(members),
+                        "longitude": sum(b["longitude"] for b in members) / len(members),
+                    }
+                    for (cx, cy), members in cells.items()
+                ),
+                key=lambda cell: -cell["count"],
+            )
+        result.append(tile)
+    return 200, {"tiles": result}
+
+
+@operation("BoatsController_findOne")
+def find_boat(req):
+    store = req.store
+    boat = _get_or_404(store.boats, req.params["boatId"], "Boat")
+    return 200, {
+        **boat,
+        "owner": store.users.get(boat["ownerId"]),
+        "trips": [t for t in store.trips.values() if t["boatId"] == boat["id"]],
+    }
+
+
+@operation("BoatsController_update")
+def update_boat(req):
+    boat = _get_or_404(req.store.boats, req.params["boatId"], "Boat")
+    if boat["ownerId"] != req.user["id"]:
+        raise HttpError(403, "You can only edit your own boats")
+    return 200, req.store.update(boat, req.body)
+
+
+@operation("BoatsController_remove")
+def remove_boat(req):
+    boat = _get_or_404(req.store.boats, req.params["boatId"], "Boat")
+    if boat["ownerId"] != req.user["id"]:
+        raise HttpError(403, "You can only delete your own boats")
+    del req.store.boats[boat["id"]]
+    return 204, None
+
+
+def _public_trip(store, trip):
+    organizer = store.users.get(trip["organizerId"]) or {}
+    return {
+        **trip,
+        "boat": store.boats.get(trip["boatId"]),
+        "organizer": {key: organizer.get(key) for key in ORGANIZER_FIELDS},
+    }
+
+
+@operation("TripsController_create")
+def create_trip(req):
+    store = req.store
+    # BF26 : interdire la creation d'une sortie sans bateau
+    if not any(b["ownerId"] == req.user["id"] for b in store.boats.values()):
+        raise business_error(403, "USER_HAS_NO_BOAT", "User must own a boat to create trips")
+
+    boat = store.boats.get(req.body["boatId"])
+    if boat is None:
+        raise HttpError(404, "Boat not found")
+    if boat["ownerId"] != req.user["id"]:
+        raise HttpError(403, "You can only create trips with your own boats")
+
+    return 201, store.insert(store.trips, {
+        "tripType": "daily",
+        "pricingType": "per_person",
+        **req.body,
+        "organizerId": req.user["id"],
+    })
+
+
+def _matching_trips(req):
+    trip_type = req.q("tripType")
+    min_price, max_price = _number(req.q("minPrice")), _number(req.q("maxPrice"))
+    return [
+        t for t in req.store.trips.values()
+        if (not trip_type or t.get("tripType") == trip_type)
+        and (not min_price or t["price"] >= min_price)
+        and (not max_price or t["price"] <= max_price)
+    ]
+
+
+@operation("TripsController_findAll")
+def find_trips(req):
+    return 200, [_public_trip(req.store, t) for t in _matching_trips(req)]
+
+
+@operation("TripsController_facets")
+def trip_facets(req):
+    limit, offset = _facet_page(req)
+    step = _number(req.q("priceStep")) if req.q("priceStep") is not None else DEFAULT_PRICE_STEP
+    if step is None or not 0 < step < math.inf:
+        raise HttpError(400, "priceStep must be a positive number")
+    trips = _matching_trips(req)
+
+    def price_bucket(trip):
+        bucket = math.floor(trip["price"] / step) * step
+        return int(bucket) if float(bucket).is_integer() else bucket
+
+    result = _facet_counts(trips, {
+        "tripType": lambda t: t.get("tripType"),
+        "pricingType": lambda t: t.get("pricingType"),
+        "price": price_bucket,
+    })
+    result["facets"]["price"].sort(key=lambda bucket: float(bucket["value"]))
+    return 200, _facet_results(result, [_public_trip(req.store, t) for t in trips], limit, offset)
+
+
+def _iso_date(value):
+    # pg_input_is_valid(value, 'date') de trip-search.projection.ts
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _trip_occurrences(store, trip):
+    """Lignes du modele de lecture trip_search d'une sortie (une par date)."""
+    boat = store.boats.get(trip["boatId"]) or {}
+    organizer = store.users.get(trip["organizerId"]) or {}
+
+    def nth(field, n):
+        values = trip.get(field) or []
+        return values[n] if n < len(values) and values[n] != "" else None
+
+    for n in range(max(1, len(trip.get("startDates") or []))):
+        yield {
+            "tripId": trip["id"],
+            "occurrence": n + 1,
+            "startDate": _iso_date(nth("startDates", n)),
+            "endDate": _iso_date(nth("endDates", n)),
+            "startTime": nth("startTimes", n),
+            "endTime": nth("endTimes", n),
+            **{key: trip.get(key) for key in ("title", "tripType", "pricingType", "price", "passengerCount")},
+            "boatId": boat.get("id"),
+            "boatName": boat.get("name"),
+            "boatType": boat.get("boatType"),
+            "boatMaxCapacity": boat.get("maxCapacity"),
+            "homePort": boat.get("homePort"),
+            "latitude": boat.get("latitude"),
+            "longitude": boat.get("longitude"),
+            "organizerId": organizer.get("id"),
+            "organizerFirstName": organizer.get("firstName"),
+            "organizerLastName": organizer.get("lastName"),
+            "organizerCity": organizer.get("city"),
+            "organizerPhotoUrl": organizer.get("photoUrl"),
+            "organizerLanguages": organizer.get("languages"),
+        }
+
+
+@operation("TripsController_search")
+def search_trips(req):
+    limit, offset = _facet_page(req)
+    from_date, to_date = req.q("fromDate"), req.q("toDate")
+    min_price, max_price = _number(req.q("minPrice")), _number(req.q("maxPrice"))
+    trip_type, boat_type = req.q("tripType"), req.q("boatType")
+    seats = _number(req.q("seats"))
+    languages = _list_param(req.q("languages"))
+    bbox = [_number(req.q(name)) for name in ("minLat", "maxLat", "minLng", "maxLng")]
+
+    def matches(row):
+        if from_date and not (row["startDate"] and row["startDate"] >= from_date):
+            return False
+        if to_date and not (row["startDate"] and row["startDate"] <= to_date):
+            return False
+        if all(value is not None for value in bbox):
+            lat, lng = row["latitude"], row["longitude"]
+            if lat is None or lng is None or not (bbox[0] <= lat <= bbox[1] and bbox[2] <= lng <= bbox[3]):
+                return False
+        return (
+            (not min_price or row["price"] >= min_price)
+            and (not max_price or row["price"] <= max_price)
+            and (not trip_type or row["tripType"] == trip_type)
+            and (not boat_type or row["boatType"] == boat_type)
+            and (not seats or row["passengerCount"] >= seats)
+            and languages <= set(row["organizerLanguages"] or [])
+        )
+
+    rows = [row for trip in req.store.trips.values() for row in _trip_occurrences(req.store, trip) if matches(row)]
+    # ORDER BY startDate NULLS LAST, price, tripId, occurrence
+    rows.sort(key=lambda r: (r["startDate"] is None, r["startDate"] or "", r["price"], r["tripId"], r["occurrence"]))
+    return 200, rows[offset:offset + (limit or TRIP_SEARCH_PAGE_SIZE)]
+
+
+# GET /trips/availability : memes constantes que TripAvailabilityService
+MAX_WATCHED_TRIPS = 50
+SSE_HEARTBEAT_SECONDS = 30
+
+
+def _booked_seats(store, trip_id, selected_date):
+    return sum(
+        b["seats"] for b in store.bookings.values()
+        if b["tripId"] == trip_id and b["selectedDate"][:10] == selected_date[:10]
+    )
+
+
+def _publish_seats(store, trip_id, selected_date, delta):
+    """Equivalent de publishSeatsChange (NOTIFY au COMMIT de la reservation)."""
+    trip = store.trips.get(trip_id)
+    if not delta or trip is None:
+        return
+    booked = _booked_seats(store, trip_id, selected_date)
+    change = {
+        "tripId": trip_id,
+        "selectedDate": selected_date[:10],
+        "delta": delta,
+        "bookedSeats": booked,
+        "remainingSeats": trip["passengerCount"] - booked,
+    }
+    for watcher in store.seat_watchers.get(trip_id, ()):
+        watcher.put({"type": "seats", "data": change})
+
+
+@operation("TripsController_availability")
+def watch_trip_availability(req):
+    store = req.store
+    # Ordre conserve, doublons retires (parseList + Set)
+    trip_ids = list(dict.fromkeys(item.strip() for item in (req.q("tripIds") or "").split(",") if item.strip()))
+    # Erreurs apres l'ouverture du flux : evenement "error" (comportement de @Sse dans NestJS)
+    if not trip_ids or len(trip_ids) > MAX_WATCHED_TRIPS:
+        return 200, EventStream([{"type": "error", "data": f"tripIds must list 1 to {MAX_WATCHED_TRIPS} trip IDs"}])
+    if not all(UUID_RE.match(trip_id) for trip_id in trip_ids):
+        return 200, EventStream([{"type": "error", "data": "tripIds must be UUIDs"}])
+
+    today = date.today().isoformat()
+    snapshot = []
+    for trip_id in trip_ids:
+        trip = store.trips.get(trip_id)
+        if trip is None:
+            continue
+        booked = {}
+        for b in store.bookings.values():
+            if b["tripId"] == trip_id and b["selectedDate"][:10] >= today:
+                booked[b["selectedDate"][:10]] = booked.get(b["selectedDate"][:10], 0) + b["seats"]
+        snapshot.append({
+            "type": "availability",
+            "data": {"tripId": trip_id, "passengerCount": trip["passengerCount"], "bookedSeats": booked},
+        })
+
+    watcher = queue.Queue()
+    for trip_id in trip_ids:
+        store.seat_watchers.setdefault(trip_id, set()).add(watcher)
+
+    def unwatch():
+        for trip_id in trip_ids:
+            watchers = store.seat_watchers.get(trip_id, set())
+            watchers.discard(watcher)
+            if not watchers:
+                store.seat_watchers.pop(trip_id, None)
+
+    return 200, EventStream(snapshot, watcher, unwatch)
+
+
+@operation("TripsController_findOne")
+def find_trip(req):
+    store = req.store
+    trip = _get_or_404(store.trips, req.params["tripId"], "Trip")
+    return 200, {
+        **_public_trip(store, trip),
+        "bookings": [b for b in store.bookings.values() if b["tripId"] == trip["id"]],
+    }
+
+
+@operation("TripsController_update")
+def update_trip(req):
+    trip = _get_or_404(req.store.trips, req.params["tripId"], "Trip")
+    if trip["organizerId"] != req.user["id"]:
+        raise HttpError(403, "You can only edit your own trips")
+    return 200, req.store.update(trip, req.body)
+
+
+@operation("TripsController_remove")
+def remove_trip(req):
+    trip = _get_or_404(req.store.trips, req.params["tripId"], "Trip")
+    if trip["organizerId"] != req.user["id"]:
+        raise HttpError(403, "You can only delete your own trips")
+    del req.store.trips[trip["id"]]
+    return 204, None
+
+
+@operation("BookingsController_create")
+def create_booking(req):
+    store = req.store
+    trip = store.trips.get(req.body["tripId"])
+    if trip is None:
+        raise HttpError(404, "Trip not found")
+    booking = store.insert(store.bookings, {
+        **req.body,
+        "userId": req.user["id"],
+        "totalPrice": trip["price"] * req.body["seats"],
+    })
+    _publish_seats(store, booking["tripId"], booking["selectedDate"], booking["seats"])
+    return 201, booking
+
+
+@operation("BookingsController_findAll")
+def find_bookings(req):
+    store = req.store
+    trip_id, user_id = req.q("tripId"), req.q("userId")
+    from_date, to_date = req.q("fromDate"), req.q("toDate")
+    return 200, [
+        {**b, "trip": store.trips.get(b["tripId"]), "user": store.users.get(b["userId"])}
+        for b in store.bookings.values()
+        if (not trip_id or b["tripId"] == trip_id) and (not user_id or b["userId"] == user_id)
+        and (not from_date or b["selectedDate"][:10] >= from_date)
+        and (not to_date or b["selectedDate"][:10] <= to_date)
+    ]
+
+
+@operation("BookingsController_findOne")
+def find_booking(req):
+    store = req.store
+    booking = _get_or_404(store.bookings, req.params["bookingId"], "Booking")
+    return 200, {**booking, "trip": store.trips.get(booking["tripId"]), "user": store.users.get(booking["userId"])}
+
+
+@operation("BookingsController_update")
+def update_booking(req):
+    store = req.store
+    booking = _get_or_404(store.bookings, req.params["bookingId"], "Booking")
+    if booking["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only edit your own bookings")
+    changes = dict(req.body)
+    if changes.get("seats"):
+        changes["totalPrice"] = store.trips[booking["tripId"]]["price"] * changes["seats"]
+    before = (booking["tripId"], booking["selectedDate"][:10], booking["seats"])
+    store.update(booking, changes)
+    if (booking["tripId"], booking["selectedDate"][:10]) == before[:2]:
+        _publish_seats(store, booking["tripId"], booking["selectedDate"], booking["seats"] - before[2])
+    else:
+        _publish_seats(store, before[0], before[1], -before[2])
+        _publish_seats(store, booking["tripId"], booking["selectedDate"], booking["seats"])
+    return 200, booking
+
+
+@operation("BookingsController_remove")
+def remove_booking(req):
+    booking = _get_or_404(req.store.bookings, req.params["bookingId"], "Booking")
+    if booking["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only cancel your own bookings")
+    del req.store.bookings[booking["id"]]
+    _publish_seats(req.store, booking["tripId"], booking["selectedDate"], -booking["seats"])
+    return 204, None
+
+
+@operation("LogbookController_create")
+def create_logbook_entry(req):
+    store = req.store
+    return 201, store.insert(store.logbook, {**req.body, "userId": req.user["id"]})
+
+
+# POST /logbook/import : memes regles que LogbookImportService
+LOGBOOK_IMPORT_CONTENT_TYPES = {"text/csv": "csv", "application/gpx+xml": "gpx"}
+LOGBOOK_IMPORT_COLUMNS = [
+    "fishSpecies", "fishingDate", "released", "length", "weight", "location", "comment", "photoUrl",
+]
+MAX_IMPORT_ERRORS = 100
+IMPORT_BOOLEANS = {"true": True, "false": False, "1": True, "0": False, "yes": True, "no": False,
+                   "oui": True, "non": False}
+GPX_CHILD_RE = {name: re.compile(rf"<{name}>(.*?)</{name}>", re.S) for name in ("name", "desc", "cmt", "time")}
+
+
+def _csv_import_rows(text):
+    """(ligne, valeurs, erreur) par enregistrement du CSV, apres l'en-tete."""
+    reader = csv.reader(io.StringIO(text.removeprefix("\ufeff")))
+    header, line = None, 1
+    for fields in reader:
+        start, line = line, reader.line_num + 1
+        if not fields:
+            continue
+        if header is None:
+            header = [name.strip() for name in fields]
+            unknown = [name for name in header if name not in LOGBOOK_IMPORT_COLUMNS]
+            if unknown:
+                raise HttpError(
+                    400, f"Unknown column(s): {', '.join(unknown)} (expected {', '.join(LOGBOOK_IMPORT_COLUMNS)})",
+                )
+            missing = [name for name in ("fishSpecies", "fishingDate") if name not in header]
+            if missing:
+                raise HttpError(400, f"Missing column(s): {', '.join(missing)}")
+            continue
+        if len(fields) != len(header):
+            yield start, None, f"expected {len(header)} fields, got {len(fields)}"
+            continue
+        yield start, dict(zip(header, fields)), None
+    if header is None:
+        raise HttpError(400, "Empty file: a header line is required")
+
+
+def _gpx_import_rows(text):
+    """(ligne, valeurs, None) par point <wpt> du GPX."""
+    for match in re.finditer(r"<wpt[\s>/]", text):
+        start = match.start()
+        tag_end = text.find(">", start)
+        if text[tag_end - 1] == "/":
+            element = text[start:tag_end + 1]
+        else:
+            end = text.find("</wpt>", tag_end)
+            if end < 0:
+                raise HttpError(400, "Unterminated <wpt> element")
+            element = text[start:end + len("</wpt>")]
+        tag = element[:element.index(">")]
+        attributes = dict(re.findall(r"\s(lat|lon)\s*=\s*[\"']([^\"']*)[\"']", tag))
+        child = {}
+        for name, pattern in GPX_CHILD_RE.items():
+            found = pattern.search(element)
+            if found:
+                value = found.group(1).strip()
+                cdata = re.fullmatch(r"<!\[CDATA\[(.*)\]\]>", value, re.S)
+                child[name] = cdata.group(1) if cdata else html.unescape(value)
+        yield text.count("\n", 0, start) + 1, {
+            "fishSpecies": child.get("name"),
+            "fishingDate": (child.get("time") or "")[:10],
+            "comment": child.get("desc") or child.get("cmt"),
+            "location": f"{attributes['lat']},{attributes['lon']}" if "lat" in attributes and "lon" in attributes else None,
+        }, None
+
+
+def _import_plain(values):
+    plain = {"released": False}
+    for name, raw in values.items():
+        value = (raw or "").strip()
+        if not value:
+            continue
+        if name in ("length", "weight"):
+            try:
+                plain[name] = float(value.replace(",", ".", 1))
+            except ValueError:
+                plain[name] = value
+        elif name == "released":
+            plain[name] = IMPORT_BOOLEANS.get(value.lower(), value)
+        else:
+            plain[name] = value
+    return plain
+
+
+@operation("LogbookController_import")
+def import_logbook_entries(req):
+    store = req.store
+    content_type = (req.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    file_format = LOGBOOK_IMPORT_CONTENT_TYPES.get(content_type)
+    if file_format is None:
+        raise HttpError(415, f"Content-Type must be one of {', '.join(LOGBOOK_IMPORT_CONTENT_TYPES)}")
+
+    schema = req.schemas["CreateLogbookEntryDto"]
+    text = req.raw_body.decode("utf-8")
+    rows = _csv_import_rows(text) if file_format == "csv" else _gpx_import_rows(text)
+    report, valid = {"imported": 0, "failed": 0, "errors": []}, []
+    for line, values, error in rows:
+        if error is None:
+            try:
+                valid.append(validate_body(_import_plain(values), "CreateLogbookEntryDto", schema))
+                continue
+            except HttpError as rejected:
+                error = rejected.body["message"]
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_IMPORT_ERRORS:
+            report["errors"].append({"line": line, "errors": error if isinstance(error, list) else [error]})
+    for entry in valid:
+        store.insert(store.logbook, {**entry, "userId": req.user["id"]})
+    report["imported"] = len(valid)
+    return 200, report
+
+
+@operation("LogbookController_findAll")
+def find_logbook_entries(req):
+    user_id, start_date, species = req.q("userId"), req.q("startDate"), req.q("fishSpecies")
+    return 200, [
+        e for e in req.store.logbook.values()
+        if e["userId"] == user_id
+        and (not start_date or e["fishingDate"] >= start_date)
+        and (not species or _ilike(e["fishSpecies"], species))
+    ]
+
+
+@operation("LogbookController_findOne")
+def find_logbook_entry(req):
+    store = req.store
+    entry = _get_or_404(store.logbook, req.params["entryId"], "Logbook entry")
+    return 200, {**entry, "user": store.users.get(entry["userId"])}
+
+
+@operation("LogbookController_update")
+def update_logbook_entry(req):
+    entry = _get_or_404(req.store.logbook, req.params["entryId"], "Logbook entry")
+    if entry["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only edit your own logbook entries")
+    return 200, req.store.update(entry, req.body)
+
+
+@operation("LogbookController_remove")
+def remove_logbook_entry(req):
+    entry = _get_or_404(req.store.logbook, req.params["entryId"], "Logbook entry")
+    if entry["userId"] != req.user["id"]:
+        raise HttpError(403, "You can only delete your own logbook entries")
+    del req.store.logbook[entry["id"]]
+    return 204, None
+
+
+# ---------------------------------------------------------------------------
+# Routage genere depuis docs/openapi.json
+# ---------------------------------------------------------------------------
+
+class Route:
+    def __init__(self, method, path, spec_operation, schemas):
+        self.method = method
+        self.operation_id = spec_operation["operationId"]
+        self.public = self.operation_id in PUBLIC_OPERATIONS
+        self.idempotent = any(p.get("name") == "Idempotency-Key" for p in spec_operation.get("parameters", []))
+        self.cost = RATE_LIMIT_COSTS.get(self.operation_id, 1)
+        self.handler = HANDLERS.get(self.operation_id)
+        # Le handler modifie le stockage : verrou exclusif (voir StandinApp.handle)
+        self.writes = self.method != "GET" or self.operation_id in WRITING_READS
+
+        # /v1/boats/{boatId} -> ^/api/v1/boats/(?P<boatId>[^/]+)$
+        pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(path))
+        self.regex = re.compile(f"^{re.escape(API_PREFIX)}{pattern}$")
+
+        self.schemas = schemas
+        self.schema_name = self.schema = None
+        body = spec_operation.get("requestBody", {}).get("content", {}).get("application/json")
+        if body:
+            self.schema_name = body["schema"]["$ref"].rsplit("/", 1)[-1]
+            self.schema = schemas[self.schema_name]
+
+
+def load_routes(spec_path=DEFAULT_SPEC):
+    with open(spec_path, encoding="utf-8") as spec_file:
+        spec = json.load(spec_file)
+    schemas = spec.get("components", {}).get("schemas", {})
+    routes = [
+        Route(method.upper(), path, spec_operation, schemas)
+        for path, operations in spec["paths"].items()
+        for method, spec_operation in operations.items()
+    ]
+    # Les chemins fixes passent avant les chemins a parametres (/boats/clusters avant /boats/{boatId})
+    routes.sort(key=lambda route: route.regex.pattern.count("(?P<"))
+    return routes
+
+
+def runtime_metrics():
+    """Equivalent de GET /api/health/runtime : seules les mesures qui ont un sens ici."""
+    metrics = {"timestamp": now_iso(), "memory": {}, "activeResources": {"Thread": threading.active_count()}}
+    try:
+        with open("/proc/self/statm") as statm:
+            metrics["memory"]["rss"] = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        metrics["openFileDescriptors"] = len(os.listdir("/proc/self/fd"))
+    except OSError:  # hors Linux
+        metrics["openFileDescriptors"] = None
+    return metrics
+
+
+def parse_trust_proxy(value):
+    """TRUST_PROXY -> False, True, nombre de proxys ou liste de sous-reseaux (comme main.ts)."""
+    value = (value or "").strip()
+    if value in ("", "false"):
+        return False
+    if value == "true":
+        return True
+    if value.isdigit():
+        return int(value)
+    networks = []
+    for item in value.split(","):
+        item = item.strip()
+        for subnet in PROXY_SUBNETS.get(item, [item]):
+            networks.append(ipaddress.ip_network(subnet, strict=False))
+    return networks
+
+
+def client_address(remote, forwarded_for, trust_proxy):
+    """Adresse du client, comme request.ip d'Express avec 'trust proxy'.
+
+    Les adresses sont parcourues depuis la connexion (remote) vers le client d'origine
+    (X-Forwarded-For lu de droite a gauche) tant qu'elles sont celles de proxys de confiance.
+    """
+    chain = [remote] + [item.strip() for item in reversed((forwarded_for or "").split(",")) if item.strip()]
+    if trust_proxy is False:
+        return remote
+    if trust_proxy is True:
+        return chain[-1]
+    if isinstance(trust_proxy, int):
+        return chain[min(trust_proxy, len(chain) - 1)]
+    for address in chain[:-1]:
+        try:
+            trusted = any(ipaddress.ip_address(address) in network for network in trust_proxy)
+        except ValueError:
+            trusted = False
+        if not trusted:
+            return address
+    return chain[-1]
+
+
+class StandinApp:
+    """Application: routes, stockage et regles transverses (auth, idempotence, debit)."""
+
+    def __init__(self, spec_path=DEFAULT_SPEC, trust_proxy=TRUST_PROXY):
+        self.routes = load_routes(spec_path)
+        self.store = Store()
+        # Tables et etats annexes du stockage ; les seaux de debit ont leur propre verrou
+        self.lock = ReadWriteLock()
+        self.buckets_lock = threading.Lock()
+        self.trust_proxy = parse_trust_proxy(trust_proxy)
+
+    def resolve(self, method, path):
+        for route in self.routes:
+            if route.method != method:
+                continue
+            match = route.regex.match(path)
+            if match:
+                return route, match.groupdict()
+        return None, None
+
+    def authenticate(self, headers):
+        authorization = headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            raise HttpError(401)
+        payload = verify_jwt(authorization[len("Bearer "):])
+        user = payload and self.store.users.get(payload.get("sub"))
+        if not user:
+            raise HttpError(401)
+        return user
+
+    def rate_limit(self, key, cost, response_headers):
+        with self.buckets_lock:
+            tokens, updated_at = self.store.buckets.get(key, (RATE_LIMIT_CAPACITY, time.monotonic()))
+            now = time.monotonic()
+            tokens = min(RATE_LIMIT_CAPACITY, tokens + (now - updated_at) * RATE_LIMIT_REFILL_PER_SECOND)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self.store.buckets[key] = (tokens, now)
+
+        response_headers["X-RateLimit-Limit"] = str(int(RATE_LIMIT_CAPACITY))
+        response_headers["X-RateLimit-Remaining"] = str(int(tokens))
+        if not allowed:
+            wait = (cost - tokens) / RATE_LIMIT_REFILL_PER_SECOND
+            response_headers["Retry-After"] = str(max(1, int(wait + 0.999)))
+            raise business_error(429, "RATE_LIMITED", "Too many requests, retry later", response_headers)
+
+    def handle(self, method, raw_path, headers, raw_body, client_ip):
+        """Traite une requete et retourne (status, en-tetes, corps JSON ou None)."""
+        url = urlsplit(raw_path)
+        response_headers = {}
+
+        if method == "GET" and url.path in (API_PREFIX, API_PREFIX + "/"):
+            return 200, response_headers, {"name": "Fisher Fans API", "version": "3.0.0", "status": "running"}
+        if method == "GET" and url.path == API_PREFIX + "/health":
+            return 200, response_headers, {"status": "ok", "timestamp": now_iso()}
+        if method == "GET" and url.path == API_PREFIX + "/health/runtime":
+            # Toujours actif ici (serveur de test) ; l'API exige RUNTIME_METRICS=true
+            return 200, response_headers, runtime_metrics()
+
+        route, params = self.resolve(method, url.path)
+        if route is None:
+            raise HttpError(404, f"Cannot {method} {url.path}")
+        if route.handler is None:
+            raise HttpError(501, f"{route.operation_id} is not implemented by the stand-in server")
+
+        # Les lectures (GET) s'executent en parallele, les ecritures une a la fois (comme des
+        # transactions serialisees) : un handler voit toujours un stockage coherent. La lecture
+        # du corps et l'envoi de la reponse se font hors verrou (StandinRequestHandler).
+        with self.lock.write() if route.writes else self.lock.read():
+            user = None if route.public else self.authenticate(headers)
+            client = f"user:{user['id']}" if user else f"ip:{client_ip}"
+            self.rate_limit(client, route.cost, response_headers)
+
+            body = None
+            if route.schema is not None:
+                try:
+                    body = json.loads(raw_body or b"{}")
+                except json.JSONDecodeError:
+                    raise HttpError(400, "Unexpected token in JSON")
+                body = validate_body(body, route.schema_name, route.schema)
+
+            idempotency_key = headers.get("Idempotency-Key") if route.idempotent else None
+            if idempotency_key is not None:
+                scope = "\n".join([client, method, raw_path, idempotency_key])
+                fingerprint = _hash(json.dumps(body, sort_keys=True))
+                stored = self.store.idempotency.get(scope)
+                if stored is not None:
+                    if stored[0] != fingerprint:
+                        raise business_error(
+                            422, "IDEMPOTENCY_KEY_REUSED",
+                            "Idempotency-Key was already used with a different request body",
+                        )
+                    response_headers["Idempotent-Replayed"] = "true"
+                    return 201, response_headers, json.loads(stored[1])
+
+            request = Request(
+                self.store, params, parse_qs(url.query), body, user, headers, raw_body, route.schemas,
+            )
+            status, payload = route.handler(request)
+            # Copie profonde : les lignes du stockage ne doivent pas etre exposees telles quelles
+            if payload is not None and not isinstance(payload, (RawResponse, EventStream)):
+                payload = json.loads(json.dumps(payload))
+
+            if idempotency_key is not None:
+                self.store.idempotency[scope] = (fingerprint, json.dumps(payload))
+            return status, response_headers, payload
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive : les clients peuvent reutiliser leurs connexions
+    server_version = SERVER_NAME
+    sys_version = ""
+    # En-tetes et corps sont envoyes separement : sans TCP_NODELAY, Nagle + ACK retarde = +40 ms
+    disable_nagle_algorithm = True
+    app = None  # StandinApp, renseignee par make_server()
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        try:
+            status, headers, payload = self.app.handle(
+                self.command, self.path, self.headers, raw_body,
+                client_address(self.client_address[0], self.headers.get("X-Forwarded-For"), self.app.trust_proxy),
+            )
+        except HttpError as error:
+            status, headers, payload = error.status, error.headers, error.body
+        except Exception:  # erreur non prevue : meme reponse que le filtre d'exceptions NestJS
+            status, headers, payload = 500, {}, HttpError(500).body
+
+        if isinstance(payload, EventStream):
+            self._stream_events(status, headers, payload)
+            return
+        if isinstance(payload, RawResponse):
+            data, content_type = payload.data, payload.content_type
+            headers = {**headers, **payload.headers}
+        else:
+            data = b"" if payload is None else json.dumps(payload).encode()
+            content_type = None if payload is None else "application/json; charset=utf-8"
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header("Content-Type", content_type)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        try:
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client parti en cours de reponse (export abandonne)
+
+    def _stream_events(self, status, headers, stream):
+        # Sans Content-Length : la fin du flux est la fermeture de la connexion
+        self.send_response(status)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for message in stream.messages():
+                self.wfile.write(message)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client parti
+        finally:
+            with self.app.lock.write():
+                stream.close()
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass  # pas de log par requete : le serveur sert aussi aux mesures de charge
+
+
+def make_server(host="127.0.0.1", port=0, spec_path=DEFAULT_SPEC, trust_proxy=TRUST_PROXY):
+    """Cree le serveur (port 0 = port libre choisi par le systeme)."""
+    app = StandinApp(spec_path, trust_proxy)
+    handler = type("BoundStandinRequestHandler", (StandinRequestHandler,), {"app": app})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(host="127.0.0.1", port=0, spec_path=DEFAULT_SPEC, trust_proxy=TRUST_PROXY):
+    """Demarre le serveur dans un thread et retourne (serveur, URL de base /api)."""
+    server = make_server(host, port, spec_path, trust_proxy)
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}{API_PREFIX}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur stand-in de l'API Fisher Fans (memoire, sans PostgreSQL)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8443")))
+    parser.add_argument("--spec", default=DEFAULT_SPEC, help="Document OpenAPI (docs/openapi.json)")
+    parser.add_argument("--trust-proxy", default=TRUST_PROXY, help="Proxys de confiance, comme TRUST_PROXY pour l'API")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.spec, args.trust_proxy)
+    missing = [r.operation_id for r in server.RequestHandlerClass.app.routes if r.handler is None]
+    print(f"Stand-in API: http://{args.host}:{args.port}{API_PREFIX}")
+    if missing:
+        print(f"Operations sans handler (501): {', '.join(missing)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
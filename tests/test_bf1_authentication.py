@@ -6,6 +6,7 @@ Ce fichier teste que:
 - L'authentification fonctionne correctement avec des credentials valides
 - L'authentification echoue avec des credentials invalides
 - Les tokens expires ou invalides sont rejetes
+- Les refresh tokens sont renouveles a chaque usage et la reutilisation est detectee
 """
 
 import pytest
@@ -169,3 +170,159 @@ class TestBF1Authentication:
         )
 
         assert response.status_code == 201, "L'inscription doit etre publique et reussir"
+
+
+class TestBF1RefreshToken:
+    """Tests pour le renouvellement du token d'acces par refresh token."""
+
+    def _login(self, user):
+        response = requests.post(
+            get_url("/auth/v1/login"),
+            json={"email": user["email"], "password": user["password"]},
+            verify=False
+        )
+        assert response.status_code in [200, 201], f"La connexion devrait reussir: {response.text}"
+        return response.json()
+
+    def _refresh(self, refresh_token):
+        return requests.post(
+            get_url("/auth/v1/refresh"),
+            json={"refreshToken": refresh_token},
+            verify=False
+        )
+
+    @pytest.mark.bf1
+    def test_login_returns_distinct_refresh_token(self, created_user):
+        """Test: Le refresh token est distinct du token d'acces."""
+        data = self._login(created_user)
+        assert data.get("refreshToken"), "La reponse doit contenir un refreshToken"
+        assert data["refreshToken"] != data["accessToken"], "Le refresh token ne doit pas etre le JWT"
+
+    @pytest.mark.bf1
+    def test_refresh_rotates_token(self, created_user):
+        """Test: Le refresh renvoie un nouveau couple de tokens utilisable."""
+        data = self._login(created_user)
+
+        response = self._refresh(data["refreshToken"])
+        assert response.status_code == 200, f"Le refresh devrait reussir: {response.text}"
+        refreshed = response.json()
+        assert refreshed["refreshToken"] != data["refreshToken"], "Le refresh token doit etre renouvele"
+        assert refreshed["user"]["id"] == created_user["id"]
+
+        response = requests.get(
+            get_url("/users"),
+            headers={"Authorization": f"Bearer {refreshed['accessToken']}"},
+            verify=False
+        )
+        assert response.status_code == 200, "Le nouveau token d'acces doit etre valide"
+
+    @pytest.mark.bf1
+    def test_refresh_reuse_revokes_family(self, created_user):
+        """Test: Reutiliser un refresh token deja consomme revoque toute la famille."""
+        data = self._login(created_user)
+        rotated = self._refresh(data["refreshToken"]).json()
+
+        reuse = self._refresh(data["refreshToken"])
+        assert reuse.status_code == 401, "Un refresh token deja utilise doit etre rejete"
+
+        response = self._refresh(rotated["refreshToken"])
+        assert response.status_code == 401, "La famille doit etre revoquee apres une reutilisation"
+
+    @pytest.mark.bf1
+    def test_refresh_with_invalid_token(self):
+        """Test: Un refresh token inconnu est rejete."""
+        response = self._refresh("invalid_refresh_token_123")
+        assert response.status_code == 401, "Un refresh token invalide doit retourner 401"
+
+    @pytest.mark.bf1
+    def test_logout_revokes_refresh_token(self, created_user):
+        """Test: Apres deconnexion, le refresh token n'est plus utilisable."""
+        data = self._login(created_user)
+
+        response = requests.post(
+            get_url("/auth/v1/logout"),
+            json={"refreshToken": data["refreshToken"]},
+            verify=False
+        )
+        assert response.status_code == 204, f"La deconnexion devrait reussir: {response.text}"
+
+        response = self._refresh(data["refreshToken"])
+        assert response.status_code == 401, "Le refresh token revoque doit etre rejete"
+
+
+class TestBF1RateLimit:
+    """Tests pour la limitation de debit par utilisateur."""
+
+    @pytest.mark.bf1
+    def test_rate_limit_headers(self, auth_headers):
+        """Test: Les reponses indiquent la limite et les jetons restants."""
+        response = requests.get(get_url("/boats"), headers=auth_headers, verify=False)
+
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" in response.headers
+        assert "X-RateLimit-Remaining" in response.headers
+
+    @pytest.mark.bf1
+    def test_rate_limit_exceeded_returns_429(self, unique_id):
+        """Test: Un client qui depasse sa limite recoit 429 avec Retry-After."""
+        uid = unique_id()
+        user = {
+            "lastName": f"RateLimit{uid}",
+            "firstName": f"Test{uid}",
+            "email": f"ratelimit.{uid}@fisherfans.test",
+            "password": "TestPassword123!",
+            "city": "Brest",
+            "status": "individual"
+        }
+        requests.post(get_url("/users"), json=user, verify=False)
+        login = requests.post(
+            get_url("/auth/v1/login"),
+            json={"email": user["email"], "password": user["password"]},
+            verify=False
+        )
+        headers = {"Authorization": f"Bearer {login.json()['accessToken']}"}
+
+        # Seau dedie a ce nouvel utilisateur : les autres tests ne sont pas impactes
+        response = None
+        for _ in range(200):
+            response = requests.get(get_url("/users"), params={"city": "Brest"}, headers=headers, verify=False)
+            if response.status_code == 429:
+                break
+
+        assert response.status_code == 429, "La limite de debit doit finir par s'appliquer"
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.json().get("businessCode") == "RATE_LIMITED"
+
+    @pytest.mark.bf1
+    def test_rate_limit_anonymous_clients_behind_proxy(self, unique_id):
+        """Test: Derriere un proxy (TRUST_PROXY), chaque client anonyme a son propre seau."""
+        credentials = {"email": f"proxy.{unique_id()}@fisherfans.test", "password": "WrongPassword123!"}
+
+        # Meme proxy (meme adresse de connexion), clients differents dans X-Forwarded-For
+        response = None
+        for _ in range(100):
+            response = requests.post(
+                get_url("/auth/v1/login"),
+                json=credentials,
+                headers={"X-Forwarded-For": "203.0.113.10"},
+                verify=False
+            )
+            if response.status_code == 429:
+                break
+        assert response.status_code == 429, "Le client qui martele le login doit etre limite"
+
+        other_client = requests.post(
+            get_url("/auth/v1/login"),
+            json=credentials,
+            headers={"X-Forwarded-For": "203.0.113.11"},
+            verify=False
+        )
+        assert other_client.status_code == 401, "Les autres clients du proxy ne doivent pas etre limites"
+
+    @pytest.mark.bf1
+    def test_health_is_not_rate_limited(self, api_base_url):
+        """Test: Le health check n'est pas soumis a la limitation."""
+        response = requests.get(f"{api_base_url}/health", verify=False)
+
+        assert response.status_code == 200
+        assert "X-RateLimit-Remaining" not in response.headers
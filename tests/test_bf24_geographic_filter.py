@@ -372,3 +372,135 @@ class TestBF24GeographicFilter:
         assert response.status_code == 200
         boats = response.json()
         assert isinstance(boats, list)
+
+    @pytest.mark.bf24
+    @pytest.mark.latency(p95_ms=50)
+    def test_filter_boats_bounding_box_latency(self, dedicated_auth_headers, latency):
+        """Test: Le filtrage par bounding box respecte son budget de latence."""
+        params = {
+            "minLat": 43.5,
+            "maxLat": 43.8,
+            "minLng": 7.0,
+            "maxLng": 7.5
+        }
+
+        response = latency.measure(lambda: requests.get(
+            get_url("/boats"),
+            params=params,
+            headers=dedicated_auth_headers,
+            verify=False
+        ))
+
+        assert response.status_code == 200
+
+
+class TestBF24BoatClusters:
+    """Tests du regroupement des bateaux par tuile de carte (GET /boats/clusters)."""
+
+    @pytest.fixture(autouse=True)
+    def setup_boats(self, auth_headers_with_permit, unique_id):
+        """Cree un bateau a Nice et un a Monaco."""
+        self.boats_created = []
+        for city, lat, lng in [("Nice", 43.7102, 7.2620), ("Monaco", 43.7384, 7.4246)]:
+            response = requests.post(
+                get_url("/boats"),
+                json={
+                    "name": f"BoatCluster{city}{unique_id()}",
+                    "boatType": "open",
+                    "maxCapacity": 6,
+                    "homePort": city,
+                    "latitude": lat,
+                    "longitude": lng
+                },
+                headers=auth_headers_with_permit,
+                verify=False
+            )
+            if response.status_code == 201:
+                self.boats_created.append(response.json())
+
+    @pytest.mark.bf24
+    def test_clusters_for_bounding_box(self, auth_headers_with_permit):
+        """Test: A faible zoom, la Cote d'Azur est resumee en cellules avec des comptes."""
+        params = {"zoom": 5, "minLat": 43.5, "maxLat": 43.8, "minLng": 7.0, "maxLng": 7.5}
+
+        response = requests.get(
+            get_url("/boats/clusters"),
+            params=params,
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200, f"La requete devrait reussir: {response.text}"
+        tiles = response.json()["tiles"]
+        assert len(tiles) == 1 and tiles[0]["z"] == 5
+        clusters = tiles[0]["clusters"]
+        assert tiles[0]["count"] == sum(cluster["count"] for cluster in clusters)
+        assert tiles[0]["count"] >= len(self.boats_created)
+        for cluster in clusters:
+            # Une cellule est une tuile du zoom z + 3, a l'interieur de la tuile demandee
+            assert cluster["z"] == 8
+            assert cluster["x"] >> 3 == tiles[0]["x"] and cluster["y"] >> 3 == tiles[0]["y"]
+            assert "boats" not in tiles[0]
+
+    @pytest.mark.bf24
+    def test_clusters_multiple_tiles(self, auth_headers_with_permit):
+        """Test: Plusieurs tuiles dans un seul appel, renvoyees dans l'ordre demande."""
+        response = requests.get(
+            get_url("/boats/clusters"),
+            params={"tiles": "5/16/11,0/0/0,5/0/0"},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200
+        tiles = response.json()["tiles"]
+        assert [(t["z"], t["x"], t["y"]) for t in tiles] == [(5, 16, 11), (0, 0, 0), (5, 0, 0)]
+        assert tiles[1]["count"] >= tiles[0]["count"] >= len(self.boats_created)
+        assert tiles[2]["count"] == 0 and tiles[2]["clusters"] == []
+
+    @pytest.mark.bf24
+    def test_clusters_drill_down_to_boats(self, auth_headers_with_permit):
+        """Test: A fort zoom, la tuile contient les bateaux eux-memes."""
+        if not self.boats_created:
+            pytest.skip("Bateaux de test non crees")
+        params = {"zoom": 16, "minLat": 43.7101, "maxLat": 43.7103, "minLng": 7.2619, "maxLng": 7.2621}
+
+        response = requests.get(
+            get_url("/boats/clusters"),
+            params=params,
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200
+        tiles = response.json()["tiles"]
+        ids = [boat["id"] for tile in tiles for boat in tile["boats"]]
+        assert self.boats_created[0]["id"] in ids
+        for tile in tiles:
+            assert tile["z"] == 16 and tile["count"] == len(tile["boats"])
+
+    @pytest.mark.bf24
+    def test_clusters_invalid_tiles(self, auth_headers_with_permit):
+        """Test: Tuile mal formee ou hors de la grille du zoom."""
+        for tiles in ["5/16", "3/8/0", "abc"]:
+            response = requests.get(
+                get_url("/boats/clusters"),
+                params={"tiles": tiles},
+                headers=auth_headers_with_permit,
+                verify=False
+            )
+            assert response.status_code == 400, f"{tiles} devrait etre refusee"
+
+    @pytest.mark.bf24
+    def test_clusters_too_many_tiles(self, auth_headers_with_permit):
+        """Test: Une bounding box qui demande trop de tuiles est refusee."""
+        params = {"zoom": 12, "minLat": 43.0, "maxLat": 44.0, "minLng": 5.0, "maxLng": 8.0}
+
+        response = requests.get(
+            get_url("/boats/clusters"),
+            params=params,
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 400
@@ -11,6 +11,9 @@ BF6: L'API FF devra permettre de creer de nouvelles reservations
 BF7: L'API FF devra permettre de creer de nouveaux carnets de peche
 """
 
+import json
+from datetime import date, timedelta
+
 import pytest
 import requests
 from conftest import get_url
@@ -225,6 +228,76 @@ class TestBF3CreateUsers:
         assert response.status_code == 409, "Un email en doublon doit retourner 409 Conflict"
 
 
+    @pytest.mark.bf3
+    def test_filter_users_by_languages(self, auth_headers, unique_id):
+        """Test: Filtrage des utilisateurs parlant toutes les langues demandees."""
+        uid = unique_id()
+        city = f"Babel{uid}"
+        for name, languages in [("Bilingue", ["Francais", "Anglais"]), ("Francophone", ["Francais"])]:
+            requests.post(
+                get_url("/users"),
+                json={
+                    "lastName": f"{name}{uid}",
+                    "firstName": "Test",
+                    "email": f"{name.lower()}.{uid}@fisherfans.test",
+                    "password": "SecurePass123!",
+                    "city": city,
+                    "status": "individual",
+                    "languages": languages
+                },
+                verify=False
+            )
+
+        response = requests.get(
+            get_url("/users"),
+            params={"city": city, "languages": "Anglais,Francais"},
+            headers=auth_headers,
+            verify=False
+        )
+
+        assert response.status_code == 200, f"La requete devrait reussir: {response.text}"
+        assert [user["lastName"] for user in response.json()] == [f"Bilingue{uid}"]
+
+    @pytest.mark.bf3
+    def test_create_user_idempotency_key_per_anonymous_client(self, unique_id):
+        """Test: Deux clients anonymes avec la meme Idempotency-Key ne partagent pas leurs reponses."""
+        key = f"signup-{unique_id()}"
+        accounts = {}
+        for address in ("203.0.113.20", "203.0.113.21"):
+            uid = unique_id()
+            accounts[address] = {
+                "lastName": f"Anonyme{uid}",
+                "firstName": "Test",
+                "email": f"anonyme.{uid}@fisherfans.test",
+                "password": "SecurePass123!",
+                "city": "Nice",
+                "status": "individual"
+            }
+
+        created = {}
+        for address, user_data in accounts.items():
+            response = requests.post(
+                get_url("/users"),
+                json=user_data,
+                headers={"Idempotency-Key": key, "X-Forwarded-For": address},
+                verify=False
+            )
+            assert response.status_code == 201, f"La creation devrait reussir: {response.text}"
+            assert response.headers.get("Idempotent-Replayed") is None
+            assert response.json()["email"] == user_data["email"]
+            created[address] = response.json()["id"]
+
+        # Le retry du premier client retrouve sa propre reponse
+        retry = requests.post(
+            get_url("/users"),
+            json=accounts["203.0.113.20"],
+            headers={"Idempotency-Key": key, "X-Forwarded-For": "203.0.113.20"},
+            verify=False
+        )
+        assert retry.status_code == 201, f"Le rejeu devrait reussir: {retry.text}"
+        assert retry.headers.get("Idempotent-Replayed") == "true"
+        assert retry.json()["id"] == created["203.0.113.20"]
+
 class TestBF4CreateBoats:
     """Tests pour la creation de bateaux (BF4)."""
 
@@ -412,6 +485,116 @@ class TestBF5CreateTrips:
         assert response.status_code in [400, 422], "La creation doit echouer sans boatId"
 
 
+class TestTripFacets:
+    """Tests des comptes par facette de la recherche de sorties (GET /trips/facets)."""
+
+    @pytest.mark.bf2
+    def test_trip_facets_price_histogram(self, auth_headers_with_permit, created_trip):
+        """Test: Types de sortie, de tarif et histogramme des prix par tranches."""
+        assert created_trip is not None
+
+        response = requests.get(
+            get_url("/trips/facets"),
+            params={"priceStep": 25, "limit": 1},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200, f"La requete devrait reussir: {response.text}"
+        data = response.json()
+        assert data["total"] >= 1
+        assert set(data["facets"]) == {"tripType", "pricingType", "price"}
+        assert sum(v["count"] for v in data["facets"]["tripType"]) == data["total"]
+        buckets = [float(v["value"]) for v in data["facets"]["price"]]
+        assert buckets == sorted(buckets), "L'histogramme est dans l'ordre des prix"
+        assert all(bucket % 25 == 0 for bucket in buckets)
+        assert sum(v["count"] for v in data["facets"]["price"]) == data["total"]
+        assert len(data["results"]) == 1
+
+    @pytest.mark.bf2
+    def test_trip_facets_invalid_price_step(self, auth_headers_with_permit):
+        """Test: Largeur de tranche invalide."""
+        response = requests.get(
+            get_url("/trips/facets"),
+            params={"priceStep": 0},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 400
+
+
+class TestTripSearch:
+    """Tests de la recherche par occurrence (GET /trips/search, modele de lecture trip_search)."""
+
+    @pytest.mark.bf2
+    def test_search_trip_occurrences(self, auth_headers_with_permit, created_boat, unique_id):
+        """Test: Une ligne par date, avec le bateau et l'organisateur, tenue a jour."""
+        assert created_boat is not None
+        uid = unique_id()
+        response = requests.post(
+            get_url("/trips"),
+            json={
+                "title": f"Week-end{uid}",
+                "tripType": "recurring",
+                "pricingType": "per_person",
+                "startDates": ["2031-05-17", "2031-05-18", "2031-06-14"],
+                "startTimes": ["06:00", "07:00", "06:00"],
+                "passengerCount": 3,
+                "price": 70.00,
+                "boatId": created_boat["id"]
+            },
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+        assert response.status_code == 201, f"La creation devrait reussir: {response.text}"
+        trip = response.json()
+        weekend = {
+            "fromDate": "2031-05-17",
+            "toDate": "2031-05-18",
+            "maxPrice": 80,
+            "minLat": 43.5, "maxLat": 43.9, "minLng": 7.0, "maxLng": 7.5,
+            "limit": 100
+        }
+
+        def occurrences(params):
+            response = requests.get(get_url("/trips/search"), params=params,
+                                    headers=auth_headers_with_permit, verify=False)
+            assert response.status_code == 200, f"La requete devrait reussir: {response.text}"
+            return [row for row in response.json() if row["tripId"] == trip["id"]]
+
+        rows = occurrences(weekend)
+        assert [(row["occurrence"], row["startDate"], row["startTime"]) for row in rows] == [
+            (1, "2031-05-17", "06:00"), (2, "2031-05-18", "07:00")
+        ], "Seules les dates du week-end correspondent, dans l'ordre"
+        assert rows[0]["boatName"] == created_boat["name"]
+        assert rows[0]["homePort"] == created_boat["homePort"]
+        assert rows[0]["organizerId"] == trip["organizerId"]
+
+        # Modification de la sortie : le modele de lecture suit dans la meme transaction
+        response = requests.put(get_url(f"/trips/{trip['id']}"), json={"price": 95.00},
+                                headers=auth_headers_with_permit, verify=False)
+        assert response.status_code == 200
+        assert occurrences(weekend) == [], "La sortie ne passe plus sous 80"
+        assert len(occurrences({**weekend, "maxPrice": 100})) == 2
+
+        response = requests.delete(get_url(f"/trips/{trip['id']}"),
+                                   headers=auth_headers_with_permit, verify=False)
+        assert response.status_code == 204
+        assert occurrences({**weekend, "maxPrice": None}) == []
+
+    @pytest.mark.bf2
+    def test_search_trips_invalid_limit(self, auth_headers_with_permit):
+        """Test: Taille de page hors limites."""
+        response = requests.get(
+            get_url("/trips/search"),
+            params={"limit": 1000},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 400
+
 class TestBF6CreateBookings:
     """Tests pour la creation de reservations (BF6)."""
 
@@ -478,6 +661,157 @@ class TestBF6CreateBookings:
 
         assert response.status_code in [400, 404, 422], "La reservation doit echouer pour une sortie inexistante"
 
+    @pytest.mark.bf6
+    def test_create_booking_idempotency_key_replay(self, auth_headers, created_trip, unique_id):
+        """Test: Une reservation rejouee avec la meme Idempotency-Key n'est pas dupliquee."""
+        assert created_trip is not None
+
+        booking_data = {
+            "tripId": created_trip["id"],
+            "selectedDate": "2026-03-01",
+            "seats": 1
+        }
+        headers = {**auth_headers, "Idempotency-Key": f"booking-{unique_id()}"}
+
+        first = requests.post(get_url("/bookings"), json=booking_data, headers=headers, verify=False)
+        second = requests.post(get_url("/bookings"), json=booking_data, headers=headers, verify=False)
+
+        assert first.status_code == 201, f"La creation devrait reussir: {first.text}"
+        assert second.status_code == 201, f"Le rejeu devrait reussir: {second.text}"
+        assert second.json()["id"] == first.json()["id"], "Le rejeu doit renvoyer la meme reservation"
+        assert second.headers.get("Idempotent-Replayed") == "true"
+
+    @pytest.mark.bf6
+    def test_create_booking_idempotency_key_different_body(self, auth_headers, created_trip, unique_id):
+        """Test: Reutiliser une Idempotency-Key avec un autre corps est refuse (422)."""
+        assert created_trip is not None
+
+        headers = {**auth_headers, "Idempotency-Key": f"booking-{unique_id()}"}
+        booking_data = {
+            "tripId": created_trip["id"],
+            "selectedDate": "2026-03-01",
+            "seats": 1
+        }
+
+        first = requests.post(get_url("/bookings"), json=booking_data, headers=headers, verify=False)
+        assert first.status_code == 201, f"La creation devrait reussir: {first.text}"
+
+        response = requests.post(
+            get_url("/bookings"),
+            json={**booking_data, "seats": 2},
+            headers=headers,
+            verify=False
+        )
+        assert response.status_code == 422, "Une cle deja utilisee avec un autre corps doit etre refusee"
+        assert response.json().get("businessCode") == "IDEMPOTENCY_KEY_REUSED"
+
+    @pytest.mark.bf6
+    def test_filter_bookings_by_date_range(self, auth_headers, created_trip):
+        """Test: Reservations d'une sortie filtrees par date (fromDate / toDate, bornes incluses)."""
+        assert created_trip is not None
+
+        # 2031 : periode sans partition a l'avance, la reservation va dans la partition par defaut
+        created = {}
+        for selected_date in ("2031-05-31", "2031-06-01", "2031-06-30", "2031-07-01"):
+            response = requests.post(
+                get_url("/bookings"),
+                json={"tripId": created_trip["id"], "selectedDate": selected_date, "seats": 1},
+                headers=auth_headers,
+                verify=False
+            )
+            assert response.status_code == 201, f"La creation devrait reussir: {response.text}"
+            created[response.json()["id"]] = selected_date
+
+        response = requests.get(
+            get_url("/bookings"),
+            params={"tripId": created_trip["id"], "fromDate": "2031-06-01", "toDate": "2031-06-30"},
+            headers=auth_headers,
+            verify=False
+        )
+
+        assert response.status_code == 200
+        found = {b["id"] for b in response.json() if b["id"] in created}
+        assert sorted(created[i] for i in found) == ["2031-06-01", "2031-06-30"]
+
+
+def _read_events(response, count):
+    """Lit count evenements SSE (id, event, data JSON) d'une reponse en flux."""
+    events, event = [], {}
+    for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+        if line:
+            field, _, value = line.partition(":")
+            event[field] = value[1:] if value.startswith(" ") else value
+            continue
+        if event:
+            events.append({"type": event.get("event"), "data": event.get("data")})
+            event = {}
+        if len(events) == count:
+            break
+    return events
+
+
+class TestTripAvailability:
+    """Tests du flux des places restantes (GET /trips/availability, SSE)."""
+
+    @pytest.mark.bf6
+    @pytest.mark.live_stream
+    def test_availability_stream_pushes_booking_changes(self, auth_headers, created_trip):
+        """Test: Etat initial de la sortie, puis evenement a chaque reservation."""
+        assert created_trip is not None
+        selected_date = (date.today() + timedelta(days=30)).isoformat()
+
+        with requests.get(
+            get_url("/trips/availability"),
+            params={"tripIds": created_trip["id"]},
+            stream=True,
+            timeout=10,
+            verify=False
+        ) as stream:
+            assert stream.status_code == 200
+            assert stream.headers["Content-Type"].startswith("text/event-stream")
+            [initial] = _read_events(stream, 1)
+            assert initial["type"] == "availability"
+            availability = json.loads(initial["data"])
+            assert availability["tripId"] == created_trip["id"]
+            assert availability["passengerCount"] == created_trip["passengerCount"]
+            booked = availability["bookedSeats"].get(selected_date, 0)
+
+            response = requests.post(
+                get_url("/bookings"),
+                json={"tripId": created_trip["id"], "selectedDate": selected_date, "seats": 1},
+                headers=auth_headers,
+                verify=False
+            )
+            assert response.status_code == 201
+
+            [event] = _read_events(stream, 1)
+            assert event["type"] == "seats"
+            change = json.loads(event["data"])
+            assert change["tripId"] == created_trip["id"]
+            assert change["selectedDate"] == selected_date
+            assert change["delta"] == 1
+            assert change["bookedSeats"] == booked + 1
+            assert change["remainingSeats"] == created_trip["passengerCount"] - booked - 1
+
+            requests.delete(get_url(f"/bookings/{response.json()['id']}"), headers=auth_headers, verify=False)
+            [event] = _read_events(stream, 1)
+            assert json.loads(event["data"])["delta"] == -1
+
+    @pytest.mark.bf6
+    @pytest.mark.live_stream
+    def test_availability_stream_invalid_trip_ids(self):
+        """Test: Identifiants invalides, le flux se termine par un evenement error."""
+        with requests.get(
+            get_url("/trips/availability"),
+            params={"tripIds": "pas-un-uuid"},
+            stream=True,
+            timeout=10,
+            verify=False
+        ) as stream:
+            [event] = _read_events(stream, 1)
+
+        assert event["type"] == "error"
+
 
 class TestBF7CreateLogbook:
     """Tests pour la creation de carnets de peche (BF7)."""
@@ -569,3 +903,93 @@ class TestBF7CreateLogbook:
         )
 
         assert response.status_code in [400, 422], "La creation doit echouer sans champs requis"
+
+    @pytest.mark.bf7
+    def test_import_logbook_csv(self, auth_headers_with_permit, created_user_with_permit):
+        """Test: Import CSV, lignes valides inserees et lignes invalides rapportees."""
+        csv_data = (
+            "fishSpecies,fishingDate,released,length,weight,location,comment\n"
+            "Bar import,2019-07-01,true,\"52,5\",2.1,Cap d'Antibes,\"Leurre, souple\"\n"
+            "Sar import,2019-07-02,,,,,\n"
+            ",2019-07-03,false,,,,\n"
+            "Congre import,pas-une-date,false,-4,,,\n"
+            "Loup import,2019-07-04\n"
+        )
+
+        response = requests.post(
+            get_url("/logbook/import"),
+            data=csv_data.encode(),
+            headers={**auth_headers_with_permit, "Content-Type": "text/csv"},
+            verify=False
+        )
+
+        assert response.status_code == 200, f"L'import devrait reussir: {response.text}"
+        report = response.json()
+        assert report["imported"] == 2
+        assert report["failed"] == 3
+        errors = {error["line"]: error["errors"] for error in report["errors"]}
+        assert set(errors) == {4, 5, 6}
+        assert "fishSpecies should not be empty" in errors[4]
+        assert len(errors[5]) == 2, "Date invalide et longueur negative"
+
+        entries = requests.get(
+            get_url("/logbook"),
+            params={"userId": created_user_with_permit["id"], "fishSpecies": "Bar import"},
+            headers=auth_headers_with_permit,
+            verify=False
+        ).json()
+        assert len(entries) == 1
+        assert entries[0]["released"] is True
+        assert float(entries[0]["length"]) == 52.5
+        assert entries[0]["comment"] == "Leurre, souple"
+
+    @pytest.mark.bf7
+    def test_import_logbook_gpx(self, auth_headers_with_permit):
+        """Test: Import GPX, un point <wpt> par prise."""
+        gpx_data = """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">
+  <wpt lat="43.5528" lon="7.1274">
+    <time>2019-08-01T06:30:00Z</time>
+    <name>Dorade &amp; co</name>
+    <desc>Au lever du jour</desc>
+  </wpt>
+  <wpt lat="43.56" lon="7.13"/>
+</gpx>
+"""
+
+        response = requests.post(
+            get_url("/logbook/import"),
+            data=gpx_data.encode(),
+            headers={**auth_headers_with_permit, "Content-Type": "application/gpx+xml"},
+            verify=False
+        )
+
+        assert response.status_code == 200, f"L'import devrait reussir: {response.text}"
+        report = response.json()
+        assert report["imported"] == 1
+        assert report["failed"] == 1, "Un point sans nom ni date est rejete"
+        assert report["errors"][0]["line"] == 8
+
+    @pytest.mark.bf7
+    def test_import_logbook_rejects_unknown_column(self, auth_headers_with_permit):
+        """Test: Un en-tete inconnu refuse tout le fichier (400)."""
+        response = requests.post(
+            get_url("/logbook/import"),
+            data=b"fishSpecies,fishingDate,userId\nBar,2019-07-01,x\n",
+            headers={**auth_headers_with_permit, "Content-Type": "text/csv"},
+            verify=False
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.bf7
+    def test_import_logbook_unsupported_content_type(self, auth_headers_with_permit):
+        """Test: Seuls text/csv et application/gpx+xml sont acceptes (415)."""
+        response = requests.post(
+            get_url("/logbook/import"),
+            json={"fishSpecies": "Bar"},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 415
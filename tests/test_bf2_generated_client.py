@@ -0,0 +1,50 @@
+"""
+Tests du client Python genere (BF2 - Ressources exposees)
+
+fisherfans_client.py est genere a partir de docs/openapi.json par generate_client.py :
+il doit rester synchronise avec la specification, et ses types de reponse doivent
+correspondre a ce que renvoie l'API.
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+import fisherfans_client
+from generate_client import DEFAULT_OUTPUT, DEFAULT_SPEC, render
+
+
+@pytest.mark.bf2
+class TestGeneratedClient:
+    """Client genere (generate_client.py) : synchronisation et decodage type."""
+
+    def test_client_is_up_to_date(self):
+        """Le client correspond a docs/openapi.json (sinon: python tests/generate_client.py)."""
+        with open(DEFAULT_SPEC, encoding="utf-8") as spec_file:
+            expected = render(json.load(spec_file))
+        with open(DEFAULT_OUTPUT, encoding="utf-8") as output:
+            assert output.read() == expected
+
+    def test_decode_typed_boats(self, api_base_url, auth_token_with_permit, created_boat):
+        """GET /boats est decode en list[Boat] avec des Decimal et des datetime."""
+        if not created_boat:
+            pytest.skip("Bateau de test non cree")
+
+        client = fisherfans_client.FisherFansClient(api_base_url, token=auth_token_with_permit)
+        boat = client.boats_find_one(created_boat["id"])
+        assert isinstance(boat, fisherfans_client.Boat)
+        assert boat.name == created_boat["name"]
+        assert isinstance(boat.deposit, Decimal)
+        assert isinstance(boat.createdAt, datetime)
+
+        boats = client.boats_find_all(homePort=created_boat["homePort"])
+        assert created_boat["id"] in [item.id for item in boats]
+
+    def test_error_raises_api_error(self, api_base_url, auth_token_with_permit):
+        """Une reponse d'erreur leve ApiError avec le statut HTTP."""
+        client = fisherfans_client.FisherFansClient(api_base_url, token=auth_token_with_permit)
+        with pytest.raises(fisherfans_client.ApiError) as error:
+            client.boats_find_one("00000000-0000-4000-8000-000000000000")
+        assert error.value.status == 404
@@ -0,0 +1,273 @@
+"""
+Tests pour BF8: Donnees personnelles (RGPD)
+
+BF8: L'API FF devra permettre a un utilisateur d'exporter l'ensemble de ses
+     donnees (droit d'acces et a la portabilite) et de supprimer son compte
+     (droit a l'effacement)
+
+L'export est une suite de lignes JSON {"type": ..., "data": ...} : profil, bateaux,
+sorties organisees, reservations et carnet de peche. La suppression anonymise le
+profil, puis efface en arriere-plan le reste des donnees personnelles.
+"""
+
+import gzip
+import json
+import time
+
+import pytest
+import requests
+from conftest import get_url
+from fixture_factory import user_payload
+
+# Plus d'abandons que de connexions dans le pool de l'API (10 par defaut, driver pg)
+EXPORT_ABORTS = 12
+ABORTED_EXPORT_ROWS = 10000
+
+
+def _export_lines(content):
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+def _export_within_rate_limit(url, headers, **kwargs):
+    """GET d'un export (cout 10) : sur un 429, attend Retry-After et recommence.
+
+    Un seau ne permet pas autant d'exports d'affilee que le test d'abandon en demande.
+    """
+    while True:
+        response = requests.get(url, headers=headers, timeout=10, verify=False, **kwargs)
+        if response.status_code != 429:
+            return response
+        response.close()
+        time.sleep(int(response.headers["Retry-After"]))
+
+
+def _pool_connections_in_use(api_base_url):
+    """Connexions du pool de l'API occupees, None si /health/runtime ne les expose pas."""
+    response = requests.get(f"{api_base_url}/health/runtime", verify=False)
+    if response.status_code != 200 or "database" not in response.json():
+        return None
+    database = response.json()["database"]
+    return database["poolTotal"] - database["poolIdle"]
+
+
+class TestBF8UserExport:
+    """Tests pour l'export RGPD (BF8)."""
+
+    @pytest.mark.bf8
+    def test_export_user_data_ndjson(self, auth_headers_with_permit, created_user_with_permit, created_boat):
+        """Test: Export diffuse en NDJSON, profil en premier, sans mot de passe."""
+        user_id = created_user_with_permit["id"]
+        entry = requests.post(
+            get_url("/logbook"),
+            json={"fishSpecies": "Bar export", "fishingDate": "2020-05-01", "released": True},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+        assert entry.status_code == 201
+
+        response = requests.get(
+            get_url(f"/users/{user_id}/export"),
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200, f"L'export devrait reussir: {response.text}"
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        assert "attachment" in response.headers.get("Content-Disposition", "")
+
+        lines = _export_lines(response.content)
+        assert lines[0]["type"] == "user"
+        assert lines[0]["data"]["id"] == user_id
+        assert "password" not in lines[0]["data"]
+        assert created_boat["id"] in {line["data"]["id"] for line in lines if line["type"] == "boat"}
+        assert entry.json()["id"] in {line["data"]["id"] for line in lines if line["type"] == "logbookEntry"}
+
+    @pytest.mark.bf8
+    def test_export_user_data_gzip(self, auth_headers_with_permit, created_user_with_permit):
+        """Test: Export compresse (format=gzip), meme contenu."""
+        user_id = created_user_with_permit["id"]
+        response = requests.get(
+            get_url(f"/users/{user_id}/export"),
+            params={"format": "gzip"},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/gzip")
+        lines = _export_lines(gzip.decompress(response.content))
+        assert lines[0] == {"type": "user", "data": lines[0]["data"]}
+        assert lines[0]["data"]["id"] == user_id
+
+    @pytest.mark.bf8
+    def test_export_other_user_forbidden(self, auth_headers, created_user_with_permit):
+        """Test: Un utilisateur ne peut exporter que ses propres donnees."""
+        response = requests.get(
+            get_url(f"/users/{created_user_with_permit['id']}/export"),
+            headers=auth_headers,
+            verify=False
+        )
+
+        assert response.status_code == 403
+
+    @pytest.mark.bf8
+    def test_export_invalid_format(self, auth_headers_with_permit, created_user_with_permit):
+        """Test: Format d'export inconnu refuse."""
+        response = requests.get(
+            get_url(f"/users/{created_user_with_permit['id']}/export"),
+            params={"format": "zip"},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.bf8
+    def test_background_export(self, auth_headers_with_permit, created_user_with_permit):
+        """Test: Export en arriere-plan, suivi puis telechargement du fichier."""
+        user_id = created_user_with_permit["id"]
+        response = requests.post(
+            get_url(f"/users/{user_id}/exports"),
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["userId"] == user_id
+        assert job["status"] in ("pending", "running", "completed")
+
+        for _ in range(50):
+            job = requests.get(
+                get_url(f"/users/{user_id}/exports/{job['id']}"),
+                headers=auth_headers_with_permit,
+                verify=False
+            ).json()
+            if job["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.1)
+        assert job["status"] == "completed"
+
+        download = requests.get(
+            get_url(f"/users/{user_id}/exports/{job['id']}/download"),
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+        assert download.status_code == 200
+        assert len(download.content) == job["size"]
+        lines = _export_lines(gzip.decompress(download.content))
+        assert lines[0]["type"] == "user"
+
+    @pytest.mark.bf8
+    def test_background_export_not_found(self, auth_headers_with_permit, created_user_with_permit):
+        """Test: Export inconnu (ou expire)."""
+        response = requests.get(
+            get_url(f"/users/{created_user_with_permit['id']}/exports/00000000-0000-0000-0000-000000000000"),
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.bf8
+    @pytest.mark.live_stream
+    def test_aborted_export_releases_connection(self, unique_id, api_base_url):
+        """Test: Client qui abandonne l'export en cours de route, la connexion PostgreSQL est rendue au pool."""
+        user_data = user_payload(unique_id())
+        user = requests.post(get_url("/users"), json=user_data, verify=False).json()
+        login_response = requests.post(
+            get_url("/auth/v1/login"),
+            json={"email": user_data["email"], "password": user_data["password"]},
+            verify=False
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['accessToken']}"}
+
+        # Export de plusieurs Mo : bien plus que ce que les tampons absorbent avant l'abandon
+        csv_data = "fishSpecies,fishingDate,released,comment\n" + "".join(
+            f"Bar {line},2019-07-01,true,{'x' * 200}\n" for line in range(ABORTED_EXPORT_ROWS)
+        )
+        response = requests.post(
+            get_url("/logbook/import"),
+            data=csv_data.encode(),
+            headers={**headers, "Content-Type": "text/csv"},
+            verify=False
+        )
+        assert response.json()["imported"] == ABORTED_EXPORT_ROWS
+        in_use = _pool_connections_in_use(api_base_url)
+
+        for _ in range(EXPORT_ABORTS):
+            with _export_within_rate_limit(get_url(f"/users/{user['id']}/export"), headers, stream=True) as stream:
+                assert stream.status_code == 200
+                next(stream.iter_content(1024))
+            # Sortie du with : connexion fermee en plein flux
+
+        if in_use is not None:
+            deadline = time.monotonic() + 5
+            while _pool_connections_in_use(api_base_url) > in_use and time.monotonic() < deadline:
+                time.sleep(0.1)
+            assert _pool_connections_in_use(api_base_url) <= in_use, "Connexions de l'export jamais rendues au pool"
+
+        # Sans liberation, les abandons ont epuise le pool : cet export attendrait une connexion
+        response = _export_within_rate_limit(get_url(f"/users/{user['id']}/export"), headers)
+        assert response.status_code == 200
+        assert len(_export_lines(response.content)) == 1 + ABORTED_EXPORT_ROWS
+
+
+class TestBF8UserErasure:
+    """Tests pour la suppression de compte (BF8)."""
+
+    @pytest.mark.bf8
+    def test_delete_user_erases_logbook_in_background(self, unique_id, auth_headers):
+        """Test: DELETE repond tout de suite, l'effacement du carnet est suivi jusqu'au bout."""
+        user_data = user_payload(unique_id())
+        user = requests.post(get_url("/users"), json=user_data, verify=False).json()
+        login_response = requests.post(
+            get_url("/auth/v1/login"),
+            json={"email": user_data["email"], "password": user_data["password"]},
+            verify=False
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['accessToken']}"}
+        entry = requests.post(
+            get_url("/logbook"),
+            json={
+                "fishSpecies": "Bar effacement",
+                "fishingDate": "2021-06-01",
+                "released": False,
+                "comment": "Devant chez moi, 12 rue du Port",
+                "location": "43.5,7.1",
+            },
+            headers=headers,
+            verify=False
+        )
+        assert entry.status_code == 201
+
+        response = requests.delete(get_url(f"/users/{user['id']}"), headers=headers, verify=False)
+        assert response.status_code == 204
+
+        for _ in range(50):
+            job = requests.get(
+                get_url(f"/users/{user['id']}/anonymization"),
+                headers=headers,
+                verify=False
+            ).json()
+            if job["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.1)
+        assert job["status"] == "completed"
+        assert job["processed"] >= 1
+
+        erased = requests.get(get_url(f"/logbook/{entry.json()['id']}"), headers=auth_headers, verify=False).json()
+        assert erased["comment"] is None
+        assert erased["location"] is None
+        assert erased["fishSpecies"] == "Bar effacement"
+
+    @pytest.mark.bf8
+    def test_anonymization_progress_other_user_forbidden(self, auth_headers, created_user_with_permit):
+        """Test: Seul l'utilisateur suit l'effacement de son compte."""
+        response = requests.get(
+            get_url(f"/users/{created_user_with_permit['id']}/anonymization"),
+            headers=auth_headers,
+            verify=False
+        )
+
+        assert response.status_code == 403
@@ -445,3 +445,116 @@ class TestBF21FilterBoats:
         assert response.status_code == 200
         boats = response.json()
         assert isinstance(boats, list)
+
+    @pytest.mark.bf21
+    def test_filter_boats_by_equipment(self, auth_headers_with_permit, unique_id):
+        """Test: Filtrage des bateaux possedant tous les equipements demandes."""
+        uid = unique_id()
+        home_port = f"PortEquipement{uid}"
+        for name, equipment in [("Complet", ["gps", "sounder", "ladder"]), ("Gps", ["gps"]), ("Vide", [])]:
+            requests.post(
+                get_url("/boats"),
+                json={
+                    "name": f"Equip{name}{uid}",
+                    "boatType": "open",
+                    "maxCapacity": 4,
+                    "homePort": home_port,
+                    "equipment": equipment
+                },
+                headers=auth_headers_with_permit,
+                verify=False
+            )
+
+        response = requests.get(
+            get_url("/boats"),
+            params={"homePort": home_port, "equipment": "gps,sounder"},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200, f"La requete devrait reussir: {response.text}"
+        names = [boat["name"] for boat in response.json()]
+        assert names == [f"EquipComplet{uid}"], "Seul le bateau avec gps ET sounder correspond"
+
+        response = requests.get(
+            get_url("/boats/facets"),
+            params={"homePort": home_port, "equipment": "gps"},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+        assert response.status_code == 200
+        assert response.json()["total"] == 2
+
+    @pytest.mark.bf21
+    def test_boat_facets_counts(self, auth_headers_with_permit, unique_id):
+        """Test: Comptes par facette pour les filtres courants, en un seul appel."""
+        uid = unique_id()
+        home_port = f"PortFacettes{uid}"
+        for boat_type, engine_type in [("open", "diesel"), ("open", "gasoline"), ("cabin", "diesel")]:
+            requests.post(
+                get_url("/boats"),
+                json={
+                    "name": f"FacetTest{boat_type}{uid}",
+                    "boatType": boat_type,
+                    "engineType": engine_type,
+                    "maxCapacity": 4,
+                    "homePort": home_port
+                },
+                headers=auth_headers_with_permit,
+                verify=False
+            )
+
+        response = requests.get(
+            get_url("/boats/facets"),
+            params={"homePort": home_port},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200, f"La requete devrait reussir: {response.text}"
+        data = response.json()
+        assert data["total"] == 3
+        facets = {name: {v["value"]: v["count"] for v in values} for name, values in data["facets"].items()}
+        assert facets["boatType"] == {"open": 2, "cabin": 1}
+        assert facets["engineType"] == {"diesel": 2, "gasoline": 1}
+        assert facets["homePort"] == {home_port: 3}
+        assert facets["licenseType"] == {}, "Les bateaux sans valeur ne sont comptes dans aucune case"
+        assert "results" not in data, "Pas de resultats sans limit"
+
+    @pytest.mark.bf21
+    def test_boat_facets_with_page(self, auth_headers_with_permit, unique_id):
+        """Test: Une page de resultats peut accompagner les comptes."""
+        uid = unique_id()
+        home_port = f"PortPage{uid}"
+        for n in range(3):
+            requests.post(
+                get_url("/boats"),
+                json={"name": f"PageTest{n}{uid}", "boatType": "canoe", "maxCapacity": 2, "homePort": home_port},
+                headers=auth_headers_with_permit,
+                verify=False
+            )
+
+        response = requests.get(
+            get_url("/boats/facets"),
+            params={"homePort": home_port, "limit": 2, "offset": 1},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert len(data["results"]) == 2
+        assert all(boat["homePort"] == home_port for boat in data["results"])
+
+    @pytest.mark.bf21
+    def test_boat_facets_invalid_limit(self, auth_headers_with_permit):
+        """Test: Taille de page hors limites."""
+        response = requests.get(
+            get_url("/boats/facets"),
+            params={"limit": 1000},
+            headers=auth_headers_with_permit,
+            verify=False
+        )
+
+        assert response.status_code == 400